@@ -1,20 +1,41 @@
-from src.classification.classify import run_classify
+import sys
 
-# python -m src.classification
+from src.classification.classify import run_classify, run_merge_shards
+
+OUTPUT_LABELS_PATH = "artifacts/classified/page_labels_ingestion.jsonl"
+OUTPUT_REPORT_PATH = "artifacts/classified/classification_report_ingestion.json"
+OUTPUT_REVIEW_PATH = "artifacts/classified/review_queue_ingestion.jsonl"
+
+# python -m src.classification                       single-node run
+# python -m src.classification shard <index> <count> one shard of a sharded run
+# python -m src.classification merge-shards <count>  combine the outputs of every shard
 if __name__ == "__main__":
-    result = run_classify(
-        enable_classification=True,
-        source_mode="html",
-        input_dir="artifacts/raw/wiki/page",
-        db_path="artifacts/raw/wiki/wiki_registry.db",
-        output_labels_path="artifacts/classified/page_labels_ingestion.jsonl",
-        output_report_path="artifacts/classified/classification_report_ingestion.json",
-        output_review_path="artifacts/classified/review_queue_ingestion.jsonl",
-        classified_output_root="artifacts/classified/wiki",
-        incremental=True,
-        full_rebuild=False,
-        state_db_path="artifacts/classified/classification_state.db",
-        low_confidence_threshold=0.5,
-        include_redirects=True,
-    )
+    command = sys.argv[1] if len(sys.argv) > 1 else "classify"
+    if command == "merge-shards":
+        result = run_merge_shards(
+            shard_count=int(sys.argv[2]),
+            output_labels_path=OUTPUT_LABELS_PATH,
+            output_report_path=OUTPUT_REPORT_PATH,
+            output_review_path=OUTPUT_REVIEW_PATH,
+        )
+    elif command in ("classify", "shard"):
+        shard_args = {"shard_index": int(sys.argv[2]), "shard_count": int(sys.argv[3])} if command == "shard" else {}
+        result = run_classify(
+            enable_classification=True,
+            source_mode="html",
+            input_dir="artifacts/raw/wiki/page",
+            db_path="artifacts/raw/wiki/wiki_registry.db",
+            output_labels_path=OUTPUT_LABELS_PATH,
+            output_report_path=OUTPUT_REPORT_PATH,
+            output_review_path=OUTPUT_REVIEW_PATH,
+            classified_output_root="artifacts/classified/wiki",
+            incremental=True,
+            full_rebuild=False,
+            state_db_path="artifacts/classified/classification_state.db",
+            low_confidence_threshold=0.5,
+            include_redirects=True,
+            **shard_args,
+        )
+    else:
+        raise ValueError(f"Unsupported classification command: {command}")
     print(result)
@@ -1,4 +1,4 @@
-﻿from dataclasses import dataclass
+﻿from dataclasses import dataclass, field
 from typing import Any
 
 from src.classification.domain.entities import WikiPage
@@ -8,6 +8,8 @@ from src.classification.domain.entities import WikiPage
 class LoadedPageMeta:
     source_path: str
     parse_warning: str | None = None
+    # Parsed source document, carried downstream so sinks do not re-read source_path.
+    payload: dict[str, Any] | None = field(default=None, compare=False, repr=False)
 
 
 @dataclass(frozen=True)
@@ -33,6 +35,8 @@ class ClassificationLabelRecord:
     is_redirect: bool
     parse_warning: str | None
     is_ambiguous: bool = False
+    # Not serialized: parsed source document for sinks that enrich the original page.
+    source_payload: dict[str, Any] | None = field(default=None, compare=False, repr=False)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -66,6 +70,14 @@ class ClassificationReportRecord:
     by_entity_type: dict[str, int]
     duration_ms: int
     generated_at: str
+    stage_timings: dict[str, dict[str, Any]] = field(default_factory=dict)
+    profile_path: str | None = None
+    # Counts over every page tracked in the state store; the fields above cover this run only.
+    corpus_totals: dict[str, Any] | None = None
+    # Counters reported by the page source itself (e.g. prefetch hits and stalls).
+    source_stats: dict[str, Any] | None = None
+    # {"index", "count"} of the shard this report covers; None for a single-node (or merged) run.
+    shard: dict[str, int] | None = None
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -79,4 +91,61 @@ class ClassificationReportRecord:
             "by_entity_type": self.by_entity_type,
             "duration_ms": self.duration_ms,
             "generated_at": self.generated_at,
+            "stage_timings": self.stage_timings,
+            "profile_path": self.profile_path,
+            "corpus_totals": self.corpus_totals,
+            "source_stats": self.source_stats,
+            "shard": self.shard,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ClassificationReportRecord":
+        return cls(
+            source_mode=str(data["source_mode"]),
+            total_discovered=int(data["total_discovered"]),
+            loaded_ok=int(data["loaded_ok"]),
+            parse_warning_count=int(data["parse_warning_count"]),
+            misc_count=int(data["misc_count"]),
+            low_conf_count=int(data["low_conf_count"]),
+            ambiguity_count=int(data["ambiguity_count"]),
+            by_entity_type=dict(data["by_entity_type"]),
+            duration_ms=int(data["duration_ms"]),
+            generated_at=str(data["generated_at"]),
+            stage_timings=dict(data.get("stage_timings") or {}),
+            profile_path=data.get("profile_path"),
+            corpus_totals=data.get("corpus_totals"),
+            source_stats=data.get("source_stats"),
+            shard=data.get("shard"),
+        )
+
+
+@dataclass(frozen=True)
+class ShadowDiffRecord:
+    shadow_label: str
+    primary_strategy_version: str
+    shadow_strategy_version: str
+    compared_count: int
+    entity_changed_count: int
+    subtype_changed_count: int
+    entity_transitions: dict[str, int]
+    subtypes_added: dict[str, int]
+    subtypes_removed: dict[str, int]
+    confidence_shift: dict[str, Any]
+    changed_examples: list[dict[str, Any]]
+    generated_at: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "shadow_label": self.shadow_label,
+            "primary_strategy_version": self.primary_strategy_version,
+            "shadow_strategy_version": self.shadow_strategy_version,
+            "compared_count": self.compared_count,
+            "entity_changed_count": self.entity_changed_count,
+            "subtype_changed_count": self.subtype_changed_count,
+            "entity_transitions": self.entity_transitions,
+            "subtypes_added": self.subtypes_added,
+            "subtypes_removed": self.subtypes_removed,
+            "confidence_shift": self.confidence_shift,
+            "changed_examples": self.changed_examples,
+            "generated_at": self.generated_at,
         }
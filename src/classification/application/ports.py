@@ -1,9 +1,10 @@
-﻿from typing import Protocol, Sequence, runtime_checkable
+﻿from typing import Any, Collection, Iterator, Mapping, Protocol, Sequence, runtime_checkable
 
 from src.classification.application.contracts import (
     ClassificationLabelRecord,
     ClassificationReportRecord,
     LoadedPage,
+    ShadowDiffRecord,
 )
 from src.classification.domain.entities import PageRef
 from src.classification.domain.incremental_policy import StateFingerprint
@@ -18,6 +19,27 @@ class PageSourcePort(Protocol):
     """Load and parse a page from a discovered reference."""
 
 
+@runtime_checkable
+class StreamingPageSourcePort(PageSourcePort, Protocol):
+    def iter_discover(self) -> Iterator[PageRef]: ...
+    """Stream page references lazily so discovery memory stays flat."""
+
+    def count(self) -> int: ...
+    """Cheap page count used for progress display."""
+
+
+@runtime_checkable
+class SourceStatsPort(Protocol):
+    def stats(self) -> dict[str, Any]: ...
+    """Counters describing how the source served the run, copied into the run report."""
+
+
+@runtime_checkable
+class PageChangeFeedPort(Protocol):
+    def poll(self) -> list[PageRef]: ...
+    """Return refs of pages that landed or changed since the previous poll."""
+
+
 @runtime_checkable
 class ClassificationSinkPort(Protocol):
     def write_label(self, row: ClassificationLabelRecord) -> None: ...
@@ -36,6 +58,12 @@ class ReportSinkPort(Protocol):
     """Persist aggregate run report."""
 
 
+@runtime_checkable
+class ShadowDiffSinkPort(Protocol):
+    def write_shadow_diff(self, report: ShadowDiffRecord) -> None: ...
+    """Persist the primary-vs-shadow classifier diff of a run."""
+
+
 @runtime_checkable
 class ClassificationStatePort(Protocol):
     def get(self, state_key: str) -> StateFingerprint | None: ...
@@ -50,6 +78,19 @@ class ClassificationStatePort(Protocol):
         strategy_version: str,
         entity_type: str,
         source_path: str,
+        rule_hits: tuple[str, ...] | None = None,
+        is_low_conf: bool | None = None,
+        is_ambiguous: bool | None = None,
     ) -> None: ...
 
+    def get_corpus_totals(self) -> dict[str, Any]: ...
+    """Corpus-wide label counts maintained alongside upserts."""
+
+    def delete_missing(self, seen_state_keys: Collection[str], source_mode: str) -> int: ...
+    """Drop state for pages that are no longer in the corpus; returns the number of rows removed."""
+
+    def record_rule_fingerprints(self, strategy_version: str, fingerprints: Mapping[str, str]) -> None: ...
+
+    def get_rule_fingerprints(self, strategy_version: str) -> dict[str, str]: ...
+
     def close(self) -> None: ...
@@ -1,10 +1,12 @@
-﻿from dataclasses import dataclass
+﻿from dataclasses import dataclass, field
+from typing import Any
 
 from src.classification.application.workflows.classification_pipeline import (
     ClassificationPipeline,
     PipelineConfig,
     PipelineSummary,
 )
+from src.classification.domain.sharding import ShardSpec
 from src.config.logger_config import logger
 
 
@@ -16,6 +18,10 @@ class ClassifyWikiPagesCommand:
     incremental: bool = True
     full_rebuild: bool = False
     show_progress: bool = True
+    profile_path: str | None = None
+    selective_reclassify: bool = False
+    prune_missing: bool = False
+    shard: ShardSpec | None = None
     # Kept for backward compatibility; infrastructure adapter is responsible for consuming this.
     state_db_path: str = "artifacts/classified/classification_state.db"
 
@@ -29,6 +35,10 @@ class ClassifyWikiPagesResult:
     ambiguity_count: int
     parse_warning_count: int
     by_entity_type: dict[str, int]
+    stage_timings: dict[str, dict[str, Any]] = field(default_factory=dict)
+    profile_path: str | None = None
+    corpus_totals: dict[str, Any] | None = None
+    source_stats: dict[str, Any] | None = None
 
 
 class ClassifyWikiPagesUseCase:
@@ -53,6 +63,10 @@ class ClassifyWikiPagesUseCase:
                 incremental=command.incremental,
                 full_rebuild=command.full_rebuild,
                 show_progress=command.show_progress,
+                profile_path=command.profile_path,
+                selective_reclassify=command.selective_reclassify,
+                prune_missing=command.prune_missing,
+                shard=command.shard,
             )
         )
         logger.info(
@@ -72,4 +86,8 @@ class ClassifyWikiPagesUseCase:
             ambiguity_count=summary.ambiguity_count,
             parse_warning_count=summary.parse_warning_count,
             by_entity_type=summary.by_entity_type,
+            stage_timings=summary.stage_timings,
+            profile_path=summary.profile_path,
+            corpus_totals=summary.corpus_totals,
+            source_stats=summary.source_stats,
         )
@@ -1,22 +1,40 @@
-from dataclasses import dataclass
+import cProfile
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
+from pathlib import Path
 from time import perf_counter
+from typing import Any
 
 from tqdm import tqdm
 from src.classification.application.contracts import (
     ClassificationLabelRecord,
     ClassificationReportRecord,
+    LoadedPage,
 )
 from src.classification.application.ports import (
     ClassificationSinkPort,
     ClassificationStatePort,
     PageSourcePort,
     ReportSinkPort,
+    ShadowDiffSinkPort,
+    SourceStatsPort,
+    StreamingPageSourcePort,
 )
+from src.classification.application.workflows.shadow_diff import ShadowDiffCollector
+from src.classification.application.workflows.stage_timer import StageTimer
 from src.classification.domain.classifier import RuleBasedClassifier
 from src.classification.domain.content_hash import compute_content_hash
-from src.classification.domain.incremental_policy import PageFingerprint, evaluate_incremental_decision
+from src.classification.domain.entities import Classification, WikiPage
+from src.classification.domain.incremental_policy import (
+    IncrementalDecision,
+    PageFingerprint,
+    StateFingerprint,
+    evaluate_incremental_decision,
+    evaluate_rule_change_impact,
+)
+from src.classification.domain.rule_fingerprints import compute_rule_fingerprints
 from src.classification.domain.rules import CLASSIFICATION_STRATEGY_VERSION
+from src.classification.domain.sharding import ShardSpec
 from src.config.logger_config import logger
 
 
@@ -28,6 +46,15 @@ class PipelineConfig:
     incremental: bool = True
     full_rebuild: bool = False
     show_progress: bool = True
+    # When set, the run is profiled with cProfile and the stats are dumped to this path.
+    profile_path: str | None = None
+    # On a strategy version bump, re-run only pages whose recorded rule hits touch changed rules.
+    selective_reclassify: bool = False
+    # The source enumerates the whole corpus (not a change feed): state rows of pages it no longer
+    # yields are deleted at the end of the run so corpus totals stop counting them.
+    prune_missing: bool = False
+    # Set when the source is one shard of a sharded run; recorded in the report for run_merge_shards.
+    shard: ShardSpec | None = None
 
 
 @dataclass(frozen=True)
@@ -42,6 +69,10 @@ class PipelineSummary:
     source_mode: str
     duration_ms: int
     generated_at: str
+    stage_timings: dict[str, dict[str, Any]] = field(default_factory=dict)
+    profile_path: str | None = None
+    corpus_totals: dict[str, Any] | None = None
+    source_stats: dict[str, Any] | None = None
 
 
 class ClassificationPipeline:
@@ -56,7 +87,13 @@ class ClassificationPipeline:
         state_store_recovered: bool = False,
         state_store_recovered_from: str | None = None,
         state_store_init_error: str | None = None,
+        shadow_classifier: RuleBasedClassifier | None = None,
+        shadow_sink: ClassificationSinkPort | None = None,
+        shadow_report_sink: ShadowDiffSinkPort | None = None,
+        shadow_label: str = "shadow",
     ) -> None:
+        if shadow_classifier is not None and (shadow_sink is None or shadow_report_sink is None):
+            raise ValueError("shadow_classifier requires shadow_sink and shadow_report_sink")
         self.source = source
         self.classifier = classifier
         self.sink = sink
@@ -66,10 +103,31 @@ class ClassificationPipeline:
         self.state_store_recovered = state_store_recovered
         self.state_store_recovered_from = state_store_recovered_from
         self.state_store_init_error = state_store_init_error
+        # Shadow mode: a second classifier labels the same loaded pages into its own sink and
+        # a diff report; it never touches state or the primary sinks.
+        self.shadow_classifier = shadow_classifier
+        self.shadow_sink = shadow_sink
+        self.shadow_report_sink = shadow_report_sink
+        self.shadow_label = shadow_label
 
     def run(self, config: PipelineConfig) -> PipelineSummary:
         started = perf_counter()
-        refs = self.source.discover()
+        timer = StageTimer()
+        profiler = cProfile.Profile() if config.profile_path else None
+        if profiler is not None:
+            profiler.enable()
+        if isinstance(self.source, StreamingPageSourcePort):
+            # Refs are consumed as they are discovered; only the count is known up front.
+            with timer.measure("discover", count=0):
+                expected_total = self.source.count()
+            refs = timer.iterate("discover", self.source.iter_discover())
+        else:
+            with timer.measure("discover", count=0):
+                refs = self.source.discover()
+            expected_total = len(refs)
+            timer.add("discover", 0.0, 0.0, count=expected_total)
+        discovered_count = 0
+        carried_forward_count = 0
         state_hit_count = 0
         state_miss_count = 0
         skipped_unchanged_count = 0
@@ -96,7 +154,7 @@ class ClassificationPipeline:
         logger.info(
             "Classification pipeline started: source_mode={}, discovered_pages={}, include_redirects={}, low_confidence_threshold={}, incremental={}, full_rebuild={}, state_store_label={}",
             config.source_mode,
-            len(refs),
+            expected_total,
             config.include_redirects,
             config.low_confidence_threshold,
             config.incremental,
@@ -104,23 +162,33 @@ class ClassificationPipeline:
             self.state_store_label,
         )
 
+        current_rule_fingerprints = compute_rule_fingerprints()
+        rule_fingerprints_by_version: dict[str, dict[str, str]] = {}
+        if self.state_store is not None:
+            self.state_store.record_rule_fingerprints(CLASSIFICATION_STRATEGY_VERSION, current_rule_fingerprints)
+
         classified_count = 0
         misc_count = 0
         low_conf_count = 0
         ambiguity_count = 0
         parse_warning_count = 0
         by_entity_type = {k: 0 for k in ("cat", "enemy", "stage", "update", "mechanic", "list", "misc", "invalid")}
+        shadow_diff = ShadowDiffCollector(shadow_label=self.shadow_label) if self.shadow_classifier is not None else None
+        corpus_totals = None
+        seen_state_keys: set[str] = set()
 
         try:
             for ref in tqdm(
                 refs,
-                total=len(refs),
+                total=expected_total,
                 desc="Classification pages",
                 unit="page",
                 leave=True,
                 disable=not config.show_progress,
             ):
-                loaded = self.source.load(ref)
+                discovered_count += 1
+                with timer.measure("load"):
+                    loaded = self.source.load(ref)
                 page = loaded.page
                 if loaded.meta.parse_warning:
                     parse_warning_count += 1
@@ -149,9 +217,11 @@ class ClassificationPipeline:
                         is_redirect=page.is_redirect,
                         parse_warning=loaded.meta.parse_warning,
                         is_ambiguous=False,
+                        source_payload=loaded.meta.payload,
                     )
-                    self.sink.write_label(invalid_row)
-                    self.sink.write_review(invalid_row)
+                    with timer.measure("sink_write"):
+                        self.sink.write_label(invalid_row)
+                        self.sink.write_review(invalid_row)
                     classified_count += 1
                     by_entity_type["invalid"] += 1
                     logger.warning(
@@ -164,20 +234,51 @@ class ClassificationPipeline:
                     continue
 
                 state_key = str(page.pageid)
-                current_hash = compute_content_hash(page.content)
+                seen_state_keys.add(state_key)
+                with timer.measure("hash"):
+                    current_hash = compute_content_hash(page.content)
                 if incremental_effective and self.state_store is not None:
-                    decision = evaluate_incremental_decision(
-                        existing=self.state_store.get(state_key),
-                        current=PageFingerprint(
+                    with timer.measure("state_lookup"):
+                        existing = self.state_store.get(state_key)
+                        current = PageFingerprint(
                             source_mode=config.source_mode,
                             revid=page.revid,
                             content_hash=current_hash,
                             strategy_version=CLASSIFICATION_STRATEGY_VERSION,
-                        ),
-                    )
+                        )
+                        decision = evaluate_incremental_decision(existing=existing, current=current)
+                        if config.selective_reclassify and decision.reason == "strategy_version_changed":
+                            decision = self._evaluate_rule_change(
+                                decision,
+                                existing,
+                                current,
+                                page,
+                                current_rule_fingerprints,
+                                rule_fingerprints_by_version,
+                            )
                     if not decision.should_classify:
-                        skipped_unchanged_count += 1
+                        if decision.reason == "rule_change_carried_forward":
+                            # Label is still valid under the new rules; only move the state to the new version.
+                            carried_forward_count += 1
+                            with timer.measure("state_upsert"):
+                                self.state_store.upsert(
+                                    state_key=state_key,
+                                    source_mode=config.source_mode,
+                                    last_revid=page.revid,
+                                    content_hash=current_hash,
+                                    strategy_version=CLASSIFICATION_STRATEGY_VERSION,
+                                    entity_type=existing.entity_type,
+                                    source_path=loaded.meta.source_path,
+                                    rule_hits=existing.rule_hits,
+                                )
+                        else:
+                            skipped_unchanged_count += 1
                         state_hit_count += 1
+                        if shadow_diff is not None:
+                            # Unchanged pages still need a primary label to compare against.
+                            with timer.measure("shadow_classify"):
+                                primary = self.classifier.classify(page)
+                            self._run_shadow(loaded, primary, config, timer, shadow_diff)
                         logger.debug(
                             "Incremental decision: action=skip, reason={}, doc_id={}, state_key={}, source_mode={}, revision_id={}",
                             decision.reason,
@@ -205,25 +306,11 @@ class ClassificationPipeline:
                         page.revid,
                     )
 
-                result = self.classifier.classify(page)
-                row = ClassificationLabelRecord(
-                    doc_id=page.doc_id,
-                    pageid=page.pageid,
-                    title=page.title,
-                    revision_id=page.revid,
-                    canonical_url=page.canonical_url,
-                    entity_type=result.entity_type,
-                    subtypes=tuple(result.subtypes),
-                    confidence=result.confidence,
-                    reasons=tuple(result.reasons),
-                    matched_rules=tuple(result.matched_rules),
-                    strategy_version=result.strategy_version,
-                    source_path=loaded.meta.source_path,
-                    is_redirect=page.is_redirect,
-                    parse_warning=loaded.meta.parse_warning,
-                    is_ambiguous=result.is_ambiguous,
-                )
-                self.sink.write_label(row)
+                with timer.measure("classify"):
+                    result = self.classifier.classify(page)
+                row = self._label_record(loaded, result)
+                with timer.measure("sink_write"):
+                    self.sink.write_label(row)
                 classified_count += 1
                 by_entity_type[result.entity_type] += 1
 
@@ -231,7 +318,8 @@ class ClassificationPipeline:
                 is_ambiguous = result.is_ambiguous
                 needs_review = result.entity_type == "misc" or is_low_conf or result.is_ambiguous
                 if needs_review:
-                    self.sink.write_review(row)
+                    with timer.measure("sink_write"):
+                        self.sink.write_review(row)
                     logger.debug(
                         "Page enqueued for review: doc_id={}, entity_type={}, confidence={}, reasons={}",
                         page.doc_id,
@@ -246,23 +334,60 @@ class ClassificationPipeline:
                 if result.entity_type == "misc":
                     misc_count += 1
                 if self.state_store is not None:
-                    self.state_store.upsert(
-                        state_key=state_key,
-                        source_mode=config.source_mode,
-                        last_revid=page.revid,
-                        content_hash=current_hash,
-                        strategy_version=result.strategy_version,
-                        entity_type=result.entity_type,
-                        source_path=loaded.meta.source_path,
+                    with timer.measure("state_upsert"):
+                        self.state_store.upsert(
+                            state_key=state_key,
+                            source_mode=config.source_mode,
+                            last_revid=page.revid,
+                            content_hash=current_hash,
+                            strategy_version=result.strategy_version,
+                            entity_type=result.entity_type,
+                            source_path=loaded.meta.source_path,
+                            rule_hits=result.rule_hits,
+                            is_low_conf=is_low_conf,
+                            is_ambiguous=is_ambiguous,
+                        )
+                if shadow_diff is not None:
+                    self._run_shadow(loaded, result, config, timer, shadow_diff)
+            if self.state_store is not None and config.prune_missing and state_tracking_enabled:
+                with timer.measure("state_prune"):
+                    pruned_count = self.state_store.delete_missing(seen_state_keys, config.source_mode)
+                if pruned_count:
+                    logger.info(
+                        "Classification state pruned: source_mode={}, pruned_count={}", config.source_mode, pruned_count
                     )
-        finally:
             if self.state_store is not None:
-                self.state_store.close()
-            self.sink.close()
+                with timer.measure("corpus_totals"):
+                    corpus_totals = self.state_store.get_corpus_totals()
+                # Pages without pageid have no state row; every run re-emits all of them.
+                corpus_totals["invalid_count"] = by_entity_type["invalid"]
+                if by_entity_type["invalid"]:
+                    corpus_totals["by_entity_type"]["invalid"] = by_entity_type["invalid"]
+                corpus_totals["total_pages"] += by_entity_type["invalid"]
+        finally:
+            close_refs = getattr(refs, "close", None)
+            if close_refs is not None:
+                # Release a streaming source's cursor/scandir handle on early exit.
+                close_refs()
+            with timer.measure("close"):
+                if self.state_store is not None:
+                    self.state_store.close()
+                self.sink.close()
+                if self.shadow_sink is not None:
+                    self.shadow_sink.close()
+            if profiler is not None:
+                profiler.disable()
+
+        profile_path = None
+        if profiler is not None and config.profile_path:
+            Path(config.profile_path).parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(config.profile_path)
+            profile_path = config.profile_path
+            logger.info("Classification profile written: profile_path={}", profile_path)
 
         duration_ms = int((perf_counter() - started) * 1000)
         summary = PipelineSummary(
-            total_pages=len(refs),
+            total_pages=discovered_count,
             classified_count=classified_count,
             misc_count=misc_count,
             low_conf_count=low_conf_count,
@@ -272,6 +397,10 @@ class ClassificationPipeline:
             source_mode=config.source_mode,
             duration_ms=duration_ms,
             generated_at=datetime.now(timezone.utc).isoformat(),
+            stage_timings=timer.to_dict(),
+            profile_path=profile_path,
+            corpus_totals=corpus_totals,
+            source_stats=self.source.stats() if isinstance(self.source, SourceStatsPort) else None,
         )
         self.report_sink.write_report(
             ClassificationReportRecord(
@@ -285,14 +414,31 @@ class ClassificationPipeline:
                 by_entity_type=summary.by_entity_type,
                 duration_ms=summary.duration_ms,
                 generated_at=summary.generated_at,
+                stage_timings=summary.stage_timings,
+                profile_path=summary.profile_path,
+                corpus_totals=summary.corpus_totals,
+                source_stats=summary.source_stats,
+                shard=config.shard.to_dict() if config.shard is not None else None,
             )
         )
+        if shadow_diff is not None:
+            shadow_record = shadow_diff.to_record()
+            self.shadow_report_sink.write_shadow_diff(shadow_record)
+            logger.info(
+                "Shadow classification completed: shadow_label={}, compared_count={}, entity_changed_count={}, subtype_changed_count={}",
+                shadow_record.shadow_label,
+                shadow_record.compared_count,
+                shadow_record.entity_changed_count,
+                shadow_record.subtype_changed_count,
+            )
         logger.info(
-            "Classification pipeline completed: source_mode={}, duration_ms={}, classified_count={}, skipped_unchanged_count={}, misc_count={}, low_conf_count={}, ambiguity_count={}, parse_warning_count={}, state_hit_count={}, state_miss_count={}, state_recovery_count={}",
+            "Classification pipeline completed: source_mode={}, duration_ms={}, stage_timings={}, classified_count={}, skipped_unchanged_count={}, carried_forward_count={}, misc_count={}, low_conf_count={}, ambiguity_count={}, parse_warning_count={}, state_hit_count={}, state_miss_count={}, state_recovery_count={}",
             summary.source_mode,
             summary.duration_ms,
+            summary.stage_timings,
             summary.classified_count,
             skipped_unchanged_count,
+            carried_forward_count,
             summary.misc_count,
             summary.low_conf_count,
             summary.ambiguity_count,
@@ -302,3 +448,67 @@ class ClassificationPipeline:
             state_recovery_count,
         )
         return summary
+
+    @staticmethod
+    def _label_record(loaded: LoadedPage, result: Classification) -> ClassificationLabelRecord:
+        page = loaded.page
+        return ClassificationLabelRecord(
+            doc_id=page.doc_id,
+            pageid=page.pageid,
+            title=page.title,
+            revision_id=page.revid,
+            canonical_url=page.canonical_url,
+            entity_type=result.entity_type,
+            subtypes=tuple(result.subtypes),
+            confidence=result.confidence,
+            reasons=tuple(result.reasons),
+            matched_rules=tuple(result.matched_rules),
+            strategy_version=result.strategy_version,
+            source_path=loaded.meta.source_path,
+            is_redirect=page.is_redirect,
+            parse_warning=loaded.meta.parse_warning,
+            is_ambiguous=result.is_ambiguous,
+            source_payload=loaded.meta.payload,
+        )
+
+    def _run_shadow(
+        self,
+        loaded: LoadedPage,
+        primary: Classification,
+        config: PipelineConfig,
+        timer: StageTimer,
+        shadow_diff: ShadowDiffCollector,
+    ) -> None:
+        with timer.measure("shadow_classify"):
+            shadow = self.shadow_classifier.classify(loaded.page)
+        shadow_row = self._label_record(loaded, shadow)
+        with timer.measure("shadow_sink_write"):
+            self.shadow_sink.write_label(shadow_row)
+            if shadow.entity_type == "misc" or shadow.confidence < config.low_confidence_threshold or shadow.is_ambiguous:
+                self.shadow_sink.write_review(shadow_row)
+        shadow_diff.compare(loaded.page, primary, shadow)
+
+    def _evaluate_rule_change(
+        self,
+        decision: IncrementalDecision,
+        existing: StateFingerprint,
+        current: PageFingerprint,
+        page: WikiPage,
+        current_rules: dict[str, str],
+        rules_by_version: dict[str, dict[str, str]],
+    ) -> IncrementalDecision:
+        # Only the strategy version may differ; any content/revision change still forces a re-run.
+        content_decision = evaluate_incremental_decision(
+            existing=existing,
+            current=replace(current, strategy_version=existing.strategy_version),
+        )
+        if content_decision.should_classify:
+            return decision
+        if existing.strategy_version not in rules_by_version:
+            rules_by_version[existing.strategy_version] = self.state_store.get_rule_fingerprints(existing.strategy_version)
+        return evaluate_rule_change_impact(
+            existing=existing,
+            previous_rules=rules_by_version[existing.strategy_version],
+            current_rules=current_rules,
+            current_hits=lambda rule_ids: self.classifier.rule_hits_for(page, rule_ids),
+        )
@@ -0,0 +1,88 @@
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any
+
+from src.classification.application.contracts import ShadowDiffRecord
+from src.classification.domain.entities import Classification, WikiPage
+
+
+class ShadowDiffCollector:
+    # Accumulates how a shadow classifier's labels differ from the primary ones over a run.
+    def __init__(self, shadow_label: str = "shadow", max_examples: int = 50) -> None:
+        self.shadow_label = shadow_label
+        self.max_examples = max_examples
+        self.compared_count = 0
+        self.entity_changed_count = 0
+        self.subtype_changed_count = 0
+        self.entity_transitions: Counter[str] = Counter()
+        self.subtypes_added: Counter[str] = Counter()
+        self.subtypes_removed: Counter[str] = Counter()
+        self.changed_examples: list[dict[str, Any]] = []
+        self.primary_strategy_version: str | None = None
+        self.shadow_strategy_version: str | None = None
+        self._confidence_delta_sum = 0.0
+        self._confidence_abs_delta_sum = 0.0
+        self._confidence_max_abs_delta = 0.0
+        self._confidence_increased = 0
+        self._confidence_decreased = 0
+
+    def compare(self, page: WikiPage, primary: Classification, shadow: Classification) -> None:
+        self.compared_count += 1
+        self.primary_strategy_version = primary.strategy_version
+        self.shadow_strategy_version = shadow.strategy_version
+
+        entity_changed = primary.entity_type != shadow.entity_type
+        if entity_changed:
+            self.entity_changed_count += 1
+            self.entity_transitions[f"{primary.entity_type}->{shadow.entity_type}"] += 1
+        added = set(shadow.subtypes) - set(primary.subtypes)
+        removed = set(primary.subtypes) - set(shadow.subtypes)
+        if added or removed:
+            self.subtype_changed_count += 1
+            self.subtypes_added.update(added)
+            self.subtypes_removed.update(removed)
+
+        delta = shadow.confidence - primary.confidence
+        self._confidence_delta_sum += delta
+        self._confidence_abs_delta_sum += abs(delta)
+        self._confidence_max_abs_delta = max(self._confidence_max_abs_delta, abs(delta))
+        if delta > 0:
+            self._confidence_increased += 1
+        elif delta < 0:
+            self._confidence_decreased += 1
+
+        if (entity_changed or added or removed) and len(self.changed_examples) < self.max_examples:
+            self.changed_examples.append(
+                {
+                    "doc_id": page.doc_id,
+                    "title": page.title,
+                    "primary_entity_type": primary.entity_type,
+                    "shadow_entity_type": shadow.entity_type,
+                    "subtypes_added": sorted(added),
+                    "subtypes_removed": sorted(removed),
+                    "confidence_delta": round(delta, 4),
+                }
+            )
+
+    def to_record(self) -> ShadowDiffRecord:
+        compared = self.compared_count
+        return ShadowDiffRecord(
+            shadow_label=self.shadow_label,
+            primary_strategy_version=self.primary_strategy_version or "",
+            shadow_strategy_version=self.shadow_strategy_version or "",
+            compared_count=compared,
+            entity_changed_count=self.entity_changed_count,
+            subtype_changed_count=self.subtype_changed_count,
+            entity_transitions=dict(self.entity_transitions.most_common()),
+            subtypes_added=dict(self.subtypes_added.most_common()),
+            subtypes_removed=dict(self.subtypes_removed.most_common()),
+            confidence_shift={
+                "mean_delta": round(self._confidence_delta_sum / compared, 6) if compared else 0.0,
+                "mean_abs_delta": round(self._confidence_abs_delta_sum / compared, 6) if compared else 0.0,
+                "max_abs_delta": round(self._confidence_max_abs_delta, 6),
+                "increased_count": self._confidence_increased,
+                "decreased_count": self._confidence_decreased,
+            },
+            changed_examples=list(self.changed_examples),
+            generated_at=datetime.now(timezone.utc).isoformat(),
+        )
@@ -0,0 +1,60 @@
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Sequence
+
+from src.classification.application.contracts import ClassificationReportRecord
+
+
+def merge_report_records(reports: Sequence[ClassificationReportRecord]) -> ClassificationReportRecord:
+    """Combine per-shard reports into the report a single-node run over all shards would produce.
+
+    Counters and stage timings add up; duration is the slowest shard since shards run in parallel.
+    """
+    if not reports:
+        raise ValueError("No shard reports to merge")
+    source_modes = {report.source_mode for report in reports}
+    if len(source_modes) != 1:
+        raise ValueError(f"Shard reports have mixed source modes: {sorted(source_modes)}")
+
+    by_entity_type: Counter[str] = Counter()
+    stage_timings: dict[str, dict[str, Any]] = {}
+    for report in reports:
+        by_entity_type.update(report.by_entity_type)
+        for stage, timing in report.stage_timings.items():
+            merged = stage_timings.setdefault(stage, {"wall_ms": 0.0, "cpu_ms": 0.0, "count": 0})
+            merged["wall_ms"] = round(merged["wall_ms"] + timing.get("wall_ms", 0.0), 3)
+            merged["cpu_ms"] = round(merged["cpu_ms"] + timing.get("cpu_ms", 0.0), 3)
+            merged["count"] += timing.get("count", 0)
+
+    return ClassificationReportRecord(
+        source_mode=source_modes.pop(),
+        total_discovered=sum(report.total_discovered for report in reports),
+        loaded_ok=sum(report.loaded_ok for report in reports),
+        parse_warning_count=sum(report.parse_warning_count for report in reports),
+        misc_count=sum(report.misc_count for report in reports),
+        low_conf_count=sum(report.low_conf_count for report in reports),
+        ambiguity_count=sum(report.ambiguity_count for report in reports),
+        # Keep the key order of a single-node report.
+        by_entity_type={key: by_entity_type[key] for key in dict.fromkeys(k for r in reports for k in r.by_entity_type)},
+        duration_ms=max(report.duration_ms for report in reports),
+        generated_at=datetime.now(timezone.utc).isoformat(),
+        stage_timings=stage_timings,
+        profile_path=None,
+        corpus_totals=_merge_corpus_totals(reports),
+    )
+
+
+def _merge_corpus_totals(reports: Sequence[ClassificationReportRecord]) -> dict[str, Any] | None:
+    # Shard state DBs hold disjoint pages, so their totals add up; a stateless shard makes it unknown.
+    if any(report.corpus_totals is None for report in reports):
+        return None
+    merged: dict[str, Any] = {}
+    by_entity_type: Counter[str] = Counter()
+    for report in reports:
+        for key, value in report.corpus_totals.items():
+            if key == "by_entity_type":
+                by_entity_type.update(value)
+            else:
+                merged[key] = merged.get(key, 0) + value
+    merged["by_entity_type"] = dict(sorted(by_entity_type.items()))
+    return merged
@@ -0,0 +1,58 @@
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from time import perf_counter, thread_time
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class StageTimer:
+    # Accumulates wall time, CPU time of the calling thread and call counts per pipeline stage.
+    def __init__(self) -> None:
+        self._wall: dict[str, float] = {}
+        self._cpu: dict[str, float] = {}
+        self._count: dict[str, int] = {}
+
+    @contextmanager
+    def measure(self, stage: str, count: int = 1) -> Iterator[None]:
+        wall_started = perf_counter()
+        cpu_started = thread_time()
+        try:
+            yield
+        finally:
+            self.add(stage, perf_counter() - wall_started, thread_time() - cpu_started, count=count)
+
+    def add(self, stage: str, wall_seconds: float, cpu_seconds: float, count: int = 1) -> None:
+        self._wall[stage] = self._wall.get(stage, 0.0) + wall_seconds
+        self._cpu[stage] = self._cpu.get(stage, 0.0) + cpu_seconds
+        self._count[stage] = self._count.get(stage, 0) + count
+
+    def iterate(self, stage: str, items: Iterable[T]) -> Iterator[T]:
+        """Yield from `items`, charging the time spent producing each item to `stage`."""
+        iterator = iter(items)
+        try:
+            while True:
+                wall_started = perf_counter()
+                cpu_started = thread_time()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self.add(stage, perf_counter() - wall_started, thread_time() - cpu_started, count=0)
+                self._count[stage] += 1
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def to_dict(self) -> dict[str, dict[str, Any]]:
+        return {
+            stage: {
+                "wall_ms": round(self._wall[stage] * 1000, 3),
+                "cpu_ms": round(self._cpu[stage] * 1000, 3),
+                "count": self._count[stage],
+            }
+            for stage in self._wall
+        }
@@ -0,0 +1,14 @@
+from src.classification.benchmarks.suite import run_benchmark_suite
+
+# python -m src.classification.benchmarks
+if __name__ == "__main__":
+    results_path = run_benchmark_suite(
+        sizes=(1000, 10_000),
+        layouts=("html", "db"),
+        work_dir="artifacts/benchmarks/work",
+        results_dir="artifacts/benchmarks",
+        categories_path="categories.json",
+        micro_sample_size=10_000,
+        seed=0,
+    )
+    print(results_path)
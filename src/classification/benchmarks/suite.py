@@ -0,0 +1,347 @@
+import json
+import os
+import platform
+import shutil
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable
+
+from src.classification.application.contracts import ClassificationLabelRecord, LoadedPage
+from src.classification.benchmarks.synthetic_corpus import (
+    SyntheticCorpus,
+    SyntheticCorpusConfig,
+    generate_corpus,
+    mutate_corpus,
+)
+from src.classification.classify import run_classify
+from src.classification.domain.classifier import RuleBasedClassifier
+from src.classification.domain.content_hash import compute_content_hash
+from src.classification.domain.rules import CLASSIFICATION_STRATEGY_VERSION
+from src.classification.infrastructure.sinks.classified_json_sink import ClassifiedJsonSink
+from src.classification.infrastructure.sinks.jsonl_sink import JsonlClassificationSink
+from src.classification.infrastructure.sinks.linked_classified_sink import LinkedClassifiedSink
+from src.classification.infrastructure.sources.HtmlPageSource import HtmlPageSource
+from src.classification.infrastructure.state.classification_state_store import ClassificationStateStore
+from src.config.logger_config import logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    name: str
+    page_count: int
+    layout: str | None
+    items: int
+    wall_seconds: float
+    # Process high-water mark after the case ran; it never decreases within one suite run.
+    peak_rss_mb: float | None
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def pages_per_sec(self) -> float:
+        return self.items / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "page_count": self.page_count,
+            "layout": self.layout,
+            "items": self.items,
+            "wall_seconds": round(self.wall_seconds, 6),
+            "pages_per_sec": round(self.pages_per_sec, 3),
+            "peak_rss_mb": self.peak_rss_mb,
+            "extra": dict(self.extra),
+        }
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 3)
+
+
+class BenchmarkSuite:
+    # Micro-benchmarks run on an in-memory sample of at most `micro_sample_size` pages so large
+    # corpora stay within memory; end-to-end cases go through run_classify on the whole corpus.
+    def __init__(
+        self,
+        work_dir: str = "artifacts/benchmarks/work",
+        categories_path: str = "categories.json",
+        micro_sample_size: int = 10_000,
+        incremental_change_ratio: float = 0.05,
+        seed: int = 0,
+        keep_corpus: bool = False,
+    ) -> None:
+        self.work_dir = Path(work_dir)
+        self.categories_path = categories_path
+        self.micro_sample_size = micro_sample_size
+        self.incremental_change_ratio = incremental_change_ratio
+        self.seed = seed
+        self.keep_corpus = keep_corpus
+        self.results: list[BenchmarkResult] = []
+
+    def run(self, sizes: tuple[int, ...] = (1000,), layouts: tuple[str, ...] = ("html", "db")) -> list[BenchmarkResult]:
+        for page_count in sizes:
+            for index, layout in enumerate(layouts):
+                corpus_root = self.work_dir / f"corpus_{page_count}_{layout}"
+                shutil.rmtree(corpus_root, ignore_errors=True)
+                config = SyntheticCorpusConfig(
+                    page_count=page_count,
+                    layout=layout,
+                    categories_path=self.categories_path,
+                    seed=self.seed,
+                )
+                corpus = self._measure(
+                    "corpus_generate", page_count, layout, page_count, lambda: generate_corpus(str(corpus_root), config)
+                )
+                try:
+                    if index == 0:
+                        # Micro-benchmarks do not depend on the source layout.
+                        self._run_micro(corpus)
+                    self._run_end_to_end(corpus, layout)
+                finally:
+                    if not self.keep_corpus:
+                        shutil.rmtree(corpus_root, ignore_errors=True)
+        return list(self.results)
+
+    def _run_micro(self, corpus: SyntheticCorpus) -> None:
+        page_count = corpus.page_count
+        source = HtmlPageSource(corpus.page_dir)
+        refs = source.discover()[: self.micro_sample_size]
+        loaded: list[LoadedPage] = self._measure(
+            "html_source_load", page_count, None, len(refs), lambda: [source.load(ref) for ref in refs]
+        )
+        pages = [item.page for item in loaded]
+
+        classifier = RuleBasedClassifier()
+        classifications = self._measure(
+            "classifier_classify", page_count, None, len(pages), lambda: [classifier.classify(page) for page in pages]
+        )
+        self._measure("classifier_classify_batch", page_count, None, len(pages), lambda: classifier.classify_batch(pages))
+        self._measure(
+            "content_hash", page_count, None, len(pages), lambda: [compute_content_hash(page.content) for page in pages]
+        )
+
+        micro_dir = Path(corpus.root) / "micro"
+        micro_dir.mkdir(parents=True, exist_ok=True)
+        store = ClassificationStateStore(str(micro_dir / "classification_state.db"))
+        try:
+
+            def upsert_all() -> None:
+                for page, result in zip(pages, classifications):
+                    store.upsert(
+                        state_key=page.doc_id,
+                        source_mode="html",
+                        last_revid=page.revid,
+                        content_hash=compute_content_hash(page.content),
+                        strategy_version=CLASSIFICATION_STRATEGY_VERSION,
+                        entity_type=result.entity_type,
+                        source_path="benchmark",
+                        rule_hits=result.rule_hits,
+                    )
+
+            self._measure("state_store_upsert", page_count, None, len(pages), upsert_all)
+            self._measure("state_store_get", page_count, None, len(pages), lambda: [store.get(page.doc_id) for page in pages])
+        finally:
+            store.close()
+
+        rows = [
+            ClassificationLabelRecord(
+                doc_id=item.page.doc_id,
+                pageid=item.page.pageid,
+                title=item.page.title,
+                revision_id=item.page.revid,
+                canonical_url=item.page.canonical_url,
+                entity_type=result.entity_type,
+                subtypes=tuple(result.subtypes),
+                confidence=result.confidence,
+                reasons=tuple(result.reasons),
+                matched_rules=tuple(result.matched_rules),
+                strategy_version=result.strategy_version,
+                source_path=item.meta.source_path,
+                is_redirect=item.page.is_redirect,
+                parse_warning=item.meta.parse_warning,
+                is_ambiguous=result.is_ambiguous,
+                source_payload=item.meta.payload,
+            )
+            for item, result in zip(loaded, classifications)
+        ]
+        sinks: dict[str, Callable[[], Any]] = {
+            "sink_jsonl": lambda: JsonlClassificationSink(
+                str(micro_dir / "labels.jsonl"), str(micro_dir / "review.jsonl")
+            ),
+            "sink_classified_json": lambda: ClassifiedJsonSink(str(micro_dir / "classified_copy")),
+            "sink_classified_json_compact": lambda: ClassifiedJsonSink(
+                str(micro_dir / "classified_compact"), compact=True
+            ),
+            "sink_linked_hardlink": lambda: LinkedClassifiedSink(str(micro_dir / "classified_linked")),
+        }
+        for name, make_sink in sinks.items():
+
+            def write_all() -> None:
+                sink = make_sink()
+                try:
+                    for row in rows:
+                        sink.write_label(row)
+                finally:
+                    sink.close()
+
+            self._measure(name, page_count, None, len(rows), write_all)
+
+    def _run_end_to_end(self, corpus: SyntheticCorpus, layout: str) -> None:
+        run_dir = Path(corpus.root) / "run"
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+        def classify(incremental: bool, full_rebuild: bool):
+            return run_classify(
+                enable_classification=True,
+                source_mode=layout,
+                input_dir=corpus.page_dir,
+                db_path=corpus.db_path or "",
+                output_labels_path=str(run_dir / "labels.jsonl"),
+                output_report_path=str(run_dir / "report.json"),
+                output_review_path=str(run_dir / "review.jsonl"),
+                classified_output_root=str(run_dir / "classified"),
+                incremental=incremental,
+                full_rebuild=full_rebuild,
+                state_db_path=str(run_dir / "classification_state.db"),
+                show_progress=False,
+            )
+
+        page_count = corpus.page_count
+        full = self._measure("run_classify_full", page_count, layout, page_count, lambda: classify(False, True))
+        self._annotate(full)
+        unchanged = self._measure(
+            "run_classify_incremental_unchanged", page_count, layout, page_count, lambda: classify(True, False)
+        )
+        self._annotate(unchanged)
+        changed_count = mutate_corpus(corpus, self.incremental_change_ratio, seed=self.seed + 1)
+        changed = self._measure(
+            "run_classify_incremental_changed", page_count, layout, page_count, lambda: classify(True, False)
+        )
+        self._annotate(changed, changed_pages=changed_count)
+
+    def _measure(self, name: str, page_count: int, layout: str | None, items: int, fn: Callable[[], Any]) -> Any:
+        started = perf_counter()
+        value = fn()
+        elapsed = perf_counter() - started
+        result = BenchmarkResult(
+            name=name,
+            page_count=page_count,
+            layout=layout,
+            items=items,
+            wall_seconds=elapsed,
+            peak_rss_mb=peak_rss_mb(),
+        )
+        self.results.append(result)
+        logger.info(
+            "Benchmark case finished: name={}, page_count={}, layout={}, items={}, wall_seconds={:.3f}, pages_per_sec={:.1f}, peak_rss_mb={}",
+            name,
+            page_count,
+            layout,
+            items,
+            elapsed,
+            result.pages_per_sec,
+            result.peak_rss_mb,
+        )
+        return value
+
+    def _annotate(self, run_result: Any, **extra: Any) -> None:
+        # Attach pipeline counters to the latest end-to-end case.
+        if run_result is None:
+            return
+        last = self.results.pop()
+        details = {
+            "classified_count": run_result.classified_count,
+            "stage_timings": run_result.stage_timings,
+            **extra,
+        }
+        self.results.append(
+            BenchmarkResult(
+                name=last.name,
+                page_count=last.page_count,
+                layout=last.layout,
+                items=last.items,
+                wall_seconds=last.wall_seconds,
+                peak_rss_mb=last.peak_rss_mb,
+                extra=details,
+            )
+        )
+
+
+def run_benchmark_suite(
+    sizes: tuple[int, ...] = (1000,),
+    layouts: tuple[str, ...] = ("html", "db"),
+    work_dir: str = "artifacts/benchmarks/work",
+    results_dir: str = "artifacts/benchmarks",
+    categories_path: str = "categories.json",
+    micro_sample_size: int = 10_000,
+    seed: int = 0,
+    keep_corpus: bool = False,
+) -> Path:
+    """Run the suite and write one JSON results file; returns its path."""
+    suite = BenchmarkSuite(
+        work_dir=work_dir,
+        categories_path=categories_path,
+        micro_sample_size=micro_sample_size,
+        seed=seed,
+        keep_corpus=keep_corpus,
+    )
+    started_at = datetime.now(timezone.utc)
+    results = suite.run(sizes=sizes, layouts=layouts)
+    payload = {
+        "created_at": started_at.isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "strategy_version": CLASSIFICATION_STRATEGY_VERSION,
+        "config": {
+            "sizes": list(sizes),
+            "layouts": list(layouts),
+            "micro_sample_size": micro_sample_size,
+            "seed": seed,
+        },
+        "results": [result.to_dict() for result in results],
+    }
+    results_path = Path(results_dir) / f"classification_bench_{started_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    results_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    logger.info("Benchmark results written: results_path={}, case_count={}", str(results_path), len(results))
+    return results_path
+
+
+def compare_benchmark_runs(baseline_path: str, current_path: str) -> list[dict[str, Any]]:
+    """Pair cases by (name, page_count, layout) and report the pages/sec ratio current/baseline."""
+
+    def load(path: str) -> dict[tuple[str, int, str | None], dict[str, Any]]:
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        return {(row["name"], row["page_count"], row["layout"]): row for row in payload["results"]}
+
+    baseline = load(baseline_path)
+    current = load(current_path)
+    rows = []
+    for key in sorted(baseline.keys() & current.keys(), key=lambda k: (k[0], k[1], k[2] or "")):
+        before = baseline[key]["pages_per_sec"]
+        after = current[key]["pages_per_sec"]
+        rows.append(
+            {
+                "name": key[0],
+                "page_count": key[1],
+                "layout": key[2],
+                "baseline_pages_per_sec": before,
+                "current_pages_per_sec": after,
+                "speedup": round(after / before, 4) if before else None,
+            }
+        )
+    return rows
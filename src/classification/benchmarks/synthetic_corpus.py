@@ -0,0 +1,252 @@
+import json
+import math
+import os
+import random
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+from src.classification.domain.rules import PRIMARY_RULES
+from src.config.logger_config import logger
+from src.ingestion.domain.models import WikiPageDoc
+from src.ingestion.infrastructure.fs_sink import JsonFileSink
+from src.ingestion.infrastructure.registry_sqlite import SQLiteRegistryRepository
+
+CORPUS_LAYOUTS = ("html", "db")
+
+# Title shapes per theme so title/content rules fire the way they do on the real wiki.
+_TITLE_TEMPLATES: dict[str, tuple[str, ...]] = {
+    "cat": ("{word} Cat", "{word} {word2} Cat"),
+    "enemy": ("{word}", "{word} {word2}"),
+    "stage": ("{word} Stage", "{word} {word2} (Stage)"),
+    "update": ("Version {major}.{minor} Update", "Patch Notes {major}.{minor}"),
+    "list": ("List of {word} Cats", "{word} Drop Table", "{word} Release Order"),
+    "mechanic": ("{word} Ability", "{word} Damage", "{word} Trait"),
+    "misc": ("{word}", "{word} {word2}"),
+}
+
+
+@dataclass(frozen=True)
+class SyntheticCorpusConfig:
+    page_count: int = 1000
+    layout: str = "html"
+    redirect_ratio: float = 0.08
+    # Lognormal content length in characters; median ~= exp(mu).
+    content_length_median: int = 3000
+    content_length_sigma: float = 0.9
+    max_categories: int = 6
+    categories_path: str = "categories.json"
+    seed: int = 0
+    first_pageid: int = 1
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "page_count": self.page_count,
+            "layout": self.layout,
+            "redirect_ratio": self.redirect_ratio,
+            "content_length_median": self.content_length_median,
+            "content_length_sigma": self.content_length_sigma,
+            "max_categories": self.max_categories,
+            "categories_path": self.categories_path,
+            "seed": self.seed,
+            "first_pageid": self.first_pageid,
+        }
+
+
+@dataclass(frozen=True)
+class SyntheticCorpus:
+    root: str
+    page_dir: str
+    db_path: str | None
+    page_count: int
+    redirect_count: int
+    by_theme: dict[str, int] = field(default_factory=dict)
+    # The config the corpus was generated with; mutations draw from the same category set.
+    config: SyntheticCorpusConfig = field(default_factory=SyntheticCorpusConfig)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "root": self.root,
+            "page_dir": self.page_dir,
+            "db_path": self.db_path,
+            "page_count": self.page_count,
+            "redirect_count": self.redirect_count,
+            "by_theme": dict(self.by_theme),
+            "config": self.config.to_dict(),
+        }
+
+
+def load_category_buckets(categories_path: str) -> dict[str, list[str]]:
+    """Group wiki categories by the entity type whose category rule they trigger ("misc" if none)."""
+    categories = json.loads(Path(categories_path).read_text(encoding="utf-8-sig"))
+    category_rules = [rule for rule in PRIMARY_RULES if rule.type in ("category", "combined")]
+    buckets: dict[str, list[str]] = {}
+    for category in categories:
+        normalized = str(category).lower().strip()
+        target = next((rule.target for rule in category_rules if rule.pattern.search(normalized)), "misc")
+        buckets.setdefault(target, []).append(str(category))
+    return buckets
+
+
+class SyntheticPageFactory:
+    # Draws a theme with the category-bucket sizes as weights, then categories mostly from that
+    # bucket plus some noise from the whole list, mirroring how real pages mix categories.
+    def __init__(self, config: SyntheticCorpusConfig) -> None:
+        if config.layout not in CORPUS_LAYOUTS:
+            raise ValueError(f"Unsupported corpus layout: {config.layout}")
+        if not 0.0 <= config.redirect_ratio <= 1.0:
+            raise ValueError(f"redirect_ratio must be within [0, 1]: {config.redirect_ratio}")
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.buckets = load_category_buckets(config.categories_path)
+        self.all_categories = [category for bucket in self.buckets.values() for category in bucket]
+        self.themes = sorted(set(self.buckets) | set(_TITLE_TEMPLATES))
+        self.theme_weights = [max(len(self.buckets.get(theme, ())), 1) for theme in self.themes]
+        self.vocabulary = sorted(
+            {
+                word
+                for category in self.all_categories
+                for word in category.removeprefix("Category:").replace("-", " ").split()
+                if word.isalpha()
+            }
+        )
+        self._mu = math.log(max(config.content_length_median, 1))
+
+    def make(self, pageid: int, revid: int = 1) -> tuple[str, WikiPageDoc]:
+        rng = self.rng
+        theme = rng.choices(self.themes, weights=self.theme_weights, k=1)[0]
+        title = self._title(theme, pageid)
+        is_redirect = rng.random() < self.config.redirect_ratio
+        if is_redirect:
+            categories: tuple[str, ...] = ()
+            content = f"#REDIRECT [[{self._title(theme, pageid + 1)}]]"
+        else:
+            categories = self._categories(theme)
+            content = self._content()
+        doc = WikiPageDoc(
+            source="synthetic",
+            pageid=pageid,
+            title=title,
+            canonical_url=f"https://battlecats.miraheze.org/wiki/{title.replace(' ', '_')}",
+            revid=revid,
+            timestamp="2026-01-01T00:00:00Z",
+            content_model="wikitext",
+            categories=categories,
+            content=content,
+            is_redirect=is_redirect,
+            redirect_target=None,
+            fetched_at="2026-01-01T00:00:00Z",
+            http={},
+        )
+        return theme, doc
+
+    def mutate_content(self, content: str) -> str:
+        return f"{content}\n{' '.join(self.rng.choices(self.vocabulary, k=20))}"
+
+    def _title(self, theme: str, pageid: int) -> str:
+        template = self.rng.choice(_TITLE_TEMPLATES[theme])
+        base = template.format(
+            word=self.rng.choice(self.vocabulary),
+            word2=self.rng.choice(self.vocabulary),
+            major=self.rng.randint(1, 14),
+            minor=self.rng.randint(0, 9),
+        )
+        # Registry titles are unique.
+        return f"{base} {pageid}"
+
+    def _categories(self, theme: str) -> tuple[str, ...]:
+        count = self.rng.randint(1, max(self.config.max_categories, 1))
+        bucket = self.buckets.get(theme) or self.all_categories
+        themed = self.rng.sample(bucket, k=min(len(bucket), max(1, count - 1)))
+        noise = self.rng.sample(self.all_categories, k=min(len(self.all_categories), count - len(themed)))
+        return tuple(dict.fromkeys(themed + noise))
+
+    def _content(self) -> str:
+        target_length = int(self.rng.lognormvariate(self._mu, self.config.content_length_sigma))
+        # Average word plus separator is ~7 characters.
+        words = self.rng.choices(self.vocabulary, k=max(target_length // 7, 1))
+        return " ".join(words)
+
+
+def generate_corpus(output_dir: str, config: SyntheticCorpusConfig) -> SyntheticCorpus:
+    """Write `config.page_count` pages as crawler JSON files, plus a registry DB for the db layout."""
+    factory = SyntheticPageFactory(config)
+    root = Path(output_dir)
+    page_sink = JsonFileSink(root / "page")
+    registry = SQLiteRegistryRepository(root / "wiki_registry.db") if config.layout == "db" else None
+    by_theme: Counter[str] = Counter()
+    redirect_count = 0
+    pending_rows: list[tuple[int, str, int, str, str]] = []
+    try:
+        for offset in range(config.page_count):
+            theme, doc = factory.make(config.first_pageid + offset)
+            file_path = page_sink.write_page_doc(doc)
+            by_theme[theme] += 1
+            redirect_count += int(doc.is_redirect)
+            if registry is not None:
+                pending_rows.append((doc.pageid, doc.title, doc.revid, str(file_path), ",".join(doc.categories)))
+                if len(pending_rows) >= 10_000:
+                    _insert_registry_rows(registry, pending_rows)
+                    pending_rows = []
+        if registry is not None and pending_rows:
+            _insert_registry_rows(registry, pending_rows)
+    finally:
+        if registry is not None:
+            registry.close()
+
+    corpus = SyntheticCorpus(
+        root=str(root),
+        page_dir=str(page_sink.output_dir),
+        db_path=str(registry.db_path) if registry is not None else None,
+        page_count=config.page_count,
+        redirect_count=redirect_count,
+        by_theme=dict(sorted(by_theme.items())),
+        config=config,
+    )
+    logger.info(
+        "Synthetic corpus generated: root={}, layout={}, page_count={}, redirect_count={}, by_theme={}",
+        corpus.root,
+        config.layout,
+        corpus.page_count,
+        corpus.redirect_count,
+        corpus.by_theme,
+    )
+    return corpus
+
+
+def mutate_corpus(corpus: SyntheticCorpus, fraction: float, seed: int = 1) -> int:
+    """Bump revid and append content on roughly `fraction` of the pages; returns the changed count."""
+    factory = SyntheticPageFactory(replace(corpus.config, seed=seed))
+    rng = random.Random(seed)
+    changed: list[tuple[int, int]] = []
+    with os.scandir(corpus.page_dir) as entries:
+        paths = [entry.path for entry in entries if entry.name.endswith(".json")]
+    for path in sorted(paths):
+        if rng.random() >= fraction:
+            continue
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        payload["revid"] = int(payload.get("revid") or 0) + 1
+        payload["content"] = factory.mutate_content(str(payload.get("content", "")))
+        Path(path).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        changed.append((payload["revid"], int(payload["pageid"])))
+    if corpus.db_path is not None and changed:
+        registry = SQLiteRegistryRepository(corpus.db_path)
+        try:
+            registry.conn.executemany(
+                "UPDATE pages SET last_revid = ?, last_updated = CURRENT_TIMESTAMP WHERE page_id = ?",
+                changed,
+            )
+            registry.conn.commit()
+        finally:
+            registry.close()
+    return len(changed)
+
+
+def _insert_registry_rows(registry: SQLiteRegistryRepository, rows: list[tuple[int, str, int, str, str]]) -> None:
+    # One transaction per batch; upsert_page commits per row, which dominates at 1M pages.
+    registry.conn.executemany(
+        "INSERT OR REPLACE INTO pages (page_id, title, last_revid, file_path, categories) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    registry.conn.commit()
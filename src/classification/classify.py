@@ -1,18 +1,35 @@
+import heapq
+import json
+import threading
+from collections.abc import Callable
 from pathlib import Path
 
+from src.classification.application.contracts import ClassificationReportRecord
 from src.classification.application.use_cases.classify_wiki_pages import (
     ClassifyWikiPagesCommand,
     ClassifyWikiPagesResult,
     ClassifyWikiPagesUseCase,
 )
 from src.classification.application.workflows.classification_pipeline import ClassificationPipeline
+from src.classification.application.workflows.shard_merge import merge_report_records
 from src.classification.domain.classifier import RuleBasedClassifier
+from src.classification.domain.rule_profiler import RuleProfiler
+from src.classification.domain.rules import RuleSet
+from src.classification.domain.sharding import ShardSpec, shard_output_path
 from src.classification.infrastructure.sinks.classified_json_sink import ClassifiedJsonSink
 from src.classification.infrastructure.sinks.composite_sink import CompositeClassificationSink
 from src.classification.infrastructure.sinks.jsonl_sink import JsonlClassificationSink
-from src.classification.infrastructure.sinks.report_sink import JsonReportSink
+from src.classification.infrastructure.sinks.linked_classified_sink import LinkedClassifiedSink
+from src.classification.infrastructure.sinks.report_sink import JsonReportSink, JsonShadowDiffSink
 from src.classification.infrastructure.sources.HtmlPageSource import HtmlPageSource
+from src.classification.infrastructure.sources.PrefetchingPageSource import PrefetchingPageSource
 from src.classification.infrastructure.sources.RegistryPageSource import RegistryPageSource
+from src.classification.infrastructure.sources.ShardedPageSource import ShardedPageSource
+from src.classification.infrastructure.sources.WatchPageSource import (
+    DirectoryChangeFeed,
+    RegistryChangeFeed,
+    WatchPageSource,
+)
 from src.classification.infrastructure.state.classification_state_store import ClassificationStateStore
 from src.config.logger_config import logger
 
@@ -26,16 +43,41 @@ def run_classify(
     output_report_path: str = "artifacts/docs/classification_report_ingestion.json",
     output_review_path: str = "artifacts/docs/review_queue_ingestion.jsonl",
     classified_output_root: str | None = None,
+    classified_compact_output: bool = False,
+    classified_output_mode: str = "copy",
     incremental: bool = True,
     full_rebuild: bool = False,
     state_db_path: str = "artifacts/classified/classification_state.db",
     low_confidence_threshold: float = 0.5,
     include_redirects: bool = True,
     show_progress: bool = True,
+    prefetch_depth: int = 0,
+    prefetch_workers: int = 4,
+    profile: bool = False,
+    rule_profile: bool = False,
+    selective_reclassify: bool = False,
+    shadow_classifier: RuleBasedClassifier | None = None,
+    shadow_rules: RuleSet | None = None,
+    shard_index: int = 0,
+    shard_count: int = 1,
 ) -> ClassifyWikiPagesResult | None:
     if not enable_classification:
         logger.info("Classification adapter is disabled. Set enable_classification=True to run.")
         return None
+    if shadow_classifier is not None and shadow_rules is not None:
+        raise ValueError("Pass either shadow_classifier or shadow_rules, not both")
+    if shadow_rules is not None:
+        # Candidate rule set evaluated against the primary labels without touching state or outputs.
+        shadow_classifier = RuleBasedClassifier(rules=shadow_rules)
+
+    shard = ShardSpec(index=shard_index, count=shard_count) if shard_count > 1 else None
+    if shard is not None:
+        # Each shard owns its labels, review queue, report and state DB; run_merge_shards combines them.
+        output_labels_path = shard_output_path(output_labels_path, shard)
+        output_review_path = shard_output_path(output_review_path, shard)
+        output_report_path = shard_output_path(output_report_path, shard)
+        state_db_path = shard_output_path(state_db_path, shard)
+        logger.info("Classification shard selected: shard={}, state_db_path={}", shard.label, state_db_path)
 
     if source_mode == "html":
         source = HtmlPageSource(input_dir=input_dir)
@@ -43,26 +85,39 @@ def run_classify(
         source = RegistryPageSource(db_path=db_path)
     else:
         raise ValueError(f"Unsupported source mode: {source_mode}")
+    if shard is not None:
+        source = ShardedPageSource(source, shard)
+    if prefetch_depth > 0:
+        source = PrefetchingPageSource(source, prefetch_depth=prefetch_depth, max_workers=prefetch_workers)
 
     state_store = None
     state_store_recovered = False
     state_store_recovered_from = None
     state_store_init_error = None
     if incremental or full_rebuild:
-        try:
-            state_store, state_store_recovered, state_store_recovered_from = ClassificationStateStore.create_with_recovery(
-                state_db_path
-            )
-        except Exception as exc:
-            state_store = None
-            state_store_init_error = f"{type(exc).__name__}:{exc}"
+        state_store, state_store_recovered, state_store_recovered_from, state_store_init_error = open_state_store(
+            state_db_path
+        )
 
     jsonl_sink = JsonlClassificationSink(labels_path=output_labels_path, review_path=output_review_path)
-    classified_root = classified_output_root or str(Path(input_dir) / "classified")
-    classified_sink = ClassifiedJsonSink(classified_root=classified_root)
+    classified_sink = build_classified_sink(
+        classified_output_root or str(Path(input_dir) / "classified"),
+        classified_output_mode,
+        classified_compact_output,
+    )
     sink = CompositeClassificationSink(primary=jsonl_sink, secondary=classified_sink)
     report_sink = JsonReportSink(report_path=output_report_path)
-    classifier = RuleBasedClassifier()
+    rule_profiler = RuleProfiler() if rule_profile else None
+    classifier = RuleBasedClassifier(profiler=rule_profiler)
+    shadow_sink = None
+    shadow_report_sink = None
+    if shadow_classifier is not None:
+        # Shadow labels and the diff sit next to the primary outputs; no classified tree is written.
+        shadow_sink = JsonlClassificationSink(
+            labels_path=str(Path(output_labels_path).with_suffix(".shadow.jsonl")),
+            review_path=str(Path(output_review_path).with_suffix(".shadow.jsonl")),
+        )
+        shadow_report_sink = JsonShadowDiffSink(report_path=str(Path(output_report_path).with_suffix(".shadow_diff.json")))
     pipeline = ClassificationPipeline(
         source=source,
         classifier=classifier,
@@ -73,9 +128,12 @@ def run_classify(
         state_store_recovered=state_store_recovered,
         state_store_recovered_from=state_store_recovered_from,
         state_store_init_error=state_store_init_error,
+        shadow_classifier=shadow_classifier,
+        shadow_sink=shadow_sink,
+        shadow_report_sink=shadow_report_sink,
     )
     use_case = ClassifyWikiPagesUseCase(pipeline=pipeline)
-    return use_case.execute(
+    result = use_case.execute(
         ClassifyWikiPagesCommand(
             source_mode=source_mode,
             low_confidence_threshold=low_confidence_threshold,
@@ -84,5 +142,183 @@ def run_classify(
             full_rebuild=full_rebuild,
             state_db_path=state_db_path,
             show_progress=show_progress,
+            profile_path=str(Path(output_report_path).with_suffix(".prof")) if profile else None,
+            selective_reclassify=selective_reclassify,
+            # Html/db sources enumerate the whole corpus (or the whole shard), so missing pages were deleted.
+            prune_missing=True,
+            shard=shard,
         )
     )
+    if rule_profiler is not None:
+        rule_report_path = Path(output_report_path).with_suffix(".rules.json")
+        rule_report_path.write_text(json.dumps(rule_profiler.to_report(), ensure_ascii=False, indent=2), encoding="utf-8")
+        logger.info("Classification rule profile written: rule_report_path={}", str(rule_report_path))
+    return result
+
+
+def run_watch(
+    source_mode: str = "html",
+    input_dir: str = "artifacts/raw/wiki/page",
+    db_path: str = "data/raw/wiki/wiki_registry.db",
+    output_labels_path: str = "artifacts/docs/page_labels_watch.jsonl",
+    output_report_path: str = "artifacts/docs/classification_report_watch.json",
+    output_review_path: str = "artifacts/docs/review_queue_watch.jsonl",
+    classified_output_root: str | None = None,
+    classified_compact_output: bool = False,
+    classified_output_mode: str = "copy",
+    state_db_path: str = "artifacts/classified/classification_state.db",
+    low_confidence_threshold: float = 0.5,
+    include_redirects: bool = True,
+    poll_interval_seconds: float = 1.0,
+    debounce_seconds: float = 2.0,
+    state_commit_every: int = 100,
+    initial_scan: bool = True,
+    max_idle_polls: int | None = None,
+    stop_event: threading.Event | None = None,
+) -> ClassifyWikiPagesResult:
+    """Classify pages as they land until stopped (Ctrl+C, `stop_event` or `max_idle_polls` empty polls).
+
+    New or changed page files (html) or registry rows by last_updated (db) go through the regular
+    incremental pipeline; state commits are batched and flushed together with the sinks when idle.
+    """
+    if source_mode == "html":
+        feed = DirectoryChangeFeed(input_dir=input_dir, debounce_seconds=debounce_seconds, initial_scan=initial_scan)
+        loader = HtmlPageSource(input_dir=input_dir)
+    elif source_mode == "db":
+        feed = RegistryChangeFeed(db_path=db_path, debounce_seconds=debounce_seconds, initial_scan=initial_scan)
+        loader = RegistryPageSource(db_path=db_path)
+    else:
+        raise ValueError(f"Unsupported source mode: {source_mode}")
+
+    state_store, state_store_recovered, state_store_recovered_from, state_store_init_error = open_state_store(
+        state_db_path, commit_every=state_commit_every
+    )
+    sink = CompositeClassificationSink(
+        primary=JsonlClassificationSink(labels_path=output_labels_path, review_path=output_review_path),
+        secondary=build_classified_sink(
+            classified_output_root or str(Path(input_dir) / "classified"),
+            classified_output_mode,
+            classified_compact_output,
+        ),
+    )
+    on_idle = [sink.flush] if state_store is None else [sink.flush, state_store.flush]
+    source = WatchPageSource(
+        feed=feed,
+        loader=loader,
+        poll_interval_seconds=poll_interval_seconds,
+        on_idle=on_idle,
+        stop_event=stop_event,
+        max_idle_polls=max_idle_polls,
+    )
+    pipeline = ClassificationPipeline(
+        source=source,
+        classifier=RuleBasedClassifier(),
+        sink=sink,
+        report_sink=JsonReportSink(report_path=output_report_path),
+        state_store=state_store,
+        state_store_label=state_db_path,
+        state_store_recovered=state_store_recovered,
+        state_store_recovered_from=state_store_recovered_from,
+        state_store_init_error=state_store_init_error,
+    )
+    logger.info(
+        "Classification watch started: source_mode={}, poll_interval_seconds={}, debounce_seconds={}, state_commit_every={}",
+        source_mode,
+        poll_interval_seconds,
+        debounce_seconds,
+        state_commit_every,
+    )
+    return ClassifyWikiPagesUseCase(pipeline=pipeline).execute(
+        ClassifyWikiPagesCommand(
+            source_mode=source_mode,
+            low_confidence_threshold=low_confidence_threshold,
+            include_redirects=include_redirects,
+            incremental=True,
+            full_rebuild=False,
+            state_db_path=state_db_path,
+            show_progress=False,
+        )
+    )
+
+
+def run_merge_shards(
+    shard_count: int,
+    output_labels_path: str = "artifacts/docs/page_labels_ingestion.jsonl",
+    output_report_path: str = "artifacts/docs/classification_report_ingestion.json",
+    output_review_path: str = "artifacts/docs/review_queue_ingestion.jsonl",
+) -> ClassificationReportRecord:
+    """Combine the outputs of `run_classify(shard_index=i, shard_count=shard_count)` for every shard.
+
+    Each shard writes its rows in source order, so a k-way merge on the source's own order key reproduces
+    the labels and review queue of a single-node run byte for byte.
+    """
+    shards = [ShardSpec(index=index, count=shard_count) for index in range(shard_count)]
+    outputs = [
+        (
+            shard_output_path(output_labels_path, shard),
+            shard_output_path(output_review_path, shard),
+            shard_output_path(output_report_path, shard),
+        )
+        for shard in shards
+    ]
+    missing = [path for paths in outputs for path in paths if not Path(path).exists()]
+    if missing:
+        raise FileNotFoundError(f"Missing shard outputs: {missing}")
+
+    shard_reports = [ClassificationReportRecord.from_dict(json.loads(Path(paths[2]).read_text(encoding="utf-8"))) for paths in outputs]
+    for shard, paths, shard_report in zip(shards, outputs, shard_reports):
+        # Leftovers from a run with a different shard count would double-count or drop pages.
+        if shard_report.shard != shard.to_dict():
+            raise ValueError(f"Shard report does not match {shard.label}: path={paths[2]}, shard={shard_report.shard}")
+    report = merge_report_records(shard_reports)
+
+    order_key = _source_order_key(report.source_mode)
+    for position, target in ((0, output_labels_path), (1, output_review_path)):
+        Path(target).parent.mkdir(parents=True, exist_ok=True)
+        shard_files = [Path(shard_paths[position]).open("r", encoding="utf-8", newline="") for shard_paths in outputs]
+        try:
+            with Path(target).open("w", encoding="utf-8", newline="") as out:
+                out.writelines(heapq.merge(*shard_files, key=lambda line: order_key(json.loads(line))))
+        finally:
+            for shard_file in shard_files:
+                shard_file.close()
+
+    JsonReportSink(report_path=output_report_path).write_report(report)
+    logger.info(
+        "Classification shards merged: shard_count={}, labels_path={}, review_path={}, total_discovered={}, loaded_ok={}",
+        shard_count,
+        output_labels_path,
+        output_review_path,
+        report.total_discovered,
+        report.loaded_ok,
+    )
+    return report
+
+
+def _source_order_key(source_mode: str) -> Callable[[dict], tuple]:
+    # Mirrors discovery order: HtmlPageSource sorts file names, RegistryPageSource orders by page_id.
+    if source_mode == "html":
+        return lambda row: (Path(row["source_path"]).name,)
+    if source_mode == "db":
+        return lambda row: (int(row["pageid"]),)
+    raise ValueError(f"Unsupported source mode: {source_mode}")
+
+
+def open_state_store(
+    state_db_path: str, commit_every: int = 1
+) -> tuple[ClassificationStateStore | None, bool, str | None, str | None]:
+    try:
+        state_store, recovered, recovered_from = ClassificationStateStore.create_with_recovery(
+            state_db_path, commit_every=commit_every
+        )
+    except Exception as exc:
+        return None, False, None, f"{type(exc).__name__}:{exc}"
+    return state_store, recovered, recovered_from, None
+
+
+def build_classified_sink(classified_root: str, classified_output_mode: str, compact: bool) -> ClassifiedJsonSink:
+    if classified_output_mode == "copy":
+        return ClassifiedJsonSink(classified_root=classified_root, compact=compact)
+    if classified_output_mode in LinkedClassifiedSink.LINK_MODES:
+        return LinkedClassifiedSink(classified_root=classified_root, link_mode=classified_output_mode)
+    raise ValueError(f"Unsupported classified output mode: {classified_output_mode}")
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from src.classification.application.use_cases.classify_wiki_pages import (
+    ClassifyWikiPagesCommand,
+    ClassifyWikiPagesResult,
+    ClassifyWikiPagesUseCase,
+)
+from src.classification.application.workflows.classification_pipeline import ClassificationPipeline
+from src.classification.classify import build_classified_sink, open_state_store
+from src.classification.domain.classifier import RuleBasedClassifier
+from src.classification.infrastructure.sinks.composite_sink import CompositeClassificationSink
+from src.classification.infrastructure.sinks.jsonl_sink import JsonlClassificationSink
+from src.classification.infrastructure.sinks.report_sink import JsonReportSink
+from src.classification.infrastructure.sources.QueuePageSource import QueuePageSource
+from src.config.logger_config import logger
+from src.ingestion.application.workflows.crawl_pages import CrawlWorkflowConfig
+from src.ingestion.crawl import DEFAULT_BASE_URL, DEFAULT_DB_PATH, DEFAULT_PAGE_DIR, DEFAULT_RAW_DIR, run_crawl_async
+from src.ingestion.domain.models import CrawlSummary, WikiPageDoc
+
+
+@dataclass(frozen=True)
+class CrawlAndClassifyResult:
+    crawl: CrawlSummary
+    classification: ClassifyWikiPagesResult
+
+
+async def run_crawl_and_classify_async(
+    *,
+    base_url: str = DEFAULT_BASE_URL,
+    page_dir: str | Path = DEFAULT_PAGE_DIR,
+    raw_dir: str | Path = DEFAULT_RAW_DIR,
+    db_path: str | Path = DEFAULT_DB_PATH,
+    workflow_config: CrawlWorkflowConfig | None = None,
+    output_labels_path: str = "artifacts/classified/page_labels_ingestion.jsonl",
+    output_report_path: str = "artifacts/classified/classification_report_ingestion.json",
+    output_review_path: str = "artifacts/classified/review_queue_ingestion.jsonl",
+    classified_output_root: str = "artifacts/classified/wiki",
+    classified_output_mode: str = "copy",
+    state_db_path: str = "artifacts/classified/classification_state.db",
+    low_confidence_threshold: float = 0.5,
+    include_redirects: bool = True,
+    handoff_queue_size: int = 256,
+    state_commit_every: int = 100,
+    show_progress: bool = True,
+) -> CrawlAndClassifyResult:
+    """Crawl and classify in one run: every page the crawler persists is handed to the pipeline in memory.
+
+    Pages are still written to `page_dir` and the registry; classification runs on a worker thread
+    behind a bounded queue and records incremental state, so a later batch run sees them as unchanged.
+    """
+    source = QueuePageSource(maxsize=handoff_queue_size)
+    command = ClassifyWikiPagesCommand(
+        # The handed-off payload is exactly the persisted page file, so state is shared with html runs.
+        source_mode="html",
+        low_confidence_threshold=low_confidence_threshold,
+        include_redirects=include_redirects,
+        incremental=True,
+        full_rebuild=False,
+        state_db_path=state_db_path,
+        show_progress=False,
+    )
+    outcome: dict[str, object] = {}
+
+    def consume() -> None:
+        try:
+            # Built on the consumer thread: the SQLite state connection must stay on one thread.
+            state_store, state_store_recovered, state_store_recovered_from, state_store_init_error = open_state_store(
+                state_db_path, commit_every=state_commit_every
+            )
+            pipeline = ClassificationPipeline(
+                source=source,
+                classifier=RuleBasedClassifier(),
+                sink=CompositeClassificationSink(
+                    primary=JsonlClassificationSink(labels_path=output_labels_path, review_path=output_review_path),
+                    secondary=build_classified_sink(classified_output_root, classified_output_mode, compact=False),
+                ),
+                report_sink=JsonReportSink(report_path=output_report_path),
+                state_store=state_store,
+                state_store_label=state_db_path,
+                state_store_recovered=state_store_recovered,
+                state_store_recovered_from=state_store_recovered_from,
+                state_store_init_error=state_store_init_error,
+            )
+            outcome["result"] = ClassifyWikiPagesUseCase(pipeline=pipeline).execute(command)
+        except BaseException as exc:
+            outcome["error"] = exc
+        finally:
+            source.close()
+
+    consumer = threading.Thread(target=consume, name="crawl-classify-consumer", daemon=True)
+    consumer.start()
+
+    async def hand_off(page_doc: WikiPageDoc, file_path: Path) -> None:
+        await asyncio.to_thread(source.submit, page_doc.to_dict(), str(file_path))
+
+    try:
+        crawl_summary = await run_crawl_async(
+            base_url=base_url,
+            page_dir=page_dir,
+            raw_dir=raw_dir,
+            db_path=db_path,
+            workflow_config=workflow_config,
+            show_progress=show_progress,
+            on_page_saved=hand_off,
+        )
+    finally:
+        try:
+            await asyncio.to_thread(source.finish)
+        except RuntimeError:
+            # Consumer already stopped; its error is re-raised below.
+            pass
+        await asyncio.to_thread(consumer.join)
+
+    if "error" in outcome:
+        raise outcome["error"]
+    classification = outcome["result"]
+    logger.info(
+        "Crawl and classify completed: processed_total={}, failed_total={}, classified_count={}",
+        crawl_summary.processed_total,
+        crawl_summary.failed_total,
+        classification.classified_count,
+    )
+    return CrawlAndClassifyResult(crawl=crawl_summary, classification=classification)
+
+
+def run_crawl_and_classify(**kwargs: Any) -> CrawlAndClassifyResult:
+    return asyncio.run(run_crawl_and_classify_async(**kwargs))
@@ -1,18 +1,13 @@
 from collections import defaultdict
+from collections.abc import Iterable, Mapping, Sequence
 from re import Pattern
+from time import perf_counter_ns
+
+import numpy as np
 
 from src.classification.domain.entities import Classification, WikiPage
-from src.classification.domain.rules import (
-    CAT_SUBTYPE_PATTERNS,
-    CLASSIFICATION_STRATEGY_VERSION,
-    ENEMY_SUBTYPE_PATTERNS,
-    LIST_SUBTYPE_PATTERNS,
-    LOW_MARGIN_THRESHOLD,
-    MECHANIC_SUBTYPE_PATTERNS,
-    PRIMARY_RULES,
-    STAGE_SUBTYPE_PATTERNS,
-    UPDATE_SUBTYPE_PATTERNS,
-)
+from src.classification.domain.rule_profiler import RuleProfiler, subtype_pattern_id
+from src.classification.domain.rules import DEFAULT_RULE_SET, LOW_MARGIN_THRESHOLD, RuleSet, RuleSpec
 from src.classification.domain.types import EntityType, RuleMatchType
 
 
@@ -28,8 +23,19 @@ class RuleBasedClassifier:
         "misc": 6,
     }
 
-    def __init__(self, low_margin_threshold: float = LOW_MARGIN_THRESHOLD):
+    # Entity types whose subtype patterns are matched per category; the others match title + content.
+    _CATEGORY_SUBTYPE_ENTITIES: frozenset[EntityType] = frozenset(("cat", "enemy", "stage"))
+
+    def __init__(
+        self,
+        low_margin_threshold: float = LOW_MARGIN_THRESHOLD,
+        profiler: RuleProfiler | None = None,
+        rules: RuleSet = DEFAULT_RULE_SET,
+    ):
         self.low_margin_threshold = low_margin_threshold
+        self.rules = rules
+        # Optional instrumentation; when set every rule and subtype pattern evaluation is timed.
+        self.profiler = profiler
 
     def classify(self, page: WikiPage) -> Classification:
         normalized_categories = tuple(c.lower().strip() for c in page.categories)
@@ -38,11 +44,13 @@ class RuleBasedClassifier:
 
         scores: dict[EntityType, float] = defaultdict(float)
         matched: dict[EntityType, list[str]] = defaultdict(list)
+        rule_hits: list[str] = []
 
-        for rule in PRIMARY_RULES:
-            if self._rule_matches(rule.pattern, rule.type, normalized_categories, title, content):
+        for rule in self.rules.primary_rules:
+            if self._evaluate_rule(rule, normalized_categories, title, content):
                 scores[rule.target] += rule.weight
                 matched[rule.target].append(rule.rule_id)
+                rule_hits.append(rule.rule_id)
 
         for entity in ("update", "cat", "enemy", "stage", "list", "mechanic"):
             if entity not in scores:
@@ -56,14 +64,17 @@ class RuleBasedClassifier:
         if best == "misc" or scores[best] <= 0.0:
             # No positive signal from rules -> force misc with explicit reason.
             reasons.append("no_rule_match")
+            if self.profiler is not None:
+                self.profiler.record_decision(page.doc_id, ())
             return Classification(
                 entity_type="misc",
                 subtypes=(),
                 confidence=0.0,
                 reasons=tuple(reasons),
                 matched_rules=(),
-                strategy_version=CLASSIFICATION_STRATEGY_VERSION,
+                strategy_version=self.rules.strategy_version,
                 is_ambiguous=False,
+                rule_hits=tuple(rule_hits),
             )
 
         confidence = scores[best] / max(scores[best] + scores[second], 1e-6)
@@ -73,7 +84,10 @@ class RuleBasedClassifier:
             is_ambiguous = True
             reasons.append(f"low_margin_conflict:{best}_vs_{second}")
 
-        subtypes = tuple(self._extract_subtypes(best, normalized_categories, title, content))
+        decided = list(matched.get(best, [])) if self.profiler is not None else None
+        subtypes = tuple(self._extract_subtypes(best, normalized_categories, title, content, decided))
+        if decided is not None:
+            self.profiler.record_decision(page.doc_id, tuple(decided))
         matched_rules = matched.get(best, [])
         if is_ambiguous:
             matched_rules = matched_rules + matched.get(second, [])
@@ -83,10 +97,151 @@ class RuleBasedClassifier:
             confidence=confidence,
             reasons=tuple(reasons),
             matched_rules=tuple(sorted(set(matched_rules))),
-            strategy_version=CLASSIFICATION_STRATEGY_VERSION,
+            strategy_version=self.rules.strategy_version,
             is_ambiguous=is_ambiguous,
+            rule_hits=tuple(rule_hits),
         )
 
+    def classify_batch(
+        self,
+        pages: Sequence[WikiPage],
+        rule_weights: Mapping[str, float] | None = None,
+        hits: np.ndarray | None = None,
+    ) -> list[Classification]:
+        """Classify many pages at once with matrix scoring.
+
+        Produces the same results as calling `classify` per page. `rule_weights` overrides
+        weights by `rule_id` and `hits` reuses a matrix from `rule_hit_matrix`, so rules can be
+        re-weighted over a whole corpus without re-running any regex.
+        """
+        if not pages:
+            return []
+        normalized = [tuple(c.lower().strip() for c in page.categories) for page in pages]
+        if hits is None:
+            hits = self._hit_matrix(pages, normalized)
+        if hits.shape != (len(pages), len(self.rules.primary_rules)):
+            raise ValueError(f"Hit matrix shape {hits.shape} does not match pages x rules")
+
+        entities = self._priority_order()
+        entity_index = {entity: idx for idx, entity in enumerate(entities)}
+        weights = self._weight_matrix(self.rules.primary_rules, entities, rule_weights)
+        scores = hits.astype(np.float64) @ weights
+
+        # Columns follow _ENTITY_PRIORITY, so argmax (first maximum) applies the same tie-break as _top_two.
+        rows = np.arange(len(pages))
+        best_idx = np.argmax(scores, axis=1)
+        best_scores = scores[rows, best_idx]
+        masked = scores.copy()
+        masked[rows, best_idx] = -np.inf
+        second_idx = np.argmax(masked, axis=1)
+        second_scores = scores[rows, second_idx]
+        margins = best_scores - second_scores
+        confidences = best_scores / np.maximum(best_scores + second_scores, 1e-6)
+        no_match = (best_idx == entity_index["misc"]) | (best_scores <= 0.0)
+        ambiguous = ~no_match & (margins < self.low_margin_threshold)
+
+        rule_targets = np.array([entity_index[rule.target] for rule in self.rules.primary_rules])
+        results: list[Classification] = []
+        for i, page in enumerate(pages):
+            rule_hits = tuple(self.rules.primary_rules[r].rule_id for r in np.flatnonzero(hits[i]))
+            if no_match[i]:
+                if self.profiler is not None:
+                    self.profiler.record_decision(page.doc_id, ())
+                results.append(
+                    Classification(
+                        entity_type="misc",
+                        subtypes=(),
+                        confidence=0.0,
+                        reasons=("no_rule_match",),
+                        matched_rules=(),
+                        strategy_version=self.rules.strategy_version,
+                        is_ambiguous=False,
+                        rule_hits=rule_hits,
+                    )
+                )
+                continue
+
+            best = entities[best_idx[i]]
+            second = entities[second_idx[i]]
+            reasons: tuple[str, ...] = ()
+            selected = rule_targets == best_idx[i]
+            if ambiguous[i]:
+                reasons = (f"low_margin_conflict:{best}_vs_{second}",)
+                selected |= rule_targets == second_idx[i]
+            matched_rules = sorted({self.rules.primary_rules[r].rule_id for r in np.flatnonzero(hits[i] & selected)})
+            decided = None
+            if self.profiler is not None:
+                decided_rules = np.flatnonzero(hits[i] & (rule_targets == best_idx[i]))
+                decided = [self.rules.primary_rules[r].rule_id for r in decided_rules]
+            subtypes = tuple(self._extract_subtypes(best, normalized[i], page.title or "", page.content or "", decided))
+            if decided is not None:
+                self.profiler.record_decision(page.doc_id, tuple(decided))
+            results.append(
+                Classification(
+                    entity_type=best,
+                    subtypes=subtypes,
+                    confidence=float(confidences[i]),
+                    reasons=reasons,
+                    matched_rules=tuple(matched_rules),
+                    strategy_version=self.rules.strategy_version,
+                    is_ambiguous=bool(ambiguous[i]),
+                    rule_hits=rule_hits,
+                )
+            )
+        return results
+
+    def rule_hits_for(self, page: WikiPage, rule_ids: Iterable[str]) -> set[str]:
+        """Evaluate only the given primary rules on `page` and return those that match."""
+        wanted = set(rule_ids)
+        categories = tuple(c.lower().strip() for c in page.categories)
+        return {
+            rule.rule_id
+            for rule in self.rules.primary_rules
+            if rule.rule_id in wanted and self._evaluate_rule(rule, categories, page.title or "", page.content or "")
+        }
+
+    def rule_hit_matrix(self, pages: Sequence[WikiPage]) -> np.ndarray:
+        """Return the boolean pages x primary rules hit matrix used by `classify_batch`."""
+        normalized = [tuple(c.lower().strip() for c in page.categories) for page in pages]
+        return self._hit_matrix(pages, normalized)
+
+    def _hit_matrix(self, pages: Sequence[WikiPage], normalized: Sequence[tuple[str, ...]]) -> np.ndarray:
+        hits = np.zeros((len(pages), len(self.rules.primary_rules)), dtype=bool)
+        for i, page in enumerate(pages):
+            title = page.title or ""
+            content = page.content or ""
+            for r, rule in enumerate(self.rules.primary_rules):
+                hits[i, r] = self._evaluate_rule(rule, normalized[i], title, content)
+        return hits
+
+    @classmethod
+    def _priority_order(cls) -> tuple[EntityType, ...]:
+        return tuple(sorted(cls._ENTITY_PRIORITY, key=cls._ENTITY_PRIORITY.__getitem__))
+
+    @staticmethod
+    def _weight_matrix(
+        rules: Sequence[RuleSpec],
+        entities: Sequence[EntityType],
+        rule_weights: Mapping[str, float] | None,
+    ) -> np.ndarray:
+        overrides = rule_weights or {}
+        unknown = set(overrides) - {rule.rule_id for rule in rules}
+        if unknown:
+            raise ValueError(f"Unknown rule ids in rule_weights: {sorted(unknown)}")
+        entity_index = {entity: idx for idx, entity in enumerate(entities)}
+        weights = np.zeros((len(rules), len(entities)), dtype=np.float64)
+        for r, rule in enumerate(rules):
+            weights[r, entity_index[rule.target]] = overrides.get(rule.rule_id, rule.weight)
+        return weights
+
+    def _evaluate_rule(self, rule: RuleSpec, categories: tuple[str, ...], title: str, content: str) -> bool:
+        if self.profiler is None:
+            return self._rule_matches(rule.pattern, rule.type, categories, title, content)
+        started = perf_counter_ns()
+        hit = self._rule_matches(rule.pattern, rule.type, categories, title, content)
+        self.profiler.record_eval(rule.rule_id, perf_counter_ns() - started, hit)
+        return hit
+
     @staticmethod
     def _rule_matches(
         pattern: Pattern[str],
@@ -120,31 +275,53 @@ class RuleBasedClassifier:
         categories: tuple[str, ...],
         title: str,
         content: str,
+        decided: list[str] | None = None,
     ) -> list[str]:
         tags: set[str] = set()
 
         category_patterns: tuple[tuple[Pattern[str], str], ...] = ()
         combined_patterns: tuple[tuple[Pattern[str], str], ...] = ()
-        if entity_type == "cat":
-            category_patterns = CAT_SUBTYPE_PATTERNS
-        elif entity_type == "enemy":
-            category_patterns = ENEMY_SUBTYPE_PATTERNS
-        elif entity_type == "stage":
-            category_patterns = STAGE_SUBTYPE_PATTERNS
-        elif entity_type == "update":
-            combined_patterns = UPDATE_SUBTYPE_PATTERNS
-        elif entity_type == "mechanic":
-            combined_patterns = MECHANIC_SUBTYPE_PATTERNS
-        elif entity_type == "list":
-            combined_patterns = LIST_SUBTYPE_PATTERNS
+        if entity_type in self._CATEGORY_SUBTYPE_ENTITIES:
+            category_patterns = self.rules.subtype_patterns.get(entity_type, ())
+        else:
+            combined_patterns = self.rules.subtype_patterns.get(entity_type, ())
+
+        combined_text = f"{title}\n{content}"
+        if self.profiler is not None:
+            # Per-pattern path so each subtype regex gets its own cost/hit record.
+            for pattern_pair in category_patterns:
+                started = perf_counter_ns()
+                found: set[str] = set()
+                for category in categories:
+                    found.update(self._extract_from_patterns(category, (pattern_pair,)))
+                self._record_subtype_pattern(entity_type, pattern_pair[0], started, found, decided)
+                tags.update(found)
+            for pattern_pair in combined_patterns:
+                started = perf_counter_ns()
+                found = self._extract_from_patterns(combined_text, (pattern_pair,))
+                self._record_subtype_pattern(entity_type, pattern_pair[0], started, found, decided)
+                tags.update(found)
+            return sorted(tags)
 
         for category in categories:
             tags.update(self._extract_from_patterns(category, category_patterns))
 
-        combined_text = f"{title}\n{content}"
         tags.update(self._extract_from_patterns(combined_text, combined_patterns))
         return sorted(tags)
 
+    def _record_subtype_pattern(
+        self,
+        entity_type: EntityType,
+        pattern: Pattern[str],
+        started_ns: int,
+        found: set[str],
+        decided: list[str] | None,
+    ) -> None:
+        rule_id = subtype_pattern_id(entity_type, pattern)
+        self.profiler.record_eval(rule_id, perf_counter_ns() - started_ns, bool(found))
+        if found and decided is not None:
+            decided.append(rule_id)
+
     @staticmethod
     def _extract_from_patterns(text: str, patterns: tuple[tuple[Pattern[str], str], ...]) -> set[str]:
         tags: set[str] = set()
@@ -38,3 +38,5 @@ class Classification:
     matched_rules: tuple[str, ...]
     strategy_version: str
     is_ambiguous: bool = False
+    # Every primary rule that matched the page, whichever entity it targets.
+    rule_hits: tuple[str, ...] = ()
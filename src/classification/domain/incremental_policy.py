@@ -1,4 +1,7 @@
-﻿from dataclasses import dataclass
+﻿from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+
+from src.classification.domain.rule_fingerprints import RULESET_GLOBAL_KEY, subtype_pattern_entity
 
 
 @dataclass(frozen=True)
@@ -7,6 +10,9 @@ class StateFingerprint:
     last_revid: int | None
     content_hash: str | None
     strategy_version: str
+    entity_type: str | None = None
+    # Primary rule ids that matched at last classification; None for rows written before hits were tracked.
+    rule_hits: tuple[str, ...] | None = None
 
 
 @dataclass(frozen=True)
@@ -45,3 +51,45 @@ def evaluate_incremental_decision(existing: StateFingerprint | None, current: Pa
     if existing.content_hash != current.content_hash:
         return IncrementalDecision(should_classify=True, reason="content_hash_changed")
     return IncrementalDecision(should_classify=False, reason="content_hash_hit")
+
+
+def evaluate_rule_change_impact(
+    existing: StateFingerprint,
+    previous_rules: Mapping[str, str] | None,
+    current_rules: Mapping[str, str],
+    current_hits: Callable[[Iterable[str]], set[str]],
+) -> IncrementalDecision:
+    """Decide whether a page with unchanged content must be re-run after a rule set change.
+
+    A changed primary rule only matters if it matched before or matches now (`current_hits`
+    evaluates just those rules); a changed subtype pattern only matters for its own entity type.
+    """
+    if not previous_rules:
+        return IncrementalDecision(should_classify=True, reason="rule_fingerprints_missing")
+    if existing.rule_hits is None or existing.entity_type is None:
+        return IncrementalDecision(should_classify=True, reason="rule_hits_missing")
+    if previous_rules.get(RULESET_GLOBAL_KEY) != current_rules.get(RULESET_GLOBAL_KEY):
+        return IncrementalDecision(should_classify=True, reason="ruleset_changed")
+
+    changed = sorted(
+        rule_id
+        for rule_id in set(previous_rules) | set(current_rules)
+        if rule_id != RULESET_GLOBAL_KEY and previous_rules.get(rule_id) != current_rules.get(rule_id)
+    )
+    recorded_hits = set(existing.rule_hits)
+    unresolved: list[str] = []
+    for rule_id in changed:
+        entity_type = subtype_pattern_entity(rule_id)
+        if entity_type is not None:
+            if entity_type == existing.entity_type:
+                return IncrementalDecision(should_classify=True, reason=f"subtype_rule_changed:{rule_id}")
+            continue
+        if rule_id in recorded_hits:
+            return IncrementalDecision(should_classify=True, reason=f"rule_changed:{rule_id}")
+        if rule_id in current_rules:
+            unresolved.append(rule_id)
+    if unresolved:
+        now_hit = current_hits(unresolved)
+        if now_hit:
+            return IncrementalDecision(should_classify=True, reason=f"rule_changed:{sorted(now_hit)[0]}")
+    return IncrementalDecision(should_classify=False, reason="rule_change_carried_forward")
@@ -0,0 +1,42 @@
+import hashlib
+import inspect
+
+from src.classification.domain import classifier as classifier_module
+from src.classification.domain.rule_profiler import SUBTYPE_PATTERN_GROUPS, subtype_pattern_id
+from src.classification.domain.rules import LOW_MARGIN_THRESHOLD, PRIMARY_RULES
+
+# Covers everything that is not a single rule (scoring code, thresholds, tie-break priority).
+# When it changes no page can be carried forward to a new strategy version.
+RULESET_GLOBAL_KEY = "__ruleset__"
+
+
+def _digest(*parts: object) -> str:
+    return hashlib.sha1("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+def compute_rule_fingerprints() -> dict[str, str]:
+    """Content hash per primary rule_id and subtype pattern id, plus RULESET_GLOBAL_KEY."""
+    try:
+        classifier_source = inspect.getsource(classifier_module)
+    except (OSError, TypeError):
+        classifier_source = None
+    fingerprints = {
+        RULESET_GLOBAL_KEY: _digest(
+            LOW_MARGIN_THRESHOLD,
+            sorted(classifier_module.RuleBasedClassifier._ENTITY_PRIORITY.items()),
+            classifier_source,
+        )
+    }
+    for rule in PRIMARY_RULES:
+        fingerprints[rule.rule_id] = _digest(rule.target, rule.weight, rule.type, rule.pattern.pattern, rule.pattern.flags)
+    for entity_type, patterns in SUBTYPE_PATTERN_GROUPS.items():
+        for pattern, template in patterns:
+            fingerprints[subtype_pattern_id(entity_type, pattern)] = _digest(template, pattern.flags)
+    return fingerprints
+
+
+def subtype_pattern_entity(rule_id: str) -> str | None:
+    """Return the entity type of a subtype pattern id, or None for primary rules."""
+    if not rule_id.startswith("subtype:"):
+        return None
+    return rule_id.split(":", 2)[1]
@@ -0,0 +1,79 @@
+from dataclasses import dataclass, field
+from re import Pattern
+from typing import Any
+
+from src.classification.domain.rules import DEFAULT_RULE_SET, RuleSet
+
+SUBTYPE_PATTERN_GROUPS = DEFAULT_RULE_SET.subtype_patterns
+
+
+def subtype_pattern_id(entity_type: str, pattern: Pattern[str]) -> str:
+    # Templates are not unique (two enemy patterns emit "ability:{group1}"), the regex source is.
+    return f"subtype:{entity_type}:{pattern.pattern}"
+
+
+@dataclass
+class RuleStats:
+    rule_id: str
+    kind: str
+    pattern: str
+    eval_count: int = 0
+    eval_ns: int = 0
+    hit_count: int = 0
+    decided_count: int = 0
+    decided_examples: list[str] = field(default_factory=list)
+
+    def to_dict(self, total_pages: int) -> dict[str, Any]:
+        return {
+            "rule_id": self.rule_id,
+            "kind": self.kind,
+            "pattern": self.pattern,
+            "eval_count": self.eval_count,
+            "total_ms": round(self.eval_ns / 1_000_000, 3),
+            "mean_us": round(self.eval_ns / self.eval_count / 1000, 3) if self.eval_count else 0.0,
+            "hit_count": self.hit_count,
+            "hit_rate": round(self.hit_count / self.eval_count, 6) if self.eval_count else 0.0,
+            "decided_count": self.decided_count,
+            "decided_rate": round(self.decided_count / total_pages, 6) if total_pages else 0.0,
+            "decided_examples": list(self.decided_examples),
+            "is_dead": self.hit_count == 0,
+        }
+
+
+class RuleProfiler:
+    """Collects per-rule evaluation cost, hit counts and decisive pages for RuleBasedClassifier."""
+
+    def __init__(self, max_examples: int = 20, rules: RuleSet = DEFAULT_RULE_SET) -> None:
+        self.max_examples = max_examples
+        self.page_count = 0
+        self.stats: dict[str, RuleStats] = {}
+        for rule in rules.primary_rules:
+            self.stats[rule.rule_id] = RuleStats(rule_id=rule.rule_id, kind="primary", pattern=rule.pattern.pattern)
+        for entity_type, patterns in rules.subtype_patterns.items():
+            for pattern, _template in patterns:
+                rule_id = subtype_pattern_id(entity_type, pattern)
+                self.stats[rule_id] = RuleStats(rule_id=rule_id, kind="subtype", pattern=pattern.pattern)
+
+    def record_eval(self, rule_id: str, elapsed_ns: int, hit: bool) -> None:
+        stats = self.stats[rule_id]
+        stats.eval_count += 1
+        stats.eval_ns += elapsed_ns
+        if hit:
+            stats.hit_count += 1
+
+    def record_decision(self, doc_id: str, rule_ids: tuple[str, ...]) -> None:
+        """Mark rules that determined a page's label (winning-entity rules and emitted subtypes)."""
+        self.page_count += 1
+        for rule_id in rule_ids:
+            stats = self.stats[rule_id]
+            stats.decided_count += 1
+            if len(stats.decided_examples) < self.max_examples:
+                stats.decided_examples.append(doc_id)
+
+    def to_report(self) -> dict[str, Any]:
+        ranked = sorted(self.stats.values(), key=lambda s: (-s.eval_ns, s.rule_id))
+        return {
+            "page_count": self.page_count,
+            "rules": [stats.to_dict(self.page_count) for stats in ranked],
+            "dead_rules": sorted(stats.rule_id for stats in self.stats.values() if stats.hit_count == 0),
+        }
@@ -1,4 +1,5 @@
 import re
+from collections.abc import Mapping
 from dataclasses import dataclass
 from typing import Pattern
 
@@ -129,3 +130,27 @@ LIST_SUBTYPE_PATTERNS: tuple[tuple[Pattern[str], str], ...] = (
     (re.compile(r"comparison", re.I), "list_kind:comparison"),
 )
 
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    # Everything RuleBasedClassifier reads. A candidate rule set for shadow runs is a modified copy of
+    # DEFAULT_RULE_SET (dataclasses.replace) with its own strategy_version.
+    strategy_version: str
+    primary_rules: tuple[RuleSpec, ...]
+    # Subtype patterns per entity type; cat/enemy/stage match each category, the rest title + content.
+    subtype_patterns: Mapping[EntityType, tuple[tuple[Pattern[str], str], ...]]
+
+
+DEFAULT_RULE_SET = RuleSet(
+    strategy_version=CLASSIFICATION_STRATEGY_VERSION,
+    primary_rules=PRIMARY_RULES,
+    subtype_patterns={
+        "cat": CAT_SUBTYPE_PATTERNS,
+        "enemy": ENEMY_SUBTYPE_PATTERNS,
+        "stage": STAGE_SUBTYPE_PATTERNS,
+        "update": UPDATE_SUBTYPE_PATTERNS,
+        "mechanic": MECHANIC_SUBTYPE_PATTERNS,
+        "list": LIST_SUBTYPE_PATTERNS,
+    },
+)
@@ -0,0 +1,54 @@
+import hashlib
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.classification.domain.entities import PageRef
+
+# Crawler files are named "<title>_<pageid>.json" (see ingestion make_filename).
+_PAGEID_SUFFIX = re.compile(r"_(\d+)$")
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:
+        if self.count < 1:
+            raise ValueError(f"shard count must be >= 1: {self.count}")
+        if not 0 <= self.index < self.count:
+            raise ValueError(f"shard index must be within [0, {self.count}): {self.index}")
+
+    def owns(self, ref: PageRef) -> bool:
+        return shard_of(shard_key(ref), self.count) == self.index
+
+    @property
+    def label(self) -> str:
+        return f"shard-{self.index:03d}-of-{self.count:03d}"
+
+    def to_dict(self) -> dict[str, int]:
+        return {"index": self.index, "count": self.count}
+
+
+def shard_key(ref: PageRef) -> str:
+    """Stable per-page key taken from the ref alone, so sharding never needs to load the page."""
+    pageid = (ref.metadata or {}).get("pageid")
+    if pageid is not None:
+        return str(pageid)
+    if ref.source_id.isdigit():
+        return ref.source_id
+    match = _PAGEID_SUFFIX.search(ref.source_id)
+    if match:
+        return match.group(1)
+    return ref.source_id
+
+
+def shard_of(key: str, count: int) -> int:
+    # sha1 rather than hash(): str hashing is salted per process and would differ across nodes.
+    return int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:8], "big") % count
+
+
+def shard_output_path(path: str, shard: ShardSpec) -> str:
+    original = Path(path)
+    return str(original.with_name(f"{original.stem}.{shard.label}{original.suffix}"))
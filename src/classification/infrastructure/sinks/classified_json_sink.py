@@ -1,27 +1,54 @@
 ﻿import json
+import os
 import re
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from src.classification.application.contracts import ClassificationLabelRecord
 from src.classification.application.ports import ClassificationSinkPort
 from src.config.logger_config import logger
 
+_LEGACY_NAME_PATTERN = re.compile(r"^(.+)__\d+\.json$")
+_UNLOADED = object()
+
+
+@dataclass
+class _EntityDirIndex:
+    # filename -> (pageid, doc_id) as stored in the file; _UNLOADED until first needed.
+    identities: dict[str, object] = field(default_factory=dict)
+    # source stem -> legacy "<stem>__<id>.json" filenames.
+    legacy_by_stem: dict[str, list[str]] = field(default_factory=dict)
+
+    def add(self, name: str, identity: object = _UNLOADED) -> None:
+        if name not in self.identities:
+            legacy = _LEGACY_NAME_PATTERN.match(name)
+            if legacy:
+                self.legacy_by_stem.setdefault(legacy.group(1), []).append(name)
+        self.identities[name] = identity
+
 
 class ClassifiedJsonSink(ClassificationSinkPort):
     # Classification output always reuses source filename as the primary naming rule.
     # We do not recalculate filenames from title/doc fields in this layer.
-    def __init__(self, classified_root: str) -> None:
+    def __init__(self, classified_root: str, compact: bool = False) -> None:
         self.classified_root = Path(classified_root)
+        self.compact = compact
         self.classified_root.mkdir(parents=True, exist_ok=True)
         self.copied_count = 0
         self.skipped_invalid_source_count = 0
         self.collision_renamed_count = 0
+        self.source_reread_count = 0
         self.by_entity_type: dict[str, int] = {}
-        logger.info("Classified JSON sink initialized: classified_root={}", str(self.classified_root))
+        self._dir_indexes: dict[str, _EntityDirIndex] = self._build_dir_indexes(self.classified_root)
+        logger.info(
+            "Classified JSON sink initialized: classified_root={}, compact={}",
+            str(self.classified_root),
+            self.compact,
+        )
 
     def write_label(self, row: ClassificationLabelRecord) -> None:
         source_path = Path(row.source_path)
-        if not source_path.exists() or source_path.suffix.lower() != ".json":
+        if not self._is_valid_source(row, source_path):
             self.skipped_invalid_source_count += 1
             logger.warning(
                 "Skip classified copy due to invalid source path: doc_id={}, source_path={}",
@@ -30,18 +57,14 @@ class ClassifiedJsonSink(ClassificationSinkPort):
             )
             return
 
-        with source_path.open("r", encoding="utf-8", errors="replace") as fp:
-            payload = json.load(fp)
-        payload["subtypes"] = list(row.subtypes)
-        payload["is_ambiguous"] = row.is_ambiguous
-
         entity_type = str(row.entity_type or "misc")
         entity_dir = self.classified_root / entity_type
-        entity_dir.mkdir(parents=True, exist_ok=True)
-        self._warn_legacy_double_underscore_names(entity_dir=entity_dir, source_name=source_path.name, entity_type=entity_type)
+        dir_index = self._dir_index(entity_type)
+        self._warn_legacy_double_underscore_names(dir_index=dir_index, source_name=source_path.name, entity_type=entity_type)
 
         target_path = self._resolve_output_path(
             entity_dir=entity_dir,
+            dir_index=dir_index,
             source_name=source_path.name,
             pageid=row.pageid,
             doc_id=row.doc_id,
@@ -49,9 +72,8 @@ class ClassifiedJsonSink(ClassificationSinkPort):
         if target_path.name != source_path.name:
             self.collision_renamed_count += 1
 
-        with target_path.open("w", encoding="utf-8") as fp:
-            json.dump(payload, fp, ensure_ascii=False, indent=2)
-            fp.write("\n")
+        identity = self._write_output(row, source_path, target_path)
+        dir_index.add(target_path.name, identity)
 
         self.copied_count += 1
         self.by_entity_type[entity_type] = self.by_entity_type.get(entity_type, 0) + 1
@@ -61,25 +83,76 @@ class ClassifiedJsonSink(ClassificationSinkPort):
 
     def close(self) -> None:
         logger.info(
-            "Classified JSON sink closed: classified_root={}, copied_count={}, skipped_invalid_source_count={}, collision_renamed_count={}, by_entity_type={}",
+            "Classified JSON sink closed: classified_root={}, copied_count={}, skipped_invalid_source_count={}, collision_renamed_count={}, source_reread_count={}, by_entity_type={}",
             str(self.classified_root),
             self.copied_count,
             self.skipped_invalid_source_count,
             self.collision_renamed_count,
+            self.source_reread_count,
             self.by_entity_type,
         )
 
+    @staticmethod
+    def _is_valid_source(row: ClassificationLabelRecord, source_path: Path) -> bool:
+        if source_path.suffix.lower() != ".json":
+            return False
+        return row.source_payload is not None or source_path.exists()
+
+    def _write_output(self, row: ClassificationLabelRecord, source_path: Path, target_path: Path) -> tuple[object, object]:
+        if row.source_payload is not None:
+            # Shallow copy keeps the source-side payload untouched for other consumers.
+            payload = dict(row.source_payload)
+        else:
+            self.source_reread_count += 1
+            with source_path.open("r", encoding="utf-8", errors="replace") as fp:
+                payload = json.load(fp)
+        payload["subtypes"] = list(row.subtypes)
+        payload["is_ambiguous"] = row.is_ambiguous
+
+        with target_path.open("w", encoding="utf-8") as fp:
+            if self.compact:
+                json.dump(payload, fp, ensure_ascii=False, separators=(",", ":"))
+            else:
+                json.dump(payload, fp, ensure_ascii=False, indent=2)
+            fp.write("\n")
+        return payload.get("pageid"), payload.get("doc_id", "")
+
+    @staticmethod
+    def _build_dir_indexes(classified_root: Path) -> dict[str, _EntityDirIndex]:
+        # One directory scan per entity type at open; writes keep the index current afterwards.
+        indexes: dict[str, _EntityDirIndex] = {}
+        with os.scandir(classified_root) as entity_entries:
+            for entity_entry in entity_entries:
+                if not entity_entry.is_dir():
+                    continue
+                dir_index = _EntityDirIndex()
+                with os.scandir(entity_entry.path) as file_entries:
+                    for file_entry in file_entries:
+                        if file_entry.name.endswith(".json") and file_entry.is_file():
+                            dir_index.add(file_entry.name)
+                indexes[entity_entry.name] = dir_index
+        return indexes
+
+    def _dir_index(self, entity_type: str) -> _EntityDirIndex:
+        dir_index = self._dir_indexes.get(entity_type)
+        if dir_index is None:
+            (self.classified_root / entity_type).mkdir(parents=True, exist_ok=True)
+            dir_index = _EntityDirIndex()
+            self._dir_indexes[entity_type] = dir_index
+        return dir_index
+
     @staticmethod
     def _resolve_output_path(
         entity_dir: Path,
+        dir_index: _EntityDirIndex,
         source_name: str,
         pageid: object,
         doc_id: object,
     ) -> Path:
         candidate = entity_dir / source_name
-        if not candidate.exists():
+        if source_name not in dir_index.identities:
             return candidate
-        if ClassifiedJsonSink._is_same_document(candidate, pageid=pageid, doc_id=doc_id):
+        if ClassifiedJsonSink._is_same_document(dir_index, candidate, pageid=pageid, doc_id=doc_id):
             return candidate
 
         # "_<id>" is collision fallback only. It is not the primary naming strategy.
@@ -89,31 +162,39 @@ class ClassifiedJsonSink(ClassificationSinkPort):
         return entity_dir / f"{source_stem}_{unique}{source_suffix}"
 
     @staticmethod
-    def _is_same_document(path: Path, pageid: object, doc_id: object) -> bool:
-        try:
-            with path.open("r", encoding="utf-8", errors="replace") as fp:
-                existing = json.load(fp)
-        except Exception:
+    def _is_same_document(dir_index: _EntityDirIndex, path: Path, pageid: object, doc_id: object) -> bool:
+        identity = dir_index.identities.get(path.name, _UNLOADED)
+        if identity is _UNLOADED:
+            # Pre-existing file not written by this sink: parse it once and cache its identity.
+            identity = ClassifiedJsonSink._read_identity(path)
+            dir_index.identities[path.name] = identity
+        if identity is None:
             return False
 
-        existing_pageid = existing.get("pageid")
+        existing_pageid, existing_doc_id = identity
         if pageid is not None and existing_pageid is not None and str(existing_pageid) == str(pageid):
             return True
-        if doc_id is not None and str(existing.get("doc_id", "")) == str(doc_id):
+        if doc_id is not None and str(existing_doc_id) == str(doc_id):
             return True
         return False
 
     @staticmethod
-    def _warn_legacy_double_underscore_names(entity_dir: Path, source_name: str, entity_type: str) -> None:
+    def _read_identity(path: Path) -> tuple[object, object] | None:
+        try:
+            with path.open("r", encoding="utf-8", errors="replace") as fp:
+                existing = json.load(fp)
+            return existing.get("pageid"), existing.get("doc_id", "")
+        except Exception:
+            return None
+
+    @staticmethod
+    def _warn_legacy_double_underscore_names(dir_index: _EntityDirIndex, source_name: str, entity_type: str) -> None:
         source_stem = Path(source_name).stem
-        pattern = re.compile(rf"^{re.escape(source_stem)}__\d+\.json$")
-        for existing in entity_dir.glob("*.json"):
-            if not pattern.match(existing.name):
-                continue
+        for legacy_name in dir_index.legacy_by_stem.get(source_stem, ()):
             recommended_pattern = f"{source_stem}_<id>.json"
             logger.warning(
                 "Detected legacy classified filename pattern: entity_type={}, legacy_filename={}, recommended_pattern={}",
                 entity_type,
-                existing.name,
+                legacy_name,
                 recommended_pattern,
             )
@@ -15,6 +15,13 @@ class CompositeClassificationSink(ClassificationSinkPort):
         self.primary.write_review(row)
         self.secondary.write_review(row)
 
+    def flush(self) -> None:
+        # flush() is optional on sinks; buffered ones expose it for long-running (watch) runs.
+        for sink in (self.primary, self.secondary):
+            flush = getattr(sink, "flush", None)
+            if flush is not None:
+                flush()
+
     def close(self) -> None:
         try:
             self.primary.close()
@@ -22,6 +22,10 @@ class JsonlClassificationSink(ClassificationSinkPort):
     def write_review(self, row: ClassificationLabelRecord) -> None:
         self._review_fp.write(json.dumps(row.to_dict(), ensure_ascii=False) + "\n")
 
+    def flush(self) -> None:
+        self._labels_fp.flush()
+        self._review_fp.flush()
+
     def close(self) -> None:
         self._labels_fp.close()
         self._review_fp.close()
@@ -0,0 +1,141 @@
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from src.classification.application.contracts import ClassificationLabelRecord
+from src.classification.infrastructure.sinks.classified_json_sink import ClassifiedJsonSink
+from src.config.logger_config import logger
+
+LABEL_MANIFEST_NAME = "labels_manifest.jsonl"
+
+
+class LinkedClassifiedSink(ClassifiedJsonSink):
+    # Zero-copy variant of ClassifiedJsonSink: entity directories hold links to the source pages and
+    # subtypes/is_ambiguous live in an append-only label manifest (last row per path wins).
+    # Hardlinks share the source inode, so a re-crawled page shows up here until it is reclassified.
+    LINK_MODES = ("hardlink", "symlink")
+
+    def __init__(self, classified_root: str, link_mode: str = "hardlink") -> None:
+        if link_mode not in self.LINK_MODES:
+            raise ValueError(f"Unsupported link mode: {link_mode}")
+        super().__init__(classified_root=classified_root)
+        self.link_mode = link_mode
+        self.symlink_fallback_count = 0
+        self.manifest_path = self.classified_root / LABEL_MANIFEST_NAME
+        self._manifest_fp = self.manifest_path.open("a", encoding="utf-8")
+        logger.info(
+            "Linked classified sink initialized: classified_root={}, link_mode={}, manifest_path={}",
+            str(self.classified_root),
+            self.link_mode,
+            str(self.manifest_path),
+        )
+
+    def flush(self) -> None:
+        self._manifest_fp.flush()
+
+    def close(self) -> None:
+        self._manifest_fp.close()
+        logger.info(
+            "Linked classified sink closed: link_mode={}, symlink_fallback_count={}",
+            self.link_mode,
+            self.symlink_fallback_count,
+        )
+        super().close()
+
+    @staticmethod
+    def _is_valid_source(row: ClassificationLabelRecord, source_path: Path) -> bool:
+        # Links always need the source file on disk, even when the payload was carried in memory.
+        return source_path.suffix.lower() == ".json" and source_path.exists()
+
+    def _write_output(self, row: ClassificationLabelRecord, source_path: Path, target_path: Path) -> tuple[object, object]:
+        self._link(source_path, target_path)
+        self._manifest_fp.write(
+            json.dumps(
+                {
+                    "path": target_path.relative_to(self.classified_root).as_posix(),
+                    "doc_id": row.doc_id,
+                    "pageid": row.pageid,
+                    "entity_type": row.entity_type,
+                    "subtypes": list(row.subtypes),
+                    "is_ambiguous": row.is_ambiguous,
+                    "strategy_version": row.strategy_version,
+                },
+                ensure_ascii=False,
+            )
+            + "\n"
+        )
+        payload = row.source_payload or {"pageid": row.pageid}
+        return payload.get("pageid"), payload.get("doc_id", "")
+
+    def _link(self, source_path: Path, target_path: Path) -> None:
+        if target_path.exists() and os.path.samefile(source_path, target_path):
+            return
+        # Link to a temp name first so an existing target is swapped atomically.
+        tmp_path = target_path.with_name(f"{target_path.name}.tmp")
+        if tmp_path.exists() or tmp_path.is_symlink():
+            tmp_path.unlink()
+        mode = self.link_mode
+        if mode == "hardlink":
+            try:
+                os.link(source_path, tmp_path)
+            except OSError as exc:
+                # Typically a cross-device link; symlinks still avoid the duplicate bytes.
+                self.symlink_fallback_count += 1
+                logger.debug("Hardlink failed, falling back to symlink: source_path={}, error={}", str(source_path), exc)
+                mode = "symlink"
+        if mode == "symlink":
+            os.symlink(source_path.resolve(), tmp_path)
+        os.replace(tmp_path, target_path)
+
+
+class ClassifiedLabelOverlay:
+    """Read-side helper that merges manifest labels into linked classified pages."""
+
+    def __init__(self, classified_root: str, manifest_name: str = LABEL_MANIFEST_NAME) -> None:
+        self.classified_root = Path(classified_root)
+        self.labels: dict[str, dict[str, Any]] = {}
+        # path -> manifest line of its last row; higher means written more recently.
+        self.sequence: dict[str, int] = {}
+        manifest_path = self.classified_root / manifest_name
+        if manifest_path.exists():
+            with manifest_path.open("r", encoding="utf-8") as fp:
+                for line_number, line in enumerate(fp):
+                    if line.strip():
+                        row = json.loads(line)
+                        self.labels[row["path"]] = row
+                        self.sequence[row["path"]] = line_number
+
+    def label_for(self, path: str | Path) -> dict[str, Any] | None:
+        return self.labels.get(self._relative_key(path))
+
+    def sequence_for(self, path: str | Path) -> int | None:
+        return self.sequence.get(self._relative_key(path))
+
+    def load_page(self, path: str | Path) -> dict[str, Any]:
+        page_path = Path(path)
+        if not page_path.is_absolute() and not page_path.exists():
+            page_path = self.classified_root / page_path
+        with page_path.open("r", encoding="utf-8", errors="replace") as fp:
+            payload = json.load(fp)
+        label = self.label_for(page_path)
+        if label is not None:
+            payload["subtypes"] = list(label["subtypes"])
+            payload["is_ambiguous"] = bool(label["is_ambiguous"])
+        return payload
+
+    def iter_pages(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        for rel_path in self.labels:
+            page_path = self.classified_root / rel_path
+            if page_path.exists():
+                yield rel_path, self.load_page(page_path)
+
+    def _relative_key(self, path: str | Path) -> str:
+        candidate = Path(path)
+        if candidate.is_absolute() or candidate.exists():
+            try:
+                return Path(os.path.abspath(candidate)).relative_to(os.path.abspath(self.classified_root)).as_posix()
+            except ValueError:
+                pass
+        return candidate.as_posix()
@@ -1,8 +1,8 @@
 ﻿import json
 from pathlib import Path
 
-from src.classification.application.contracts import ClassificationReportRecord
-from src.classification.application.ports import ReportSinkPort
+from src.classification.application.contracts import ClassificationReportRecord, ShadowDiffRecord
+from src.classification.application.ports import ReportSinkPort, ShadowDiffSinkPort
 from src.config.logger_config import logger
 
 
@@ -17,3 +17,16 @@ class JsonReportSink(ReportSinkPort):
             encoding="utf-8",
         )
         logger.info("Classification report written: report_path={}", str(self.report_path))
+
+
+class JsonShadowDiffSink(ShadowDiffSinkPort):
+    def __init__(self, report_path: str) -> None:
+        self.report_path = Path(report_path)
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write_shadow_diff(self, report: ShadowDiffRecord) -> None:
+        self.report_path.write_text(
+            json.dumps(report.to_dict(), ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        logger.info("Shadow classification diff written: report_path={}", str(self.report_path))
@@ -1,16 +1,19 @@
 ﻿import json
+import os
 import re
 from pathlib import Path
+from typing import Iterator
 
 from src.classification.application.contracts import LoadedPage, LoadedPageMeta
-from src.classification.application.ports import PageSourcePort
+from src.classification.application.ports import StreamingPageSourcePort
 from src.classification.domain.entities import PageRef, WikiPage
 from src.config.logger_config import logger
 
 
-class HtmlPageSource(PageSourcePort):
+class HtmlPageSource(StreamingPageSourcePort):
     def __init__(self, input_dir: str) -> None:
         self.input_dir = Path(input_dir)
+        self._listing: tuple[int, list[str]] | None = None
 
     def discover(self) -> list[PageRef]:
         refs: list[PageRef] = []
@@ -19,13 +22,31 @@ class HtmlPageSource(PageSourcePort):
         logger.info("HTML source discovered {} pages from {}", len(refs), str(self.input_dir))
         return refs
 
+    def iter_discover(self) -> Iterator[PageRef]:
+        # Same order as discover(); only the file names are held, refs are built as they are consumed.
+        for name in self._sorted_json_names():
+            path = self.input_dir / name
+            yield PageRef(source_id=path.stem, location=str(path))
+
+    def count(self) -> int:
+        return len(self._sorted_json_names())
+
+    def _sorted_json_names(self) -> list[str]:
+        # count() and iter_discover() share one listing while the directory is unchanged, so a run scans it once.
+        mtime_ns = self.input_dir.stat().st_mtime_ns
+        if self._listing is None or self._listing[0] != mtime_ns:
+            with os.scandir(self.input_dir) as entries:
+                names = sorted(entry.name for entry in entries if entry.name.endswith(".json") and entry.is_file())
+            self._listing = (mtime_ns, names)
+        return self._listing[1]
+
     def load(self, ref: PageRef) -> LoadedPage:
         path = Path(ref.location)
         raw = path.read_text(encoding="utf-8", errors="replace")
 
         try:
             parsed = json.loads(raw)
-            return self._from_parsed(path, parsed, parse_warning=None)
+            return self._from_parsed(path, parsed, parse_warning=None, payload=parsed)
         except json.JSONDecodeError as exc:
             # Fault-tolerant path keeps pipeline running for malformed JSON files.
             fallback = self._fallback_extract(raw)
@@ -34,7 +55,12 @@ class HtmlPageSource(PageSourcePort):
             return self._from_parsed(path, fallback, parse_warning=warning)
 
     @staticmethod
-    def _from_parsed(path: Path, parsed: dict, parse_warning: str | None) -> LoadedPage:
+    def from_payload(source_path: str, payload: dict) -> LoadedPage:
+        """Build a LoadedPage from an already parsed crawler document (same mapping as load())."""
+        return HtmlPageSource._from_parsed(Path(source_path), payload, parse_warning=None, payload=payload)
+
+    @staticmethod
+    def _from_parsed(path: Path, parsed: dict, parse_warning: str | None, payload: dict | None = None) -> LoadedPage:
         categories = tuple(sorted({str(c).strip() for c in parsed.get("categories", []) if str(c).strip()}))
         page = WikiPage(
             pageid=HtmlPageSource._to_int(parsed.get("pageid")),
@@ -46,7 +72,10 @@ class HtmlPageSource(PageSourcePort):
             content=str(parsed.get("content", "")),
             is_redirect=bool(parsed.get("is_redirect", False)),
         )
-        return LoadedPage(page=page, meta=LoadedPageMeta(source_path=str(path), parse_warning=parse_warning))
+        return LoadedPage(
+            page=page,
+            meta=LoadedPageMeta(source_path=str(path), parse_warning=parse_warning, payload=payload),
+        )
 
     @staticmethod
     def _to_int(value) -> int | None:
@@ -0,0 +1,125 @@
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterator
+
+from src.classification.application.contracts import LoadedPage
+from src.classification.application.ports import PageSourcePort, SourceStatsPort, StreamingPageSourcePort
+from src.classification.domain.entities import PageRef
+from src.config.logger_config import logger
+
+
+class PrefetchingPageSource(StreamingPageSourcePort, SourceStatsPort):
+    # Wraps any PageSourcePort and loads the next `prefetch_depth` refs on a thread pool while the
+    # consumer works on the current page. Refs are delivered in discovery order and load() hands
+    # back the prefetched result; refs loaded out of order fall back to a synchronous load.
+    def __init__(self, source: PageSourcePort, prefetch_depth: int = 32, max_workers: int = 4) -> None:
+        if prefetch_depth < 1:
+            raise ValueError(f"prefetch_depth must be >= 1: {prefetch_depth}")
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1: {max_workers}")
+        self.source = source
+        self.prefetch_depth = prefetch_depth
+        self.max_workers = max_workers
+        self.hit_count = 0
+        self.stall_count = 0
+        self.miss_count = 0
+        # One read-ahead queue per running iter_discover(); load() takes from whichever one holds the ref.
+        self._active: list[deque[tuple[PageRef, Future[LoadedPage]]]] = []
+        self._lock = threading.Lock()
+        # Non-streaming inner sources: the list discover()ed by count() is reused by the next iteration.
+        self._discovered: list[PageRef] | None = None
+
+    def discover(self) -> list[PageRef]:
+        return list(self._inner_refs())
+
+    def count(self) -> int:
+        if isinstance(self.source, StreamingPageSourcePort):
+            return self.source.count()
+        self._discovered = list(self.source.discover())
+        return len(self._discovered)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "prefetch_depth": self.prefetch_depth,
+            "max_workers": self.max_workers,
+            "hit_count": self.hit_count,
+            "stall_count": self.stall_count,
+            "miss_count": self.miss_count,
+        }
+
+    def iter_discover(self) -> Iterator[PageRef]:
+        refs = self._inner_refs()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="page-prefetch")
+        pending: deque[tuple[PageRef, Future[LoadedPage]]] = deque()
+        exhausted = False
+
+        def fill() -> None:
+            nonlocal exhausted
+            while not exhausted and len(pending) < self.prefetch_depth:
+                ref = next(refs, None)
+                if ref is None:
+                    exhausted = True
+                    return
+                future = executor.submit(self.source.load, ref)
+                with self._lock:
+                    pending.append((ref, future))
+
+        with self._lock:
+            self._active.append(pending)
+        try:
+            fill()
+            while pending:
+                ref = pending[0][0]
+                yield ref
+                with self._lock:
+                    skipped = pending[0][1] if pending and pending[0][0] is ref else None
+                    if skipped is not None:
+                        pending.popleft()
+                if skipped is not None:
+                    # Consumer skipped load() for this ref; drop its prefetched result.
+                    skipped.cancel()
+                fill()
+        finally:
+            with self._lock:
+                self._active.remove(pending)
+                leftover = [future for _, future in pending]
+                pending.clear()
+            for future in leftover:
+                future.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+            close_refs = getattr(refs, "close", None)
+            if close_refs is not None:
+                close_refs()
+            logger.info(
+                "Prefetching source finished: prefetch_depth={}, max_workers={}, hit_count={}, stall_count={}, miss_count={}",
+                self.prefetch_depth,
+                self.max_workers,
+                self.hit_count,
+                self.stall_count,
+                self.miss_count,
+            )
+
+    def load(self, ref: PageRef) -> LoadedPage:
+        future = self._take_prefetched(ref)
+        if future is not None:
+            if future.done():
+                self.hit_count += 1
+            else:
+                self.stall_count += 1
+            return future.result()
+        self.miss_count += 1
+        return self.source.load(ref)
+
+    def _take_prefetched(self, ref: PageRef) -> Future[LoadedPage] | None:
+        with self._lock:
+            for pending in self._active:
+                if pending and pending[0][0] is ref:
+                    return pending.popleft()[1]
+        return None
+
+    def _inner_refs(self) -> Iterator[PageRef]:
+        if isinstance(self.source, StreamingPageSourcePort):
+            return self.source.iter_discover()
+        discovered, self._discovered = self._discovered, None
+        return iter(discovered if discovered is not None else self.source.discover())
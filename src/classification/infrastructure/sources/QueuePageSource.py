@@ -0,0 +1,75 @@
+import queue
+from typing import Any, Iterator
+
+from src.classification.application.contracts import LoadedPage
+from src.classification.application.ports import StreamingPageSourcePort
+from src.classification.domain.entities import PageRef
+from src.classification.infrastructure.sources.HtmlPageSource import HtmlPageSource
+from src.config.logger_config import logger
+
+_END_OF_STREAM = object()
+
+
+class QueuePageSource(StreamingPageSourcePort):
+    # In-process handoff from a producer (the crawler) to ClassificationPipeline. Producers call
+    # submit() with the parsed crawler document and the file it was persisted to; the bounded
+    # queue blocks them when classification falls behind. Pages are mapped exactly like
+    # HtmlPageSource.load() would map the persisted file, without reading it back.
+    def __init__(self, maxsize: int = 256, put_timeout_seconds: float = 0.5) -> None:
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be >= 1: {maxsize}")
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=maxsize)
+        self.put_timeout_seconds = put_timeout_seconds
+        self.received_count = 0
+        self._consumer_done = False
+
+    def submit(self, payload: dict[str, Any], source_path: str) -> None:
+        self._put((payload, source_path))
+
+    def finish(self) -> None:
+        """Signal that no more pages will be submitted."""
+        self._put(_END_OF_STREAM)
+
+    def close(self) -> None:
+        """Mark the consumer as gone so blocked and future submit() calls fail instead of waiting."""
+        self._consumer_done = True
+
+    def discover(self) -> list[PageRef]:
+        return list(self.iter_discover())
+
+    def count(self) -> int:
+        # Unknown up front while the producer is still running.
+        return 0
+
+    def iter_discover(self) -> Iterator[PageRef]:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _END_OF_STREAM:
+                    return
+                payload, source_path = item
+                self.received_count += 1
+                yield PageRef(
+                    source_id=str(payload.get("pageid")),
+                    location=source_path,
+                    metadata={"pageid": payload.get("pageid"), "payload": payload},
+                )
+        finally:
+            self._consumer_done = True
+            logger.info("Queue page source finished: received_count={}", self.received_count)
+
+    def load(self, ref: PageRef) -> LoadedPage:
+        payload = (ref.metadata or {}).get("payload")
+        if payload is None:
+            return HtmlPageSource(input_dir=".").load(ref)
+        return HtmlPageSource.from_payload(ref.location, payload)
+
+    def _put(self, item: Any) -> None:
+        # Timed puts so a producer never blocks forever on a consumer that has already stopped.
+        while not self._consumer_done:
+            try:
+                self._queue.put(item, timeout=self.put_timeout_seconds)
+                return
+            except queue.Full:
+                continue
+        raise RuntimeError("Classification consumer stopped; page not handed off")
@@ -1,14 +1,15 @@
 ﻿import sqlite3
 from pathlib import Path
+from typing import Iterator
 
 from src.classification.application.contracts import LoadedPage, LoadedPageMeta
-from src.classification.application.ports import PageSourcePort
+from src.classification.application.ports import StreamingPageSourcePort
 from src.classification.domain.entities import PageRef, WikiPage
 from src.classification.infrastructure.sources.HtmlPageSource import HtmlPageSource
 from src.config.logger_config import logger
 
 
-class RegistryPageSource(PageSourcePort):
+class RegistryPageSource(StreamingPageSourcePort):
     def __init__(self, db_path: str) -> None:
         self.db_path = db_path
 
@@ -36,12 +37,31 @@ class RegistryPageSource(PageSourcePort):
         finally:
             conn.close()
 
+    def iter_discover(self) -> Iterator[PageRef]:
+        # Rows are pulled lazily from the cursor and carry no metadata copy; load() queries
+        # the registry for the fallback fields only when a page file is missing.
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cur = conn.execute("SELECT page_id, file_path FROM pages ORDER BY page_id")
+            for page_id, file_path in cur:
+                yield PageRef(source_id=str(page_id), location=file_path or "")
+        finally:
+            conn.close()
+
+    def count(self) -> int:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return int(conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0])
+        finally:
+            conn.close()
+
     def load(self, ref: PageRef) -> LoadedPage:
         file_path = ref.location
         if file_path and Path(file_path).exists():
             return HtmlPageSource(input_dir=".").load(PageRef(source_id=ref.source_id, location=file_path))
 
-        raw_categories = str(ref.metadata.get("categories", "") or "")
+        metadata = ref.metadata or self._fetch_metadata(ref.source_id)
+        raw_categories = str(metadata.get("categories", "") or "")
         categories = tuple(c.strip() for c in raw_categories.split(",") if c.strip())
         logger.warning(
             "Registry page uses metadata fallback due to missing file path: source_id={}, db_path={}",
@@ -49,9 +69,9 @@ class RegistryPageSource(PageSourcePort):
             self.db_path,
         )
         page = WikiPage(
-            pageid=int(ref.metadata["pageid"]) if ref.metadata.get("pageid") is not None else None,
-            title=str(ref.metadata.get("title", "")),
-            revid=int(ref.metadata["revid"]) if ref.metadata.get("revid") is not None else None,
+            pageid=int(metadata["pageid"]) if metadata.get("pageid") is not None else None,
+            title=str(metadata.get("title", "")),
+            revid=int(metadata["revid"]) if metadata.get("revid") is not None else None,
             timestamp=None,
             canonical_url=None,
             categories=categories,
@@ -65,3 +85,17 @@ class RegistryPageSource(PageSourcePort):
                 parse_warning="missing_file_path",
             ),
         )
+
+    def _fetch_metadata(self, source_id: str) -> dict:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            row = conn.execute(
+                "SELECT page_id, title, last_revid, categories FROM pages WHERE page_id = ?",
+                (source_id,),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return {"pageid": source_id}
+        page_id, title, revid, categories = row
+        return {"pageid": page_id, "title": title, "revid": revid, "categories": categories}
@@ -0,0 +1,47 @@
+from typing import Iterator
+
+from src.classification.application.contracts import LoadedPage
+from src.classification.application.ports import PageSourcePort, StreamingPageSourcePort
+from src.classification.domain.entities import PageRef
+from src.classification.domain.sharding import ShardSpec
+
+
+class ShardedPageSource(StreamingPageSourcePort):
+    # Yields only the refs owned by `shard`; ownership is decided from the ref before any load,
+    # so each node reads just its own pages and the shards partition the corpus exactly.
+    def __init__(self, source: PageSourcePort, shard: ShardSpec) -> None:
+        self.source = source
+        self.shard = shard
+        # Non-streaming inner sources: the refs count() already discovered are reused by the next iteration.
+        self._discovered: list[PageRef] | None = None
+
+    def discover(self) -> list[PageRef]:
+        return list(self.iter_discover())
+
+    def iter_discover(self) -> Iterator[PageRef]:
+        if isinstance(self.source, StreamingPageSourcePort):
+            refs = self.source.iter_discover()
+        else:
+            discovered, self._discovered = self._discovered, None
+            refs = iter(discovered if discovered is not None else self.source.discover())
+        try:
+            for ref in refs:
+                if self.shard.owns(ref):
+                    yield ref
+        finally:
+            close_refs = getattr(refs, "close", None)
+            if close_refs is not None:
+                close_refs()
+
+    def count(self) -> int:
+        # Progress-bar estimate: the sha1 shard hash splits pages evenly, so this avoids a second full
+        # scan of the inner source. Run reports count the refs actually iterated.
+        if isinstance(self.source, StreamingPageSourcePort):
+            total = self.source.count()
+        else:
+            self._discovered = list(self.source.discover())
+            total = len(self._discovered)
+        return -(-total // self.shard.count)
+
+    def load(self, ref: PageRef) -> LoadedPage:
+        return self.source.load(ref)
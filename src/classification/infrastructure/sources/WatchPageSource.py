@@ -0,0 +1,168 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Iterator, Sequence
+
+from src.classification.application.contracts import LoadedPage
+from src.classification.application.ports import PageChangeFeedPort, PageSourcePort, StreamingPageSourcePort
+from src.classification.domain.entities import PageRef
+from src.config.logger_config import logger
+
+
+class DirectoryChangeFeed(PageChangeFeedPort):
+    # Polls the page directory with scandir and emits files whose (mtime_ns, size) changed.
+    # A change is held back until its signature has been stable for `debounce_seconds`, so
+    # files still being written by the crawler are not picked up half-way.
+    def __init__(
+        self,
+        input_dir: str,
+        debounce_seconds: float = 2.0,
+        initial_scan: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.input_dir = Path(input_dir)
+        self.debounce_seconds = debounce_seconds
+        self.clock = clock
+        self._emitted: dict[str, tuple[int, int]] = {} if initial_scan else self._scan()
+        self._pending: dict[str, tuple[tuple[int, int], float]] = {}
+
+    def poll(self) -> list[PageRef]:
+        now = self.clock()
+        current = self._scan()
+        for name in set(self._emitted) - set(current):
+            del self._emitted[name]
+        for name in set(self._pending) - set(current):
+            del self._pending[name]
+        for name, signature in current.items():
+            if self._emitted.get(name) == signature:
+                self._pending.pop(name, None)
+                continue
+            pending = self._pending.get(name)
+            if pending is None or pending[0] != signature:
+                self._pending[name] = (signature, now)
+        ready = sorted(name for name, (_, changed_at) in self._pending.items() if now - changed_at >= self.debounce_seconds)
+        for name in ready:
+            self._emitted[name] = self._pending.pop(name)[0]
+        return [PageRef(source_id=Path(name).stem, location=str(self.input_dir / name)) for name in ready]
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        signatures: dict[str, tuple[int, int]] = {}
+        with os.scandir(self.input_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    signatures[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+
+class RegistryChangeFeed(PageChangeFeedPort):
+    # Follows registry rows by (last_updated, page_id). last_updated has one-second resolution, so
+    # only rows older than the current second minus `debounce_seconds` are taken: a second is read
+    # once it can no longer gain rows, and the watermark never skips a late row of the same second.
+    def __init__(
+        self,
+        db_path: str,
+        debounce_seconds: float = 2.0,
+        initial_scan: bool = True,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        self.db_path = db_path
+        self.debounce_seconds = debounce_seconds
+        self.clock = clock
+        self._watermark: tuple[str, int] = ("", -1)
+        if not initial_scan:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                row = conn.execute(
+                    "SELECT last_updated, page_id FROM pages ORDER BY last_updated DESC, page_id DESC LIMIT 1"
+                ).fetchone()
+            finally:
+                conn.close()
+            if row is not None:
+                self._watermark = (str(row[0]), int(row[1]))
+
+    def poll(self) -> list[PageRef]:
+        settled_before = (self.clock() - timedelta(seconds=self.debounce_seconds)).strftime("%Y-%m-%d %H:%M:%S")
+        last_updated, page_id = self._watermark
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(
+                """
+                SELECT page_id, file_path, last_updated FROM pages
+                WHERE (last_updated > ? OR (last_updated = ? AND page_id > ?)) AND last_updated < ?
+                ORDER BY last_updated, page_id
+                """,
+                (last_updated, last_updated, page_id, settled_before),
+            ).fetchall()
+        finally:
+            conn.close()
+        if rows:
+            self._watermark = (str(rows[-1][2]), int(rows[-1][0]))
+        return [PageRef(source_id=str(row_page_id), location=file_path or "") for row_page_id, file_path, _ in rows]
+
+
+class WatchPageSource(StreamingPageSourcePort):
+    # Endless streaming source for ClassificationPipeline: iter_discover() keeps polling `feed` and
+    # yields new refs as they land, so the pipeline's incremental policy and sinks apply unchanged.
+    # `on_idle` callbacks (sink/state flushes) run whenever a poll comes back empty. The stream ends
+    # on `stop_event`, KeyboardInterrupt or after `max_idle_polls` empty polls, letting the
+    # pipeline close its sinks and write the report normally.
+    def __init__(
+        self,
+        feed: PageChangeFeedPort,
+        loader: PageSourcePort,
+        poll_interval_seconds: float = 1.0,
+        on_idle: Sequence[Callable[[], None]] = (),
+        stop_event: threading.Event | None = None,
+        max_idle_polls: int | None = None,
+    ) -> None:
+        self.feed = feed
+        self.loader = loader
+        self.poll_interval_seconds = poll_interval_seconds
+        self.on_idle = tuple(on_idle)
+        self.stop_event = stop_event or threading.Event()
+        self.max_idle_polls = max_idle_polls
+        self.poll_count = 0
+        self.batch_count = 0
+        self.emitted_count = 0
+
+    def discover(self) -> list[PageRef]:
+        return self.feed.poll()
+
+    def count(self) -> int:
+        # Unknown up front for an open-ended stream.
+        return 0
+
+    def iter_discover(self) -> Iterator[PageRef]:
+        idle_polls = 0
+        try:
+            while not self.stop_event.is_set():
+                self.poll_count += 1
+                refs = self.feed.poll()
+                if refs:
+                    idle_polls = 0
+                    self.batch_count += 1
+                    self.emitted_count += len(refs)
+                    logger.info("Watch batch detected: batch_size={}, emitted_count={}", len(refs), self.emitted_count)
+                    yield from refs
+                    continue
+                idle_polls += 1
+                for callback in self.on_idle:
+                    callback()
+                if self.max_idle_polls is not None and idle_polls >= self.max_idle_polls:
+                    break
+                self.stop_event.wait(self.poll_interval_seconds)
+        except KeyboardInterrupt:
+            logger.info("Watch interrupted, finishing run")
+        logger.info(
+            "Watch source stopped: poll_count={}, batch_count={}, emitted_count={}",
+            self.poll_count,
+            self.batch_count,
+            self.emitted_count,
+        )
+
+    def load(self, ref: PageRef) -> LoadedPage:
+        return self.loader.load(ref)
@@ -1,10 +1,11 @@
 ﻿from __future__ import annotations
 
+import json
 import sqlite3
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import ClassVar
+from typing import Any, ClassVar, Collection, Mapping
 
 from src.classification.application.ports import ClassificationStatePort
 from src.classification.domain.incremental_policy import StateFingerprint
@@ -20,12 +21,56 @@ class ClassificationStateRow:
     entity_type: str
     source_path: str
     last_classified_at: str
+    rule_hits: tuple[str, ...] | None = None
+    is_low_conf: bool | None = None
+    is_ambiguous: bool | None = None
 
 
 class ClassificationStateStore(ClassificationStatePort):
     RECOVERY_SUFFIX: ClassVar[str] = ".corrupt"
+    # Rows written before the flags existed have is_low_conf NULL; they are counted as "unflagged".
+    _AGGREGATE_TRIGGERS: ClassVar[dict[str, str]] = {
+        "trg_class_state_aggregates_insert": """
+            AFTER INSERT ON classification_state BEGIN
+                INSERT INTO classification_aggregates (metric, value) VALUES
+                    ('total', 1),
+                    ('entity:' || NEW.entity_type, 1),
+                    ('low_conf', COALESCE(NEW.is_low_conf, 0)),
+                    ('ambiguous', COALESCE(NEW.is_ambiguous, 0)),
+                    ('unflagged', NEW.is_low_conf IS NULL)
+                ON CONFLICT(metric) DO UPDATE SET value = value + excluded.value;
+            END
+        """,
+        "trg_class_state_aggregates_update": """
+            AFTER UPDATE OF entity_type, is_low_conf, is_ambiguous ON classification_state BEGIN
+                INSERT INTO classification_aggregates (metric, value) VALUES
+                    ('entity:' || OLD.entity_type, -1),
+                    ('entity:' || NEW.entity_type, 1),
+                    ('low_conf', COALESCE(NEW.is_low_conf, 0) - COALESCE(OLD.is_low_conf, 0)),
+                    ('ambiguous', COALESCE(NEW.is_ambiguous, 0) - COALESCE(OLD.is_ambiguous, 0)),
+                    ('unflagged', (NEW.is_low_conf IS NULL) - (OLD.is_low_conf IS NULL))
+                ON CONFLICT(metric) DO UPDATE SET value = value + excluded.value;
+            END
+        """,
+        "trg_class_state_aggregates_delete": """
+            AFTER DELETE ON classification_state BEGIN
+                INSERT INTO classification_aggregates (metric, value) VALUES
+                    ('total', -1),
+                    ('entity:' || OLD.entity_type, -1),
+                    ('low_conf', -COALESCE(OLD.is_low_conf, 0)),
+                    ('ambiguous', -COALESCE(OLD.is_ambiguous, 0)),
+                    ('unflagged', -(OLD.is_low_conf IS NULL))
+                ON CONFLICT(metric) DO UPDATE SET value = value + excluded.value;
+            END
+        """,
+    }
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(self, db_path: str, commit_every: int = 1) -> None:
+        if commit_every < 1:
+            raise ValueError(f"commit_every must be >= 1: {commit_every}")
+        # Upserts are committed in batches of `commit_every`; flush()/close() commit the rest.
+        self.commit_every = commit_every
+        self._pending_writes = 0
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._conn = sqlite3.connect(str(self.db_path))
@@ -36,9 +81,9 @@ class ClassificationStateStore(ClassificationStatePort):
             raise
 
     @classmethod
-    def create_with_recovery(cls, db_path: str) -> tuple[ClassificationStateStore, bool, str | None]:
+    def create_with_recovery(cls, db_path: str, commit_every: int = 1) -> tuple[ClassificationStateStore, bool, str | None]:
         try:
-            return cls(db_path), False, None
+            return cls(db_path, commit_every=commit_every), False, None
         except sqlite3.DatabaseError:
             original = Path(db_path)
             if not original.exists():
@@ -47,7 +92,7 @@ class ClassificationStateStore(ClassificationStatePort):
                 f"{original.suffix}{cls.RECOVERY_SUFFIX}.{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}"
             )
             original.replace(backup)
-            store = cls(db_path)
+            store = cls(db_path, commit_every=commit_every)
             return store, True, str(backup)
 
     def _ensure_schema(self) -> None:
@@ -72,13 +117,59 @@ class ClassificationStateStore(ClassificationStatePort):
             ON classification_state(source_mode)
             """
         )
+        columns = {row[1] for row in cur.execute("PRAGMA table_info(classification_state)")}
+        if "rule_hits" not in columns:
+            # Rows created before rule hits were tracked keep NULL and are always re-run on rule changes.
+            cur.execute("ALTER TABLE classification_state ADD COLUMN rule_hits TEXT")
+        for flag in ("is_low_conf", "is_ambiguous"):
+            if flag not in columns:
+                cur.execute(f"ALTER TABLE classification_state ADD COLUMN {flag} INTEGER")
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS classification_aggregates (
+                metric TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+            """
+        )
+        existing_triggers = {
+            row[0] for row in cur.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_class_state_%'")
+        }
+        # SQLite keeps the corpus aggregates in step with every insert, update and delete of a state row,
+        # inside the same statement, so an upsert needs no extra read of the previous row.
+        for name, sql in self._AGGREGATE_TRIGGERS.items():
+            cur.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {sql}")
+        if existing_triggers != set(self._AGGREGATE_TRIGGERS):
+            # New DB, pre-aggregate DB or counters maintained by an older version: rebuild from the rows.
+            cur.execute("DELETE FROM classification_aggregates")
+            cur.execute(
+                """
+                INSERT INTO classification_aggregates (metric, value)
+                SELECT 'entity:' || entity_type, COUNT(*) FROM classification_state GROUP BY entity_type
+                UNION ALL SELECT 'total', COUNT(*) FROM classification_state
+                UNION ALL SELECT 'low_conf', COALESCE(SUM(is_low_conf), 0) FROM classification_state
+                UNION ALL SELECT 'ambiguous', COALESCE(SUM(is_ambiguous), 0) FROM classification_state
+                UNION ALL SELECT 'unflagged', COUNT(*) FROM classification_state WHERE is_low_conf IS NULL
+                """
+            )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS classification_rule_fingerprints (
+                strategy_version TEXT NOT NULL,
+                rule_id TEXT NOT NULL,
+                rule_hash TEXT NOT NULL,
+                PRIMARY KEY (strategy_version, rule_id)
+            )
+            """
+        )
         self._conn.commit()
 
     def _get_row(self, state_key: str) -> ClassificationStateRow | None:
         cur = self._conn.cursor()
         cur.execute(
             """
-            SELECT doc_id, source_mode, last_revid, content_hash, strategy_version, entity_type, source_path, last_classified_at
+            SELECT doc_id, source_mode, last_revid, content_hash, strategy_version, entity_type, source_path, last_classified_at,
+                   rule_hits, is_low_conf, is_ambiguous
             FROM classification_state
             WHERE doc_id = ?
             """,
@@ -96,6 +187,9 @@ class ClassificationStateStore(ClassificationStatePort):
             entity_type=str(row[5]),
             source_path=str(row[6]),
             last_classified_at=str(row[7]),
+            rule_hits=tuple(json.loads(row[8])) if row[8] is not None else None,
+            is_low_conf=bool(row[9]) if row[9] is not None else None,
+            is_ambiguous=bool(row[10]) if row[10] is not None else None,
         )
 
     def get(self, state_key: str) -> StateFingerprint | None:
@@ -107,6 +201,8 @@ class ClassificationStateStore(ClassificationStatePort):
             last_revid=row.last_revid,
             content_hash=row.content_hash,
             strategy_version=row.strategy_version,
+            entity_type=row.entity_type,
+            rule_hits=row.rule_hits,
         )
 
     def upsert(
@@ -119,35 +215,110 @@ class ClassificationStateStore(ClassificationStatePort):
         strategy_version: str,
         entity_type: str,
         source_path: str,
+        rule_hits: tuple[str, ...] | None = None,
+        is_low_conf: bool | None = None,
+        is_ambiguous: bool | None = None,
     ) -> None:
+        """Write one page state; `is_low_conf`/`is_ambiguous` of None keep the stored flags."""
         now = datetime.now(timezone.utc).isoformat()
+        # The aggregate triggers update the corpus counters in the same statement as the row.
+        try:
+            self._conn.execute(
+                """
+                INSERT INTO classification_state (
+                    doc_id, source_mode, last_revid, content_hash, strategy_version, entity_type, source_path, last_classified_at,
+                    rule_hits, is_low_conf, is_ambiguous
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(doc_id) DO UPDATE SET
+                    source_mode = excluded.source_mode,
+                    last_revid = excluded.last_revid,
+                    content_hash = excluded.content_hash,
+                    strategy_version = excluded.strategy_version,
+                    entity_type = excluded.entity_type,
+                    source_path = excluded.source_path,
+                    last_classified_at = excluded.last_classified_at,
+                    rule_hits = excluded.rule_hits,
+                    is_low_conf = COALESCE(excluded.is_low_conf, classification_state.is_low_conf),
+                    is_ambiguous = COALESCE(excluded.is_ambiguous, classification_state.is_ambiguous)
+                """,
+                (
+                    state_key,
+                    source_mode,
+                    last_revid,
+                    content_hash,
+                    strategy_version,
+                    entity_type,
+                    source_path,
+                    now,
+                    json.dumps(list(rule_hits)) if rule_hits is not None else None,
+                    int(is_low_conf) if is_low_conf is not None else None,
+                    int(is_ambiguous) if is_ambiguous is not None else None,
+                ),
+            )
+        except Exception:
+            # Drops the whole uncommitted batch; those pages are simply re-classified next run.
+            self._conn.rollback()
+            self._pending_writes = 0
+            raise
+        self._pending_writes += 1
+        if self._pending_writes >= self.commit_every:
+            self.flush()
+
+    def delete_missing(self, seen_state_keys: Collection[str], source_mode: str) -> int:
+        """Delete `source_mode` rows whose key was not seen in a full pass over the corpus; returns the count."""
+        stale = [
+            (state_key,)
+            for (state_key,) in self._conn.execute(
+                "SELECT doc_id FROM classification_state WHERE source_mode = ?", (source_mode,)
+            ).fetchall()
+            if state_key not in seen_state_keys
+        ]
+        if stale:
+            self._conn.executemany("DELETE FROM classification_state WHERE doc_id = ?", stale)
+            self.flush()
+        return len(stale)
+
+    def flush(self) -> None:
+        self._conn.commit()
+        self._pending_writes = 0
+
+    def get_corpus_totals(self) -> dict[str, Any]:
+        """Corpus-wide counts over every tracked page, read from the maintained aggregates."""
+        metrics = dict(self._conn.execute("SELECT metric, value FROM classification_aggregates").fetchall())
+        by_entity_type = {
+            metric.removeprefix("entity:"): int(value)
+            for metric, value in sorted(metrics.items())
+            if metric.startswith("entity:") and value
+        }
+        return {
+            "total_pages": int(metrics.get("total", 0)),
+            "by_entity_type": by_entity_type,
+            "misc_count": by_entity_type.get("misc", 0),
+            "low_conf_count": int(metrics.get("low_conf", 0)),
+            "ambiguity_count": int(metrics.get("ambiguous", 0)),
+            # Rows from before the flags were stored; low_conf/ambiguity counts exclude them until reclassified.
+            "unflagged_count": int(metrics.get("unflagged", 0)),
+        }
+
+    def record_rule_fingerprints(self, strategy_version: str, fingerprints: Mapping[str, str]) -> None:
         cur = self._conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO classification_state (
-                doc_id, source_mode, last_revid, content_hash, strategy_version, entity_type, source_path, last_classified_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(doc_id) DO UPDATE SET
-                source_mode = excluded.source_mode,
-                last_revid = excluded.last_revid,
-                content_hash = excluded.content_hash,
-                strategy_version = excluded.strategy_version,
-                entity_type = excluded.entity_type,
-                source_path = excluded.source_path,
-                last_classified_at = excluded.last_classified_at
-            """,
-            (
-                state_key,
-                source_mode,
-                last_revid,
-                content_hash,
-                strategy_version,
-                entity_type,
-                source_path,
-                now,
-            ),
+        cur.execute("DELETE FROM classification_rule_fingerprints WHERE strategy_version = ?", (strategy_version,))
+        cur.executemany(
+            "INSERT INTO classification_rule_fingerprints (strategy_version, rule_id, rule_hash) VALUES (?, ?, ?)",
+            [(strategy_version, rule_id, rule_hash) for rule_id, rule_hash in sorted(fingerprints.items())],
         )
         self._conn.commit()
 
+    def get_rule_fingerprints(self, strategy_version: str) -> dict[str, str]:
+        cur = self._conn.cursor()
+        cur.execute(
+            "SELECT rule_id, rule_hash FROM classification_rule_fingerprints WHERE strategy_version = ?",
+            (strategy_version,),
+        )
+        return {str(rule_id): str(rule_hash) for rule_id, rule_hash in cur.fetchall()}
+
     def close(self) -> None:
-        self._conn.close()
+        try:
+            self.flush()
+        finally:
+            self._conn.close()
@@ -2,21 +2,36 @@
 
 from llama_index.llms.openrouter import OpenRouter
 from llama_index.core import Settings
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from llama_index.llms.huggingface import HuggingFaceLLM
 
 from dotenv import load_dotenv
 import os
 
+from src.indexing.infrastructure.cached_embedding import CachedEmbedding
+from src.indexing.infrastructure.cpu_embedding import build_embed_model
+from src.indexing.infrastructure.embedding_cache import EmbeddingCacheStore
+from src.query.rerank_scorers import DEFAULT_CROSS_ENCODER
+
 load_dotenv()
 
 os.environ["OPENROUTER_API_KEY"] = os.getenv("OPENROUTER_API_KEY")
 
-# 嵌入模型
-Settings.embed_model = HuggingFaceEmbedding(
-    model_name="Qwen/Qwen3-Embedding-0.6B", device="cuda"
+# 嵌入模型（向量快取於 indexes/embedding_cache，首次查詢時才開啟，相同文字不會重複計算）
+# EMBED_DEVICE: auto/cuda/mps/cpu；CPU 時 EMBED_BACKEND: torch/torch-int8/onnx，EMBED_PROCESSES: 編碼行程數
+Settings.embed_model = CachedEmbedding(
+    build_embed_model(
+        "Qwen/Qwen3-Embedding-0.6B",
+        device=os.getenv("EMBED_DEVICE", "auto"),
+        backend=os.getenv("EMBED_BACKEND", "torch"),
+        num_processes=int(os.getenv("EMBED_PROCESSES", "1")),
+    ),
+    EmbeddingCacheStore("indexes/embedding_cache", max_bytes=2 * 1024**3),
 )
 
+# 重排序：RERANKER=llm（遠端 LLM，預設）/cross-encoder（本機 CPU 模型，載入失敗時退回 lexical）/lexical
+RERANKER = os.getenv("RERANKER", "llm")
+RERANK_MODEL = os.getenv("RERANK_MODEL", DEFAULT_CROSS_ENCODER)
+
 # LLM模型
 """Settings.llm = HuggingFaceLLM(
     model_name="Qwen/Qwen3-1.7B",
@@ -0,0 +1 @@
+"""Vector index build context."""
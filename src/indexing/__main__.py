@@ -0,0 +1,11 @@
+from src.indexing.build_index import run_build_index
+
+# python -m src.indexing
+if __name__ == "__main__":
+    report = run_build_index(
+        classified_root="artifacts/classified/wiki",
+        persist_dir="indexes/vector_store",
+        state_db_path="indexes/index_state.db",
+        full_rebuild=False,
+    )
+    print(report)
@@ -0,0 +1 @@
+"""Application layer for vector index builds."""
@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class IndexBuildReport:
+    persist_dir: str
+    signature: str
+    rebuild_reason: str | None
+    scanned_count: int
+    added_count: int
+    changed_count: int
+    removed_count: int
+    revid_only_count: int
+    unchanged_count: int
+    skipped_count: int
+    inserted_node_count: int
+    deleted_node_count: int
+    checkpoint_count: int
+    elapsed_seconds: float
+    generated_at: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "persist_dir": self.persist_dir,
+            "signature": self.signature,
+            "rebuild_reason": self.rebuild_reason,
+            "scanned_count": self.scanned_count,
+            "added_count": self.added_count,
+            "changed_count": self.changed_count,
+            "removed_count": self.removed_count,
+            "revid_only_count": self.revid_only_count,
+            "unchanged_count": self.unchanged_count,
+            "skipped_count": self.skipped_count,
+            "inserted_node_count": self.inserted_node_count,
+            "deleted_node_count": self.deleted_node_count,
+            "checkpoint_count": self.checkpoint_count,
+            "elapsed_seconds": self.elapsed_seconds,
+            "generated_at": self.generated_at,
+        }
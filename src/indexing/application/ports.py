@@ -0,0 +1,55 @@
+from typing import Iterator, Protocol, Sequence, runtime_checkable
+
+from src.indexing.domain.models import IndexDocument, IndexStateRow
+
+
+@runtime_checkable
+class IndexCorpusPort(Protocol):
+    def iter_documents(self) -> Iterator[IndexDocument]: ...
+    """Stream indexable pages; each doc_id is yielded at most once."""
+
+    @property
+    def skipped_count(self) -> int: ...
+    """Pages left out of the index (redirects, empty content, unreadable files)."""
+
+
+@runtime_checkable
+class VectorIndexPort(Protocol):
+    def add_documents(self, documents: Sequence[IndexDocument]) -> dict[str, list[str]]: ...
+    """Chunk, embed and insert documents; returns the node ids created per doc_id."""
+
+    def delete_nodes(self, node_ids: Sequence[str]) -> None: ...
+    """Remove nodes from the vector store and docstore."""
+
+    def reset(self) -> None: ...
+    """Drop every node so the next persist writes an empty index."""
+
+    def persist(self) -> None: ...
+    """Write the index to its persist directory."""
+
+
+@runtime_checkable
+class IndexStatePort(Protocol):
+    def get_all(self) -> dict[str, IndexStateRow]: ...
+    """Load the pageid -> (revid, fingerprint, node ids) table."""
+
+    def upsert(self, row: IndexStateRow) -> None: ...
+    """Stage one row; it becomes durable on the next commit."""
+
+    def delete(self, doc_id: str) -> None: ...
+    """Stage the removal of one row."""
+
+    def clear(self) -> None: ...
+    """Stage the removal of every row."""
+
+    def get_signature(self) -> str | None: ...
+    """Signature of the settings the stored embeddings were built with."""
+
+    def set_signature(self, signature: str) -> None: ...
+    """Stage a new signature."""
+
+    def commit(self) -> None: ...
+    """Make staged changes durable; called only after the index was persisted."""
+
+    def close(self) -> None: ...
+    """Release resources, discarding uncommitted changes."""
@@ -0,0 +1 @@
+"""Workflow orchestrators for index builds."""
@@ -0,0 +1,163 @@
+import time
+from datetime import datetime, timezone
+
+from tqdm import tqdm
+
+from src.config.logger_config import logger
+from src.indexing.application.contracts import IndexBuildReport
+from src.indexing.application.ports import IndexCorpusPort, IndexStatePort, VectorIndexPort
+from src.indexing.domain.change_policy import ADDED, CHANGED, REVID_ONLY, UNCHANGED, evaluate_index_change
+from src.indexing.domain.models import IndexDocument, IndexStateRow
+
+
+class IncrementalIndexBuilder:
+    # Only added/changed pages are embedded. State rows are committed after the index is persisted,
+    # so an interrupted run at worst re-embeds the pages of its last checkpoint.
+    def __init__(
+        self,
+        corpus: IndexCorpusPort,
+        index: VectorIndexPort,
+        state_store: IndexStatePort,
+        signature: str,
+        persist_dir: str,
+        batch_size: int = 32,
+        checkpoint_every: int = 1000,
+        show_progress: bool = True,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1: {batch_size}")
+        if checkpoint_every < 1:
+            raise ValueError(f"checkpoint_every must be >= 1: {checkpoint_every}")
+        self.corpus = corpus
+        self.index = index
+        self.state_store = state_store
+        self.signature = signature
+        self.persist_dir = persist_dir
+        self.batch_size = batch_size
+        self.checkpoint_every = checkpoint_every
+        self.show_progress = show_progress
+
+    def run(self, full_rebuild: bool = False) -> IndexBuildReport:
+        started = time.perf_counter()
+        state = self.state_store.get_all()
+        stored_signature = self.state_store.get_signature()
+        rebuild_reason = None
+        if full_rebuild:
+            rebuild_reason = "full_rebuild_requested"
+        elif stored_signature is not None and stored_signature != self.signature:
+            rebuild_reason = "signature_changed"
+        elif stored_signature is None and state:
+            rebuild_reason = "signature_missing"
+        if rebuild_reason is not None:
+            logger.info(
+                "Index rebuild from scratch: reason={}, stored_signature={}, signature={}",
+                rebuild_reason,
+                stored_signature,
+                self.signature,
+            )
+            self.index.reset()
+            self.state_store.clear()
+            state = {}
+        self.state_store.set_signature(self.signature)
+
+        counts = {ADDED: 0, CHANGED: 0, REVID_ONLY: 0, UNCHANGED: 0}
+        inserted_nodes = 0
+        deleted_nodes = 0
+        checkpoints = 0
+        seen: set[str] = set()
+        batch: list[IndexDocument] = []
+        since_checkpoint = 0
+
+        def flush_batch() -> None:
+            nonlocal inserted_nodes, deleted_nodes, since_checkpoint
+            if not batch:
+                return
+            stale = [node_id for document in batch if document.doc_id in state for node_id in state[document.doc_id].node_ids]
+            if stale:
+                # Node ids are derived from doc_id, so old chunks must go before the new ones land.
+                self.index.delete_nodes(stale)
+                deleted_nodes += len(stale)
+            node_ids = self.index.add_documents(batch)
+            for document in batch:
+                ids = tuple(node_ids.get(document.doc_id, ()))
+                inserted_nodes += len(ids)
+                self.state_store.upsert(self._state_row(document, ids))
+            since_checkpoint += len(batch)
+            batch.clear()
+
+        def checkpoint() -> None:
+            nonlocal checkpoints, since_checkpoint
+            self.index.persist()
+            self.state_store.commit()
+            checkpoints += 1
+            since_checkpoint = 0
+
+        for document in tqdm(
+            self.corpus.iter_documents(),
+            desc="Index pages",
+            unit="page",
+            leave=True,
+            disable=not self.show_progress,
+        ):
+            seen.add(document.doc_id)
+            existing = state.get(document.doc_id)
+            change = evaluate_index_change(existing, document)
+            counts[change] += 1
+            if change == REVID_ONLY:
+                self.state_store.upsert(self._state_row(document, existing.node_ids))
+            elif change in (ADDED, CHANGED):
+                batch.append(document)
+                if len(batch) >= self.batch_size:
+                    flush_batch()
+                    if since_checkpoint >= self.checkpoint_every:
+                        checkpoint()
+        flush_batch()
+
+        removed = [row for doc_id, row in state.items() if doc_id not in seen]
+        removed_node_ids = [node_id for row in removed for node_id in row.node_ids]
+        if removed_node_ids:
+            self.index.delete_nodes(removed_node_ids)
+            deleted_nodes += len(removed_node_ids)
+        for row in removed:
+            self.state_store.delete(row.doc_id)
+        checkpoint()
+
+        report = IndexBuildReport(
+            persist_dir=self.persist_dir,
+            signature=self.signature,
+            rebuild_reason=rebuild_reason,
+            scanned_count=len(seen),
+            added_count=counts[ADDED],
+            changed_count=counts[CHANGED],
+            removed_count=len(removed),
+            revid_only_count=counts[REVID_ONLY],
+            unchanged_count=counts[UNCHANGED],
+            skipped_count=self.corpus.skipped_count,
+            inserted_node_count=inserted_nodes,
+            deleted_node_count=deleted_nodes,
+            checkpoint_count=checkpoints,
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+            generated_at=datetime.now(timezone.utc).isoformat(),
+        )
+        logger.info(
+            "Index build completed: persist_dir={}, added_count={}, changed_count={}, removed_count={}, unchanged_count={}, inserted_node_count={}, deleted_node_count={}",
+            report.persist_dir,
+            report.added_count,
+            report.changed_count,
+            report.removed_count,
+            report.unchanged_count,
+            report.inserted_node_count,
+            report.deleted_node_count,
+        )
+        return report
+
+    @staticmethod
+    def _state_row(document: IndexDocument, node_ids: tuple[str, ...]) -> IndexStateRow:
+        return IndexStateRow(
+            doc_id=document.doc_id,
+            revid=document.revid,
+            fingerprint=document.fingerprint,
+            node_ids=node_ids,
+            source_path=document.source_path,
+            indexed_at=datetime.now(timezone.utc).isoformat(),
+        )
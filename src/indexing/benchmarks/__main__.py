@@ -0,0 +1,33 @@
+import sys
+
+from src.indexing.benchmarks.ann_bench import run_ann_benchmark
+from src.indexing.benchmarks.embedding_bench import run_embedding_benchmark
+from src.indexing.benchmarks.quantization_bench import run_quantization_benchmark
+
+# python -m src.indexing.benchmarks [embedding|ann|quantization]
+if __name__ == "__main__":
+    suite = sys.argv[1] if len(sys.argv) > 1 else "embedding"
+    if suite == "embedding":
+        results_path = run_embedding_benchmark(
+            classified_root="artifacts/classified/wiki",
+            sample_size=512,
+            results_dir="artifacts/benchmarks",
+            seed=0,
+        )
+    elif suite == "ann":
+        results_path = run_ann_benchmark(
+            vector_dir="indexes/vector_store/default__vector_store.memmap",
+            scales=(1, 10),
+            nprobes=(1, 4, 8, 16, 32),
+            results_dir="artifacts/benchmarks",
+            seed=0,
+        )
+    elif suite == "quantization":
+        results_path = run_quantization_benchmark(
+            vector_dir="indexes/vector_store/default__vector_store.memmap",
+            results_dir="artifacts/benchmarks",
+            seed=0,
+        )
+    else:
+        raise ValueError(f"Unsupported benchmark suite: {suite}")
+    print(results_path)
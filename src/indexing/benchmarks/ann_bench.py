@@ -0,0 +1,134 @@
+import json
+import os
+import platform
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+
+from src.config.logger_config import logger
+from src.indexing.infrastructure.ivf_index import IvfConfig
+from src.indexing.infrastructure.memmap_vectors import MemmapVectorMatrix
+
+
+def load_corpus_vectors(vector_dir: str, synthetic_rows: int = 20_000, synthetic_dim: int = 256, seed: int = 0) -> np.ndarray:
+    """Vectors of the persisted index, or clustered synthetic vectors when there is none yet."""
+    if MemmapVectorMatrix.exists(vector_dir):
+        vectors = MemmapVectorMatrix.load(vector_dir).base_vectors
+        if vectors is not None and len(vectors):
+            return np.asarray(vectors, dtype=np.float32)
+    logger.info("No persisted vectors found, using synthetic clusters: vector_dir={}", vector_dir)
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(synthetic_rows // 100, 1), synthetic_dim)).astype(np.float32)
+    points = centers[rng.integers(0, len(centers), size=synthetic_rows)]
+    points += rng.normal(scale=0.35, size=points.shape).astype(np.float32)
+    return points
+
+
+def scale_vectors(vectors: np.ndarray, factor: int, noise: float, seed: int) -> np.ndarray:
+    # Growth is simulated with perturbed copies, which keeps the corpus's cluster structure.
+    rng = np.random.default_rng(seed)
+    copies = [vectors]
+    for _ in range(factor - 1):
+        copies.append(vectors + rng.normal(scale=noise, size=vectors.shape).astype(np.float32))
+    scaled = np.vstack(copies)
+    return scaled / np.linalg.norm(scaled, axis=1, keepdims=True)
+
+
+def _latency_ms(samples: list[float]) -> dict[str, float]:
+    values = np.asarray(samples) * 1000.0
+    return {"p50_ms": round(float(np.percentile(values, 50)), 3), "p99_ms": round(float(np.percentile(values, 99)), 3)}
+
+
+def run_ann_benchmark(
+    vector_dir: str = "indexes/vector_store/default__vector_store.memmap",
+    scales: tuple[int, ...] = (1, 10),
+    nprobes: tuple[int, ...] = (1, 4, 8, 16, 32),
+    top_k: int = 10,
+    query_count: int = 200,
+    ann: IvfConfig | None = None,
+    work_dir: str = "artifacts/benchmarks/work/ann",
+    results_dir: str = "artifacts/benchmarks",
+    seed: int = 0,
+) -> Path:
+    """Recall@k against exact search and p50/p99 latency for each nprobe, at each corpus scale."""
+    ann = ann or IvfConfig(min_rows=0, seed=seed)
+    base = load_corpus_vectors(vector_dir, seed=seed)
+    base = base / np.linalg.norm(base, axis=1, keepdims=True)
+    rng = np.random.default_rng(seed)
+    # Queries are perturbed corpus rows: close to real content without being exact duplicates.
+    query_rows = base[rng.integers(0, len(base), size=query_count)]
+    queries = query_rows + rng.normal(scale=0.02, size=query_rows.shape).astype(np.float32)
+
+    started_at = datetime.now(timezone.utc)
+    results: list[dict[str, Any]] = []
+    for factor in scales:
+        vectors = scale_vectors(base, factor, noise=0.02, seed=seed + factor)
+        scale_dir = Path(work_dir) / f"scale_{factor}"
+        shutil.rmtree(scale_dir, ignore_errors=True)
+        matrix = MemmapVectorMatrix(dtype="float32", ann=ann)
+        matrix.add([str(i) for i in range(len(vectors))], vectors)
+        build_started = perf_counter()
+        matrix.save(scale_dir)
+        build_seconds = perf_counter() - build_started
+        del vectors
+
+        exact_ids: list[set[str]] = []
+        timings: list[float] = []
+        for query in queries:
+            start = perf_counter()
+            ids, _ = matrix.query(query, top_k, nprobe=0)
+            timings.append(perf_counter() - start)
+            exact_ids.append(set(ids))
+        results.append(
+            {"scale": factor, "rows": len(matrix), "method": "exact", "nprobe": None, "recall_at_k": 1.0, **_latency_ms(timings)}
+        )
+        for nprobe in nprobes:
+            timings, recalls = [], []
+            for query, expected in zip(queries, exact_ids):
+                start = perf_counter()
+                ids, _ = matrix.query(query, top_k, nprobe=nprobe)
+                timings.append(perf_counter() - start)
+                recalls.append(len(expected & set(ids)) / max(len(expected), 1))
+            results.append(
+                {
+                    "scale": factor,
+                    "rows": len(matrix),
+                    "method": "ivf",
+                    "nprobe": nprobe,
+                    "nlist": ann.resolve_nlist(len(matrix)),
+                    "recall_at_k": round(float(np.mean(recalls)), 4),
+                    "build_seconds": round(build_seconds, 3),
+                    **_latency_ms(timings),
+                }
+            )
+        logger.info("ANN benchmark scale done: scale={}, rows={}", factor, len(matrix))
+        del matrix
+        shutil.rmtree(scale_dir, ignore_errors=True)
+
+    payload = {
+        "created_at": started_at.isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "vector_dir": vector_dir,
+            "corpus_rows": len(base),
+            "dim": int(base.shape[1]),
+            "top_k": top_k,
+            "query_count": query_count,
+            "ann": ann.to_dict(),
+            "seed": seed,
+        },
+        "results": results,
+    }
+    results_path = Path(results_dir) / f"ann_bench_{started_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    results_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    logger.info("ANN benchmark results written: results_path={}, case_count={}", str(results_path), len(results))
+    return results_path
@@ -0,0 +1,110 @@
+import json
+import os
+import platform
+import random
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from src.classification.benchmarks.suite import BenchmarkResult, peak_rss_mb
+from src.classification.benchmarks.synthetic_corpus import SyntheticCorpusConfig, SyntheticPageFactory
+from src.config.logger_config import logger
+from src.indexing.infrastructure.classified_corpus import ClassifiedCorpusReader
+from src.indexing.infrastructure.cpu_embedding import CpuEmbedding, CpuEmbeddingConfig
+
+DEFAULT_MODEL = "Qwen/Qwen3-Embedding-0.6B"
+
+
+def default_embedding_configs(model_name: str = DEFAULT_MODEL) -> tuple[tuple[str, CpuEmbeddingConfig], ...]:
+    processes = max(min((os.cpu_count() or 1) // 4, 4), 2)
+    return (
+        ("fixed_batch_torch", CpuEmbeddingConfig(model_name, backend="torch", max_batch_size=32, length_bucketing=False)),
+        ("bucketed_torch", CpuEmbeddingConfig(model_name, backend="torch")),
+        ("bucketed_torch_int8", CpuEmbeddingConfig(model_name, backend="torch-int8")),
+        ("bucketed_onnx", CpuEmbeddingConfig(model_name, backend="onnx")),
+        (f"bucketed_torch_{processes}proc", CpuEmbeddingConfig(model_name, backend="torch", num_processes=processes)),
+    )
+
+
+def sample_chunk_texts(
+    classified_root: str,
+    sample_size: int,
+    chunk_words: int = 180,
+    categories_path: str = "categories.json",
+    seed: int = 0,
+) -> list[str]:
+    """Chunk-sized texts from the classified corpus, or synthetic pages when it is empty."""
+    rng = random.Random(seed)
+    texts: list[str] = []
+    for document in ClassifiedCorpusReader(classified_root).iter_documents():
+        words = document.text.split()
+        texts.extend(" ".join(words[start : start + chunk_words]) for start in range(0, len(words), chunk_words))
+        if len(texts) >= sample_size * 4:
+            break
+    if not texts:
+        factory = SyntheticPageFactory(SyntheticCorpusConfig(categories_path=categories_path, seed=seed))
+        while len(texts) < sample_size:
+            _, doc = factory.make(len(texts) + 1)
+            words = doc.content.split()
+            texts.extend(" ".join(words[start : start + chunk_words]) for start in range(0, len(words), chunk_words))
+    rng.shuffle(texts)
+    return texts[:sample_size]
+
+
+def run_embedding_benchmark(
+    configs: tuple[tuple[str, CpuEmbeddingConfig], ...] | None = None,
+    classified_root: str = "artifacts/classified/wiki",
+    sample_size: int = 512,
+    results_dir: str = "artifacts/benchmarks",
+    categories_path: str = "categories.json",
+    seed: int = 0,
+) -> Path:
+    """Encode the same sample with every configuration and write throughput plus drift from the first config."""
+    configs = configs or default_embedding_configs()
+    texts = sample_chunk_texts(classified_root, sample_size, categories_path=categories_path, seed=seed)
+    started_at = datetime.now(timezone.utc)
+    results: list[BenchmarkResult] = []
+    reference: np.ndarray | None = None
+    for name, config in configs:
+        try:
+            embedding = CpuEmbedding(config)
+            token_count = sum(embedding.token_counts(texts))
+            embedding.get_text_embedding_batch(texts[: min(8, len(texts))])  # load weights / warm up
+            start = perf_counter()
+            vectors = np.asarray(embedding.get_text_embedding_batch(texts), dtype=np.float32)
+            elapsed = perf_counter() - start
+            embedding.close()
+        except Exception as exc:
+            # Optional backends (e.g. onnx without optimum installed) are reported, not fatal.
+            logger.warning("Embedding benchmark case failed: name={}, error={}", name, exc)
+            results.append(BenchmarkResult(name, len(texts), None, 0, 0.0, peak_rss_mb(), {"error": str(exc)}))
+            continue
+        if reference is None:
+            reference = vectors
+        extra = {
+            "config": config.to_dict(),
+            "token_count": token_count,
+            "tokens_per_sec": round(token_count / elapsed, 3) if elapsed > 0 else 0.0,
+            # Vectors are normalized, so the row-wise dot product is the cosine similarity.
+            "mean_cosine_to_reference": round(float(np.mean(np.sum(vectors * reference, axis=1))), 6),
+        }
+        results.append(BenchmarkResult(name, len(texts), None, len(texts), elapsed, peak_rss_mb(), extra))
+        logger.info("Embedding benchmark case done: name={}, texts_per_sec={}", name, round(len(texts) / elapsed, 3))
+
+    payload = {
+        "created_at": started_at.isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {"sample_size": len(texts), "classified_root": classified_root, "seed": seed},
+        "results": [result.to_dict() for result in results],
+    }
+    results_path = Path(results_dir) / f"embedding_bench_{started_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    results_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    logger.info("Embedding benchmark results written: results_path={}, case_count={}", str(results_path), len(results))
+    return results_path
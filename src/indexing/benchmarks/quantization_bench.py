@@ -0,0 +1,133 @@
+import json
+import os
+import platform
+import shutil
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+
+from src.config.logger_config import logger
+from src.indexing.benchmarks.ann_bench import load_corpus_vectors
+from src.indexing.infrastructure.memmap_vectors import MemmapVectorMatrix
+from src.indexing.infrastructure.quantization import QuantizationConfig
+
+
+@dataclass(frozen=True)
+class StorageVariant:
+    name: str
+    dtype: str = "float32"
+    quantization: QuantizationConfig | None = None
+
+
+def default_storage_variants(dim: int) -> list[StorageVariant]:
+    # PQ sizes: dim/8 and dim/16 sub-vectors, i.e. 32x and 64x smaller than float32 codes.
+    variants = [
+        StorageVariant("float32"),
+        StorageVariant("float16", dtype="float16"),
+        StorageVariant("int8_no_rescore", quantization=QuantizationConfig(kind="int8", rescore_factor=0)),
+        StorageVariant("int8_rescore4", quantization=QuantizationConfig(kind="int8", rescore_factor=4)),
+    ]
+    for divisor in (8, 16):
+        if dim % divisor == 0:
+            subvectors = dim // divisor
+            variants.append(
+                StorageVariant(
+                    f"pq{subvectors}_no_rescore",
+                    quantization=QuantizationConfig(kind="pq", pq_subvectors=subvectors, rescore_factor=0),
+                )
+            )
+            variants.append(
+                StorageVariant(
+                    f"pq{subvectors}_rescore10",
+                    quantization=QuantizationConfig(kind="pq", pq_subvectors=subvectors, rescore_factor=10),
+                )
+            )
+    return variants
+
+
+def run_quantization_benchmark(
+    vector_dir: str = "indexes/vector_store/default__vector_store.memmap",
+    variants: list[StorageVariant] | None = None,
+    top_k: int = 10,
+    query_count: int = 200,
+    work_dir: str = "artifacts/benchmarks/work/quantization",
+    results_dir: str = "artifacts/benchmarks",
+    seed: int = 0,
+) -> Path:
+    """Memory, latency and recall@k of each storage variant against exact float32 search."""
+    base = load_corpus_vectors(vector_dir, seed=seed)
+    base = base / np.linalg.norm(base, axis=1, keepdims=True)
+    variants = variants or default_storage_variants(int(base.shape[1]))
+    rng = np.random.default_rng(seed)
+    query_rows = base[rng.integers(0, len(base), size=query_count)]
+    queries = query_rows + rng.normal(scale=0.02, size=query_rows.shape).astype(np.float32)
+    ids = [str(i) for i in range(len(base))]
+
+    # Ground truth is a brute-force float32 scan, independent of the matrix code paths under test.
+    exact_ids = [set(np.argsort(-(base @ query), kind="stable")[:top_k].astype(str).tolist()) for query in queries]
+    float_bytes = int(base.astype(np.float32).nbytes)
+
+    started_at = datetime.now(timezone.utc)
+    results: list[dict[str, Any]] = []
+    for variant in variants:
+        variant_dir = Path(work_dir) / variant.name
+        shutil.rmtree(variant_dir, ignore_errors=True)
+        matrix = MemmapVectorMatrix(dtype=variant.dtype, quantization=variant.quantization)
+        matrix.add(ids, base)
+        build_started = perf_counter()
+        matrix.save(variant_dir)
+        build_seconds = perf_counter() - build_started
+
+        timings, recalls = [], []
+        for query, expected in zip(queries, exact_ids):
+            start = perf_counter()
+            found, _ = matrix.query(query, top_k)
+            timings.append(perf_counter() - start)
+            recalls.append(len(expected & set(found)) / max(len(expected), 1))
+        latencies = np.asarray(timings) * 1000.0
+        scanned = matrix.scan_nbytes
+        results.append(
+            {
+                "variant": variant.name,
+                "dtype": variant.dtype,
+                "quantization": variant.quantization.to_dict() if variant.quantization is not None else None,
+                "rows": len(matrix),
+                "scan_bytes": scanned,
+                "bytes_per_vector": round(scanned / max(len(matrix), 1), 2),
+                "compression_vs_float32": round(float_bytes / max(scanned, 1), 2),
+                "build_seconds": round(build_seconds, 3),
+                "recall_at_k": round(float(np.mean(recalls)), 4),
+                "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+                "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+            }
+        )
+        logger.info("Quantization benchmark variant done: variant={}, recall_at_k={}", variant.name, results[-1]["recall_at_k"])
+        del matrix
+        shutil.rmtree(variant_dir, ignore_errors=True)
+
+    payload = {
+        "created_at": started_at.isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "vector_dir": vector_dir,
+            "corpus_rows": len(base),
+            "dim": int(base.shape[1]),
+            "top_k": top_k,
+            "query_count": query_count,
+            "seed": seed,
+        },
+        "results": results,
+    }
+    results_path = Path(results_dir) / f"quantization_bench_{started_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    results_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    logger.info("Quantization benchmark results written: results_path={}, case_count={}", str(results_path), len(results))
+    return results_path
@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+
+from llama_index.core import Settings
+
+import src.config.settings  # noqa: F401
+from src.config.logger_config import logger
+from src.indexing.application.contracts import IndexBuildReport
+from src.indexing.application.workflows.incremental_index import IncrementalIndexBuilder
+from src.indexing.domain.change_policy import build_index_signature, build_node_set_signature
+from src.indexing.infrastructure.bm25_index import Bm25Index
+from src.indexing.infrastructure.classified_corpus import ClassifiedCorpusReader
+from src.indexing.infrastructure.index_state_store import SQLiteIndexStateStore
+from src.indexing.infrastructure.ivf_index import IvfConfig
+from src.indexing.infrastructure.llama_vector_index import LlamaVectorIndex
+from src.indexing.infrastructure.quantization import QuantizationConfig
+
+
+def run_build_index(
+    *,
+    classified_root: str = "artifacts/classified/wiki",
+    persist_dir: str = "indexes/vector_store",
+    bm25_dir: str = "indexes/vector_store/bm25",
+    state_db_path: str = "indexes/index_state.db",
+    output_report_path: str = "indexes/index_build_report.json",
+    chunk_size: int = 1024,
+    chunk_overlap: int = 200,
+    vector_dtype: str = "float32",
+    ann: IvfConfig | None = None,
+    quantization: QuantizationConfig | None = None,
+    include_redirects: bool = False,
+    batch_size: int = 32,
+    checkpoint_every: int = 1000,
+    full_rebuild: bool = False,
+    show_progress: bool = True,
+) -> IndexBuildReport:
+    """Embed the classified corpus into `persist_dir`, re-embedding only pages added or changed since the last run."""
+    embed_model_name = str(getattr(Settings.embed_model, "model_name", type(Settings.embed_model).__name__))
+    signature = build_index_signature(embed_model_name, chunk_size, chunk_overlap)
+    state_store = SQLiteIndexStateStore(state_db_path)
+    vector_index = LlamaVectorIndex(
+        persist_dir,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        vector_dtype=vector_dtype,
+        ann=ann,
+        quantization=quantization,
+    )
+    try:
+        builder = IncrementalIndexBuilder(
+            corpus=ClassifiedCorpusReader(classified_root, include_redirects=include_redirects),
+            index=vector_index,
+            state_store=state_store,
+            signature=signature,
+            persist_dir=persist_dir,
+            batch_size=batch_size,
+            checkpoint_every=checkpoint_every,
+            show_progress=show_progress,
+        )
+        report = builder.run(full_rebuild=full_rebuild)
+        node_set_signature = build_node_set_signature(signature, state_store.get_all().values())
+    finally:
+        state_store.close()
+        # Nothing below embeds; the embed model's worker pool would otherwise live until interpreter exit.
+        close_embed_model = getattr(Settings.embed_model, "close", None)
+        if callable(close_embed_model):
+            close_embed_model()
+
+    # BM25 is rebuilt from the docstore rather than patched: tokenizing every chunk takes seconds,
+    # embedding is what the incremental path saves. Comparing node-set signatures also catches a
+    # previous run that persisted the vectors but died before the BM25 save.
+    stored_source = Bm25Index.load(bm25_dir).source_signature if Bm25Index.exists(bm25_dir) else None
+    if stored_source != node_set_signature:
+        bm25 = Bm25Index.build(vector_index.iter_node_texts())
+        bm25.source_signature = node_set_signature
+        bm25.save(bm25_dir)
+
+    report_path = Path(output_report_path)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+    logger.info("Index build report written: path={}", str(report_path))
+    return report
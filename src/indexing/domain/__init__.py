@@ -0,0 +1 @@
+"""Domain layer for vector index builds."""
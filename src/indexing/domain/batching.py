@@ -0,0 +1,28 @@
+from collections.abc import Sequence
+
+
+def plan_token_batches(token_counts: Sequence[int], max_batch_tokens: int, max_batch_size: int) -> list[list[int]]:
+    """Group text positions into batches of similar length whose padded size stays within `max_batch_tokens`.
+
+    A batch costs `len(batch) * longest_text` tokens once padded, so texts are sorted by length and
+    packed greedily; a single text longer than the budget still gets a batch of its own.
+    """
+    if max_batch_tokens < 1:
+        raise ValueError(f"max_batch_tokens must be >= 1: {max_batch_tokens}")
+    if max_batch_size < 1:
+        raise ValueError(f"max_batch_size must be >= 1: {max_batch_size}")
+    order = sorted(range(len(token_counts)), key=lambda position: token_counts[position], reverse=True)
+    batches: list[list[int]] = []
+    current: list[int] = []
+    longest = 0
+    for position in order:
+        length = max(int(token_counts[position]), 1)
+        candidate_longest = max(longest, length)
+        if current and (len(current) >= max_batch_size or candidate_longest * (len(current) + 1) > max_batch_tokens):
+            batches.append(current)
+            current, candidate_longest = [], length
+        current.append(position)
+        longest = candidate_longest
+    if current:
+        batches.append(current)
+    return batches
@@ -0,0 +1,45 @@
+import hashlib
+import json
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from src.indexing.domain.models import IndexDocument, IndexStateRow
+
+ADDED = "added"
+CHANGED = "changed"
+REVID_ONLY = "revid_only"
+UNCHANGED = "unchanged"
+
+
+def compute_document_fingerprint(title: str, text: str, metadata: Mapping[str, Any]) -> str:
+    # Covers everything that ends up on the nodes; revid is left out so a null edit is not re-embedded.
+    normalized = (text or "").replace("\r\n", "\n").replace("\r", "\n").strip()
+    payload = json.dumps(
+        {"title": title, "text": normalized, "metadata": {k: v for k, v in metadata.items() if k != "revid"}},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def build_index_signature(embed_model_name: str, chunk_size: int, chunk_overlap: int) -> str:
+    """Settings that invalidate every stored embedding when they change."""
+    return f"embed_model={embed_model_name};chunk_size={chunk_size};chunk_overlap={chunk_overlap}"
+
+
+def build_node_set_signature(index_signature: str, rows: Iterable[IndexStateRow]) -> str:
+    """Identifies the indexed node set; indexes derived from the docstore (BM25) are stale when it differs."""
+    digest = hashlib.sha1(index_signature.encode("utf-8"))
+    for row in sorted(rows, key=lambda row: row.doc_id):
+        digest.update(json.dumps([row.doc_id, row.fingerprint, list(row.node_ids)], ensure_ascii=False).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def evaluate_index_change(existing: IndexStateRow | None, document: IndexDocument) -> str:
+    if existing is None:
+        return ADDED
+    if existing.fingerprint != document.fingerprint:
+        return CHANGED
+    if existing.revid != document.revid:
+        return REVID_ONLY
+    return UNCHANGED
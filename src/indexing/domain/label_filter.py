@@ -0,0 +1,31 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class LabelFilter:
+    """Restriction on classification labels stored with every node.
+
+    A node matches when its entity_type is one of `entity_types` (any, if empty) and, for every
+    group in `subtype_groups`, it carries at least one of the group's subtype tags.
+    """
+
+    entity_types: tuple[str, ...] = ()
+    subtype_groups: tuple[tuple[str, ...], ...] = ()
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.entity_types and not self.subtype_groups
+
+    def matches(self, metadata: Mapping[str, Any]) -> bool:
+        if self.entity_types and metadata.get("entity_type") not in self.entity_types:
+            return False
+        subtypes = set(metadata.get("subtypes") or ())
+        return all(subtypes.intersection(group) for group in self.subtype_groups)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "entity_types": list(self.entity_types),
+            "subtype_groups": [list(group) for group in self.subtype_groups],
+        }
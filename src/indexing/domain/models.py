@@ -0,0 +1,25 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class IndexDocument:
+    # One classified page as it is handed to the chunker/embedder.
+    doc_id: str
+    pageid: int | None
+    revid: int | None
+    title: str
+    text: str
+    fingerprint: str
+    source_path: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class IndexStateRow:
+    doc_id: str
+    revid: int | None
+    fingerprint: str
+    node_ids: tuple[str, ...]
+    source_path: str
+    indexed_at: str
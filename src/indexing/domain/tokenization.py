@@ -0,0 +1,26 @@
+import re
+
+# Latin words keep hyphenated / apostrophe compounds ("anti-red", "cat's") whole; CJK runs become bigrams.
+_TOKEN_PATTERN = re.compile(r"[0-9a-z]+(?:['\-][0-9a-z]+)*|[぀-ヿ㐀-䶿一-鿿豈-﫿]+")
+_CJK_PATTERN = re.compile(r"[぀-ヿ㐀-䶿一-鿿豈-﫿]")
+MAX_TOKEN_LENGTH = 32
+
+
+def tokenize(text: str) -> list[str]:
+    """Lexical terms for BM25: lowercase words, their hyphen parts, and CJK character bigrams."""
+    tokens: list[str] = []
+    for match in _TOKEN_PATTERN.finditer(text.lower()):
+        term = match.group(0)
+        if _CJK_PATTERN.match(term):
+            if len(term) == 1:
+                tokens.append(term)
+            else:
+                tokens.extend(term[position : position + 2] for position in range(len(term) - 1))
+            continue
+        if len(term) > MAX_TOKEN_LENGTH:
+            continue
+        tokens.append(term)
+        if "-" in term:
+            # "Anti-Red" is also matched by "anti red" and "red".
+            tokens.extend(part for part in term.split("-") if part)
+    return tokens
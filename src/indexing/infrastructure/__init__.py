@@ -0,0 +1 @@
+"""Infrastructure adapters for vector index builds."""
@@ -0,0 +1,206 @@
+import json
+import math
+import os
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.config.logger_config import logger
+from src.indexing.domain.label_filter import LabelFilter
+from src.indexing.domain.tokenization import tokenize
+
+_META_FILE = "meta.json"
+_GENERATION_KINDS = ("terms", "offsets", "docs", "tfs", "lengths", "ids", "labels")
+_MAX_TF = np.iinfo(np.uint16).max
+
+
+class Bm25Index:
+    """Okapi BM25 over node texts, stored as CSR postings in `.npy` files and opened with np.memmap.
+
+    `docs[offsets[t]:offsets[t + 1]]` / `tfs[...]` are the postings of the t-th term of the sorted
+    `terms` array; terms are looked up by binary search, so no vocabulary dict is ever built at query time.
+    """
+
+    def __init__(
+        self,
+        terms: np.ndarray,
+        offsets: np.ndarray,
+        docs: np.ndarray,
+        tfs: np.ndarray,
+        lengths: np.ndarray,
+        ids: np.ndarray,
+        labels: list[dict[str, Any]] | None = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> None:
+        self.terms = terms
+        self.offsets = offsets
+        self.docs = docs
+        self.tfs = tfs
+        self.lengths = lengths
+        self.ids = ids
+        self.k1 = k1
+        self.b = b
+        self.directory: Path | None = None
+        self.generation = 0
+        # Signature of the node set this index was built from; build_index rebuilds when it no longer matches.
+        self.source_signature: str | None = None
+        self._labels = labels
+        self._average_length = float(lengths.mean()) if len(lengths) else 0.0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(
+        cls,
+        documents: Iterable[tuple[str, str, Mapping[str, Any]]],
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> "Bm25Index":
+        """Index (node_id, text, metadata) triples; entity_type/subtypes are kept for label filters."""
+        term_ids: dict[str, int] = {}
+        posting_terms: list[np.ndarray] = []
+        posting_docs: list[np.ndarray] = []
+        posting_tfs: list[np.ndarray] = []
+        lengths: list[int] = []
+        ids: list[str] = []
+        labels: list[dict[str, Any]] = []
+        for position, (node_id, text, metadata) in enumerate(documents):
+            tokens = tokenize(text)
+            counts = Counter(tokens)
+            posting_terms.append(np.fromiter((term_ids.setdefault(term, len(term_ids)) for term in counts), dtype=np.int64))
+            posting_docs.append(np.full(len(counts), position, dtype=np.int32))
+            posting_tfs.append(np.fromiter(counts.values(), dtype=np.int64).clip(max=_MAX_TF).astype(np.uint16))
+            lengths.append(len(tokens))
+            ids.append(str(node_id))
+            labels.append({"entity_type": metadata.get("entity_type"), "subtypes": list(metadata.get("subtypes") or [])})
+
+        vocabulary = sorted(term_ids)
+        # First-seen term ids -> positions in the sorted vocabulary.
+        rank = np.empty(len(vocabulary), dtype=np.int64)
+        rank[[term_ids[term] for term in vocabulary]] = np.arange(len(vocabulary))
+        all_terms = rank[np.concatenate(posting_terms)] if posting_terms else np.zeros(0, dtype=np.int64)
+        all_docs = np.concatenate(posting_docs) if posting_docs else np.zeros(0, dtype=np.int32)
+        all_tfs = np.concatenate(posting_tfs) if posting_tfs else np.zeros(0, dtype=np.uint16)
+        order = np.argsort(all_terms, kind="stable")
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(all_terms, minlength=len(vocabulary)))
+        return cls(
+            terms=np.array(vocabulary, dtype=str),
+            offsets=offsets,
+            docs=all_docs[order],
+            tfs=all_tfs[order],
+            lengths=np.array(lengths, dtype=np.int32),
+            ids=np.array(ids, dtype=str),
+            labels=labels,
+            k1=k1,
+            b=b,
+        )
+
+    @classmethod
+    def exists(cls, directory: str | Path) -> bool:
+        return (Path(directory) / _META_FILE).exists()
+
+    @classmethod
+    def load(cls, directory: str | Path) -> "Bm25Index":
+        directory = Path(directory)
+        meta = json.loads((directory / _META_FILE).read_text(encoding="utf-8"))
+        generation = meta["generation"]
+        arrays = {
+            kind: np.load(directory / _generation_file(kind, generation, "npy"), mmap_mode="r")
+            for kind in ("terms", "offsets", "docs", "tfs", "lengths", "ids")
+        }
+        index = cls(**arrays, k1=meta["k1"], b=meta["b"])
+        index.directory = directory
+        index.generation = generation
+        index.source_signature = meta.get("source_signature")
+        return index
+
+    @property
+    def labels(self) -> list[dict[str, Any]]:
+        # Parsed on the first label-filtered query only.
+        if self._labels is None:
+            path = self.directory / _generation_file("labels", self.generation, "json")
+            self._labels = json.loads(path.read_text(encoding="utf-8"))
+        return self._labels
+
+    def query(self, text: str, top_k: int, label_filter: LabelFilter | None = None) -> tuple[list[str], list[float]]:
+        """Top-k node ids by BM25 score; nodes sharing no term with the query are never returned."""
+        if top_k <= 0 or len(self) == 0:
+            return [], []
+        scores = np.zeros(len(self), dtype=np.float32)
+        count = len(self)
+        for term in set(tokenize(text)):
+            position = int(np.searchsorted(self.terms, term))
+            if position >= len(self.terms) or self.terms[position] != term:
+                continue
+            start, end = int(self.offsets[position]), int(self.offsets[position + 1])
+            docs = np.asarray(self.docs[start:end])
+            tfs = np.asarray(self.tfs[start:end], dtype=np.float32)
+            idf = math.log(1.0 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * np.asarray(self.lengths[docs], dtype=np.float32) / self._average_length)
+            # Each document occurs once per term's postings, so fancy-index += is safe.
+            scores[docs] += idf * tfs * (self.k1 + 1.0) / (tfs + norm)
+        candidates = np.flatnonzero(scores > 0)
+        if label_filter is not None and not label_filter.is_empty:
+            labels = self.labels
+            candidates = candidates[[label_filter.matches(labels[position]) for position in candidates]]
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return np.asarray(self.ids[candidates]).astype(str).tolist(), scores[candidates].astype(float).tolist()
+
+    def save(self, directory: str | Path) -> None:
+        """Write a new generation of files, then swap meta.json to it (same scheme as MemmapVectorMatrix).
+
+        The previous generation is kept so a loaded index (which parses its labels lazily) keeps working;
+        generations older than that are removed.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        meta_path = directory / _META_FILE
+        stored = json.loads(meta_path.read_text(encoding="utf-8"))["generation"] if meta_path.exists() else 0
+        generation = max(stored, self.generation) + 1
+        for kind in ("terms", "offsets", "docs", "tfs", "lengths", "ids"):
+            np.save(directory / _generation_file(kind, generation, "npy"), np.asarray(getattr(self, kind)))
+        (directory / _generation_file("labels", generation, "json")).write_text(
+            json.dumps(self.labels, ensure_ascii=False), encoding="utf-8"
+        )
+        meta = {
+            "generation": generation,
+            "count": len(self),
+            "term_count": len(self.terms),
+            "k1": self.k1,
+            "b": self.b,
+            "source_signature": self.source_signature,
+        }
+        (directory / f"{_META_FILE}.tmp").write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(directory / f"{_META_FILE}.tmp", meta_path)
+        for path in directory.iterdir():
+            if path.name != _META_FILE and _file_generation(path.name) not in (None, generation, stored):
+                path.unlink(missing_ok=True)
+        self.directory = directory
+        self.generation = generation
+        logger.info(
+            "BM25 index saved: directory={}, count={}, term_count={}, generation={}",
+            str(directory),
+            len(self),
+            len(self.terms),
+            generation,
+        )
+
+
+def _generation_file(kind: str, generation: int, suffix: str) -> str:
+    return f"{kind}-{generation:06d}.{suffix}"
+
+
+def _file_generation(name: str) -> int | None:
+    stem, _, _ = name.partition(".")
+    kind, _, generation = stem.rpartition("-")
+    if kind not in _GENERATION_KINDS or not generation.isdigit():
+        return None
+    return int(generation)
@@ -0,0 +1,68 @@
+from collections.abc import Callable
+
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from pydantic import PrivateAttr
+
+from src.indexing.infrastructure.embedding_cache import EmbeddingCacheStore, embedding_text_hash
+
+
+class CachedEmbedding(BaseEmbedding):
+    """Embedding model wrapper that serves vectors from an EmbeddingCacheStore and only calls the model on misses."""
+
+    _inner: BaseEmbedding = PrivateAttr()
+    _cache: EmbeddingCacheStore = PrivateAttr()
+
+    def __init__(self, inner: BaseEmbedding, cache: EmbeddingCacheStore, **kwargs) -> None:
+        super().__init__(
+            model_name=inner.model_name,
+            embed_batch_size=inner.embed_batch_size,
+            callback_manager=inner.callback_manager,
+            **kwargs,
+        )
+        self._inner = inner
+        self._cache = cache
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedEmbedding"
+
+    @property
+    def cache(self) -> EmbeddingCacheStore:
+        return self._cache
+
+    def close(self) -> None:
+        """Release the wrapped model's workers (if it has any) and flush the cache; both reopen on next use."""
+        close_inner = getattr(self._inner, "close", None)
+        if callable(close_inner):
+            close_inner()
+        self._cache.close()
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        return self._cached([query], "query", lambda texts: [self._inner._get_query_embedding(texts[0])])[0]
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        return self._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self._cached([text], "text", self._inner._get_text_embeddings)[0]
+
+    def _get_text_embeddings(self, texts: list[str]) -> list[Embedding]:
+        return self._cached(texts, "text", self._inner._get_text_embeddings)
+
+    def _cached(self, texts: list[str], kind: str, compute: Callable[[list[str]], list[Embedding]]) -> list[Embedding]:
+        hashes = [embedding_text_hash(text, kind) for text in texts]
+        # The dimension is only known once the model has produced a vector; until then everything misses.
+        dim = self._cache.dimension_for(self.model_name)
+        cached = self._cache.get_many(self.model_name, dim, hashes) if dim is not None else {}
+        vectors: dict[str, Embedding] = {text_hash: vector.tolist() for text_hash, vector in cached.items()}
+
+        missing: dict[str, str] = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in vectors:
+                missing.setdefault(text_hash, text)
+        if missing:
+            computed = compute(list(missing.values()))
+            fresh = dict(zip(missing, computed))
+            self._cache.put_many(self.model_name, len(computed[0]), fresh)
+            vectors.update(fresh)
+        return [vectors[text_hash] for text_hash in hashes]
@@ -0,0 +1,94 @@
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from src.classification.infrastructure.sinks.linked_classified_sink import ClassifiedLabelOverlay
+from src.config.logger_config import logger
+from src.indexing.application.ports import IndexCorpusPort
+from src.indexing.domain.change_policy import compute_document_fingerprint
+from src.indexing.domain.models import IndexDocument
+
+
+class ClassifiedCorpusReader(IndexCorpusPort):
+    # Reads the classified tree (`<root>/<entity_type>/*.json`, copy or linked layout).
+    # A page that moved between entity types leaves its old copy behind, so the latest write per
+    # pageid wins: manifest order for linked pages (links share the source mtime), lstat mtime otherwise.
+    def __init__(self, classified_root: str, include_redirects: bool = False) -> None:
+        self.classified_root = Path(classified_root)
+        self.include_redirects = include_redirects
+        self.overlay = ClassifiedLabelOverlay(str(self.classified_root))
+        self._skipped_count = 0
+
+    @property
+    def skipped_count(self) -> int:
+        return self._skipped_count
+
+    def iter_documents(self) -> Iterator[IndexDocument]:
+        self._skipped_count = 0
+        seen: set[str] = set()
+        for entity_type, path in self._discover():
+            try:
+                payload = self.overlay.load_page(path)
+            except Exception as exc:
+                self._skipped_count += 1
+                logger.warning("Skip unreadable classified page: path={}, error={}", path, exc)
+                continue
+            document = self._to_document(entity_type, path, payload)
+            if document is None or document.doc_id in seen:
+                self._skipped_count += 1
+                continue
+            seen.add(document.doc_id)
+            yield document
+
+    def _discover(self) -> list[tuple[str, str]]:
+        entries: list[tuple[tuple[int, float], str, str]] = []
+        if not self.classified_root.exists():
+            return []
+        with os.scandir(self.classified_root) as entity_entries:
+            for entity_entry in entity_entries:
+                if not entity_entry.is_dir():
+                    continue
+                with os.scandir(entity_entry.path) as file_entries:
+                    for file_entry in file_entries:
+                        if file_entry.name.endswith(".json") and file_entry.is_file():
+                            entries.append((self._recency(file_entry), entity_entry.name, file_entry.path))
+        entries.sort(key=lambda entry: (-entry[0][0], -entry[0][1], entry[2]))
+        return [(entity_type, path) for _, entity_type, path in entries]
+
+    def _recency(self, file_entry: os.DirEntry) -> tuple[int, float]:
+        # Manifest-tracked pages rank ahead of untracked copies and are ordered by manifest position.
+        sequence = self.overlay.sequence_for(file_entry.path)
+        if sequence is not None:
+            return 1, float(sequence)
+        return 0, file_entry.stat(follow_symlinks=False).st_mtime
+
+    def _to_document(self, entity_type: str, path: str, payload: dict[str, Any]) -> IndexDocument | None:
+        if payload.get("is_redirect") and not self.include_redirects:
+            return None
+        text = str(payload.get("content") or "").strip()
+        if not text:
+            return None
+        pageid = payload.get("pageid")
+        title = str(payload.get("title") or Path(path).stem)
+        doc_id = str(pageid) if pageid is not None else str(payload.get("doc_id") or title)
+        revid = payload.get("revid")
+        metadata = {
+            "pageid": pageid,
+            "title": title,
+            "entity_type": entity_type,
+            "subtypes": list(payload.get("subtypes") or []),
+            "categories": list(payload.get("categories") or []),
+            "canonical_url": payload.get("canonical_url"),
+            "revid": revid,
+        }
+        return IndexDocument(
+            doc_id=doc_id,
+            pageid=int(pageid) if pageid is not None else None,
+            revid=int(revid) if revid is not None else None,
+            title=title,
+            text=text,
+            fingerprint=compute_document_fingerprint(title, text, metadata),
+            source_path=path,
+            metadata=metadata,
+        )
@@ -0,0 +1,229 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from multiprocessing import get_context
+from typing import Any
+
+import numpy as np
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from pydantic import PrivateAttr
+
+from src.config.logger_config import logger
+from src.indexing.domain.batching import plan_token_batches
+
+EMBEDDING_BACKENDS = ("torch", "torch-int8", "onnx")
+# Backends whose vectors differ enough from fp32 torch that cached/indexed vectors must not be mixed.
+_LOSSY_BACKENDS = ("torch-int8",)
+
+
+def detect_device(preferred: str | None = None) -> str:
+    """Resolve "auto" (or None) to cuda, mps or cpu depending on what torch can see."""
+    requested = (preferred or "auto").lower()
+    if requested != "auto":
+        return requested
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    if torch.cuda.is_available():
+        return "cuda"
+    mps = getattr(torch.backends, "mps", None)
+    if mps is not None and mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+@dataclass(frozen=True)
+class CpuEmbeddingConfig:
+    model_name: str
+    backend: str = "torch"
+    # Padded tokens per forward pass; bounds activation memory instead of a fixed text count.
+    max_batch_tokens: int = 16_384
+    max_batch_size: int = 64
+    max_length: int = 512
+    length_bucketing: bool = True
+    num_processes: int = 1
+    threads_per_process: int | None = None
+
+    @property
+    def embedding_identity(self) -> str:
+        return f"{self.model_name}@{self.backend}" if self.backend in _LOSSY_BACKENDS else self.model_name
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "model_name": self.model_name,
+            "backend": self.backend,
+            "max_batch_tokens": self.max_batch_tokens,
+            "max_batch_size": self.max_batch_size,
+            "max_length": self.max_length,
+            "length_bucketing": self.length_bucketing,
+            "num_processes": self.num_processes,
+            "threads_per_process": self.threads_per_process,
+        }
+
+
+class SentenceTransformerEncoder:
+    # The tokenizer is loaded eagerly for batch planning; the model only when something is encoded.
+    # CpuEmbedding with a pool sends every encode to the workers, so its own encoder never loads the weights.
+    def __init__(self, config: CpuEmbeddingConfig) -> None:
+        if config.backend not in EMBEDDING_BACKENDS:
+            raise ValueError(f"Unsupported embedding backend: {config.backend}")
+        from transformers import AutoTokenizer
+
+        self.config = config
+        self.tokenizer = AutoTokenizer.from_pretrained(config.model_name)
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = self._load_model()
+        return self._model
+
+    def _load_model(self):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if self.config.threads_per_process:
+            torch.set_num_threads(self.config.threads_per_process)
+        if self.config.backend == "onnx":
+            # Needs optimum[onnxruntime]; the ONNX graph is exported on first load when the repo has none.
+            model = SentenceTransformer(self.config.model_name, device="cpu", backend="onnx")
+        else:
+            model = SentenceTransformer(self.config.model_name, device="cpu")
+            if self.config.backend == "torch-int8":
+                torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        model.max_seq_length = self.config.max_length
+        logger.info(
+            "Embedding model loaded: model_name={}, backend={}, threads={}",
+            self.config.model_name,
+            self.config.backend,
+            torch.get_num_threads(),
+        )
+        return model
+
+    def token_counts(self, texts: list[str]) -> list[int]:
+        encoded = self.tokenizer(texts, add_special_tokens=True, truncation=True, max_length=self.config.max_length)
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def plan_batches(self, texts: list[str]) -> list[list[int]]:
+        if not self.config.length_bucketing:
+            size = self.config.max_batch_size
+            return [list(range(start, min(start + size, len(texts)))) for start in range(0, len(texts), size)]
+        return plan_token_batches(self.token_counts(texts), self.config.max_batch_tokens, self.config.max_batch_size)
+
+    def encode_batch(self, texts: list[str], prompt_name: str | None) -> np.ndarray:
+        model = self.model
+        return model.encode(
+            texts,
+            batch_size=len(texts),
+            prompt_name=prompt_name if prompt_name in (model.prompts or {}) else None,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+
+    def encode(self, texts: list[str], prompt_name: str | None) -> np.ndarray:
+        batches = self.plan_batches(texts)
+        results: list[np.ndarray | None] = [None] * len(texts)
+        for batch in batches:
+            vectors = self.encode_batch([texts[position] for position in batch], prompt_name)
+            for position, vector in zip(batch, vectors):
+                results[position] = vector
+        return np.vstack(results) if results else np.zeros((0, 0), dtype=np.float32)
+
+
+_worker_encoder: SentenceTransformerEncoder | None = None
+
+
+def _init_worker(config: CpuEmbeddingConfig) -> None:
+    global _worker_encoder
+    _worker_encoder = SentenceTransformerEncoder(config)
+
+
+def _encode_in_worker(texts: list[str], prompt_name: str | None) -> np.ndarray:
+    return _worker_encoder.encode_batch(texts, prompt_name)
+
+
+class CpuEmbedding(BaseEmbedding):
+    """Sentence-transformers embedding for CPU nodes: token-budgeted length buckets, optional int8/ONNX, optional process pool."""
+
+    _config: CpuEmbeddingConfig = PrivateAttr()
+    _encoder: SentenceTransformerEncoder = PrivateAttr()
+    _pool: ProcessPoolExecutor | None = PrivateAttr(default=None)
+
+    def __init__(self, config: CpuEmbeddingConfig, embed_batch_size: int = 256, **kwargs) -> None:
+        # model_name doubles as the cache/index identity, so lossy backends get their own.
+        super().__init__(model_name=config.embedding_identity, embed_batch_size=embed_batch_size, **kwargs)
+        if config.num_processes > 1 and config.threads_per_process is None:
+            config = replace(config, threads_per_process=max((os.cpu_count() or 1) // config.num_processes, 1))
+        self._config = config
+        self._encoder = SentenceTransformerEncoder(config)
+        self._pool = None
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CpuEmbedding"
+
+    def token_counts(self, texts: list[str]) -> list[int]:
+        return self._encoder.token_counts(texts)
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        return self._encode([query], "query")[0]
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        return self._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self._get_text_embeddings([text])[0]
+
+    def _get_text_embeddings(self, texts: list[str]) -> list[Embedding]:
+        return self._encode(texts, "document")
+
+    def _encode(self, texts: list[str], prompt_name: str) -> list[Embedding]:
+        if self._config.num_processes <= 1:
+            return self._encoder.encode(texts, prompt_name).tolist()
+        # Even single queries go to the pool: encoding here would load an extra copy of the weights.
+        batches = self._encoder.plan_batches(texts)
+        pool = self._get_pool()
+        futures = [pool.submit(_encode_in_worker, [texts[position] for position in batch], prompt_name) for batch in batches]
+        results: list[Embedding | None] = [None] * len(texts)
+        for batch, future in zip(batches, futures):
+            for position, vector in zip(batch, future.result()):
+                results[position] = vector.tolist()
+        return results
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a process that already holds torch thread pools can deadlock.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._config.num_processes,
+                mp_context=get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._config,),
+            )
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def build_embed_model(
+    model_name: str,
+    device: str | None = None,
+    backend: str = "torch",
+    num_processes: int = 1,
+    **config_kwargs: Any,
+) -> BaseEmbedding:
+    """Pick the embedding backend for this node: HuggingFaceEmbedding on an accelerator, CpuEmbedding otherwise."""
+    resolved = detect_device(device)
+    if resolved != "cpu":
+        from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+        logger.info("Embedding device selected: device={}, model_name={}", resolved, model_name)
+        return HuggingFaceEmbedding(model_name=model_name, device=resolved)
+    config = CpuEmbeddingConfig(model_name=model_name, backend=backend, num_processes=num_processes, **config_kwargs)
+    logger.info("Embedding device selected: device=cpu, config={}", config.to_dict())
+    return CpuEmbedding(config)
@@ -0,0 +1,282 @@
+import hashlib
+import sqlite3
+import threading
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+import numpy as np
+
+from src.config.logger_config import logger
+
+_LOOKUP_CHUNK = 500
+
+
+def embedding_text_hash(text: str, kind: str = "text") -> str:
+    # Query and document embeddings of the same string differ for instruction-tuned models.
+    normalized = (text or "").replace("\r\n", "\n").replace("\r", "\n").strip()
+    return hashlib.sha256(f"{kind}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+class _VectorFile:
+    # Fixed-width float32 rows in a file that grows by doubling; rows are addressed by slot.
+    def __init__(self, path: Path, dim: int, capacity: int) -> None:
+        self.path = path
+        self.dim = dim
+        self.capacity = 0
+        self.array: np.memmap | None = None
+        self.ensure_capacity(capacity)
+
+    def ensure_capacity(self, capacity: int) -> None:
+        if capacity <= self.capacity and self.array is not None:
+            return
+        existing_rows = self.path.stat().st_size // (self.dim * 4) if self.path.exists() else 0
+        # Never shrink: rows past the requested capacity may still be referenced.
+        capacity = max(capacity, self.capacity, existing_rows, 1)
+        if self.array is not None:
+            self.array.flush()
+            self.array = None
+        with self.path.open("ab") as fp:
+            fp.truncate(capacity * self.dim * 4)
+        self.capacity = capacity
+        self.array = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def flush(self) -> None:
+        if self.array is not None:
+            self.array.flush()
+
+
+class EmbeddingCacheStore:
+    """Disk-backed embedding cache: SQLite maps (model, dim, text hash) to a row of a memory-mapped vector file.
+
+    Each (model, dim) pair gets its own vector file bounded by `max_bytes`; when it is full the
+    least recently used entries are evicted and their rows reused. Nothing touches disk until the
+    first lookup or write, and calls are serialized so one store can back a model shared across threads.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 2 * 1024**3) -> None:
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be > 0: {max_bytes}")
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hit_count = 0
+        self.miss_count = 0
+        self.evicted_count = 0
+        self._files: dict[tuple[str, int], _VectorFile] = {}
+        self._lock = threading.RLock()
+        self._db: sqlite3.Connection | None = None
+        self._clock = 0
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Access is serialized by self._lock, so the connection may follow the caller's thread.
+            conn = sqlite3.connect(str(self.cache_dir / "embedding_cache.db"), check_same_thread=False)
+            try:
+                self._ensure_schema(conn)
+                row = conn.execute("SELECT COALESCE(MAX(last_used), 0) FROM entries").fetchone()
+            except Exception:
+                conn.close()
+                raise
+            self._clock = int(row[0])
+            self._db = conn
+        return self._db
+
+    @staticmethod
+    def _ensure_schema(conn: sqlite3.Connection) -> None:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS vector_files (
+                model TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                file_name TEXT NOT NULL,
+                next_slot INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (model, dim)
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                model TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                text_hash TEXT NOT NULL,
+                slot INTEGER NOT NULL,
+                last_used INTEGER NOT NULL,
+                PRIMARY KEY (model, dim, text_hash)
+            )
+            """
+        )
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_entries_lru ON entries(model, dim, last_used)")
+        conn.commit()
+
+    def slot_limit(self, dim: int) -> int:
+        return max(self.max_bytes // (dim * 4), 1)
+
+    def dimension_for(self, model: str) -> int | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT dim FROM vector_files WHERE model = ? ORDER BY rowid DESC LIMIT 1", (model,)
+            ).fetchone()
+        return int(row[0]) if row else None
+
+    def entry_count(self, model: str, dim: int) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM entries WHERE model = ? AND dim = ?", (model, dim)).fetchone()
+        return int(row[0])
+
+    def get_many(self, model: str, dim: int, text_hashes: Sequence[str]) -> dict[str, np.ndarray]:
+        with self._lock:
+            return self._get_many(model, dim, text_hashes)
+
+    def put_many(self, model: str, dim: int, vectors: Mapping[str, Sequence[float] | np.ndarray]) -> None:
+        with self._lock:
+            self._put_many(model, dim, vectors)
+
+    def close(self) -> None:
+        with self._lock:
+            for vector_file in self._files.values():
+                vector_file.flush()
+            self._files.clear()
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
+        logger.info(
+            "Embedding cache closed: cache_dir={}, hit_count={}, miss_count={}, evicted_count={}",
+            str(self.cache_dir),
+            self.hit_count,
+            self.miss_count,
+            self.evicted_count,
+        )
+
+    def _get_many(self, model: str, dim: int, text_hashes: Sequence[str]) -> dict[str, np.ndarray]:
+        unique = list(dict.fromkeys(text_hashes))
+        if not unique or self._file_row(model, dim) is None:
+            self.miss_count += len(unique)
+            return {}
+        vectors = self._vector_file(model, dim).array
+        found: dict[str, np.ndarray] = {}
+        for start in range(0, len(unique), _LOOKUP_CHUNK):
+            chunk = unique[start : start + _LOOKUP_CHUNK]
+            rows = self._conn.execute(
+                f"SELECT text_hash, slot FROM entries WHERE model = ? AND dim = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                (model, dim, *chunk),
+            ).fetchall()
+            for text_hash, slot in rows:
+                found[text_hash] = np.array(vectors[slot])
+        if found:
+            self._clock += 1
+            self._conn.executemany(
+                "UPDATE entries SET last_used = ? WHERE model = ? AND dim = ? AND text_hash = ?",
+                [(self._clock, model, dim, text_hash) for text_hash in found],
+            )
+            self._conn.commit()
+        self.hit_count += len(found)
+        self.miss_count += len(unique) - len(found)
+        return found
+
+    def _put_many(self, model: str, dim: int, vectors: Mapping[str, Sequence[float] | np.ndarray]) -> None:
+        if not vectors:
+            return
+        limit = self.slot_limit(dim)
+        items = list(vectors.items())[-limit:]
+        if self._file_row(model, dim) is None:
+            self._conn.execute(
+                "INSERT INTO vector_files (model, dim, file_name, next_slot) VALUES (?, ?, ?, 0)",
+                (model, dim, f"vectors_{hashlib.sha1(model.encode('utf-8')).hexdigest()[:16]}_{dim}.f32"),
+            )
+        existing = self._existing_slots(model, dim, [text_hash for text_hash, _ in items])
+        new_hashes = [text_hash for text_hash, _ in items if text_hash not in existing]
+        allocated = self._allocate_slots(model, dim, len(new_hashes), limit, keep=set(existing))
+        slots = dict(existing)
+        slots.update(zip(new_hashes, allocated))
+        if len(allocated) < len(new_hashes):
+            # Slots leaked by an interrupted write cannot be evicted; leave the overflow uncached.
+            logger.warning(
+                "Embedding cache has no free slots, skipping vectors: model={}, dim={}, skipped_count={}",
+                model,
+                dim,
+                len(new_hashes) - len(allocated),
+            )
+            items = [(text_hash, vector) for text_hash, vector in items if text_hash in slots]
+
+        # Evicted rows are released before their slots are overwritten; a crash in between only leaks slots.
+        self._conn.commit()
+        if not items:
+            return
+
+        vector_file = self._vector_file(model, dim)
+        needed = max(slots.values()) + 1
+        if needed > vector_file.capacity:
+            vector_file.ensure_capacity(min(max(needed, vector_file.capacity * 2), limit))
+        for text_hash, vector in items:
+            vector_file.array[slots[text_hash]] = np.asarray(vector, dtype=np.float32)
+        # Vectors reach the file before the rows that point at them are committed.
+        vector_file.flush()
+        self._clock += 1
+        self._conn.executemany(
+            """
+            INSERT INTO entries (model, dim, text_hash, slot, last_used) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(model, dim, text_hash) DO UPDATE SET slot = excluded.slot, last_used = excluded.last_used
+            """,
+            [(model, dim, text_hash, slots[text_hash], self._clock) for text_hash, _ in items],
+        )
+        self._conn.commit()
+
+    def _file_row(self, model: str, dim: int) -> tuple[str, int] | None:
+        return self._conn.execute(
+            "SELECT file_name, next_slot FROM vector_files WHERE model = ? AND dim = ?", (model, dim)
+        ).fetchone()
+
+    def _vector_file(self, model: str, dim: int) -> _VectorFile:
+        vector_file = self._files.get((model, dim))
+        if vector_file is None:
+            file_name, next_slot = self._file_row(model, dim)
+            capacity = min(max(next_slot, 1024), self.slot_limit(dim))
+            vector_file = _VectorFile(self.cache_dir / file_name, dim, capacity=capacity)
+            self._files[(model, dim)] = vector_file
+        return vector_file
+
+    def _existing_slots(self, model: str, dim: int, text_hashes: list[str]) -> dict[str, int]:
+        slots: dict[str, int] = {}
+        for start in range(0, len(text_hashes), _LOOKUP_CHUNK):
+            chunk = text_hashes[start : start + _LOOKUP_CHUNK]
+            slots.update(
+                self._conn.execute(
+                    f"SELECT text_hash, slot FROM entries WHERE model = ? AND dim = ? AND text_hash IN ({','.join('?' * len(chunk))})",
+                    (model, dim, *chunk),
+                ).fetchall()
+            )
+        return slots
+
+    def _allocate_slots(self, model: str, dim: int, count: int, limit: int, keep: set[str]) -> list[int]:
+        if count == 0:
+            return []
+        _, next_slot = self._file_row(model, dim)
+        fresh = min(count, limit - next_slot)
+        slots = list(range(next_slot, next_slot + fresh))
+        self._conn.execute(
+            "UPDATE vector_files SET next_slot = ? WHERE model = ? AND dim = ?", (next_slot + fresh, model, dim)
+        )
+        missing = count - len(slots)
+        if missing > 0:
+            slots.extend(self._evict(model, dim, missing, keep))
+        return slots
+
+    def _evict(self, model: str, dim: int, count: int, keep: set[str]) -> list[int]:
+        victims = [
+            (text_hash, slot)
+            for text_hash, slot in self._conn.execute(
+                "SELECT text_hash, slot FROM entries WHERE model = ? AND dim = ? ORDER BY last_used LIMIT ?",
+                (model, dim, count + len(keep)),
+            )
+            if text_hash not in keep
+        ][:count]
+        self._conn.executemany(
+            "DELETE FROM entries WHERE model = ? AND dim = ? AND text_hash = ?",
+            [(model, dim, text_hash) for text_hash, _ in victims],
+        )
+        self.evicted_count += len(victims)
+        return [slot for _, slot in victims]
@@ -0,0 +1,100 @@
+import json
+import sqlite3
+from pathlib import Path
+
+from src.indexing.application.ports import IndexStatePort
+from src.indexing.domain.models import IndexStateRow
+
+SIGNATURE_KEY = "index_signature"
+
+
+class SQLiteIndexStateStore(IndexStatePort):
+    # Writes are staged in one open transaction; commit() is driven by the builder's checkpoints.
+    def __init__(self, db_path: str) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        try:
+            self._ensure_schema()
+        except Exception:
+            self._conn.close()
+            raise
+
+    def _ensure_schema(self) -> None:
+        cur = self._conn.cursor()
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS index_state (
+                doc_id TEXT PRIMARY KEY,
+                last_revid INTEGER,
+                fingerprint TEXT NOT NULL,
+                node_ids TEXT NOT NULL,
+                source_path TEXT NOT NULL,
+                indexed_at TEXT NOT NULL
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS index_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get_all(self) -> dict[str, IndexStateRow]:
+        rows = self._conn.execute(
+            "SELECT doc_id, last_revid, fingerprint, node_ids, source_path, indexed_at FROM index_state"
+        )
+        return {
+            doc_id: IndexStateRow(
+                doc_id=doc_id,
+                revid=last_revid,
+                fingerprint=fingerprint,
+                node_ids=tuple(json.loads(node_ids)),
+                source_path=source_path,
+                indexed_at=indexed_at,
+            )
+            for doc_id, last_revid, fingerprint, node_ids, source_path, indexed_at in rows
+        }
+
+    def upsert(self, row: IndexStateRow) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO index_state (doc_id, last_revid, fingerprint, node_ids, source_path, indexed_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(doc_id) DO UPDATE SET
+                last_revid = excluded.last_revid,
+                fingerprint = excluded.fingerprint,
+                node_ids = excluded.node_ids,
+                source_path = excluded.source_path,
+                indexed_at = excluded.indexed_at
+            """,
+            (row.doc_id, row.revid, row.fingerprint, json.dumps(list(row.node_ids)), row.source_path, row.indexed_at),
+        )
+
+    def delete(self, doc_id: str) -> None:
+        self._conn.execute("DELETE FROM index_state WHERE doc_id = ?", (doc_id,))
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM index_state")
+
+    def get_signature(self) -> str | None:
+        row = self._conn.execute("SELECT value FROM index_meta WHERE key = ?", (SIGNATURE_KEY,)).fetchone()
+        return row[0] if row else None
+
+    def set_signature(self, signature: str) -> None:
+        self._conn.execute(
+            "INSERT INTO index_meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (SIGNATURE_KEY, signature),
+        )
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def close(self) -> None:
+        # Uncommitted rows belong to an index that was never persisted; drop them.
+        self._conn.rollback()
+        self._conn.close()
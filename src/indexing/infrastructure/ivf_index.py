@@ -0,0 +1,121 @@
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+_ASSIGN_BLOCK = 65_536
+
+
+@dataclass(frozen=True)
+class IvfConfig:
+    # nlist=None picks ~4*sqrt(N) lists, which keeps rows scanned per probe around sqrt(N)/4.
+    nlist: int | None = None
+    nprobe: int = 8
+    # Below this many rows exact search is already fast and no IVF files are written.
+    min_rows: int = 20_000
+    train_sample: int = 100_000
+    iterations: int = 15
+    seed: int = 0
+
+    def resolve_nlist(self, row_count: int) -> int:
+        nlist = self.nlist or int(4 * math.sqrt(row_count))
+        return max(1, min(nlist, row_count))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "min_rows": self.min_rows,
+            "train_sample": self.train_sample,
+            "iterations": self.iterations,
+            "seed": self.seed,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "IvfConfig":
+        return cls(**payload)
+
+
+class IvfIndex:
+    """Inverted-file index over normalized rows: spherical k-means centroids plus rows grouped per list.
+
+    `rows[offsets[i]:offsets[i + 1]]` are the matrix rows assigned to centroid i.
+    """
+
+    def __init__(self, centroids: np.ndarray, offsets: np.ndarray, rows: np.ndarray, trained_count: int) -> None:
+        self.centroids = centroids
+        self.offsets = offsets
+        self.rows = rows
+        # Row count the centroids were trained on; see needs_retrain().
+        self.trained_count = trained_count
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, config: IvfConfig) -> "IvfIndex":
+        count = len(vectors)
+        nlist = config.resolve_nlist(count)
+        rng = np.random.default_rng(config.seed)
+        sample_size = min(count, max(config.train_sample, nlist))
+        sample_rows = np.sort(rng.choice(count, size=sample_size, replace=False))
+        sample = np.asarray(vectors[sample_rows], dtype=np.float32)
+
+        centroids = sample[rng.choice(sample_size, size=nlist, replace=False)].copy()
+        for _ in range(config.iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(assignment, kind="stable")
+            sizes = np.bincount(assignment, minlength=nlist)
+            starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+            sums = np.zeros_like(centroids)
+            filled = sizes > 0
+            sums[filled] = np.add.reduceat(sample[order], starts[filled], axis=0)
+            empty = sizes == 0
+            # Empty lists are re-seeded from random sample rows instead of being dropped.
+            sums[empty] = sample[rng.choice(sample_size, size=int(empty.sum()), replace=True)]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.where(norms == 0, 1.0, norms)
+
+        return cls.assign(vectors, centroids.astype(np.float32), trained_count=count)
+
+    @classmethod
+    def assign(cls, vectors: np.ndarray, centroids: np.ndarray, trained_count: int) -> "IvfIndex":
+        """Group rows under existing centroids; much cheaper than build() when the corpus barely moved."""
+        count = len(vectors)
+        nlist = len(centroids)
+        assignment = np.empty(count, dtype=np.int32)
+        for start in range(0, count, _ASSIGN_BLOCK):
+            block = np.asarray(vectors[start : start + _ASSIGN_BLOCK], dtype=np.float32)
+            assignment[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        rows = np.argsort(assignment, kind="stable").astype(np.int64)
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(assignment, minlength=nlist))
+        return cls(centroids, offsets, rows, trained_count)
+
+    def needs_retrain(self, row_count: int) -> bool:
+        return not self.trained_count / 2 <= row_count <= self.trained_count * 2
+
+    def candidate_rows(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Matrix rows in the `nprobe` lists whose centroids are closest to the (normalized) query."""
+        nprobe = max(1, min(nprobe, self.nlist))
+        scores = self.centroids @ query
+        lists = np.argpartition(-scores, nprobe - 1)[:nprobe] if nprobe < self.nlist else np.arange(self.nlist)
+        return np.concatenate([self.rows[self.offsets[i] : self.offsets[i + 1]] for i in lists])
+
+    def save(self, directory: Path, suffix: str) -> None:
+        np.save(directory / f"ivf_trained-{suffix}.npy", np.array([self.trained_count], dtype=np.int64))
+        np.save(directory / f"ivf_centroids-{suffix}.npy", self.centroids)
+        np.save(directory / f"ivf_offsets-{suffix}.npy", self.offsets)
+        np.save(directory / f"ivf_rows-{suffix}.npy", self.rows)
+
+    @classmethod
+    def load(cls, directory: Path, suffix: str) -> "IvfIndex":
+        return cls(
+            centroids=np.load(directory / f"ivf_centroids-{suffix}.npy"),
+            offsets=np.load(directory / f"ivf_offsets-{suffix}.npy"),
+            rows=np.load(directory / f"ivf_rows-{suffix}.npy", mmap_mode="r"),
+            trained_count=int(np.load(directory / f"ivf_trained-{suffix}.npy")[0]),
+        )
@@ -0,0 +1,95 @@
+from collections.abc import Iterator, Sequence
+from typing import Any
+from pathlib import Path
+
+from llama_index.core import Document, StorageContext, VectorStoreIndex, load_index_from_storage
+from llama_index.core.node_parser import SentenceSplitter
+
+from src.config.logger_config import logger
+from src.indexing.application.ports import VectorIndexPort
+from src.indexing.domain.models import IndexDocument
+from src.indexing.infrastructure.ivf_index import IvfConfig
+from src.indexing.infrastructure.memmap_vector_store import MemmapVectorStore, load_storage_context
+from src.indexing.infrastructure.quantization import QuantizationConfig
+
+# Kept on the nodes for filtering/citations but not embedded or shown to the LLM.
+EMBED_EXCLUDED_METADATA = ["pageid", "revid", "canonical_url", "categories", "subtypes"]
+LLM_EXCLUDED_METADATA = ["pageid", "revid", "canonical_url"]
+
+
+def chunk_node_id(doc_id: str, position: int) -> str:
+    return f"{doc_id}-{position}"
+
+
+class LlamaVectorIndex(VectorIndexPort):
+    # Wraps the VectorStoreIndex that build_query_engine loads from `persist_dir`.
+    def __init__(
+        self,
+        persist_dir: str,
+        chunk_size: int = 1024,
+        chunk_overlap: int = 200,
+        vector_dtype: str = "float32",
+        ann: IvfConfig | None = None,
+        quantization: QuantizationConfig | None = None,
+    ) -> None:
+        self.persist_dir = Path(persist_dir)
+        self.vector_dtype = vector_dtype
+        self.ann = ann
+        self.quantization = quantization
+        # Deterministic node ids: re-inserting a page overwrites its chunks instead of orphaning them.
+        self.splitter = SentenceSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            id_func=lambda position, document: chunk_node_id(document.doc_id, position),
+        )
+        self.index = self._load_or_create()
+
+    def _load_or_create(self) -> VectorStoreIndex:
+        if (self.persist_dir / "docstore.json").exists():
+            storage = load_storage_context(
+                self.persist_dir, dtype=self.vector_dtype, ann=self.ann, quantization=self.quantization
+            )
+            logger.info("Vector index loaded: persist_dir={}", str(self.persist_dir))
+            return load_index_from_storage(storage)
+        logger.info("Vector index created: persist_dir={}", str(self.persist_dir))
+        return self._empty_index()
+
+    def _empty_index(self) -> VectorStoreIndex:
+        vector_store = MemmapVectorStore(dtype=self.vector_dtype, ann=self.ann, quantization=self.quantization)
+        storage = StorageContext.from_defaults(vector_store=vector_store)
+        return VectorStoreIndex(nodes=[], storage_context=storage)
+
+    def add_documents(self, documents: Sequence[IndexDocument]) -> dict[str, list[str]]:
+        node_ids: dict[str, list[str]] = {}
+        nodes = []
+        for document in documents:
+            llama_document = Document(
+                id_=document.doc_id,
+                text=document.text,
+                metadata=dict(document.metadata),
+                excluded_embed_metadata_keys=EMBED_EXCLUDED_METADATA,
+                excluded_llm_metadata_keys=LLM_EXCLUDED_METADATA,
+            )
+            document_nodes = self.splitter.get_nodes_from_documents([llama_document])
+            node_ids[document.doc_id] = [node.node_id for node in document_nodes]
+            nodes.extend(document_nodes)
+        if nodes:
+            # One insert per batch so the embed model sees full embedding batches.
+            self.index.insert_nodes(nodes)
+        return node_ids
+
+    def iter_node_texts(self) -> Iterator[tuple[str, str, dict[str, Any]]]:
+        """(node_id, title + chunk text, metadata) for every chunk in the docstore; the lexical index input."""
+        for node in self.index.docstore.docs.values():
+            title = str(node.metadata.get("title") or "")
+            yield node.node_id, f"{title}\n{node.get_content()}", node.metadata
+
+    def delete_nodes(self, node_ids: Sequence[str]) -> None:
+        self.index.delete_nodes(list(node_ids), delete_from_docstore=True)
+
+    def reset(self) -> None:
+        self.index = self._empty_index()
+
+    def persist(self) -> None:
+        self.persist_dir.mkdir(parents=True, exist_ok=True)
+        self.index.storage_context.persist(persist_dir=str(self.persist_dir))
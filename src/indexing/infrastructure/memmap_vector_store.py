@@ -0,0 +1,201 @@
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from llama_index.core import StorageContext
+from llama_index.core.schema import BaseNode
+from llama_index.core.vector_stores import SimpleVectorStore
+from llama_index.core.vector_stores.types import (
+    BasePydanticVectorStore,
+    FilterCondition,
+    FilterOperator,
+    MetadataFilters,
+    VectorStoreQuery,
+    VectorStoreQueryMode,
+    VectorStoreQueryResult,
+)
+from pydantic import PrivateAttr
+
+from src.config.logger_config import logger
+from src.indexing.domain.label_filter import LabelFilter
+from src.indexing.infrastructure.ivf_index import IvfConfig
+from src.indexing.infrastructure.memmap_vectors import MemmapVectorMatrix
+from src.indexing.infrastructure.quantization import QuantizationConfig
+
+# Node metadata copied into the row table so queries can be restricted without touching the docstore.
+ROW_METADATA_KEYS = ("pageid", "title", "entity_type", "subtypes")
+
+
+def memmap_dir_for(persist_dir: str | Path, namespace: str = "default") -> Path:
+    return Path(persist_dir) / f"{namespace}__vector_store.memmap"
+
+
+class MemmapVectorStore(BasePydanticVectorStore):
+    """llama-index vector store backed by MemmapVectorMatrix; text lives in the docstore."""
+
+    stores_text: bool = False
+    is_embedding_query: bool = True
+    _matrix: MemmapVectorMatrix = PrivateAttr()
+
+    def __init__(
+        self,
+        matrix: MemmapVectorMatrix | None = None,
+        dtype: str = "float32",
+        ann: IvfConfig | None = None,
+        quantization: QuantizationConfig | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._matrix = (
+            matrix if matrix is not None else MemmapVectorMatrix(dtype=dtype, ann=ann, quantization=quantization)
+        )
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "MemmapVectorStore"
+
+    @classmethod
+    def from_persist_dir(
+        cls,
+        persist_dir: str | Path,
+        dtype: str = "float32",
+        ann: IvfConfig | None = None,
+        quantization: QuantizationConfig | None = None,
+    ) -> "MemmapVectorStore":
+        """Open the mapped matrix; an index persisted with the JSON SimpleVectorStore is converted once.
+
+        `ann` and `quantization` replace the stored settings from the next save on; None keeps what was persisted.
+        """
+        directory = memmap_dir_for(persist_dir)
+        if MemmapVectorMatrix.exists(directory):
+            matrix = MemmapVectorMatrix.load(directory)
+            if ann is not None:
+                matrix.ann = ann
+            if quantization is not None:
+                matrix.quantization = quantization
+            return cls(matrix=matrix)
+        store = cls(dtype=dtype, ann=ann, quantization=quantization)
+        legacy_path = Path(persist_dir) / "default__vector_store.json"
+        if legacy_path.exists():
+            legacy = SimpleVectorStore.from_persist_path(str(legacy_path))
+            data = legacy.data
+            node_ids = list(data.embedding_dict)
+            if node_ids:
+                store._matrix.add(
+                    node_ids,
+                    [data.embedding_dict[node_id] for node_id in node_ids],
+                    [
+                        {
+                            "ref_doc_id": data.text_id_to_ref_doc_id.get(node_id),
+                            "metadata": _row_metadata(data.metadata_dict.get(node_id) or {}),
+                        }
+                        for node_id in node_ids
+                    ],
+                )
+            store._matrix.save(directory)
+            logger.info(
+                "Converted JSON vector store to memmap: source={}, target={}, count={}",
+                str(legacy_path),
+                str(directory),
+                len(node_ids),
+            )
+        return store
+
+    @property
+    def client(self) -> MemmapVectorMatrix:
+        return self._matrix
+
+    def add(self, nodes: Sequence[BaseNode], **add_kwargs: Any) -> list[str]:
+        if not nodes:
+            return []
+        ids = [node.node_id for node in nodes]
+        self._matrix.add(
+            ids,
+            [node.get_embedding() for node in nodes],
+            [{"ref_doc_id": node.ref_doc_id, "metadata": _row_metadata(node.metadata)} for node in nodes],
+        )
+        return ids
+
+    def delete(self, ref_doc_id: str, **delete_kwargs: Any) -> None:
+        self._matrix.delete_ref_doc(ref_doc_id)
+
+    def delete_nodes(
+        self,
+        node_ids: list[str] | None = None,
+        filters: MetadataFilters | None = None,
+        **delete_kwargs: Any,
+    ) -> None:
+        if filters is not None:
+            raise ValueError("Metadata filters are not supported when deleting from MemmapVectorStore")
+        self._matrix.delete(node_ids or [])
+
+    def clear(self) -> None:
+        self._matrix = MemmapVectorMatrix(
+            dtype=self._matrix.dtype, ann=self._matrix.ann, quantization=self._matrix.quantization
+        )
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:
+        # VectorIndexRetriever(vector_store_kwargs={"nprobe": n}) tunes ANN recall per retriever; 0 means exact.
+        if query.mode != VectorStoreQueryMode.DEFAULT:
+            raise ValueError(f"Unsupported query mode: {query.mode}")
+        ids, similarities = self._matrix.query(
+            query.query_embedding,
+            query.similarity_top_k,
+            allowed_ids=set(query.node_ids) if query.node_ids else None,
+            allowed_ref_doc_ids=set(query.doc_ids) if query.doc_ids else None,
+            nprobe=kwargs.get("nprobe"),
+            label_filter=label_filter_from_metadata_filters(query.filters) if query.filters is not None else None,
+        )
+        return VectorStoreQueryResult(ids=ids, similarities=similarities)
+
+    def persist(self, persist_path: str, fs: Any = None) -> None:
+        # StorageContext passes "<persist_dir>/default__vector_store.json"; the matrix goes beside it.
+        path = Path(persist_path)
+        namespace = path.name.split("__", 1)[0]
+        self._matrix.save(memmap_dir_for(path.parent, namespace))
+
+
+def load_storage_context(
+    persist_dir: str | Path,
+    dtype: str = "float32",
+    ann: IvfConfig | None = None,
+    quantization: QuantizationConfig | None = None,
+) -> StorageContext:
+    """StorageContext for a persisted index with its vectors opened through MemmapVectorStore."""
+    return StorageContext.from_defaults(
+        persist_dir=str(persist_dir),
+        vector_store=MemmapVectorStore.from_persist_dir(persist_dir, dtype=dtype, ann=ann, quantization=quantization),
+    )
+
+
+def label_filter_from_metadata_filters(filters: MetadataFilters) -> LabelFilter:
+    """Translate llama-index filters on `entity_type` / `subtypes` into a LabelFilter evaluated on the row table.
+
+    Supported: AND of `entity_type` EQ/IN and `subtypes` CONTAINS/ANY/ALL.
+    """
+    if filters.condition != FilterCondition.AND and len(filters.filters) > 1:
+        raise ValueError(f"Unsupported metadata filter condition: {filters.condition}")
+    entity_types: tuple[str, ...] | None = None
+    subtype_groups: list[tuple[str, ...]] = []
+    for metadata_filter in filters.filters:
+        if isinstance(metadata_filter, MetadataFilters):
+            raise ValueError("Nested metadata filters are not supported by MemmapVectorStore")
+        values = metadata_filter.value if isinstance(metadata_filter.value, list) else [metadata_filter.value]
+        values = tuple(str(value) for value in values)
+        key, operator = metadata_filter.key, metadata_filter.operator
+        if key == "entity_type" and operator in (FilterOperator.EQ, FilterOperator.IN):
+            entity_types = values if entity_types is None else tuple(v for v in entity_types if v in values)
+        elif key == "subtypes" and operator in (FilterOperator.CONTAINS, FilterOperator.ANY):
+            subtype_groups.append(values)
+        elif key == "subtypes" and operator == FilterOperator.ALL:
+            subtype_groups.extend((value,) for value in values)
+        else:
+            raise ValueError(f"Unsupported metadata filter: {key} {operator}")
+    if entity_types == ():
+        # Contradicting entity_type filters: an empty subtype group matches no node.
+        subtype_groups.append(())
+    return LabelFilter(entity_types=entity_types or (), subtype_groups=tuple(subtype_groups))
+
+
+def _row_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
+    return {key: metadata[key] for key in ROW_METADATA_KEYS if key in metadata}
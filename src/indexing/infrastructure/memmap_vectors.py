@@ -0,0 +1,440 @@
+import json
+import os
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.config.logger_config import logger
+from src.indexing.domain.label_filter import LabelFilter
+from src.indexing.infrastructure.ivf_index import IvfConfig, IvfIndex
+from src.indexing.infrastructure.quantization import (
+    QuantizationConfig,
+    Quantizer,
+    encode_to_file,
+    load_quantizer,
+    needs_retrain,
+    save_quantizer,
+    score_codes,
+    train_quantizer,
+)
+
+VECTOR_DTYPES = ("float32", "float16")
+_META_FILE = "meta.json"
+# Rows scored per step; float16 blocks are widened to float32 for the dot product.
+_SCORE_BLOCK = 65_536
+_GENERATION_KINDS = (
+    "vectors",
+    "ids",
+    "rows",
+    "ivf_centroids",
+    "ivf_offsets",
+    "ivf_rows",
+    "ivf_trained",
+    "quantizer",
+    "codes",
+)
+
+
+class MemmapVectorMatrix:
+    """Normalized embeddings as one contiguous `.npy` matrix opened with np.memmap, plus an id array and row table.
+
+    Persisted rows are read-only and shared through the page cache; additions and deletions are kept
+    in memory (delta rows, tombstones) until save() compacts everything into new files.
+    """
+
+    def __init__(
+        self,
+        dim: int | None = None,
+        dtype: str = "float32",
+        ann: IvfConfig | None = None,
+        quantization: QuantizationConfig | None = None,
+    ) -> None:
+        if dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+        self.dim = dim
+        self.dtype = dtype
+        # With `ann` set, save() also builds an IVF index and queries probe it instead of scanning every row.
+        self.ann = ann
+        self._ivf: IvfIndex | None = None
+        # With `quantization` set, the first pass scores compact codes and only a shortlist touches the float rows.
+        self.quantization = quantization
+        self._quantizer: Quantizer | None = None
+        self._codes: np.ndarray | None = None
+        self.directory: Path | None = None
+        self.generation = 0
+        self._base: np.ndarray | None = None
+        self._base_ids: np.ndarray | None = None
+        self._base_rows: list[dict[str, Any]] | None = None
+        self._deleted: np.ndarray | None = None
+        self._base_index: dict[str, int] | None = None
+        # ("entity_type" | "subtype", value) -> base row positions; built on the first filtered query.
+        self._label_postings: dict[tuple[str, str], np.ndarray] | None = None
+        self._delta: dict[str, tuple[np.ndarray, dict[str, Any]]] = {}
+        self._delta_matrix: tuple[list[str], np.ndarray] | None = None
+
+    @classmethod
+    def exists(cls, directory: str | Path) -> bool:
+        return (Path(directory) / _META_FILE).exists()
+
+    @classmethod
+    def load(cls, directory: str | Path) -> "MemmapVectorMatrix":
+        directory = Path(directory)
+        meta = json.loads((directory / _META_FILE).read_text(encoding="utf-8"))
+        ann = IvfConfig.from_dict(meta["ann"]) if meta.get("ann") else None
+        quantization = QuantizationConfig.from_dict(meta["quantization"]) if meta.get("quantization") else None
+        matrix = cls(dim=meta["dim"], dtype=meta["dtype"], ann=ann, quantization=quantization)
+        matrix.directory = directory
+        matrix.generation = meta["generation"]
+        if meta["count"]:
+            matrix._base = np.load(directory / _generation_file("vectors", matrix.generation, "npy"), mmap_mode="r")
+            matrix._base_ids = np.load(directory / _generation_file("ids", matrix.generation, "npy"), mmap_mode="r")
+            matrix._deleted = np.zeros(meta["count"], dtype=bool)
+        if meta.get("ivf"):
+            matrix._ivf = IvfIndex.load(directory, f"{matrix.generation:06d}")
+        if meta.get("quantized"):
+            matrix._quantizer = load_quantizer(directory / _generation_file("quantizer", matrix.generation, "npz"))
+            matrix._codes = np.load(directory / _generation_file("codes", matrix.generation, "npy"), mmap_mode="r")
+        return matrix
+
+    def __len__(self) -> int:
+        base = 0 if self._deleted is None else int(len(self._deleted) - self._deleted.sum())
+        return base + len(self._delta)
+
+    @property
+    def base_vectors(self) -> np.ndarray | None:
+        """The persisted (memory-mapped) matrix, tombstoned rows included."""
+        return self._base
+
+    @property
+    def scan_nbytes(self) -> int:
+        """Bytes every exact-path query scans: the codes (plus quantizer parameters) when quantized, else the matrix."""
+        if self._quantizer is not None:
+            return int(self._codes.nbytes + sum(array.nbytes for array in self._quantizer.arrays().values()))
+        return int(self._base.nbytes) if self._base is not None else 0
+
+    @property
+    def base_rows(self) -> list[dict[str, Any]]:
+        # The row table (ref_doc_id plus filterable metadata) is only parsed when something needs it.
+        if self._base_rows is None:
+            if self._base is None:
+                self._base_rows = []
+            else:
+                rows_path = self.directory / _generation_file("rows", self.generation, "json")
+                self._base_rows = json.loads(rows_path.read_text(encoding="utf-8"))
+        return self._base_rows
+
+    def add(
+        self,
+        ids: Sequence[str],
+        vectors: Sequence[Sequence[float]] | np.ndarray,
+        rows: Sequence[Mapping[str, Any]] | None = None,
+    ) -> None:
+        array = np.asarray(vectors, dtype=np.float32)
+        if array.ndim != 2 or len(array) != len(ids):
+            raise ValueError(f"Expected {len(ids)} vectors, got shape {array.shape}")
+        if self.dim is None:
+            self.dim = int(array.shape[1])
+        elif array.shape[1] != self.dim:
+            raise ValueError(f"Vector dimension mismatch: expected {self.dim}, got {array.shape[1]}")
+        norms = np.linalg.norm(array, axis=1, keepdims=True)
+        array = array / np.where(norms == 0, 1.0, norms)
+        for position, node_id in enumerate(ids):
+            self._delete_base(node_id)
+            self._delta[str(node_id)] = (array[position], dict(rows[position]) if rows is not None else {})
+        self._delta_matrix = None
+
+    def delete(self, ids: Sequence[str]) -> None:
+        for node_id in ids:
+            self._delete_base(node_id)
+            if self._delta.pop(str(node_id), None) is not None:
+                self._delta_matrix = None
+
+    def delete_ref_doc(self, ref_doc_id: str) -> None:
+        self.delete([node_id for node_id, row in self.iter_rows() if row.get("ref_doc_id") == ref_doc_id])
+
+    def iter_rows(self):
+        if self._base is not None:
+            for position, row in enumerate(self.base_rows):
+                if not self._deleted[position]:
+                    yield str(self._base_ids[position]), row
+        for node_id, (_, row) in self._delta.items():
+            yield node_id, row
+
+    def get_vector(self, node_id: str) -> np.ndarray | None:
+        if node_id in self._delta:
+            return self._delta[node_id][0]
+        position = self._base_position(node_id)
+        if position is None:
+            return None
+        return np.asarray(self._base[position], dtype=np.float32)
+
+    def query(
+        self,
+        query: Sequence[float] | np.ndarray,
+        top_k: int,
+        allowed_ids: set[str] | None = None,
+        allowed_ref_doc_ids: set[str] | None = None,
+        nprobe: int | None = None,
+        label_filter: LabelFilter | None = None,
+    ) -> tuple[list[str], list[float]]:
+        """Top-k node ids by cosine similarity, optionally restricted to node ids, ref doc ids or labels.
+
+        A restriction that keeps less than half of the rows is searched as a partition: only its rows are scored.
+
+        When an IVF index exists only `nprobe` lists are scanned (default from the ANN config);
+        `nprobe=0` forces exact search. With quantized codes the scan ranks codes and the best
+        top_k * rescore_factor rows are re-scored from the float matrix. Delta rows are always scored exactly.
+        """
+        if top_k <= 0 or len(self) == 0:
+            return [], []
+        if label_filter is not None and label_filter.is_empty:
+            label_filter = None
+        vector = np.asarray(query, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector = vector / norm
+
+        candidate_ids: list[np.ndarray] = []
+        candidate_scores: list[np.ndarray] = []
+        if self._base is not None:
+            mask = ~self._deleted
+            if allowed_ids is not None:
+                # Position lookups rather than np.isin: casting to the fixed-width id dtype would truncate longer ids.
+                id_index = self._id_index()
+                allowed_positions = [id_index[node_id] for node_id in map(str, allowed_ids) if node_id in id_index]
+                allowed_mask = np.zeros(len(mask), dtype=bool)
+                allowed_mask[allowed_positions] = True
+                mask &= allowed_mask
+            if allowed_ref_doc_ids is not None:
+                mask &= np.array([row.get("ref_doc_id") in allowed_ref_doc_ids for row in self.base_rows], dtype=bool)
+            if label_filter is not None:
+                mask &= self._label_mask(label_filter)
+            restricted = allowed_ids is not None or allowed_ref_doc_ids is not None or label_filter is not None
+            probes = self.ann.nprobe if nprobe is None and self.ann is not None else nprobe
+            rows = None
+            if self._ivf is not None and probes:
+                rows = np.sort(self._ivf.candidate_rows(vector, probes))
+                rows = rows[mask[rows]]
+                if restricted and len(rows) < top_k:
+                    # A selective filter leaves the probed lists nearly empty; its partition is small enough to scan.
+                    rows = np.flatnonzero(mask)
+            elif restricted:
+                selected = np.flatnonzero(mask)
+                if len(selected) * 2 < len(mask):
+                    rows = selected
+            if rows is None:
+                scores = self._first_pass_scores(vector, None)
+                scores[~mask] = -np.inf
+            else:
+                scores = self._first_pass_scores(vector, rows)
+            rescore_factor = self.quantization.rescore_factor if self._quantizer is not None else 0
+            local = self._top_positions(scores, top_k * rescore_factor if rescore_factor else top_k)
+            local = local[np.isfinite(scores[local])]
+            positions = local if rows is None else rows[local]
+            scores = scores[local]
+            if rescore_factor:
+                positions = np.sort(positions)
+                scores = np.asarray(self._base[positions], dtype=np.float32) @ vector
+                local = self._top_positions(scores, top_k)
+                positions, scores = positions[local], scores[local]
+            candidate_ids.append(np.asarray(self._base_ids[positions]).astype(str))
+            candidate_scores.append(scores)
+        if self._delta:
+            delta_ids, delta_matrix = self._stacked_delta()
+            scores = delta_matrix @ vector
+            for position, node_id in enumerate(delta_ids):
+                row = self._delta[node_id][1]
+                if (
+                    (allowed_ids is not None and node_id not in allowed_ids)
+                    or (allowed_ref_doc_ids is not None and row.get("ref_doc_id") not in allowed_ref_doc_ids)
+                    or (label_filter is not None and not label_filter.matches(row.get("metadata") or {}))
+                ):
+                    scores[position] = -np.inf
+            positions = self._top_positions(scores, top_k)
+            candidate_ids.append(np.asarray(delta_ids, dtype=str)[positions])
+            candidate_scores.append(scores[positions])
+
+        ids = np.concatenate(candidate_ids)
+        scores = np.concatenate(candidate_scores)
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        order = order[np.isfinite(scores[order])]
+        return ids[order].tolist(), scores[order].astype(float).tolist()
+
+    def save(self, directory: str | Path) -> None:
+        """Compact live rows into a new generation of files, switch meta.json to it and re-open it mapped.
+
+        The previous generation is kept so readers that opened it (and parse its row table lazily) keep
+        working; generations older than that are removed.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        meta_path = directory / _META_FILE
+        stored = json.loads(meta_path.read_text(encoding="utf-8"))["generation"] if meta_path.exists() else 0
+        generation = max(stored, self.generation) + 1
+        live_base = np.flatnonzero(~self._deleted) if self._base is not None else np.zeros(0, dtype=np.int64)
+        delta_ids = list(self._delta)
+        count = len(live_base) + len(delta_ids)
+
+        if count:
+            out = np.lib.format.open_memmap(
+                directory / _generation_file("vectors", generation, "npy"),
+                mode="w+",
+                dtype=self.dtype,
+                shape=(count, self.dim),
+            )
+            for start in range(0, len(live_base), _SCORE_BLOCK):
+                block = live_base[start : start + _SCORE_BLOCK]
+                out[start : start + len(block)] = self._base[block]
+            if delta_ids:
+                out[len(live_base) :] = self._stacked_delta()[1]
+            out.flush()
+            del out
+            ids = np.asarray(self._base_ids[live_base]).astype(str).tolist() if len(live_base) else []
+            ids.extend(delta_ids)
+            np.save(directory / _generation_file("ids", generation, "npy"), np.array(ids, dtype=str))
+            rows = [self.base_rows[position] for position in live_base]
+            rows.extend(self._delta[node_id][1] for node_id in delta_ids)
+            (directory / _generation_file("rows", generation, "json")).write_text(
+                json.dumps(rows, ensure_ascii=False), encoding="utf-8"
+            )
+        with_ivf = self.ann is not None and count >= self.ann.min_rows
+        if with_ivf:
+            vectors = np.load(directory / _generation_file("vectors", generation, "npy"), mmap_mode="r")
+            if self._ivf is None or self._ivf.needs_retrain(count):
+                ivf = IvfIndex.build(vectors, self.ann)
+            else:
+                ivf = IvfIndex.assign(vectors, self._ivf.centroids, self._ivf.trained_count)
+            ivf.save(directory, f"{generation:06d}")
+            del ivf
+            del vectors
+        quantized = self.quantization is not None and count > 0
+        if quantized:
+            vectors = np.load(directory / _generation_file("vectors", generation, "npy"), mmap_mode="r")
+            quantizer = self._quantizer
+            if needs_retrain(quantizer, self.quantization, count):
+                quantizer = train_quantizer(vectors, self.quantization)
+            save_quantizer(quantizer, directory / _generation_file("quantizer", generation, "npz"))
+            encode_to_file(quantizer, vectors, directory / _generation_file("codes", generation, "npy"))
+            del vectors
+        # meta.json is swapped last: until then readers see the previous generation intact.
+        meta = {
+            "dim": self.dim,
+            "dtype": self.dtype,
+            "count": count,
+            "generation": generation,
+            "ann": self.ann.to_dict() if self.ann is not None else None,
+            "ivf": with_ivf,
+            "quantization": self.quantization.to_dict() if self.quantization is not None else None,
+            "quantized": quantized,
+        }
+        (directory / f"{_META_FILE}.tmp").write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(directory / f"{_META_FILE}.tmp", directory / _META_FILE)
+        for path in directory.iterdir():
+            if path.name != _META_FILE and _file_generation(path.name) not in (None, generation, stored):
+                path.unlink(missing_ok=True)
+
+        reloaded = MemmapVectorMatrix.load(directory)
+        self.__dict__.update(reloaded.__dict__)
+        logger.info(
+            "Memmap vectors saved: directory={}, count={}, dim={}, dtype={}, generation={}",
+            str(directory),
+            count,
+            self.dim,
+            self.dtype,
+            generation,
+        )
+
+    def label_vocabulary(self) -> tuple[set[str], set[str]]:
+        """Entity types and subtype tags present in the row table."""
+        entity_types: set[str] = set()
+        subtypes: set[str] = set()
+        for _, row in self.iter_rows():
+            metadata = row.get("metadata") or {}
+            if metadata.get("entity_type"):
+                entity_types.add(str(metadata["entity_type"]))
+            subtypes.update(str(tag) for tag in metadata.get("subtypes") or ())
+        return entity_types, subtypes
+
+    def _label_mask(self, label_filter: LabelFilter) -> np.ndarray:
+        postings = self._postings()
+        mask = np.ones(len(self._deleted), dtype=bool)
+        groups = [[("entity_type", value) for value in label_filter.entity_types]] if label_filter.entity_types else []
+        groups.extend([("subtype", tag) for tag in group] for group in label_filter.subtype_groups)
+        for group in groups:
+            group_mask = np.zeros(len(self._deleted), dtype=bool)
+            for key in group:
+                if key in postings:
+                    group_mask[postings[key]] = True
+            mask &= group_mask
+        return mask
+
+    def _postings(self) -> dict[tuple[str, str], np.ndarray]:
+        if self._label_postings is None:
+            collected: dict[tuple[str, str], list[int]] = {}
+            for position, row in enumerate(self.base_rows):
+                metadata = row.get("metadata") or {}
+                if metadata.get("entity_type"):
+                    collected.setdefault(("entity_type", str(metadata["entity_type"])), []).append(position)
+                for tag in metadata.get("subtypes") or ():
+                    collected.setdefault(("subtype", str(tag)), []).append(position)
+            self._label_postings = {key: np.asarray(positions, dtype=np.int64) for key, positions in collected.items()}
+        return self._label_postings
+
+    def _first_pass_scores(self, vector: np.ndarray, rows: np.ndarray | None) -> np.ndarray:
+        if self._quantizer is not None:
+            return score_codes(self._quantizer, self._codes, vector, rows)
+        if rows is None:
+            return self._score_base(vector)
+        return np.asarray(self._base[rows], dtype=np.float32) @ vector
+
+    def _score_base(self, vector: np.ndarray) -> np.ndarray:
+        scores = np.empty(len(self._base), dtype=np.float32)
+        for start in range(0, len(self._base), _SCORE_BLOCK):
+            block = np.asarray(self._base[start : start + _SCORE_BLOCK], dtype=np.float32)
+            scores[start : start + len(block)] = block @ vector
+        return scores
+
+    @staticmethod
+    def _top_positions(scores: np.ndarray, top_k: int) -> np.ndarray:
+        if len(scores) <= top_k:
+            return np.arange(len(scores))
+        return np.argpartition(-scores, top_k - 1)[:top_k]
+
+    def _stacked_delta(self) -> tuple[list[str], np.ndarray]:
+        if self._delta_matrix is None:
+            delta_ids = list(self._delta)
+            stacked = np.vstack([self._delta[node_id][0] for node_id in delta_ids]) if delta_ids else np.zeros((0, self.dim or 0))
+            self._delta_matrix = (delta_ids, stacked.astype(np.float32))
+        return self._delta_matrix
+
+    def _base_position(self, node_id: str) -> int | None:
+        if self._base is None:
+            return None
+        position = self._id_index().get(str(node_id))
+        if position is None or self._deleted[position]:
+            return None
+        return position
+
+    def _id_index(self) -> dict[str, int]:
+        if self._base_index is None:
+            self._base_index = {str(value): position for position, value in enumerate(np.asarray(self._base_ids).astype(str))}
+        return self._base_index
+
+    def _delete_base(self, node_id: str) -> None:
+        position = self._base_position(node_id)
+        if position is not None:
+            self._deleted[position] = True
+
+
+def _generation_file(kind: str, generation: int, suffix: str) -> str:
+    return f"{kind}-{generation:06d}.{suffix}"
+
+
+def _file_generation(name: str) -> int | None:
+    stem, _, _ = name.partition(".")
+    kind, _, generation = stem.rpartition("-")
+    if kind not in _GENERATION_KINDS or not generation.isdigit():
+        return None
+    return int(generation)
@@ -0,0 +1,201 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+QUANTIZATION_KINDS = ("int8", "pq")
+_ENCODE_BLOCK = 65_536
+_PQ_CENTROIDS = 256
+
+
+@dataclass(frozen=True)
+class QuantizationConfig:
+    kind: str = "int8"
+    # Product quantization: one byte per sub-vector, so each vector costs `pq_subvectors` bytes.
+    pq_subvectors: int = 64
+    # The first pass keeps top_k * rescore_factor candidates for an exact float re-score; 0 disables it.
+    rescore_factor: int = 4
+    train_sample: int = 100_000
+    iterations: int = 10
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.kind not in QUANTIZATION_KINDS:
+            raise ValueError(f"Unsupported quantization: {self.kind}")
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "pq_subvectors": self.pq_subvectors,
+            "rescore_factor": self.rescore_factor,
+            "train_sample": self.train_sample,
+            "iterations": self.iterations,
+            "seed": self.seed,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "QuantizationConfig":
+        return cls(**payload)
+
+
+class ScalarQuantizer:
+    """Per-dimension int8 codes: x ~= (code + 128) * scale + low."""
+
+    kind = "int8"
+
+    def __init__(self, low: np.ndarray, scale: np.ndarray, trained_count: int) -> None:
+        self.low = low
+        self.scale = scale
+        self.trained_count = trained_count
+
+    @classmethod
+    def train(cls, sample: np.ndarray, trained_count: int, config: QuantizationConfig) -> "ScalarQuantizer":
+        low = sample.min(axis=0)
+        high = sample.max(axis=0)
+        scale = (high - low) / 255.0
+        return cls(low.astype(np.float32), np.where(scale == 0, 1.0, scale).astype(np.float32), trained_count)
+
+    def code_shape(self, dim: int) -> tuple[int, np.dtype]:
+        return dim, np.dtype(np.int8)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        codes = np.rint((vectors - self.low) / self.scale) - 128
+        return np.clip(codes, -128, 127).astype(np.int8)
+
+    def score(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        # Inner product with the decoded rows, without decoding them: code . (q * scale) + q . (128 * scale + low).
+        weights = query * self.scale
+        bias = float(query @ (128.0 * self.scale + self.low))
+        return codes.astype(np.float32) @ weights + bias
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        return {"low": self.low, "scale": self.scale}
+
+    @classmethod
+    def from_arrays(cls, arrays: Any, trained_count: int) -> "ScalarQuantizer":
+        return cls(arrays["low"], arrays["scale"], trained_count)
+
+
+class ProductQuantizer:
+    """Sub-vectors replaced by the index of their nearest codebook entry (256 per sub-space)."""
+
+    kind = "pq"
+
+    def __init__(self, codebooks: np.ndarray, trained_count: int) -> None:
+        # (subvectors, centroids, sub_dim)
+        self.codebooks = codebooks
+        self.trained_count = trained_count
+
+    @classmethod
+    def train(cls, sample: np.ndarray, trained_count: int, config: QuantizationConfig) -> "ProductQuantizer":
+        dim = sample.shape[1]
+        if dim % config.pq_subvectors:
+            raise ValueError(f"Vector dimension {dim} is not divisible by pq_subvectors={config.pq_subvectors}")
+        rng = np.random.default_rng(config.seed)
+        sub_dim = dim // config.pq_subvectors
+        centroids = min(_PQ_CENTROIDS, len(sample))
+        codebooks = np.empty((config.pq_subvectors, centroids, sub_dim), dtype=np.float32)
+        for subspace in range(config.pq_subvectors):
+            part = np.ascontiguousarray(sample[:, subspace * sub_dim : (subspace + 1) * sub_dim])
+            codebooks[subspace] = _kmeans(part, centroids, config.iterations, rng)
+        return cls(codebooks, trained_count)
+
+    def code_shape(self, dim: int) -> tuple[int, np.dtype]:
+        return len(self.codebooks), np.dtype(np.uint8)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        subvectors, _, sub_dim = self.codebooks.shape
+        codes = np.empty((len(vectors), subvectors), dtype=np.uint8)
+        for subspace, codebook in enumerate(self.codebooks):
+            part = vectors[:, subspace * sub_dim : (subspace + 1) * sub_dim]
+            codes[:, subspace] = _nearest(part, codebook)
+        return codes
+
+    def score(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        subvectors, _, sub_dim = self.codebooks.shape
+        table = np.einsum("mkd,md->mk", self.codebooks, query.reshape(subvectors, sub_dim))
+        return table[np.arange(subvectors), codes].sum(axis=1)
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        return {"codebooks": self.codebooks}
+
+    @classmethod
+    def from_arrays(cls, arrays: Any, trained_count: int) -> "ProductQuantizer":
+        return cls(arrays["codebooks"], trained_count)
+
+
+Quantizer = ScalarQuantizer | ProductQuantizer
+_QUANTIZERS: dict[str, type[ScalarQuantizer] | type[ProductQuantizer]] = {"int8": ScalarQuantizer, "pq": ProductQuantizer}
+
+
+def train_quantizer(vectors: np.ndarray, config: QuantizationConfig) -> Quantizer:
+    """Fit quantization parameters on a sample of the (normalized) rows."""
+    count = len(vectors)
+    rng = np.random.default_rng(config.seed)
+    sample_rows = np.sort(rng.choice(count, size=min(count, config.train_sample), replace=False))
+    sample = np.asarray(vectors[sample_rows], dtype=np.float32)
+    return _QUANTIZERS[config.kind].train(sample, count, config)
+
+
+def needs_retrain(quantizer: Quantizer | None, config: QuantizationConfig, row_count: int) -> bool:
+    # Same drift rule as the IVF centroids: reuse parameters until the corpus halves or doubles.
+    if quantizer is None or quantizer.kind != config.kind:
+        return True
+    if isinstance(quantizer, ProductQuantizer) and len(quantizer.codebooks) != config.pq_subvectors:
+        return True
+    return not quantizer.trained_count / 2 <= row_count <= quantizer.trained_count * 2
+
+
+def encode_to_file(quantizer: Quantizer, vectors: np.ndarray, path: Path) -> None:
+    width, dtype = quantizer.code_shape(vectors.shape[1])
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(len(vectors), width))
+    for start in range(0, len(vectors), _ENCODE_BLOCK):
+        block = np.asarray(vectors[start : start + _ENCODE_BLOCK], dtype=np.float32)
+        out[start : start + len(block)] = quantizer.encode(block)
+    out.flush()
+    del out
+
+
+def score_codes(quantizer: Quantizer, codes: np.ndarray, query: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+    """Approximate inner products for every code row, or only for `rows`."""
+    count = len(codes) if rows is None else len(rows)
+    scores = np.empty(count, dtype=np.float32)
+    for start in range(0, count, _ENCODE_BLOCK):
+        selection = slice(start, start + _ENCODE_BLOCK) if rows is None else rows[start : start + _ENCODE_BLOCK]
+        block = np.asarray(codes[selection])
+        scores[start : start + len(block)] = quantizer.score(block, query)
+    return scores
+
+
+def save_quantizer(quantizer: Quantizer, path: Path) -> None:
+    with path.open("wb") as handle:
+        np.savez(handle, kind=np.array(quantizer.kind), trained_count=np.array(quantizer.trained_count), **quantizer.arrays())
+
+
+def load_quantizer(path: Path) -> Quantizer:
+    with np.load(path) as arrays:
+        kind = str(arrays["kind"])
+        if kind not in _QUANTIZERS:
+            raise ValueError(f"Unsupported quantization: {kind}")
+        return _QUANTIZERS[kind].from_arrays({key: arrays[key] for key in arrays.files}, int(arrays["trained_count"]))
+
+
+def _kmeans(points: np.ndarray, k: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    centroids = points[rng.choice(len(points), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = _nearest(points, centroids)
+        order = np.argsort(assignment, kind="stable")
+        sizes = np.bincount(assignment, minlength=k)
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        filled = sizes > 0
+        centroids[filled] = np.add.reduceat(points[order], starts[filled], axis=0) / sizes[filled, None]
+        # Empty cells are re-seeded from random points so every code stays usable.
+        empty = ~filled
+        centroids[empty] = points[rng.choice(len(points), size=int(empty.sum()), replace=True)]
+    return centroids
+
+
+def _nearest(points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    # argmin ||x - c||^2 == argmax (2 x.c - ||c||^2)
+    return np.argmax(2.0 * (points @ centroids.T) - (centroids**2).sum(axis=1), axis=1)
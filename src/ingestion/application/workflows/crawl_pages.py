@@ -1,16 +1,21 @@
 import asyncio
 from contextlib import ExitStack
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
 
 import aiohttp
 from tqdm import tqdm
 from src.config.logger_config import logger
 
-from src.ingestion.domain.models import CrawlSummary, PageRef
+from src.ingestion.domain.models import CrawlSummary, PageRef, WikiPageDoc
 from src.ingestion.infrastructure.fs_sink import JsonFileSink
 from src.ingestion.infrastructure.mw_client import MediaWikiClient
 from src.ingestion.infrastructure.registry_sqlite import SQLiteRegistryRepository
 
+# Called with every persisted page and its file path, e.g. to hand it to an in-process consumer.
+PageSavedCallback = Callable[[WikiPageDoc, Path], Awaitable[None]]
+
 
 @dataclass(frozen=True)
 class CrawlWorkflowConfig:
@@ -30,11 +35,13 @@ class CrawlPagesWorkflow:
         registry: SQLiteRegistryRepository,
         sink: JsonFileSink,
         config: CrawlWorkflowConfig | None = None,
+        on_page_saved: PageSavedCallback | None = None,
     ) -> None:
         self.mw_client = mw_client
         self.registry = registry
         self.sink = sink
         self.config = config or CrawlWorkflowConfig()
+        self.on_page_saved = on_page_saved
         self._semaphore = asyncio.Semaphore(self.config.semaphore_limit)
 
     async def run(self) -> CrawlSummary:
@@ -145,7 +152,6 @@ class CrawlPagesWorkflow:
                 file_path = self.sink.write_page_doc(page_doc)
                 self.registry.upsert_page(page_doc, file_path)
                 logger.info("Saved JSON: {}", page_doc.title)
-                return True
             except Exception as exc:
                 logger.exception(
                     "Failed processing pageid {} with error type {}: {}",
@@ -154,3 +160,16 @@ class CrawlPagesWorkflow:
                     exc,
                 )
                 return False
+        if self.on_page_saved is not None:
+            # Outside the semaphore: a slow consumer applies backpressure without holding fetch slots.
+            try:
+                await self.on_page_saved(page_doc, file_path)
+            except Exception as exc:
+                # The page is persisted; a failed handoff only affects the downstream consumer.
+                logger.exception(
+                    "Page handoff failed for pageid {} with error type {}: {}",
+                    ref.pageid,
+                    type(exc).__name__,
+                    exc,
+                )
+        return True
@@ -6,7 +6,7 @@ from pathlib import Path
 
 import aiohttp
 
-from src.ingestion.application.workflows.crawl_pages import CrawlPagesWorkflow, CrawlWorkflowConfig
+from src.ingestion.application.workflows.crawl_pages import CrawlPagesWorkflow, CrawlWorkflowConfig, PageSavedCallback
 from src.ingestion.domain.models import CrawlSummary
 from src.ingestion.infrastructure.fs_sink import JsonFileSink
 from src.ingestion.infrastructure.mw_client import MediaWikiClient
@@ -29,6 +29,7 @@ async def run_crawl_async(
     db_path: str | Path = DEFAULT_DB_PATH,
     workflow_config: CrawlWorkflowConfig | None = None,
     show_progress: bool = True,
+    on_page_saved: PageSavedCallback | None = None,
 ) -> CrawlSummary:
     page_path = Path(page_dir)
     page_path.mkdir(parents=True, exist_ok=True)
@@ -51,6 +52,7 @@ async def run_crawl_async(
             if workflow_config is not None
             else CrawlWorkflowConfig(show_progress=show_progress)
         ),
+        on_page_saved=on_page_saved,
     )
     try:
         return await workflow.run()
@@ -0,0 +1 @@
+"""Ranking-quality and latency evaluations for the query path."""
@@ -0,0 +1,12 @@
+from src.query.benchmarks.rerank_eval import run_rerank_evaluation
+
+# python -m src.query.benchmarks
+if __name__ == "__main__":
+    results_path = run_rerank_evaluation(
+        persist_dir="indexes/vector_store",
+        questions_path=None,
+        sample_size=50,
+        results_dir="artifacts/benchmarks",
+        seed=0,
+    )
+    print(results_path)
@@ -0,0 +1,78 @@
+import json
+import random
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from src.indexing.domain.tokenization import tokenize
+
+# Page-anchored questions: the page a question was generated from is its relevant answer. The question quotes
+# a sentence of the page with the title masked, so rerankers cannot score it by matching the title string.
+QUESTION_TEMPLATES: dict[str, str] = {
+    "cat": "Which cat unit is this about: {excerpt}",
+    "enemy": "Which enemy is this about: {excerpt}",
+    "stage": "Which stage is this about: {excerpt}",
+    "update": "Which update is this about: {excerpt}",
+}
+DEFAULT_TEMPLATE = "Which page is this about: {excerpt}"
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|(?<=[。！？])|\n+")
+_MIN_EXCERPT_TOKENS = 6
+_MAX_EXCERPT_CHARS = 200
+
+
+@dataclass(frozen=True)
+class EvalQuestion:
+    question: str
+    relevant_titles: tuple[str, ...]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"question": self.question, "relevant_titles": list(self.relevant_titles)}
+
+
+def build_excerpt_questions(
+    pages: Iterable[tuple[str | None, str | None, str]],
+    sample_size: int,
+    seed: int = 0,
+) -> list[EvalQuestion]:
+    """One title-free question per sampled (title, entity_type) page, built from its (title, entity_type, text) chunks."""
+    excerpts: dict[tuple[str, str], str] = {}
+    for title, entity_type, text in pages:
+        key = (title or "", entity_type or "")
+        if not title or key in excerpts:
+            continue
+        excerpt = title_free_excerpt(title, text)
+        if excerpt is not None:
+            excerpts[key] = excerpt
+    unique = sorted(excerpts)
+    rng = random.Random(seed)
+    sample = rng.sample(unique, min(sample_size, len(unique)))
+    return [
+        EvalQuestion(QUESTION_TEMPLATES.get(entity_type, DEFAULT_TEMPLATE).format(excerpt=excerpts[(title, entity_type)]), (title,))
+        for title, entity_type in sample
+    ]
+
+
+def title_free_excerpt(title: str, text: str) -> str | None:
+    """First sentence long enough to identify the page, with every mention of the title replaced by "it"."""
+    pattern = re.compile(re.escape(title), re.IGNORECASE)
+    for sentence in _SENTENCE_BREAK.split(text or ""):
+        masked = pattern.sub("it", sentence.strip())
+        if len(tokenize(masked)) < _MIN_EXCERPT_TOKENS:
+            continue
+        if len(masked) > _MAX_EXCERPT_CHARS:
+            masked = masked[:_MAX_EXCERPT_CHARS].rsplit(" ", 1)[0]
+        return masked
+    return None
+
+
+def load_questions(path: str | Path) -> list[EvalQuestion]:
+    """JSONL rows of {"question": ..., "relevant_titles": [...]}; an empty list means unlabeled."""
+    questions: list[EvalQuestion] = []
+    with Path(path).open("r", encoding="utf-8") as fp:
+        for line in fp:
+            if line.strip():
+                row = json.loads(line)
+                questions.append(EvalQuestion(row["question"], tuple(row.get("relevant_titles") or ())))
+    return questions
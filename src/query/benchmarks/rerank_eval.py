@@ -0,0 +1,147 @@
+import json
+import os
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+from llama_index.core import load_index_from_storage
+from llama_index.core.postprocessor import LLMRerank
+from llama_index.core.schema import QueryBundle
+
+import src.config.settings  # noqa: F401
+from src.config.logger_config import logger
+from src.indexing.infrastructure.bm25_index import Bm25Index
+from src.indexing.infrastructure.memmap_vector_store import load_storage_context
+from src.query.benchmarks.questions import EvalQuestion, build_excerpt_questions, load_questions
+from src.query.engine import build_reranker
+from src.query.hybrid_retriever import HybridRetriever
+from src.query.label_routed_retriever import dense_search
+from src.query.rerank_policy import COSINE_RERANK_POLICY, RRF_RERANK_POLICY, RerankPolicy
+
+DEFAULT_RERANKERS = ("retrieval", "llm", "llm_adaptive", "cross-encoder", "lexical")
+REFERENCE_RERANKER = "llm"
+
+
+def _build_postprocessor(name: str, top_n: int, policy: RerankPolicy):
+    if name == "retrieval":
+        return None
+    if name == "llm":
+        # The reranker the engine used before: plain sequential LLMRerank.
+        return LLMRerank(choice_batch_size=5, top_n=top_n)
+    if name == "llm_adaptive":
+        return build_reranker("llm", top_n=top_n, policy=policy)
+    return build_reranker(name, top_n=top_n, policy=policy)
+
+
+def run_rerank_evaluation(
+    persist_dir: str = "indexes/vector_store",
+    questions_path: str | None = None,
+    rerankers: tuple[str, ...] = DEFAULT_RERANKERS,
+    candidate_k: int = 10,
+    top_n: int = 3,
+    sample_size: int = 50,
+    results_dir: str = "artifacts/benchmarks",
+    seed: int = 0,
+) -> Path:
+    """Rerank the same retrieved candidates with every reranker; report hit@n / MRR@n on labeled questions,
+    top-n agreement with LLMRerank, and rerank latency."""
+    storage = load_storage_context(persist_dir)
+    index = load_index_from_storage(storage)
+    if questions_path:
+        questions = load_questions(questions_path)
+    else:
+        pages = (
+            (node.metadata.get("title"), node.metadata.get("entity_type"), node.get_content())
+            for node in index.docstore.docs.values()
+        )
+        questions = build_excerpt_questions(pages, sample_size, seed=seed)
+    bm25_dir = Path(persist_dir) / "bm25"
+    if Bm25Index.exists(bm25_dir):
+        search = HybridRetriever(index=index, sparse_index=Bm25Index.load(bm25_dir)).search
+        policy = RRF_RERANK_POLICY
+    else:
+        search = lambda query_bundle, label_filter, top_k: dense_search(index, query_bundle, label_filter, top_k)  # noqa: E731
+        policy = COSINE_RERANK_POLICY
+
+    postprocessors = {name: _build_postprocessor(name, top_n, policy) for name in rerankers}
+    started_at = datetime.now(timezone.utc)
+    stats: dict[str, dict[str, Any]] = {
+        name: {"latencies": [], "reciprocal_ranks": [], "agreements": [], "error_count": 0} for name in rerankers
+    }
+    details: list[dict[str, Any]] = []
+    for question in questions:
+        query_bundle = QueryBundle(question.question)
+        candidates = search(query_bundle, None, candidate_k)
+        picks: dict[str, list[str]] = {}
+        titles: dict[str, list[str]] = {}
+        for name, postprocessor in postprocessors.items():
+            start = perf_counter()
+            try:
+                ranked = candidates[:top_n] if postprocessor is None else postprocessor.postprocess_nodes(list(candidates), query_bundle=query_bundle)
+            except Exception as exc:
+                # Remote rerankers can hit rate limits; one failed question must not sink the run.
+                stats[name]["error_count"] += 1
+                logger.warning("Rerank evaluation case failed: reranker={}, question={}, error={}", name, question.question, exc)
+                continue
+            stats[name]["latencies"].append(perf_counter() - start)
+            picks[name] = [node.node.node_id for node in ranked]
+            titles[name] = [str(node.node.metadata.get("title") or "") for node in ranked]
+            if question.relevant_titles:
+                stats[name]["reciprocal_ranks"].append(_reciprocal_rank(titles[name], question))
+        reference = picks.get(REFERENCE_RERANKER)
+        if reference is not None:
+            for name, node_ids in picks.items():
+                stats[name]["agreements"].append(len(set(node_ids) & set(reference)) / max(len(reference), 1))
+        details.append({**question.to_dict(), "top_titles": titles})
+
+    results = [_summarize(name, values) for name, values in stats.items()]
+    payload = {
+        "created_at": started_at.isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "persist_dir": persist_dir,
+            "questions_path": questions_path,
+            "question_count": len(questions),
+            "candidate_k": candidate_k,
+            "top_n": top_n,
+            "reference": REFERENCE_RERANKER,
+            "seed": seed,
+        },
+        "results": results,
+        "questions": details,
+    }
+    results_path = Path(results_dir) / f"rerank_eval_{started_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    results_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    logger.info("Rerank evaluation results written: results_path={}, question_count={}", str(results_path), len(questions))
+    return results_path
+
+
+def _reciprocal_rank(titles: list[str], question: EvalQuestion) -> float:
+    relevant = {title.lower() for title in question.relevant_titles}
+    for rank, title in enumerate(titles, start=1):
+        if title.lower() in relevant:
+            return 1.0 / rank
+    return 0.0
+
+
+def _summarize(name: str, values: dict[str, Any]) -> dict[str, Any]:
+    latencies = np.asarray(values["latencies"]) * 1000.0
+    reciprocal_ranks = values["reciprocal_ranks"]
+    return {
+        "reranker": name,
+        "evaluated_count": len(latencies),
+        "error_count": values["error_count"],
+        "hit_at_n": round(float(np.mean([rr > 0 for rr in reciprocal_ranks])), 4) if reciprocal_ranks else None,
+        "mrr_at_n": round(float(np.mean(reciprocal_ranks)), 4) if reciprocal_ranks else None,
+        "agreement_with_llm": round(float(np.mean(values["agreements"])), 4) if values["agreements"] else None,
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3) if len(latencies) else None,
+        "p99_ms": round(float(np.percentile(latencies, 99)), 3) if len(latencies) else None,
+    }
@@ -0,0 +1,112 @@
+import asyncio
+from typing import Any
+
+from llama_index.core.async_utils import asyncio_run
+from llama_index.core.postprocessor import LLMRerank
+from llama_index.core.schema import BaseNode, NodeWithScore, QueryBundle
+from pydantic import PrivateAttr
+
+from src.config.logger_config import logger
+from src.query.rerank_policy import RerankPlan, RerankPolicy, RerankScoreCache, RerankStats, plan_rerank
+
+
+class ConcurrentLLMRerank(LLMRerank):
+    """LLMRerank that sends its choice batches concurrently, skips or truncates reranking when retrieval
+    scores already separate the top node, and caches per-(query, node) relevance scores."""
+
+    _policy: RerankPolicy = PrivateAttr()
+    _cache: RerankScoreCache = PrivateAttr()
+    _stats: RerankStats = PrivateAttr()
+
+    def __init__(
+        self,
+        policy: RerankPolicy | None = None,
+        cache: RerankScoreCache | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._policy = policy or RerankPolicy()
+        self._cache = cache or RerankScoreCache()
+        self._stats = RerankStats()
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "ConcurrentLLMRerank"
+
+    @property
+    def stats(self) -> RerankStats:
+        return self._stats
+
+    def _postprocess_nodes(
+        self,
+        nodes: list[NodeWithScore],
+        query_bundle: QueryBundle | None = None,
+    ) -> list[NodeWithScore]:
+        if query_bundle is None:
+            raise ValueError("Query bundle must be provided.")
+        if not nodes:
+            return []
+        nodes = sorted(nodes, key=lambda node: node.score if node.score is not None else float("-inf"), reverse=True)
+        plan = plan_rerank([node.score for node in nodes], self.top_n, self._policy)
+        if plan.action == "skip":
+            self._record(plan, llm_calls=0, cache_hits=0, failed_batches=0)
+            return nodes[: self.top_n]
+
+        query_str = query_bundle.query_str
+        candidates = [node.node for node in nodes[: plan.candidate_count]]
+        scores: dict[str, float] = {}
+        uncached: list[BaseNode] = []
+        for node in candidates:
+            cached = self._cache.get(query_str, node.node_id, node.hash)
+            if cached is None:
+                uncached.append(node)
+            else:
+                scores[node.node_id] = cached
+        batches = [uncached[start : start + self.choice_batch_size] for start in range(0, len(uncached), self.choice_batch_size)]
+        results = asyncio_run(self._ascore_batches(batches, query_str)) if batches else []
+        failed_batches = 0
+        for batch, batch_scores in zip(batches, results):
+            if batch_scores is None:
+                failed_batches += 1
+                continue
+            for node in batch:
+                score = batch_scores.get(node.node_id, 0.0)
+                self._cache.put(query_str, node.node_id, node.hash, score)
+                scores[node.node_id] = score
+        self._record(plan, llm_calls=len(batches), cache_hits=len(candidates) - len(uncached), failed_batches=failed_batches)
+
+        chosen = [NodeWithScore(node=node, score=scores[node.node_id]) for node in candidates if scores.get(node.node_id, 0.0) > 0]
+        if not chosen:
+            # Nothing judged relevant (or every batch failed): keep the retrieval order rather than answer from nothing.
+            return nodes[: self.top_n]
+        return sorted(chosen, key=lambda node: node.score, reverse=True)[: self.top_n]
+
+    async def _ascore_batches(self, batches: list[list[BaseNode]], query_str: str) -> list[dict[str, float] | None]:
+        return list(await asyncio.gather(*(self._ascore_batch(batch, query_str) for batch in batches)))
+
+    async def _ascore_batch(self, batch: list[BaseNode], query_str: str) -> dict[str, float] | None:
+        raw_response = await self.llm.apredict(
+            self.choice_select_prompt,
+            context_str=self._format_node_batch_fn(batch),
+            query_str=query_str,
+        )
+        try:
+            raw_choices, relevances = self._parse_choice_select_answer_fn(raw_response, len(batch))
+            choices = [batch[int(choice) - 1] for choice in raw_choices]
+        except (ValueError, IndexError) as exc:
+            logger.warning("Rerank batch answer unparsable, batch left unscored: batch_size={}, error={}", len(batch), exc)
+            return None
+        relevances = relevances or [1.0 for _ in choices]
+        return {node.node_id: float(relevance) for node, relevance in zip(choices, relevances)}
+
+    def _record(self, plan: RerankPlan, llm_calls: int, cache_hits: int, failed_batches: int) -> None:
+        self._stats.record(plan, llm_calls=llm_calls, cache_hits=cache_hits, failed_batches=failed_batches)
+        logger.info(
+            "Rerank: action={}, candidates={}, margin={}, llm_calls={}, cache_hits={}, skip_rate={}",
+            plan.action,
+            plan.candidate_count,
+            round(plan.margin, 4) if plan.margin is not None else None,
+            llm_calls,
+            cache_hits,
+            round(self._stats.skip_rate, 4),
+        )
@@ -1,15 +1,25 @@
-from llama_index.core import StorageContext, load_index_from_storage
+from llama_index.core import load_index_from_storage
 from llama_index.core.query_engine import RetrieverQueryEngine
 from llama_index.core.response_synthesizers import get_response_synthesizer
-from llama_index.core.retrievers import VectorIndexRetriever
-from llama_index.core.postprocessor import LLMRerank
 
 import src.config.settings
+from src.config.settings import RERANK_MODEL, RERANKER
 from src.config.prompts import QA_PROMPT, CHOICE_SELECT_PROMPT
+from src.config.logger_config import logger
+from src.indexing.infrastructure.bm25_index import Bm25Index
+from src.indexing.infrastructure.memmap_vector_store import load_storage_context
+from src.query.concurrent_rerank import ConcurrentLLMRerank
+from src.query.hybrid_retriever import HybridRetriever
+from src.query.label_routed_retriever import LabelRoutedRetriever
+from src.query.local_rerank import LocalRerank
+from src.query.rerank_policy import COSINE_RERANK_POLICY, RRF_RERANK_POLICY, RerankPolicy
+from src.query.rerank_scorers import RERANKER_KINDS, build_passage_scorer
+from src.query.routing import LabelQueryRouter
 
 
 def build_query_engine():
-    storage = StorageContext.from_defaults(persist_dir="indexes/vector_store")
+    # Vectors are memory-mapped, not parsed from JSON; processes share one page-cached copy.
+    storage = load_storage_context("indexes/vector_store")
     index = load_index_from_storage(storage)
 
     synthesizer = get_response_synthesizer(
@@ -17,19 +27,47 @@ def build_query_engine():
         text_qa_template=QA_PROMPT,
     )
 
-    retriever = VectorIndexRetriever(
-        index=index,
-        similarity_top_k=10,
-    )
+    # Dense + BM25 fused with RRF ranks exact unit / ability names well enough that 5 candidates
+    # (one rerank batch) replace the dense-only top 10.
+    search = None
+    similarity_top_k = 10
+    rerank_policy = COSINE_RERANK_POLICY
+    if Bm25Index.exists("indexes/vector_store/bm25"):
+        hybrid = HybridRetriever(index=index, sparse_index=Bm25Index.load("indexes/vector_store/bm25"))
+        search = hybrid.search
+        similarity_top_k = 5
+        # Node scores are fused RRF scores now, not cosine similarities.
+        rerank_policy = RRF_RERANK_POLICY
+    else:
+        logger.warning("BM25 index missing, using dense retrieval only: run python -m src.indexing")
 
-    reranker = LLMRerank(
-        # choice_select_prompt=CHOICE_SELECT_PROMPT,
-        choice_batch_size=5,  # Rank 5 documents at a time (to fit context window)
-        top_n=3,
+    # Questions naming an entity type / rarity / trait search only that partition.
+    retriever = LabelRoutedRetriever(
+        index=index,
+        router=LabelQueryRouter(vocabulary=storage.vector_store.client.label_vocabulary()),
+        similarity_top_k=similarity_top_k,
+        routed_top_k=5,
+        search=search,
     )
 
     return RetrieverQueryEngine(
         retriever=retriever,
         response_synthesizer=synthesizer,
-        node_postprocessors=[reranker],
+        node_postprocessors=[build_reranker(RERANKER, policy=rerank_policy)],
     )
+
+
+def build_reranker(kind: str, top_n: int = 3, policy: RerankPolicy | None = None):
+    if kind not in RERANKER_KINDS:
+        raise ValueError(f"Unsupported reranker: {kind}")
+    if kind == "llm":
+        # Batches go to the LLM concurrently; a clear retrieval winner skips the rerank entirely.
+        # `policy` must match the retriever's score type (cosine by default).
+        return ConcurrentLLMRerank(
+            # choice_select_prompt=CHOICE_SELECT_PROMPT,
+            choice_batch_size=5,  # Rank 5 documents at a time (to fit context window)
+            top_n=top_n,
+            policy=policy or COSINE_RERANK_POLICY,
+        )
+    # In-process scoring: no network round-trip, rate limit or per-query cost.
+    return LocalRerank(scorer=build_passage_scorer(kind, model_name=RERANK_MODEL), top_n=top_n)
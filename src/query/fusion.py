@@ -0,0 +1,17 @@
+from collections.abc import Sequence
+
+# k=60 from Cormack et al.; larger values flatten the advantage of the very first ranks.
+DEFAULT_RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]],
+    top_n: int,
+    k: int = DEFAULT_RRF_K,
+) -> list[tuple[str, float]]:
+    """Fuse ranked id lists by sum of 1 / (k + rank); ties keep the order ids were first seen."""
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])[:top_n]
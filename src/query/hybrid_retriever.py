@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from llama_index.core import VectorStoreIndex
+from llama_index.core.base.base_retriever import BaseRetriever
+from llama_index.core.schema import NodeWithScore, QueryBundle
+
+from src.config.logger_config import logger
+from src.indexing.domain.label_filter import LabelFilter
+from src.indexing.infrastructure.bm25_index import Bm25Index
+from src.query.fusion import DEFAULT_RRF_K, reciprocal_rank_fusion
+from src.query.label_routed_retriever import dense_search
+
+
+class HybridRetriever(BaseRetriever):
+    """Dense vector search and BM25 run concurrently, fused with reciprocal rank fusion.
+
+    Each side returns `top_k * candidate_multiplier` candidates; node scores are the fused RRF scores.
+    """
+
+    def __init__(
+        self,
+        index: VectorStoreIndex,
+        sparse_index: Bm25Index,
+        similarity_top_k: int = 10,
+        candidate_multiplier: int = 2,
+        rrf_k: int = DEFAULT_RRF_K,
+        vector_store_kwargs: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.index = index
+        self.sparse_index = sparse_index
+        self.similarity_top_k = similarity_top_k
+        self.candidate_multiplier = candidate_multiplier
+        self.rrf_k = rrf_k
+        self.vector_store_kwargs = vector_store_kwargs or {}
+        # BM25 runs on this one worker while the calling thread embeds the query and searches the dense side.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hybrid-retrieval")
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __del__(self) -> None:
+        executor = getattr(self, "_executor", None)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _retrieve(self, query_bundle: QueryBundle) -> list[NodeWithScore]:
+        return self.search(query_bundle, None, self.similarity_top_k)
+
+    def search(self, query_bundle: QueryBundle, label_filter: LabelFilter | None, top_k: int) -> list[NodeWithScore]:
+        candidate_k = top_k * self.candidate_multiplier
+        sparse_future = self._executor.submit(self.sparse_index.query, query_bundle.query_str, candidate_k, label_filter)
+        dense_nodes = dense_search(self.index, query_bundle, label_filter, candidate_k, self.vector_store_kwargs)
+        sparse_ids, _ = sparse_future.result()
+
+        dense_ids = [node.node.node_id for node in dense_nodes]
+        fused = reciprocal_rank_fusion([dense_ids, sparse_ids], top_n=top_k, k=self.rrf_k)
+        nodes_by_id = {node.node.node_id: node.node for node in dense_nodes}
+        # BM25 can briefly run ahead of or behind the docstore (a build that died between the two saves);
+        # ids the docstore does not know are dropped, since get_nodes raises on them even with raise_error=False.
+        docstore = self.index.docstore
+        missing = [node_id for node_id, _ in fused if node_id not in nodes_by_id and docstore.document_exists(node_id)]
+        if missing:
+            nodes_by_id.update((node.node_id, node) for node in docstore.get_nodes(missing))
+        logger.debug(
+            "Hybrid retrieval fused: dense_count={}, sparse_count={}, overlap={}, returned={}",
+            len(dense_ids),
+            len(sparse_ids),
+            len(set(dense_ids) & set(sparse_ids)),
+            len(fused),
+        )
+        return [NodeWithScore(node=nodes_by_id[node_id], score=score) for node_id, score in fused if node_id in nodes_by_id]
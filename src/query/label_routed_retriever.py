@@ -0,0 +1,85 @@
+from collections.abc import Callable
+from typing import Any
+
+from llama_index.core import VectorStoreIndex
+from llama_index.core.base.base_retriever import BaseRetriever
+from llama_index.core.retrievers import VectorIndexRetriever
+from llama_index.core.schema import NodeWithScore, QueryBundle
+from llama_index.core.vector_stores.types import FilterOperator, MetadataFilter, MetadataFilters
+
+from src.config.logger_config import logger
+from src.indexing.domain.label_filter import LabelFilter
+from src.query.routing import LabelQueryRouter
+
+# (query, label filter or None, top_k) -> nodes; HybridRetriever.search plugs in here.
+SearchFunction = Callable[[QueryBundle, LabelFilter | None, int], list[NodeWithScore]]
+
+
+def to_metadata_filters(label_filter: LabelFilter) -> MetadataFilters:
+    filters: list[MetadataFilter] = []
+    if label_filter.entity_types:
+        filters.append(MetadataFilter(key="entity_type", value=list(label_filter.entity_types), operator=FilterOperator.IN))
+    for group in label_filter.subtype_groups:
+        filters.append(MetadataFilter(key="subtypes", value=list(group), operator=FilterOperator.ANY))
+    return MetadataFilters(filters=filters)
+
+
+class LabelRoutedRetriever(BaseRetriever):
+    """Vector retrieval restricted to the entity types / subtypes a question names.
+
+    Routed questions search only their partition and return `routed_top_k` nodes, so fewer candidates
+    reach the reranker; when the partition yields fewer than `min_routed_results`, the full index is searched.
+    """
+
+    def __init__(
+        self,
+        index: VectorStoreIndex,
+        router: LabelQueryRouter,
+        similarity_top_k: int = 10,
+        routed_top_k: int | None = None,
+        min_routed_results: int = 1,
+        vector_store_kwargs: dict[str, Any] | None = None,
+        search: SearchFunction | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.index = index
+        self.router = router
+        self.similarity_top_k = similarity_top_k
+        self.routed_top_k = routed_top_k or similarity_top_k
+        self.min_routed_results = min_routed_results
+        self.vector_store_kwargs = vector_store_kwargs or {}
+        self.search = search or self._dense_search
+
+    def _retrieve(self, query_bundle: QueryBundle) -> list[NodeWithScore]:
+        decision = self.router.route(query_bundle.query_str)
+        if not decision.label_filter.is_empty:
+            nodes = self.search(query_bundle, decision.label_filter, self.routed_top_k)
+            if len(nodes) >= self.min_routed_results:
+                logger.info(
+                    "Query routed: label_filter={}, matched_rules={}, node_count={}",
+                    decision.label_filter.to_dict(),
+                    list(decision.matched_rules),
+                    len(nodes),
+                )
+                return nodes
+            logger.info("Routed partition too small, searching full index: label_filter={}", decision.label_filter.to_dict())
+        return self.search(query_bundle, None, self.similarity_top_k)
+
+    def _dense_search(self, query_bundle: QueryBundle, label_filter: LabelFilter | None, top_k: int) -> list[NodeWithScore]:
+        return dense_search(self.index, query_bundle, label_filter, top_k, self.vector_store_kwargs)
+
+
+def dense_search(
+    index: VectorStoreIndex,
+    query_bundle: QueryBundle,
+    label_filter: LabelFilter | None,
+    top_k: int,
+    vector_store_kwargs: dict[str, Any] | None = None,
+) -> list[NodeWithScore]:
+    return VectorIndexRetriever(
+        index=index,
+        similarity_top_k=top_k,
+        filters=to_metadata_filters(label_filter) if label_filter is not None else None,
+        vector_store_kwargs=vector_store_kwargs or {},
+    ).retrieve(query_bundle)
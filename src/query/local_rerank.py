@@ -0,0 +1,54 @@
+from time import perf_counter
+from typing import Any
+
+from llama_index.core.postprocessor.types import BaseNodePostprocessor
+from llama_index.core.schema import NodeWithScore, QueryBundle
+from pydantic import Field, PrivateAttr
+
+from src.config.logger_config import logger
+from src.query.fusion import reciprocal_rank_fusion
+from src.query.rerank_scorers import PassageScorer
+
+
+class LocalRerank(BaseNodePostprocessor):
+    """Drop-in for LLMRerank that scores (query, node) pairs in-process with a PassageScorer."""
+
+    top_n: int = Field(default=3, description="Top N nodes to return.")
+    _scorer: PassageScorer = PrivateAttr()
+
+    def __init__(self, scorer: PassageScorer, top_n: int = 3, **kwargs: Any) -> None:
+        super().__init__(top_n=top_n, **kwargs)
+        self._scorer = scorer
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "LocalRerank"
+
+    def _postprocess_nodes(
+        self,
+        nodes: list[NodeWithScore],
+        query_bundle: QueryBundle | None = None,
+    ) -> list[NodeWithScore]:
+        if query_bundle is None:
+            raise ValueError("Query bundle must be provided.")
+        if not nodes:
+            return []
+        started = perf_counter()
+        passages = [f"{node.node.metadata.get('title') or ''}\n{node.node.get_content()}" for node in nodes]
+        scores = self._scorer.score(query_bundle.query_str, passages)
+        order = sorted(range(len(nodes)), key=lambda position: -scores[position])
+        ranked = [(position, float(scores[position])) for position in order]
+        if not self._scorer.standalone:
+            # Lexical evidence alone would discard the dense signal: fuse it with the retrieval order.
+            # The fused RRF score replaces the lexical one so scores keep decreasing down the list.
+            retrieval_ranking = [str(position) for position in range(len(nodes))]
+            fused = reciprocal_rank_fusion([retrieval_ranking, [str(position) for position in order]], top_n=len(nodes))
+            ranked = [(int(position), score) for position, score in fused]
+        reranked = [NodeWithScore(node=nodes[position].node, score=score) for position, score in ranked[: self.top_n]]
+        logger.debug(
+            "Local rerank: scorer={}, node_count={}, elapsed_ms={}",
+            self._scorer.name,
+            len(nodes),
+            round((perf_counter() - started) * 1000, 2),
+        )
+        return reranked
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Literal
+
+RerankAction = Literal["skip", "truncate", "full"]
+
+
+@dataclass(frozen=True)
+class RerankPolicy:
+    # Margins are relative to the top-1 retrieval score, but their useful range depends on the score type:
+    # use COSINE_RERANK_POLICY for dense similarities and RRF_RERANK_POLICY for fused ranks.
+    # Rerank is skipped when top-1 leads top-2 by at least `skip_margin`...
+    skip_margin: float = 0.4
+    # ...and otherwise only candidates scoring within `window` of top-1 are sent to the LLM (None: all).
+    window: float | None = 0.6
+
+
+COSINE_RERANK_POLICY = RerankPolicy(skip_margin=0.4, window=0.6)
+# RRF scores (k=60) sit in a narrow band: a node found by both retrievers scores about 2/(k + rank), one found
+# by a single retriever at most 1/(k + 1), roughly half of that. Skip when only the top node was found by both;
+# otherwise send just the nodes both retrievers found (a 0.6 window would keep every fused candidate).
+RRF_RERANK_POLICY = RerankPolicy(skip_margin=0.4, window=0.45)
+
+
+@dataclass(frozen=True)
+class RerankPlan:
+    action: RerankAction
+    candidate_count: int
+    margin: float | None
+
+
+def plan_rerank(scores: Sequence[float | None], top_n: int, policy: RerankPolicy) -> RerankPlan:
+    """Decide how many of the retrieved nodes (sorted by retrieval score, descending) go to the LLM."""
+    if len(scores) <= 1:
+        return RerankPlan("skip", 0, None)
+    if any(score is None for score in scores):
+        return RerankPlan("full", len(scores), None)
+    top = float(scores[0])
+    if top <= 0:
+        return RerankPlan("full", len(scores), None)
+    margin = (top - float(scores[1])) / top
+    if margin >= policy.skip_margin:
+        return RerankPlan("skip", 0, margin)
+    if policy.window is not None:
+        within = sum(1 for score in scores if float(score) >= top * (1.0 - policy.window))
+        candidate_count = min(len(scores), max(top_n, within))
+        if candidate_count < len(scores):
+            return RerankPlan("truncate", candidate_count, margin)
+    return RerankPlan("full", len(scores), margin)
+
+
+class RerankScoreCache:
+    """LRU of LLM relevance scores per (query, node id, node content hash); 0.0 means "not chosen"."""
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._scores: OrderedDict[tuple[str, str, str], float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def get(self, query: str, node_id: str, node_hash: str) -> float | None:
+        key = (query, node_id, node_hash)
+        score = self._scores.get(key)
+        if score is not None:
+            self._scores.move_to_end(key)
+        return score
+
+    def put(self, query: str, node_id: str, node_hash: str, score: float) -> None:
+        key = (query, node_id, node_hash)
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        while len(self._scores) > self.max_entries:
+            self._scores.popitem(last=False)
+
+
+@dataclass
+class RerankStats:
+    query_count: int = 0
+    skipped_count: int = 0
+    truncated_count: int = 0
+    llm_call_count: int = 0
+    cache_hit_count: int = 0
+    failed_batch_count: int = 0
+
+    @property
+    def skip_rate(self) -> float:
+        return self.skipped_count / self.query_count if self.query_count else 0.0
+
+    def record(self, plan: RerankPlan, llm_calls: int, cache_hits: int, failed_batches: int) -> None:
+        self.query_count += 1
+        self.skipped_count += plan.action == "skip"
+        self.truncated_count += plan.action == "truncate"
+        self.llm_call_count += llm_calls
+        self.cache_hit_count += cache_hits
+        self.failed_batch_count += failed_batches
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "query_count": self.query_count,
+            "skipped_count": self.skipped_count,
+            "truncated_count": self.truncated_count,
+            "skip_rate": round(self.skip_rate, 4),
+            "llm_call_count": self.llm_call_count,
+            "cache_hit_count": self.cache_hit_count,
+            "failed_batch_count": self.failed_batch_count,
+        }
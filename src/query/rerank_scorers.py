@@ -0,0 +1,100 @@
+import math
+from collections import Counter
+from collections.abc import Sequence
+from typing import Protocol, runtime_checkable
+
+from src.config.logger_config import logger
+from src.indexing.domain.tokenization import tokenize
+
+RERANKER_KINDS = ("llm", "cross-encoder", "lexical")
+DEFAULT_CROSS_ENCODER = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+
+
+@runtime_checkable
+class PassageScorer(Protocol):
+    name: str
+    # False when the scores are weak evidence on their own and should be fused with the retrieval order.
+    standalone: bool
+
+    def score(self, query: str, passages: Sequence[str]) -> list[float]:
+        """Relevance of each passage to the query; higher is better."""
+
+
+class LexicalScorer:
+    """Feature-based scorer: BM25 over the candidate pool, title coverage and query bigram hits.
+
+    Passages are "<title>\\n<text>", as LocalRerank builds them.
+    """
+
+    name = "lexical"
+    standalone = False
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, title_weight: float = 1.5, phrase_weight: float = 1.0) -> None:
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self.phrase_weight = phrase_weight
+
+    def score(self, query: str, passages: Sequence[str]) -> list[float]:
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms or not passages:
+            return [0.0 for _ in passages]
+        query_bigrams = set(zip(query_terms, query_terms[1:]))
+        tokenized = [tokenize(passage) for passage in passages]
+        titles = [set(tokenize(passage.split("\n", 1)[0])) for passage in passages]
+        average_length = sum(len(tokens) for tokens in tokenized) / len(tokenized) or 1.0
+        document_frequency = Counter(term for tokens in tokenized for term in set(tokens))
+
+        scores: list[float] = []
+        for tokens, title in zip(tokenized, titles):
+            counts = Counter(tokens)
+            norm = self.k1 * (1.0 - self.b + self.b * len(tokens) / average_length)
+            bm25 = 0.0
+            for term in query_terms:
+                tf = counts.get(term, 0)
+                if tf:
+                    df = document_frequency[term]
+                    idf = math.log(1.0 + (len(passages) - df + 0.5) / (df + 0.5))
+                    bm25 += idf * tf * (self.k1 + 1.0) / (tf + norm)
+            title_coverage = sum(1 for term in query_terms if term in title) / len(query_terms)
+            phrase_hits = len(query_bigrams & set(zip(tokens, tokens[1:]))) / len(query_bigrams) if query_bigrams else 0.0
+            scores.append(bm25 + self.title_weight * title_coverage + self.phrase_weight * phrase_hits)
+        return scores
+
+
+class CrossEncoderScorer:
+    """Small sentence-transformers cross-encoder on CPU; pairs are scored in batches."""
+
+    name = "cross-encoder"
+    standalone = True
+
+    def __init__(self, model_name: str = DEFAULT_CROSS_ENCODER, device: str = "cpu", batch_size: int = 16, max_length: int = 512) -> None:
+        from sentence_transformers import CrossEncoder
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.model = CrossEncoder(model_name, device=device, max_length=max_length)
+
+    def score(self, query: str, passages: Sequence[str]) -> list[float]:
+        if not passages:
+            return []
+        scores = self.model.predict(
+            [(query, passage) for passage in passages],
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+        )
+        return [float(score) for score in scores]
+
+
+def build_passage_scorer(kind: str, model_name: str = DEFAULT_CROSS_ENCODER, device: str = "cpu") -> PassageScorer:
+    """Cross-encoder when its model can be loaded, otherwise the lexical scorer."""
+    if kind == "lexical":
+        return LexicalScorer()
+    if kind != "cross-encoder":
+        raise ValueError(f"Unsupported local reranker: {kind}")
+    try:
+        return CrossEncoderScorer(model_name, device=device)
+    except Exception as exc:
+        # Missing package, unknown model id, download or hub errors: any of them leaves lexical scoring.
+        logger.warning("Cross-encoder unavailable, using lexical reranker: model_name={}, error={}", model_name, exc)
+        return LexicalScorer()
@@ -0,0 +1,105 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Pattern
+
+from src.classification.domain.types import EntityType
+from src.indexing.domain.label_filter import LabelFilter
+
+# Question-side counterparts of the classification rules. They only have to recognise what a question
+# names; a wrong restriction hides the answer, so every pattern errs on the side of not matching.
+ENTITY_ROUTE_PATTERNS: tuple[tuple[str, Pattern[str], EntityType], ...] = (
+    # "Battle Cats" / "Empire of Cats" / 貓咪大戰爭 name the game or a chapter, not a unit.
+    ("route_cat", re.compile(r"(?<!battle )(?<!of )\bcats?\b|\bcat units?\b|貓(?!咪大戰爭)|猫(?!咪大战争)", re.I), "cat"),
+    ("route_enemy", re.compile(r"\benem(?:y|ies)\b|敵人|敌人", re.I), "enemy"),
+    ("route_stage", re.compile(r"\bstages?\b|關卡|关卡", re.I), "stage"),
+    ("route_update", re.compile(r"\bversion\s*\d+\.\d+|\bpatch\s*notes?\b|版本更新", re.I), "update"),
+)
+
+
+CAT_RARITY_ROUTE_PATTERNS: tuple[tuple[Pattern[str], str], ...] = (
+    (re.compile(r"\bnormal cats?\b|基本貓|基本猫", re.I), "rarity:normal"),
+    (re.compile(r"\bspecial cats?\b|\bex cats?\b|EX貓|EX猫", re.I), "rarity:special"),
+    (re.compile(r"(?<!super )(?<!uber )\brare cats?\b|(?<!激)稀有貓|(?<!激)稀有猫", re.I), "rarity:rare"),
+    (re.compile(r"\bsuper rares?\b|(?<!超)激稀有", re.I), "rarity:super_rare"),
+    (re.compile(r"\buber(?: rares?)?s?\b|超激稀有", re.I), "rarity:uber_rare"),
+    (re.compile(r"\blegend(?:ary)? rares?\b|傳說稀有|传说稀有", re.I), "rarity:legend_rare"),
+)
+
+
+CAT_ATTACK_ROUTE_PATTERNS: tuple[tuple[Pattern[str], str], ...] = (
+    (re.compile(r"\bsingle[- ]target\b|單體攻擊|单体攻击", re.I), "attack_type:single"),
+    (re.compile(r"\barea attack\b|範圍攻擊|范围攻击", re.I), "attack_type:area"),
+    (re.compile(r"\blong[- ]distance\b|遠方攻擊|远方攻击", re.I), "attack_type:long_distance"),
+    (re.compile(r"\bomni[- ]?strike\b|全方位攻擊|全方位攻击", re.I), "attack_type:omni"),
+)
+
+
+# Trait slugs as the classifier derives them from "Anti-<Trait> Cats" / "<Trait> Enemies"; some traits
+# are named two ways, and the vocabulary check keeps whichever the index actually has.
+TRAIT_ROUTE_PATTERNS: tuple[tuple[Pattern[str], tuple[str, ...]], ...] = (
+    (re.compile(r"\bred\b|紅色|红色", re.I), ("red",)),
+    (re.compile(r"\bfloating\b|飄浮|漂浮", re.I), ("floating",)),
+    (re.compile(r"\bblack\b|黑色", re.I), ("black",)),
+    (re.compile(r"\bmetal\b|鋼鐵|钢铁", re.I), ("metal",)),
+    (re.compile(r"\bangels?\b|天使", re.I), ("angel",)),
+    (re.compile(r"\baliens?\b|外星", re.I), ("alien",)),
+    (re.compile(r"\bzombies?\b|不死|殭屍|僵尸", re.I), ("zombie",)),
+    (re.compile(r"\brelics?\b|古代種|古代种", re.I), ("relic",)),
+    (re.compile(r"\baku\b|惡魔|恶魔", re.I), ("aku",)),
+    (re.compile(r"\btraitless\b|\bwhite enem(?:y|ies)\b|無屬性|无属性", re.I), ("traitless", "white")),
+)
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    label_filter: LabelFilter
+    matched_rules: tuple[str, ...]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"label_filter": self.label_filter.to_dict(), "matched_rules": list(self.matched_rules)}
+
+
+class LabelQueryRouter:
+    """Maps a question to the classification labels it names, so retrieval can search that partition only."""
+
+    def __init__(self, vocabulary: tuple[set[str], set[str]] | None = None) -> None:
+        # (entity types, subtype tags) present in the index; labels outside it are never routed to.
+        self.vocabulary = vocabulary
+
+    def route(self, question: str) -> RouteDecision:
+        matched: list[str] = []
+        entity_types: list[str] = []
+        for rule_id, pattern, entity_type in ENTITY_ROUTE_PATTERNS:
+            if pattern.search(question):
+                entity_types.append(entity_type)
+                matched.append(rule_id)
+
+        cat_groups: list[tuple[str, ...]] = []
+        for patterns in (CAT_RARITY_ROUTE_PATTERNS, CAT_ATTACK_ROUTE_PATTERNS):
+            tags = tuple(tag for pattern, tag in patterns if pattern.search(question))
+            if tags:
+                cat_groups.append(tags)
+                matched.extend(tags)
+        traits = tuple(slug for pattern, slugs in TRAIT_ROUTE_PATTERNS if pattern.search(question) for slug in slugs)
+        matched.extend(f"trait:{slug}" for slug in traits)
+
+        subtype_groups: list[tuple[str, ...]] = []
+        if cat_groups and entity_types in ([], ["cat"]):
+            # Rarity and attack type only exist on cat pages.
+            entity_types = ["cat"]
+            subtype_groups.extend(cat_groups)
+        # A trait means target_trait for cats and trait for enemies; with both or neither named it stays open.
+        if traits and entity_types == ["cat"]:
+            subtype_groups.append(tuple(f"target_trait:{slug}" for slug in traits))
+        elif traits and entity_types == ["enemy"]:
+            subtype_groups.append(tuple(f"trait:{slug}" for slug in traits))
+
+        if self.vocabulary is not None:
+            known_entities, known_subtypes = self.vocabulary
+            entity_types = [entity_type for entity_type in entity_types if entity_type in known_entities]
+            subtype_groups = [tuple(tag for tag in group if tag in known_subtypes) for group in subtype_groups]
+            subtype_groups = [group for group in subtype_groups if group]
+        return RouteDecision(
+            label_filter=LabelFilter(entity_types=tuple(entity_types), subtype_groups=tuple(subtype_groups)),
+            matched_rules=tuple(matched),
+        )
@@ -1,5 +1,6 @@
 import json
 import unittest
+from dataclasses import replace
 from pathlib import Path
 from unittest.mock import patch
 
@@ -10,9 +11,10 @@ from src.classification.application.use_cases.classify_wiki_pages import (
 from src.classification.application.workflows.classification_pipeline import ClassificationPipeline, PipelineConfig
 from src.classification.domain.entities import PageRef
 from src.classification.domain.classifier import RuleBasedClassifier
+from src.classification.domain.rule_fingerprints import compute_rule_fingerprints
 from src.classification.infrastructure.state.classification_state_store import ClassificationStateStore
 from src.classification.infrastructure.sinks.jsonl_sink import JsonlClassificationSink
-from src.classification.infrastructure.sinks.report_sink import JsonReportSink
+from src.classification.infrastructure.sinks.report_sink import JsonReportSink, JsonShadowDiffSink
 from src.classification.infrastructure.sources.HtmlPageSource import HtmlPageSource
 from tests.utils.tempdir import managed_temp_dir
 
@@ -23,7 +25,17 @@ def _write_page(path: Path, payload: dict) -> None:
 
 class ClassificationPipelineTests(unittest.TestCase):
     @staticmethod
-    def _run_html_pipeline(tmp_path: Path, input_dir: Path, labels_name: str, *, incremental: bool, full_rebuild: bool, state_db: Path):
+    def _run_html_pipeline(
+        tmp_path: Path,
+        input_dir: Path,
+        labels_name: str,
+        *,
+        incremental: bool,
+        full_rebuild: bool,
+        state_db: Path,
+        selective_reclassify: bool = False,
+        prune_missing: bool = False,
+    ):
         state_store = None
         state_store_recovered = False
         state_store_recovered_from = None
@@ -56,6 +68,8 @@ class ClassificationPipelineTests(unittest.TestCase):
                 incremental=incremental,
                 full_rebuild=full_rebuild,
                 state_db_path=str(state_db),
+                selective_reclassify=selective_reclassify,
+                prune_missing=prune_missing,
             )
         )
 
@@ -115,6 +129,94 @@ class ClassificationPipelineTests(unittest.TestCase):
             lines = labels_path.read_text(encoding="utf-8").strip().splitlines()
             self.assertEqual(len(lines), 2)
 
+    def test_pipeline_shadow_classifier_diffs_without_touching_state(self):
+        class StageShadowClassifier(RuleBasedClassifier):
+            def classify(self, page):
+                result = super().classify(page)
+                if result.entity_type != "cat":
+                    return result
+                return replace(result, entity_type="stage", subtypes=("stage_family:shadow",), confidence=result.confidence - 0.5)
+
+        with managed_temp_dir("pipeline_shadow") as tmp_path:
+            input_dir = tmp_path / "html"
+            input_dir.mkdir()
+            state_db = tmp_path / "classification_state.db"
+            _write_page(
+                input_dir / "cat.json",
+                {
+                    "pageid": 1,
+                    "title": "Cat A",
+                    "revid": 1,
+                    "categories": ["Category:Cat Units", "Category:Uber Rare Cats"],
+                    "content": "cat content",
+                    "is_redirect": False,
+                },
+            )
+            _write_page(
+                input_dir / "enemy.json",
+                {
+                    "pageid": 2,
+                    "title": "Enemy A",
+                    "revid": 1,
+                    "categories": ["Category:Enemy Units"],
+                    "content": "enemy content",
+                    "is_redirect": False,
+                },
+            )
+
+            def run(name: str):
+                state_store = ClassificationStateStore(str(state_db))
+                pipeline = ClassificationPipeline(
+                    source=HtmlPageSource(str(input_dir)),
+                    classifier=RuleBasedClassifier(),
+                    sink=JsonlClassificationSink(str(tmp_path / f"{name}.jsonl"), str(tmp_path / f"{name}_review.jsonl")),
+                    report_sink=JsonReportSink(str(tmp_path / f"{name}_report.json")),
+                    state_store=state_store,
+                    shadow_classifier=StageShadowClassifier(),
+                    shadow_sink=JsonlClassificationSink(
+                        str(tmp_path / f"{name}_shadow.jsonl"), str(tmp_path / f"{name}_shadow_review.jsonl")
+                    ),
+                    shadow_report_sink=JsonShadowDiffSink(str(tmp_path / f"{name}_diff.json")),
+                )
+                result = ClassifyWikiPagesUseCase(pipeline=pipeline).execute(
+                    ClassifyWikiPagesCommand(source_mode="html", include_redirects=True, incremental=True, show_progress=False)
+                )
+                diff = json.loads((tmp_path / f"{name}_diff.json").read_text(encoding="utf-8"))
+                return result, diff
+
+            first, first_diff = run("first")
+            self.assertEqual(first.classified_count, 2)
+            self.assertEqual(first_diff["compared_count"], 2)
+            self.assertEqual(first_diff["entity_changed_count"], 1)
+            self.assertEqual(first_diff["entity_transitions"], {"cat->stage": 1})
+            self.assertEqual(first_diff["subtypes_added"], {"stage_family:shadow": 1})
+            self.assertEqual(first_diff["confidence_shift"]["decreased_count"], 1)
+            shadow_rows = [
+                json.loads(line) for line in (tmp_path / "first_shadow.jsonl").read_text(encoding="utf-8").splitlines()
+            ]
+            self.assertEqual(sorted(row["entity_type"] for row in shadow_rows), ["enemy", "stage"])
+
+            # Incremental skips still feed the shadow comparison; state keeps the primary label.
+            second, second_diff = run("second")
+            self.assertEqual(second.classified_count, 0)
+            self.assertEqual(second_diff["compared_count"], 2)
+            store = ClassificationStateStore(str(state_db))
+            try:
+                self.assertEqual(store.get("1").entity_type, "cat")
+            finally:
+                store.close()
+
+    def test_pipeline_shadow_classifier_requires_sinks(self):
+        with managed_temp_dir("pipeline_shadow_invalid") as tmp_path:
+            with self.assertRaises(ValueError):
+                ClassificationPipeline(
+                    source=HtmlPageSource(str(tmp_path)),
+                    classifier=RuleBasedClassifier(),
+                    sink=JsonlClassificationSink(str(tmp_path / "labels.jsonl"), str(tmp_path / "review.jsonl")),
+                    report_sink=JsonReportSink(str(tmp_path / "report.json")),
+                    shadow_classifier=RuleBasedClassifier(),
+                )
+
     def test_pipeline_closes_sink_when_load_raises(self):
         class FailingSource:
             def discover(self):
@@ -334,6 +436,89 @@ class ClassificationPipelineTests(unittest.TestCase):
                 second = self._run_html_pipeline(tmp_path, input_dir, "labels_strategy_2.jsonl", incremental=True, full_rebuild=False, state_db=state_db)
             self.assertEqual(second.classified_count, 1)
 
+    def test_pipeline_selective_reclassify_carries_forward_unaffected_pages(self):
+        with managed_temp_dir("pipeline_selective_reclassify") as tmp_path:
+            input_dir = tmp_path / "html"
+            input_dir.mkdir()
+            state_db = tmp_path / "classification_state.db"
+            _write_page(
+                input_dir / "enemy.json",
+                {
+                    "pageid": 51,
+                    "title": "Enemy T",
+                    "revid": 5,
+                    "categories": ["Category:Enemies"],
+                    "content": "enemy body",
+                    "is_redirect": False,
+                },
+            )
+            run = lambda name: self._run_html_pipeline(
+                tmp_path, input_dir, name, incremental=True, full_rebuild=False, state_db=state_db, selective_reclassify=True
+            )
+            self.assertEqual(run("labels_selective_1.jsonl").classified_count, 1)
+
+            pipeline_module = "src.classification.application.workflows.classification_pipeline"
+            with patch(f"{pipeline_module}.CLASSIFICATION_STRATEGY_VERSION", "9.9.9"):
+                carried = run("labels_selective_2.jsonl")
+            self.assertEqual(carried.classified_count, 0)
+            state = ClassificationStateStore(str(state_db))
+            try:
+                row = state.get("51")
+            finally:
+                state.close()
+            self.assertEqual(row.strategy_version, "9.9.9")
+            self.assertEqual(row.entity_type, "enemy")
+
+            # A changed rule the page matched forces a re-run under the next version.
+            hit_rule = row.rule_hits[0]
+            changed = {**compute_rule_fingerprints(), hit_rule: "changed"}
+            with (
+                patch(f"{pipeline_module}.CLASSIFICATION_STRATEGY_VERSION", "9.9.10"),
+                patch(f"{pipeline_module}.compute_rule_fingerprints", return_value=changed),
+            ):
+                rerun = run("labels_selective_3.jsonl")
+            self.assertEqual(rerun.classified_count, 1)
+
+    def test_pipeline_reports_corpus_totals_alongside_run_delta(self):
+        with managed_temp_dir("pipeline_corpus_totals") as tmp_path:
+            input_dir = tmp_path / "html"
+            input_dir.mkdir()
+            state_db = tmp_path / "classification_state.db"
+            pages = {
+                "cat.json": {"pageid": 1, "title": "Cat A", "revid": 1, "categories": ["Category:Cat Units"]},
+                "enemy.json": {"pageid": 2, "title": "Enemy A", "revid": 1, "categories": ["Category:Enemy Units"]},
+                "other.json": {"pageid": 3, "title": "Other", "revid": 1, "categories": []},
+            }
+            for name, payload in pages.items():
+                _write_page(input_dir / name, {**payload, "content": "body", "is_redirect": False})
+
+            first = self._run_html_pipeline(tmp_path, input_dir, "labels_totals_1.jsonl", incremental=True, full_rebuild=False, state_db=state_db)
+            self.assertEqual(first.corpus_totals["total_pages"], 3)
+
+            # Page 3 changes into an enemy page; only it is re-classified.
+            _write_page(
+                input_dir / "other.json",
+                {"pageid": 3, "title": "Other", "revid": 2, "categories": ["Category:Enemy Units"], "content": "body", "is_redirect": False},
+            )
+            second = self._run_html_pipeline(tmp_path, input_dir, "labels_totals_2.jsonl", incremental=True, full_rebuild=False, state_db=state_db)
+            self.assertEqual(second.classified_count, 1)
+            self.assertEqual(second.by_entity_type["enemy"], 1)
+            self.assertEqual(second.corpus_totals["total_pages"], 3)
+            self.assertEqual(second.corpus_totals["by_entity_type"], {"cat": 1, "enemy": 2})
+            self.assertEqual(second.corpus_totals["misc_count"], 0)
+            report = json.loads((tmp_path / "report_labels_totals_2.jsonl.json").read_text(encoding="utf-8"))
+            self.assertEqual(report["corpus_totals"], second.corpus_totals)
+
+            # A page removed from the corpus stops counting once a full pass no longer yields it.
+            (input_dir / "cat.json").unlink()
+            kept = self._run_html_pipeline(tmp_path, input_dir, "labels_totals_3.jsonl", incremental=True, full_rebuild=False, state_db=state_db)
+            self.assertEqual(kept.corpus_totals["total_pages"], 3)
+            third = self._run_html_pipeline(
+                tmp_path, input_dir, "labels_totals_4.jsonl", incremental=True, full_rebuild=False, state_db=state_db, prune_missing=True
+            )
+            self.assertEqual(third.corpus_totals["total_pages"], 2)
+            self.assertEqual(third.corpus_totals["by_entity_type"], {"enemy": 2})
+
     def test_pipeline_recovers_when_state_db_is_corrupted(self):
         with managed_temp_dir("pipeline_state_corrupt") as tmp_path:
             input_dir = tmp_path / "html"
@@ -0,0 +1,83 @@
+import json
+import sqlite3
+import unittest
+
+from src.classification.benchmarks.suite import compare_benchmark_runs, run_benchmark_suite
+from src.classification.benchmarks.synthetic_corpus import (
+    SyntheticCorpusConfig,
+    generate_corpus,
+    load_category_buckets,
+    mutate_corpus,
+)
+from tests.utils.tempdir import managed_temp_dir
+
+
+class SyntheticCorpusTests(unittest.TestCase):
+    def test_category_buckets_follow_category_rules(self):
+        buckets = load_category_buckets("categories.json")
+        self.assertIn("Category:Angel Enemies", buckets["enemy"])
+        self.assertIn("Category:3DS Stages", buckets["stage"])
+
+    def test_db_layout_writes_pages_and_registry_then_mutates(self):
+        with managed_temp_dir("synthetic_corpus_db") as tmp_path:
+            config = SyntheticCorpusConfig(page_count=40, layout="db", redirect_ratio=0.25, seed=3)
+            corpus = generate_corpus(str(tmp_path / "corpus"), config)
+
+            files = sorted((tmp_path / "corpus" / "page").glob("*.json"))
+            self.assertEqual(len(files), 40)
+            self.assertEqual(sum(corpus.by_theme.values()), 40)
+            payloads = [json.loads(path.read_text(encoding="utf-8")) for path in files]
+            self.assertEqual(sum(p["is_redirect"] for p in payloads), corpus.redirect_count)
+            conn = sqlite3.connect(corpus.db_path)
+            try:
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0], 40)
+            finally:
+                conn.close()
+
+            again = generate_corpus(str(tmp_path / "again"), config)
+            self.assertEqual(again.by_theme, corpus.by_theme)
+
+            changed = mutate_corpus(corpus, fraction=0.5, seed=1)
+            self.assertGreater(changed, 0)
+            conn = sqlite3.connect(corpus.db_path)
+            try:
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM pages WHERE last_revid = 2").fetchone()[0], changed)
+            finally:
+                conn.close()
+
+    def test_mutations_use_the_corpus_category_set(self):
+        with managed_temp_dir("synthetic_corpus_categories") as tmp_path:
+            categories_path = tmp_path / "categories.json"
+            categories_path.write_text(json.dumps(["Category:Zebra Cats", "Category:Quokka Enemies"]), encoding="utf-8")
+            config = SyntheticCorpusConfig(page_count=10, redirect_ratio=0.0, categories_path=str(categories_path))
+            corpus = generate_corpus(str(tmp_path / "corpus"), config)
+            self.assertEqual(corpus.config, config)
+
+            self.assertEqual(mutate_corpus(corpus, fraction=1.0, seed=1), 10)
+            for path in (tmp_path / "corpus" / "page").glob("*.json"):
+                appended = json.loads(path.read_text(encoding="utf-8"))["content"].rsplit("\n", 1)[1]
+                self.assertLessEqual(set(appended.split()), {"Zebra", "Cats", "Quokka", "Enemies"})
+
+    def test_unknown_layout_is_rejected(self):
+        with managed_temp_dir("synthetic_corpus_layout") as tmp_path:
+            with self.assertRaises(ValueError):
+                generate_corpus(str(tmp_path), SyntheticCorpusConfig(page_count=1, layout="xml"))
+
+    def test_suite_writes_comparable_results(self):
+        with managed_temp_dir("benchmark_suite") as tmp_path:
+            results_path = run_benchmark_suite(
+                sizes=(15,),
+                layouts=("html",),
+                work_dir=str(tmp_path / "work"),
+                results_dir=str(tmp_path / "results"),
+            )
+            payload = json.loads(results_path.read_text(encoding="utf-8"))
+            names = {row["name"] for row in payload["results"]}
+            self.assertTrue({"classifier_classify", "content_hash", "state_store_upsert", "sink_jsonl"} <= names)
+            self.assertTrue({"run_classify_full", "run_classify_incremental_changed"} <= names)
+            full = next(row for row in payload["results"] if row["name"] == "run_classify_full")
+            self.assertEqual(full["extra"]["classified_count"], 15)
+            self.assertGreater(full["pages_per_sec"], 0)
+
+            comparison = compare_benchmark_runs(str(results_path), str(results_path))
+            self.assertTrue(all(row["speedup"] in (1.0, None) for row in comparison))
@@ -4,7 +4,9 @@ from src.classification.domain.incremental_policy import (
     PageFingerprint,
     StateFingerprint,
     evaluate_incremental_decision,
+    evaluate_rule_change_impact,
 )
+from src.classification.domain.rule_fingerprints import RULESET_GLOBAL_KEY
 
 
 class IncrementalPolicyTests(unittest.TestCase):
@@ -55,3 +57,48 @@ class IncrementalPolicyTests(unittest.TestCase):
         )
         self.assertTrue(decision.should_classify)
         self.assertEqual(decision.reason, "content_hash_changed")
+
+    def test_rule_change_carried_forward_when_page_never_hit_changed_rule(self):
+        existing = StateFingerprint("html", 1, "h1", "1.0.0", entity_type="enemy", rule_hits=("enemy_category",))
+        decision = evaluate_rule_change_impact(
+            existing=existing,
+            previous_rules={RULESET_GLOBAL_KEY: "g", "enemy_category": "a", "cat_title": "b", "subtype:cat:x": "c"},
+            current_rules={RULESET_GLOBAL_KEY: "g", "enemy_category": "a", "cat_title": "B", "subtype:cat:x": "C"},
+            current_hits=lambda rule_ids: set(),
+        )
+        self.assertFalse(decision.should_classify)
+        self.assertEqual(decision.reason, "rule_change_carried_forward")
+
+    def test_rule_change_reclassifies_on_recorded_or_new_hit(self):
+        existing = StateFingerprint("html", 1, "h1", "1.0.0", entity_type="enemy", rule_hits=("enemy_category",))
+        previous = {RULESET_GLOBAL_KEY: "g", "enemy_category": "a", "cat_title": "b"}
+        recorded = evaluate_rule_change_impact(
+            existing=existing,
+            previous_rules=previous,
+            current_rules={**previous, "enemy_category": "A"},
+            current_hits=lambda rule_ids: set(),
+        )
+        self.assertEqual(recorded.reason, "rule_changed:enemy_category")
+        new_hit = evaluate_rule_change_impact(
+            existing=existing,
+            previous_rules=previous,
+            current_rules={**previous, "cat_title": "B"},
+            current_hits=lambda rule_ids: set(rule_ids),
+        )
+        self.assertEqual(new_hit.reason, "rule_changed:cat_title")
+
+    def test_rule_change_reclassifies_without_history_or_on_global_change(self):
+        rules = {RULESET_GLOBAL_KEY: "g"}
+        with_hits = StateFingerprint("html", 1, "h1", "1.0.0", entity_type="enemy", rule_hits=())
+        self.assertEqual(
+            evaluate_rule_change_impact(with_hits, {}, rules, lambda rule_ids: set()).reason,
+            "rule_fingerprints_missing",
+        )
+        self.assertEqual(
+            evaluate_rule_change_impact(StateFingerprint("html", 1, "h1", "1.0.0"), rules, rules, lambda rule_ids: set()).reason,
+            "rule_hits_missing",
+        )
+        self.assertEqual(
+            evaluate_rule_change_impact(with_hits, rules, {RULESET_GLOBAL_KEY: "G"}, lambda rule_ids: set()).reason,
+            "ruleset_changed",
+        )
@@ -0,0 +1,54 @@
+import unittest
+
+from src.classification.domain.classifier import RuleBasedClassifier
+from src.classification.domain.entities import WikiPage
+from src.classification.domain.rule_profiler import RuleProfiler, subtype_pattern_id
+from src.classification.domain.rules import CAT_SUBTYPE_PATTERNS, PRIMARY_RULES
+
+
+def _page(pageid: int, title: str, categories: tuple[str, ...], content: str = "") -> WikiPage:
+    return WikiPage(
+        pageid=pageid,
+        title=title,
+        revid=100,
+        timestamp="2025-01-01T00:00:00Z",
+        canonical_url="https://example.com",
+        categories=categories,
+        content=content,
+        is_redirect=False,
+    )
+
+
+class RuleProfilerTests(unittest.TestCase):
+    def setUp(self):
+        self.pages = [
+            _page(1, "Cat A", ("Category:Cat Units", "Category:Uber Rare Cats")),
+            _page(2, "Enemy A", ("Category:Enemy Units",)),
+            _page(3, "Nothing", ()),
+        ]
+
+    def test_profiled_classification_is_unchanged(self):
+        plain = [RuleBasedClassifier().classify(page) for page in self.pages]
+        profiled_classifier = RuleBasedClassifier(profiler=RuleProfiler())
+        self.assertEqual([profiled_classifier.classify(page) for page in self.pages], plain)
+        self.assertEqual(RuleBasedClassifier(profiler=RuleProfiler()).classify_batch(self.pages), plain)
+
+    def test_records_evaluations_hits_and_decisions(self):
+        profiler = RuleProfiler(max_examples=1)
+        classifier = RuleBasedClassifier(profiler=profiler)
+        for page in self.pages:
+            classifier.classify(page)
+
+        report = profiler.to_report()
+        self.assertEqual(report["page_count"], 3)
+        by_id = {row["rule_id"]: row for row in report["rules"]}
+        self.assertEqual(by_id["cat_units"]["eval_count"], len(self.pages))
+        self.assertEqual(by_id["cat_units"]["hit_count"], 1)
+        self.assertEqual(by_id["cat_units"]["decided_examples"], ["1"])
+        rarity = by_id[subtype_pattern_id("cat", CAT_SUBTYPE_PATTERNS[4][0])]
+        self.assertEqual(rarity["hit_count"], 1)
+        self.assertEqual(rarity["decided_count"], 1)
+        self.assertIn("stage_general", report["dead_rules"])
+        self.assertEqual(len([row for row in report["rules"] if row["kind"] == "primary"]), len(PRIMARY_RULES))
+        totals = [row["total_ms"] for row in report["rules"]]
+        self.assertEqual(totals, sorted(totals, reverse=True))
@@ -1,7 +1,10 @@
+import re
 import unittest
+from dataclasses import replace
 
 from src.classification.domain.classifier import RuleBasedClassifier
 from src.classification.domain.entities import WikiPage
+from src.classification.domain.rules import DEFAULT_RULE_SET, RuleSpec
 
 
 def _page(title: str, categories: tuple[str, ...], content: str = "") -> WikiPage:
@@ -56,3 +59,50 @@ class RuleClassifierTests(unittest.TestCase):
         self.assertEqual(result.entity_type, "stage")
         self.assertTrue(result.is_ambiguous)
         self.assertIn("low_margin_conflict:stage_vs_update", result.reasons)
+
+    def test_classify_batch_matches_single_page_classify(self):
+        pages = [
+            _page("Cat A", ("Category:Cat Units", "Category:Uber Rare Cats")),
+            _page("Enemy A", ("Category:Enemy Units",)),
+            _page("Mixed Signals", ("Category:Versions", "Category:Cat Units")),
+            _page(
+                "1 + 2 = Tor",
+                ("Category:Sub-chapter 106 Stages", "Category:Zero Legends Stages"),
+                content="Like other stages added in Version 13.0.",
+            ),
+            _page("List of Enemies", (), content="== List of enemies"),
+            _page("Nothing", ()),
+        ]
+        classifier = RuleBasedClassifier()
+        self.assertEqual(classifier.classify_batch(pages), [classifier.classify(page) for page in pages])
+        self.assertEqual(classifier.classify_batch([]), [])
+
+    def test_classify_batch_reweights_rules_from_hit_matrix(self):
+        pages = [_page("Ambiguous", ("Category:Cat Units", "Category:Enemy Units"))]
+        classifier = RuleBasedClassifier()
+        hits = classifier.rule_hit_matrix(pages)
+        self.assertEqual(classifier.classify_batch(pages, hits=hits)[0].entity_type, "cat")
+
+        reweighted = classifier.classify_batch(pages, rule_weights={"enemy_units": 2.0}, hits=hits)
+        self.assertEqual(reweighted[0].entity_type, "enemy")
+        with self.assertRaises(ValueError):
+            classifier.classify_batch(pages, rule_weights={"missing_rule": 1.0})
+
+    def test_candidate_rule_set_is_used_instead_of_the_default(self):
+        candidate = replace(
+            DEFAULT_RULE_SET,
+            strategy_version="candidate",
+            primary_rules=DEFAULT_RULE_SET.primary_rules
+            + (RuleSpec("mechanic_gimmick", "mechanic", 2.0, "title", re.compile(r"gimmick", re.I)),),
+            subtype_patterns={**DEFAULT_RULE_SET.subtype_patterns, "cat": ((re.compile(r"category:(.+) cats", re.I), "tag:{group1}"),)},
+        )
+        pages = [_page("Gimmick Cat", ("Category:Cat Units",)), _page("Cat A", ("Category:Cat Units", "Category:Rare Cats"))]
+
+        default = [RuleBasedClassifier().classify(page) for page in pages]
+        shadow = [RuleBasedClassifier(rules=candidate).classify(page) for page in pages]
+
+        self.assertEqual([result.entity_type for result in default], ["cat", "cat"])
+        self.assertEqual(shadow[0].entity_type, "mechanic")
+        self.assertEqual(shadow[1].subtypes, ("tag:rare",))
+        self.assertEqual({result.strategy_version for result in shadow}, {"candidate"})
+        self.assertEqual(RuleBasedClassifier(rules=candidate).classify_batch(pages), shadow)
@@ -0,0 +1,27 @@
+import unittest
+from pathlib import Path
+
+from src.classification.domain.entities import PageRef
+from src.classification.domain.sharding import ShardSpec, shard_key, shard_output_path
+
+
+class ShardingTests(unittest.TestCase):
+    def test_shard_key_prefers_pageid(self):
+        self.assertEqual(shard_key(PageRef(source_id="12", location="")), "12")
+        self.assertEqual(shard_key(PageRef(source_id="Cat A_34", location="")), "34")
+        self.assertEqual(shard_key(PageRef(source_id="x", location="", metadata={"pageid": 56})), "56")
+        self.assertEqual(shard_key(PageRef(source_id="no-id", location="")), "no-id")
+
+    def test_every_ref_has_exactly_one_owner(self):
+        shards = [ShardSpec(index=index, count=4) for index in range(4)]
+        for pageid in range(200):
+            ref = PageRef(source_id=f"Page_{pageid}", location="")
+            self.assertEqual(sum(shard.owns(ref) for shard in shards), 1)
+
+    def test_invalid_spec_and_output_path(self):
+        with self.assertRaises(ValueError):
+            ShardSpec(index=2, count=2)
+        self.assertEqual(
+            shard_output_path("out/labels.jsonl", ShardSpec(index=1, count=3)),
+            str(Path("out/labels.shard-001-of-003.jsonl")),
+        )
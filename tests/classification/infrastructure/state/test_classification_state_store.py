@@ -1,4 +1,5 @@
-﻿import unittest
+﻿import sqlite3
+import unittest
 
 from src.classification.infrastructure.state.classification_state_store import ClassificationStateStore
 from tests.utils.tempdir import managed_temp_dir
@@ -38,3 +39,143 @@ class ClassificationStateStoreTests(unittest.TestCase):
                 self.assertIsNone(backup)
             finally:
                 store.close()
+
+    def test_legacy_db_gains_rule_hits_and_fingerprints(self):
+        with managed_temp_dir("state_store_rule_hits") as tmp_path:
+            db_path = tmp_path / "classification_state.db"
+            conn = sqlite3.connect(str(db_path))
+            conn.execute(
+                """
+                CREATE TABLE classification_state (
+                    doc_id TEXT PRIMARY KEY, source_mode TEXT NOT NULL, last_revid INTEGER, content_hash TEXT,
+                    strategy_version TEXT NOT NULL, entity_type TEXT NOT NULL, source_path TEXT NOT NULL,
+                    last_classified_at TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute("INSERT INTO classification_state VALUES ('1', 'html', 1, 'h1', '1.0.0', 'cat', 'p', 'now')")
+            conn.commit()
+            conn.close()
+
+            store = ClassificationStateStore(str(db_path))
+            try:
+                self.assertIsNone(store.get("1").rule_hits)
+                self.assertEqual(store.get_corpus_totals()["by_entity_type"], {"cat": 1})
+                store.upsert(
+                    state_key="2",
+                    source_mode="html",
+                    last_revid=2,
+                    content_hash="h2",
+                    strategy_version="1.0.0",
+                    entity_type="enemy",
+                    source_path="memory://2",
+                    rule_hits=("enemy_category",),
+                )
+                self.assertEqual(store.get("2").rule_hits, ("enemy_category",))
+                store.record_rule_fingerprints("1.0.0", {"enemy_category": "a"})
+                self.assertEqual(store.get_rule_fingerprints("1.0.0"), {"enemy_category": "a"})
+                self.assertEqual(store.get_rule_fingerprints("0.0.1"), {})
+            finally:
+                store.close()
+
+    def test_upserts_maintain_corpus_totals(self):
+        with managed_temp_dir("state_store_aggregates") as tmp_path:
+            store = ClassificationStateStore(str(tmp_path / "classification_state.db"))
+            try:
+
+                def upsert(state_key: str, entity_type: str, **flags):
+                    store.upsert(
+                        state_key=state_key,
+                        source_mode="html",
+                        last_revid=1,
+                        content_hash="h",
+                        strategy_version="1.0.0",
+                        entity_type=entity_type,
+                        source_path="memory://",
+                        **flags,
+                    )
+
+                upsert("1", "cat", is_low_conf=False, is_ambiguous=True)
+                upsert("2", "misc", is_low_conf=True, is_ambiguous=False)
+                upsert("3", "cat", is_low_conf=False, is_ambiguous=False)
+                # Relabel and keep the stored flags (carry-forward style upsert).
+                upsert("2", "enemy")
+                upsert("1", "stage", is_low_conf=False, is_ambiguous=False)
+
+                self.assertEqual(
+                    store.get_corpus_totals(),
+                    {
+                        "total_pages": 3,
+                        "by_entity_type": {"cat": 1, "enemy": 1, "stage": 1},
+                        "misc_count": 0,
+                        "low_conf_count": 1,
+                        "ambiguity_count": 0,
+                        "unflagged_count": 0,
+                    },
+                )
+
+                self.assertEqual(store.delete_missing({"1", "3"}, "html"), 1)
+                self.assertEqual(store.delete_missing({"1", "3"}, "db"), 0)
+                totals = store.get_corpus_totals()
+                self.assertEqual((totals["total_pages"], totals["low_conf_count"]), (2, 0))
+                self.assertEqual(totals["by_entity_type"], {"cat": 1, "stage": 1})
+            finally:
+                store.close()
+
+            reopened = ClassificationStateStore(str(tmp_path / "classification_state.db"))
+            try:
+                self.assertEqual(reopened.get_corpus_totals()["total_pages"], 2)
+            finally:
+                reopened.close()
+
+    def test_migration_recomputes_aggregates_from_rows(self):
+        with managed_temp_dir("state_store_aggregate_migration") as tmp_path:
+            db_path = tmp_path / "classification_state.db"
+            ClassificationStateStore(str(db_path)).close()
+            conn = sqlite3.connect(str(db_path))
+            conn.execute(
+                "INSERT INTO classification_state VALUES ('1', 'html', 1, 'h1', '1.0.0', 'cat', 'p', 'now', NULL, 1, 0)"
+            )
+            conn.execute(
+                "INSERT INTO classification_state VALUES ('2', 'html', 1, 'h2', '1.0.0', 'enemy', 'p', 'now', NULL, NULL, NULL)"
+            )
+            # Simulate a DB whose counters were maintained without triggers and drifted.
+            conn.execute("DROP TRIGGER trg_class_state_aggregates_insert")
+            conn.execute("UPDATE classification_aggregates SET value = 99")
+            conn.commit()
+            conn.close()
+
+            store = ClassificationStateStore(str(db_path))
+            try:
+                totals = store.get_corpus_totals()
+                self.assertEqual(totals["total_pages"], 2)
+                self.assertEqual(totals["by_entity_type"], {"cat": 1, "enemy": 1})
+                self.assertEqual((totals["low_conf_count"], totals["unflagged_count"]), (1, 1))
+            finally:
+                store.close()
+
+    def test_batched_commits_become_visible_on_flush(self):
+        with managed_temp_dir("state_store_batched") as tmp_path:
+            db_path = tmp_path / "classification_state.db"
+            store = ClassificationStateStore(str(db_path), commit_every=3)
+            try:
+                for key in ("1", "2"):
+                    store.upsert(
+                        state_key=key,
+                        source_mode="html",
+                        last_revid=1,
+                        content_hash="h",
+                        strategy_version="1.0.0",
+                        entity_type="cat",
+                        source_path="memory://",
+                    )
+                reader = sqlite3.connect(str(db_path))
+                try:
+                    count = lambda: reader.execute("SELECT COUNT(*) FROM classification_state").fetchone()[0]
+                    self.assertEqual(count(), 0)
+                    store.flush()
+                    self.assertEqual(count(), 2)
+                finally:
+                    reader.close()
+            finally:
+                store.close()
@@ -166,3 +166,74 @@ class ClassifiedJsonSinkTests(unittest.TestCase):
 
             self.assertTrue((classified_dir / "stage_1.json").exists())
             warning_mock.assert_called()
+
+    def test_write_label_uses_carried_payload_without_reading_source(self):
+        with managed_temp_dir("classified_payload") as tmp_path:
+            source_path = tmp_path / "cat_5.json"
+            source_payload = {"pageid": 5, "title": "Cat Five"}
+
+            sink = ClassifiedJsonSink(classified_root=str(tmp_path / "classified"), compact=True)
+            sink.write_label(
+                ClassificationLabelRecord(
+                    doc_id="5",
+                    pageid=5,
+                    title="Cat Five",
+                    revision_id=None,
+                    canonical_url=None,
+                    entity_type="cat",
+                    source_path=str(source_path),
+                    subtypes=("rarity:rare",),
+                    confidence=1.0,
+                    reasons=(),
+                    matched_rules=(),
+                    strategy_version="1.0.0",
+                    is_redirect=False,
+                    parse_warning=None,
+                    source_payload=source_payload,
+                )
+            )
+            sink.close()
+
+            target_path = tmp_path / "classified" / "cat" / "cat_5.json"
+            text = target_path.read_text(encoding="utf-8")
+            self.assertEqual(text.count("\n"), 1)
+            copied_payload = json.loads(text)
+            self.assertEqual(copied_payload["subtypes"], ["rarity:rare"])
+            self.assertEqual(sink.source_reread_count, 0)
+            self.assertNotIn("subtypes", source_payload)
+
+    def test_existing_directory_is_indexed_once_at_open(self):
+        with managed_temp_dir("classified_index") as tmp_path:
+            classified_dir = tmp_path / "classified" / "cat"
+            classified_dir.mkdir(parents=True, exist_ok=True)
+            (classified_dir / "same.json").write_text(json.dumps({"pageid": 1, "title": "Old"}), encoding="utf-8")
+
+            sink = ClassifiedJsonSink(classified_root=str(tmp_path / "classified"))
+            with patch("src.classification.infrastructure.sinks.classified_json_sink.Path.glob") as glob_mock:
+                for pageid in (2, 3, 3):
+                    sink.write_label(
+                        ClassificationLabelRecord(
+                            doc_id=str(pageid),
+                            pageid=pageid,
+                            title="New",
+                            revision_id=None,
+                            canonical_url=None,
+                            entity_type="cat",
+                            source_path=str(tmp_path / "same.json"),
+                            subtypes=(),
+                            confidence=1.0,
+                            reasons=(),
+                            matched_rules=(),
+                            strategy_version="1.0.0",
+                            is_redirect=False,
+                            parse_warning=None,
+                            source_payload={"pageid": pageid, "title": "New"},
+                        )
+                    )
+            sink.close()
+
+            glob_mock.assert_not_called()
+            self.assertEqual(json.loads((classified_dir / "same.json").read_text(encoding="utf-8"))["pageid"], 1)
+            self.assertTrue((classified_dir / "same_2.json").exists())
+            self.assertTrue((classified_dir / "same_3.json").exists())
+            self.assertEqual(sink.collision_renamed_count, 3)
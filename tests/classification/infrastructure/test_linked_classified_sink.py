@@ -0,0 +1,74 @@
+import json
+import os
+import unittest
+
+from src.classification.application.contracts import ClassificationLabelRecord
+from src.classification.infrastructure.sinks.linked_classified_sink import (
+    ClassifiedLabelOverlay,
+    LinkedClassifiedSink,
+)
+from tests.utils.tempdir import managed_temp_dir
+
+
+def _row(source_path: str, subtypes: tuple[str, ...], is_ambiguous: bool = False) -> ClassificationLabelRecord:
+    return ClassificationLabelRecord(
+        doc_id="7",
+        pageid=7,
+        title="Cat Seven",
+        revision_id=None,
+        canonical_url=None,
+        entity_type="cat",
+        source_path=source_path,
+        subtypes=subtypes,
+        confidence=1.0,
+        reasons=(),
+        matched_rules=(),
+        strategy_version="1.0.0",
+        is_redirect=False,
+        parse_warning=None,
+        is_ambiguous=is_ambiguous,
+    )
+
+
+class LinkedClassifiedSinkTests(unittest.TestCase):
+    def test_links_source_and_overlays_labels_on_read(self):
+        with managed_temp_dir("linked_sink") as tmp_path:
+            source_path = tmp_path / "cat_7.json"
+            source_path.write_text(json.dumps({"pageid": 7, "title": "Cat Seven"}), encoding="utf-8")
+            classified_root = tmp_path / "classified"
+
+            sink = LinkedClassifiedSink(classified_root=str(classified_root))
+            sink.write_label(_row(str(source_path), ("rarity:rare",)))
+            sink.close()
+
+            target_path = classified_root / "cat" / "cat_7.json"
+            self.assertTrue(os.path.samefile(source_path, target_path))
+            self.assertNotIn("subtypes", json.loads(target_path.read_text(encoding="utf-8")))
+
+            overlay = ClassifiedLabelOverlay(str(classified_root))
+            enriched = overlay.load_page(target_path)
+            self.assertEqual(enriched["subtypes"], ["rarity:rare"])
+            self.assertFalse(enriched["is_ambiguous"])
+            self.assertEqual(overlay.label_for("cat/cat_7.json")["entity_type"], "cat")
+
+    def test_manifest_keeps_latest_label_across_runs(self):
+        with managed_temp_dir("linked_sink_rerun") as tmp_path:
+            source_path = tmp_path / "cat_7.json"
+            source_path.write_text(json.dumps({"pageid": 7, "title": "Cat Seven"}), encoding="utf-8")
+            classified_root = tmp_path / "classified"
+
+            for subtypes, is_ambiguous in ((("rarity:rare",), False), (("rarity:uber_rare",), True)):
+                sink = LinkedClassifiedSink(classified_root=str(classified_root), link_mode="symlink")
+                sink.write_label(_row(str(source_path), subtypes, is_ambiguous))
+                sink.close()
+
+            self.assertTrue((classified_root / "cat" / "cat_7.json").is_symlink())
+            self.assertFalse((classified_root / "cat" / "cat_7_7.json").exists())
+            pages = dict(ClassifiedLabelOverlay(str(classified_root)).iter_pages())
+            self.assertEqual(pages["cat/cat_7.json"]["subtypes"], ["rarity:uber_rare"])
+            self.assertTrue(pages["cat/cat_7.json"]["is_ambiguous"])
+
+    def test_rejects_unknown_link_mode(self):
+        with managed_temp_dir("linked_sink_mode") as tmp_path:
+            with self.assertRaises(ValueError):
+                LinkedClassifiedSink(classified_root=str(tmp_path), link_mode="copy")
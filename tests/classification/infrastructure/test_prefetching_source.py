@@ -0,0 +1,95 @@
+import json
+import threading
+import unittest
+
+from src.classification.domain.entities import PageRef
+from src.classification.infrastructure.sources.HtmlPageSource import HtmlPageSource
+from src.classification.infrastructure.sources.PrefetchingPageSource import PrefetchingPageSource
+from tests.utils.tempdir import managed_temp_dir
+
+
+class PrefetchingPageSourceTests(unittest.TestCase):
+    def test_delivers_refs_in_order_with_prefetched_pages(self):
+        with managed_temp_dir("prefetch") as tmp_path:
+            for pageid in range(1, 11):
+                (tmp_path / f"page_{pageid:02d}.json").write_text(
+                    json.dumps({"pageid": pageid, "title": f"Page {pageid}"}), encoding="utf-8"
+                )
+            inner = HtmlPageSource(str(tmp_path))
+            source = PrefetchingPageSource(inner, prefetch_depth=4, max_workers=2)
+
+            self.assertEqual(source.count(), 10)
+            streamed = list(source.iter_discover())
+            expected = [ref.location for ref in inner.iter_discover()]
+            self.assertEqual([ref.location for ref in streamed], expected)
+
+            loaded_ids = []
+            for ref in source.iter_discover():
+                loaded_ids.append(source.load(ref).page.pageid)
+            self.assertEqual(len(loaded_ids), 10)
+            self.assertEqual(source.hit_count + source.stall_count, 10)
+            self.assertEqual(source.miss_count, 0)
+
+    def test_load_errors_surface_to_consumer_and_workers_stop(self):
+        class FailingSource:
+            def __init__(self):
+                self.loaded = []
+                self.lock = threading.Lock()
+
+            def discover(self):
+                return [PageRef(source_id=str(i), location=f"memory://{i}") for i in range(20)]
+
+            def load(self, ref):
+                with self.lock:
+                    self.loaded.append(ref.source_id)
+                raise RuntimeError(f"boom:{ref.source_id}")
+
+        inner = FailingSource()
+        source = PrefetchingPageSource(inner, prefetch_depth=3, max_workers=1)
+        refs = source.iter_discover()
+        first = next(refs)
+        with self.assertRaisesRegex(RuntimeError, "boom:0"):
+            source.load(first)
+        refs.close()
+        self.assertLessEqual(len(inner.loaded), 4)
+
+    def test_interleaved_iterations_keep_their_own_read_ahead(self):
+        with managed_temp_dir("prefetch_interleaved") as tmp_path:
+            for pageid in range(1, 5):
+                (tmp_path / f"page_{pageid}.json").write_text(json.dumps({"pageid": pageid}), encoding="utf-8")
+            source = PrefetchingPageSource(HtmlPageSource(str(tmp_path)), prefetch_depth=2, max_workers=1)
+
+            outer_ids = []
+            for outer_ref in source.iter_discover():
+                outer_ids.append(source.load(outer_ref).page.pageid)
+                inner_ids = [source.load(ref).page.pageid for ref in source.iter_discover()]
+                self.assertEqual(inner_ids, [1, 2, 3, 4])
+            self.assertEqual(outer_ids, [1, 2, 3, 4])
+            self.assertEqual(source.miss_count, 0)
+            self.assertEqual(source.stats()["hit_count"] + source.stats()["stall_count"], 20)
+
+    def test_count_then_iterate_discovers_non_streaming_source_once(self):
+        class ListSource:
+            discover_calls = 0
+
+            def discover(self):
+                self.discover_calls += 1
+                return [PageRef(source_id=str(i), location=f"memory://{i}") for i in range(3)]
+
+            def load(self, ref):
+                raise AssertionError("not loaded")
+
+        inner = ListSource()
+        source = PrefetchingPageSource(inner, prefetch_depth=2, max_workers=1)
+        self.assertEqual(source.count(), 3)
+        self.assertEqual([ref.source_id for ref in source.iter_discover()], ["0", "1", "2"])
+        self.assertEqual(inner.discover_calls, 1)
+
+    def test_out_of_order_load_falls_back_to_source(self):
+        with managed_temp_dir("prefetch_miss") as tmp_path:
+            path = tmp_path / "page.json"
+            path.write_text(json.dumps({"pageid": 5}), encoding="utf-8")
+            source = PrefetchingPageSource(HtmlPageSource(str(tmp_path)))
+            loaded = source.load(PageRef(source_id="page", location=str(path)))
+            self.assertEqual(loaded.page.pageid, 5)
+            self.assertEqual(source.miss_count, 1)
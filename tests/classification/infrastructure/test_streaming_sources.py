@@ -0,0 +1,91 @@
+import json
+import os
+import sqlite3
+import unittest
+from unittest import mock
+
+from src.classification.application.ports import StreamingPageSourcePort
+from src.classification.domain.entities import PageRef
+from src.classification.domain.sharding import ShardSpec
+from src.classification.infrastructure.sources.HtmlPageSource import HtmlPageSource
+from src.classification.infrastructure.sources.RegistryPageSource import RegistryPageSource
+from src.classification.infrastructure.sources.ShardedPageSource import ShardedPageSource
+from tests.utils.tempdir import managed_temp_dir
+
+
+class StreamingSourceTests(unittest.TestCase):
+    def test_html_source_streams_json_files_with_count(self):
+        with managed_temp_dir("stream_html") as tmp_path:
+            for pageid in (3, 1, 2):
+                (tmp_path / f"page_{pageid}.json").write_text(json.dumps({"pageid": pageid}), encoding="utf-8")
+            (tmp_path / "notes.txt").write_text("skip", encoding="utf-8")
+            (tmp_path / "classified").mkdir()
+
+            source = HtmlPageSource(str(tmp_path))
+            self.assertIsInstance(source, StreamingPageSourcePort)
+            with mock.patch(
+                "src.classification.infrastructure.sources.HtmlPageSource.os.scandir", wraps=os.scandir
+            ) as scandir:
+                self.assertEqual(source.count(), 3)
+                streamed = [ref.source_id for ref in source.iter_discover()]
+            self.assertEqual(scandir.call_count, 1)
+            self.assertEqual(streamed, ["page_1", "page_2", "page_3"])
+            self.assertEqual(streamed, [ref.source_id for ref in source.discover()])
+
+            (tmp_path / "page_0.json").write_text(json.dumps({"pageid": 0}), encoding="utf-8")
+            os.utime(tmp_path, ns=(0, 0))
+            self.assertEqual(source.count(), 4)
+
+    def test_registry_source_streams_rows_and_loads_fallback_on_demand(self):
+        with managed_temp_dir("stream_registry") as tmp_path:
+            db_path = tmp_path / "registry.db"
+            conn = sqlite3.connect(db_path)
+            conn.execute(
+                "CREATE TABLE pages (page_id INTEGER PRIMARY KEY, title TEXT, last_revid INTEGER, file_path TEXT, categories TEXT)"
+            )
+            conn.executemany(
+                "INSERT INTO pages VALUES (?, ?, ?, ?, ?)",
+                [
+                    (2, "Enemy B", 20, "", "Category:Enemy Units"),
+                    (1, "Cat A", 10, str(tmp_path / "missing.json"), "Category:Cat Units,Category:Rare Cats"),
+                ],
+            )
+            conn.commit()
+            conn.close()
+
+            source = RegistryPageSource(str(db_path))
+            self.assertEqual(source.count(), 2)
+            refs = list(source.iter_discover())
+            self.assertEqual([ref.source_id for ref in refs], ["1", "2"])
+            self.assertEqual(refs[0].metadata, {})
+
+            loaded = source.load(refs[0])
+            self.assertEqual(loaded.page.pageid, 1)
+            self.assertEqual(loaded.page.title, "Cat A")
+            self.assertEqual(loaded.page.revid, 10)
+            self.assertEqual(loaded.page.categories, ("Category:Cat Units", "Category:Rare Cats"))
+            self.assertEqual(loaded.meta.parse_warning, "missing_file_path")
+
+    def test_sharded_source_count_estimates_without_scanning(self):
+        class CountingSource:
+            def __init__(self):
+                self.iterations = 0
+
+            def discover(self):
+                return list(self.iter_discover())
+
+            def iter_discover(self):
+                self.iterations += 1
+                return iter([PageRef(source_id=str(pageid), location="") for pageid in range(10)])
+
+            def count(self):
+                return 10
+
+            def load(self, ref):
+                raise AssertionError("not loaded")
+
+        inner = CountingSource()
+        shards = [ShardedPageSource(inner, ShardSpec(index=index, count=3)) for index in range(3)]
+        self.assertEqual([shard.count() for shard in shards], [4, 4, 4])
+        self.assertEqual(inner.iterations, 0)
+        self.assertEqual(sum(len(list(shard.iter_discover())) for shard in shards), 10)
@@ -0,0 +1,118 @@
+import json
+import os
+import sqlite3
+import unittest
+from datetime import datetime, timezone
+
+from src.classification.classify import run_watch
+from src.classification.infrastructure.sources.WatchPageSource import DirectoryChangeFeed, RegistryChangeFeed
+from src.ingestion.infrastructure.registry_sqlite import SQLiteRegistryRepository
+from tests.utils.tempdir import managed_temp_dir
+
+
+def _write_page(path, pageid: int, revid: int = 1, categories=("Category:Enemy Units",)) -> None:
+    path.write_text(
+        json.dumps(
+            {
+                "pageid": pageid,
+                "title": f"Page {pageid}",
+                "revid": revid,
+                "categories": list(categories),
+                "content": f"content {revid}",
+                "is_redirect": False,
+            }
+        ),
+        encoding="utf-8",
+    )
+
+
+class DirectoryChangeFeedTests(unittest.TestCase):
+    def test_emits_new_and_changed_files_after_debounce(self):
+        with managed_temp_dir("watch_dir_feed") as tmp_path:
+            now = [0.0]
+            _write_page(tmp_path / "a_1.json", 1)
+            feed = DirectoryChangeFeed(str(tmp_path), debounce_seconds=2.0, clock=lambda: now[0])
+
+            self.assertEqual(feed.poll(), [])
+            now[0] = 2.5
+            self.assertEqual([ref.source_id for ref in feed.poll()], ["a_1"])
+            self.assertEqual(feed.poll(), [])
+
+            _write_page(tmp_path / "a_1.json", 1, revid=22)
+            _write_page(tmp_path / "b_2.json", 2)
+            now[0] = 3.0
+            self.assertEqual(feed.poll(), [])
+            now[0] = 5.0
+            self.assertEqual([ref.source_id for ref in feed.poll()], ["a_1", "b_2"])
+
+    def test_initial_scan_disabled_skips_existing_files(self):
+        with managed_temp_dir("watch_dir_feed_no_initial") as tmp_path:
+            _write_page(tmp_path / "a_1.json", 1)
+            feed = DirectoryChangeFeed(str(tmp_path), debounce_seconds=0.0, initial_scan=False)
+            self.assertEqual(feed.poll(), [])
+
+
+class RegistryChangeFeedTests(unittest.TestCase):
+    def test_follows_rows_by_last_updated_once_settled(self):
+        with managed_temp_dir("watch_registry_feed") as tmp_path:
+            db_path = tmp_path / "wiki_registry.db"
+            SQLiteRegistryRepository(db_path).close()
+            conn = sqlite3.connect(db_path)
+            conn.executemany(
+                "INSERT INTO pages (page_id, title, last_revid, file_path, categories, last_updated) VALUES (?, ?, 1, ?, '', ?)",
+                [(2, "B", "b.json", "2026-01-01 00:00:05"), (1, "A", "a.json", "2026-01-01 00:00:10")],
+            )
+            conn.commit()
+            now = [datetime(2026, 1, 1, 0, 0, 12, tzinfo=timezone.utc)]
+            feed = RegistryChangeFeed(str(db_path), debounce_seconds=1.0, clock=lambda: now[0])
+
+            self.assertEqual([ref.source_id for ref in feed.poll()], ["2", "1"])
+            self.assertEqual(feed.poll(), [])
+
+            # Rows are only taken once their second is older than the debounce window.
+            conn.executemany(
+                "INSERT INTO pages (page_id, title, last_revid, file_path, categories, last_updated) VALUES (?, ?, 1, ?, '', ?)",
+                [(3, "C", "c.json", "2026-01-01 00:00:11"), (4, "D", "d.json", "2026-01-01 00:00:12")],
+            )
+            conn.commit()
+            conn.close()
+            self.assertEqual(feed.poll(), [])
+            now[0] = datetime(2026, 1, 1, 0, 0, 13, tzinfo=timezone.utc)
+            self.assertEqual([ref.source_id for ref in feed.poll()], ["3"])
+            now[0] = datetime(2026, 1, 1, 0, 0, 14, tzinfo=timezone.utc)
+            self.assertEqual([ref.source_id for ref in feed.poll()], ["4"])
+
+
+class RunWatchTests(unittest.TestCase):
+    def test_watch_classifies_landed_pages_with_incremental_state(self):
+        with managed_temp_dir("watch_run") as tmp_path:
+            input_dir = tmp_path / "page"
+            input_dir.mkdir()
+            _write_page(input_dir / "a_1.json", 1)
+            _write_page(input_dir / "b_2.json", 2)
+
+            def watch(name: str):
+                return run_watch(
+                    source_mode="html",
+                    input_dir=str(input_dir),
+                    output_labels_path=str(tmp_path / f"{name}_labels.jsonl"),
+                    output_report_path=str(tmp_path / f"{name}_report.json"),
+                    output_review_path=str(tmp_path / f"{name}_review.jsonl"),
+                    classified_output_root=str(tmp_path / "classified"),
+                    state_db_path=str(tmp_path / "state.db"),
+                    poll_interval_seconds=0.0,
+                    debounce_seconds=0.0,
+                    state_commit_every=50,
+                    max_idle_polls=1,
+                )
+
+            first = watch("first")
+            self.assertEqual(first.classified_count, 2)
+            self.assertEqual(len((tmp_path / "first_labels.jsonl").read_text(encoding="utf-8").splitlines()), 2)
+
+            _write_page(input_dir / "b_2.json", 2, revid=3)
+            os.utime(input_dir / "b_2.json", ns=(1, 1))
+            second = watch("second")
+            self.assertEqual(second.total_pages, 2)
+            self.assertEqual(second.classified_count, 1)
+            self.assertEqual(second.corpus_totals["total_pages"], 2)
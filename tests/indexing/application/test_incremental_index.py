@@ -0,0 +1,206 @@
+import json
+import os
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+from src.classification.application.contracts import ClassificationLabelRecord
+from src.classification.infrastructure.sinks.linked_classified_sink import LinkedClassifiedSink
+from src.indexing.application.workflows.incremental_index import IncrementalIndexBuilder
+from src.indexing.domain.change_policy import build_node_set_signature
+from src.indexing.infrastructure.classified_corpus import ClassifiedCorpusReader
+from src.indexing.infrastructure.index_state_store import SQLiteIndexStateStore
+from tests.utils.tempdir import managed_temp_dir
+
+
+class FakeVectorIndex:
+    def __init__(self) -> None:
+        self.nodes: dict[str, str] = {}
+        self.embedded_doc_ids: list[str] = []
+        self.persist_count = 0
+
+    def add_documents(self, documents):
+        node_ids = {}
+        for document in documents:
+            self.embedded_doc_ids.append(document.doc_id)
+            chunks = [document.text[i : i + 20] for i in range(0, len(document.text), 20)]
+            node_ids[document.doc_id] = [f"{document.doc_id}-{i}" for i in range(len(chunks))]
+            self.nodes.update(zip(node_ids[document.doc_id], chunks))
+        return node_ids
+
+    def delete_nodes(self, node_ids):
+        for node_id in node_ids:
+            self.nodes.pop(node_id, None)
+
+    def reset(self):
+        self.nodes.clear()
+
+    def persist(self):
+        self.persist_count += 1
+
+
+def write_page(root: Path, entity_type: str, pageid: int, content: str, revid: int = 1, **extra) -> Path:
+    path = root / entity_type / f"Page {pageid}_{pageid}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"pageid": pageid, "title": f"Page {pageid}", "revid": revid, "content": content, "subtypes": [], **extra}
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    return path
+
+
+class TestIncrementalIndexBuilder(unittest.TestCase):
+    def _run(self, root: Path, index: FakeVectorIndex, signature: str = "sig-a", **kwargs):
+        store = SQLiteIndexStateStore(str(root / "index_state.db"))
+        try:
+            builder = IncrementalIndexBuilder(
+                corpus=ClassifiedCorpusReader(str(root / "classified")),
+                index=index,
+                state_store=store,
+                signature=signature,
+                persist_dir=str(root / "vector_store"),
+                batch_size=2,
+                show_progress=False,
+            )
+            return builder.run(**kwargs)
+        finally:
+            store.close()
+
+    def test_second_run_embeds_only_delta_and_drops_removed_pages(self) -> None:
+        with managed_temp_dir("index_incremental") as tmp:
+            classified = tmp / "classified"
+            write_page(classified, "cat", 1, "Basic cat content that is long enough for two chunks")
+            write_page(classified, "enemy", 2, "Doge enemy content")
+            removed_path = write_page(classified, "stage", 3, "Stage content")
+            write_page(classified, "misc", 4, "#REDIRECT [[Page 1]]", is_redirect=True)
+            index = FakeVectorIndex()
+
+            first = self._run(tmp, index)
+            self.assertEqual(first.added_count, 3)
+            self.assertEqual(first.skipped_count, 1)
+            self.assertEqual(sorted(index.embedded_doc_ids), ["1", "2", "3"])
+
+            index.embedded_doc_ids.clear()
+            write_page(classified, "enemy", 2, "Doge enemy content, rebalanced", revid=2)
+            write_page(classified, "cat", 1, "Basic cat content that is long enough for two chunks", revid=5)
+            removed_path.unlink()
+            write_page(classified, "cat", 5, "New cat")
+
+            second = self._run(tmp, index)
+            self.assertEqual(sorted(index.embedded_doc_ids), ["2", "5"])
+            self.assertEqual(second.added_count, 1)
+            self.assertEqual(second.changed_count, 1)
+            self.assertEqual(second.removed_count, 1)
+            self.assertEqual(second.revid_only_count, 1)
+            self.assertFalse(any(node_id.startswith("3-") for node_id in index.nodes))
+            self.assertEqual(index.nodes["2-1"], "rebalanced")
+            self.assertNotIn("Doge enemy content", index.nodes.values())
+
+            index.embedded_doc_ids.clear()
+            third = self._run(tmp, index)
+            self.assertEqual(index.embedded_doc_ids, [])
+            self.assertEqual(third.unchanged_count, 3)
+
+            store = SQLiteIndexStateStore(str(tmp / "index_state.db"))
+            try:
+                state = store.get_all()
+            finally:
+                store.close()
+            self.assertEqual(sorted(state), ["1", "2", "5"])
+            self.assertEqual(state["1"].revid, 5)
+
+    def test_node_set_signature_follows_content_not_revids(self) -> None:
+        with managed_temp_dir("index_node_set") as tmp:
+            write_page(tmp / "classified", "cat", 1, "Cat content")
+            self._run(tmp, FakeVectorIndex())
+
+            def node_set_signature() -> str:
+                store = SQLiteIndexStateStore(str(tmp / "index_state.db"))
+                try:
+                    return build_node_set_signature("sig-a", store.get_all().values())
+                finally:
+                    store.close()
+
+            initial = node_set_signature()
+            write_page(tmp / "classified", "cat", 1, "Cat content", revid=2)
+            self._run(tmp, FakeVectorIndex())
+            after_null_edit = node_set_signature()
+            write_page(tmp / "classified", "cat", 1, "Cat content, rebalanced", revid=3)
+            self._run(tmp, FakeVectorIndex())
+
+            self.assertEqual(after_null_edit, initial)
+            self.assertNotEqual(node_set_signature(), initial)
+
+    def test_signature_change_rebuilds_everything(self) -> None:
+        with managed_temp_dir("index_signature") as tmp:
+            write_page(tmp / "classified", "cat", 1, "Cat content")
+            write_page(tmp / "classified", "cat", 2, "Other cat content")
+            index = FakeVectorIndex()
+            self._run(tmp, index, signature="sig-a")
+            index.embedded_doc_ids.clear()
+
+            report = self._run(tmp, index, signature="sig-b")
+
+            self.assertEqual(report.rebuild_reason, "signature_changed")
+            self.assertEqual(sorted(index.embedded_doc_ids), ["1", "2"])
+
+    def test_state_is_not_committed_when_run_fails_before_persist(self) -> None:
+        class FailingIndex(FakeVectorIndex):
+            def persist(self):
+                raise RuntimeError("disk full")
+
+        with managed_temp_dir("index_crash") as tmp:
+            write_page(tmp / "classified", "cat", 1, "Cat content")
+            with self.assertRaises(RuntimeError):
+                self._run(tmp, FailingIndex())
+
+            index = FakeVectorIndex()
+            report = self._run(tmp, index)
+
+            self.assertEqual(report.added_count, 1)
+            self.assertEqual(index.embedded_doc_ids, ["1"])
+
+    def test_newest_copy_wins_when_page_moved_between_entity_types(self) -> None:
+        with managed_temp_dir("index_moved") as tmp:
+            old = write_page(tmp / "classified", "misc", 1, "Old label content")
+            os.utime(old, (1_000_000, 1_000_000))
+            write_page(tmp / "classified", "cat", 1, "New label content")
+
+            documents = list(ClassifiedCorpusReader(str(tmp / "classified")).iter_documents())
+
+            self.assertEqual(len(documents), 1)
+            self.assertEqual(documents[0].metadata["entity_type"], "cat")
+
+    def test_latest_manifest_row_wins_for_linked_layout(self) -> None:
+        with managed_temp_dir("index_moved_linked") as tmp:
+            source = tmp / "pages" / "Page 1.json"
+            source.parent.mkdir(parents=True)
+            source.write_text(json.dumps({"pageid": 1, "title": "Page 1", "content": "Linked content"}), encoding="utf-8")
+            row = ClassificationLabelRecord(
+                doc_id="1",
+                pageid=1,
+                title="Page 1",
+                revision_id=None,
+                canonical_url=None,
+                entity_type="cat",
+                source_path=str(source),
+                subtypes=(),
+                confidence=1.0,
+                reasons=(),
+                matched_rules=(),
+                strategy_version="1.0.0",
+                is_redirect=False,
+                parse_warning=None,
+            )
+            sink = LinkedClassifiedSink(classified_root=str(tmp / "classified"))
+            sink.write_label(row)
+            # Reclassified later; both hardlinks share one inode, so mtimes tie and "cat" sorts first.
+            sink.write_label(replace(row, entity_type="stage"))
+            sink.close()
+
+            documents = list(ClassifiedCorpusReader(str(tmp / "classified")).iter_documents())
+
+            self.assertEqual(len(documents), 1)
+            self.assertEqual(documents[0].metadata["entity_type"], "stage")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from src.indexing.domain.batching import plan_token_batches
+
+
+class TestPlanTokenBatches(unittest.TestCase):
+    def test_batches_respect_padded_token_budget(self) -> None:
+        lengths = [10, 500, 12, 480, 11, 9, 300]
+
+        batches = plan_token_batches(lengths, max_batch_tokens=1000, max_batch_size=8)
+
+        self.assertEqual(sorted(position for batch in batches for position in batch), list(range(len(lengths))))
+        for batch in batches:
+            self.assertLessEqual(max(lengths[p] for p in batch) * len(batch), 1000)
+        # Long texts are grouped together instead of padding the short ones.
+        self.assertEqual(batches[0], [1, 3])
+        self.assertEqual(batches[-1], [0, 5])
+
+    def test_max_batch_size_and_oversized_text(self) -> None:
+        batches = plan_token_batches([5000, 1, 1, 1], max_batch_tokens=100, max_batch_size=2)
+
+        self.assertEqual(batches[0], [0])
+        self.assertEqual([len(batch) for batch in batches[1:]], [2, 1])
+
+    def test_rejects_non_positive_limits(self) -> None:
+        with self.assertRaises(ValueError):
+            plan_token_batches([1], max_batch_tokens=0, max_batch_size=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+
+from src.indexing.domain.label_filter import LabelFilter
+from src.indexing.domain.tokenization import tokenize
+from src.indexing.infrastructure.bm25_index import Bm25Index
+from tests.utils.tempdir import managed_temp_dir
+
+DOCUMENTS = [
+    ("cat-1", "Crazed Cat\nAnti-Red cat with Massive Damage against Red enemies.", {"entity_type": "cat", "subtypes": ["target_trait:red"]}),
+    ("cat-2", "Jiangshi Cat\nResistant against Zombie enemies.", {"entity_type": "cat", "subtypes": ["target_trait:zombie"]}),
+    ("enemy-1", "Red Cyclone\nA red enemy with a wave attack.", {"entity_type": "enemy", "subtypes": ["trait:red"]}),
+    ("stage-1", "Korea\nAn Empire of Cats stage with red enemies and more red enemies.", {"entity_type": "stage"}),
+]
+
+
+class TokenizeTests(unittest.TestCase):
+    def test_hyphen_compounds_and_cjk_bigrams(self) -> None:
+        self.assertEqual(tokenize("Anti-Red"), ["anti-red", "anti", "red"])
+        self.assertEqual(tokenize("超激稀有"), ["超激", "激稀", "稀有"])
+        self.assertEqual(tokenize("貓 HP"), ["貓", "hp"])
+
+
+class Bm25IndexTests(unittest.TestCase):
+    def test_exact_terms_rank_first_and_survive_reload(self) -> None:
+        index = Bm25Index.build(DOCUMENTS)
+
+        ids, scores = index.query("anti-red massive damage", 3)
+
+        self.assertEqual(ids[0], "cat-1")
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertNotIn("cat-2", ids)
+        with managed_temp_dir("bm25-") as temp_dir:
+            index.save(temp_dir / "bm25")
+            reloaded = Bm25Index.load(temp_dir / "bm25")
+
+            self.assertIsInstance(reloaded.docs, np.memmap)
+            self.assertEqual(reloaded.query("anti-red massive damage", 3), (ids, scores))
+            self.assertEqual(
+                sorted(reloaded.query("red", 10, LabelFilter(entity_types=("enemy", "stage")))[0]), ["enemy-1", "stage-1"]
+            )
+            self.assertEqual(reloaded.query("red", 10, LabelFilter(subtype_groups=(("trait:red",),)))[0], ["enemy-1"])
+
+    def test_unknown_terms_and_resave_generations(self) -> None:
+        index = Bm25Index.build(DOCUMENTS)
+
+        self.assertEqual(index.query("metal angel", 5), ([], []))
+        with managed_temp_dir("bm25-resave-") as temp_dir:
+            directory = temp_dir / "bm25"
+            index.save(directory)
+            Bm25Index.build(DOCUMENTS[:2]).save(directory)
+
+            Bm25Index.build(DOCUMENTS[:3]).save(directory)
+
+            self.assertEqual(len(Bm25Index.load(directory)), 3)
+            # The previous generation stays for loaded readers; anything older is collected.
+            self.assertEqual(
+                {path.name.split("-")[-1] for path in directory.iterdir() if path.name != "meta.json"},
+                {"000002.npy", "000002.json", "000003.npy", "000003.json"},
+            )
+
+    def test_loaded_reader_survives_a_save_and_filters_lazily(self) -> None:
+        with managed_temp_dir("bm25-reader-") as temp_dir:
+            directory = temp_dir / "bm25"
+            Bm25Index.build(DOCUMENTS).save(directory)
+            reader = Bm25Index.load(directory)
+
+            Bm25Index.build(DOCUMENTS[:2]).save(directory)
+
+            self.assertEqual(reader.query("red", 5, LabelFilter(entity_types=("cat",)))[0], ["cat-1"])
+
+    def test_source_signature_survives_reload(self) -> None:
+        with managed_temp_dir("bm25-source-") as temp_dir:
+            directory = temp_dir / "bm25"
+            Bm25Index.build(DOCUMENTS).save(directory)
+            self.assertIsNone(Bm25Index.load(directory).source_signature)
+
+            index = Bm25Index.build(DOCUMENTS)
+            index.source_signature = "nodes-a"
+            index.save(directory)
+
+            self.assertEqual(Bm25Index.load(directory).source_signature, "nodes-a")
+
+
+if __name__ == "__main__":
+    unittest.main()
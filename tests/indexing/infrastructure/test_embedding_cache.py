@@ -0,0 +1,135 @@
+import importlib.util
+import threading
+import unittest
+
+import numpy as np
+
+from src.indexing.infrastructure.embedding_cache import EmbeddingCacheStore, embedding_text_hash
+from tests.utils.tempdir import managed_temp_dir
+
+HAS_LLAMA_INDEX = importlib.util.find_spec("llama_index") is not None
+
+
+class TestEmbeddingCacheStore(unittest.TestCase):
+    def test_vectors_survive_reopen(self) -> None:
+        with managed_temp_dir("embedding_cache_reopen") as tmp:
+            store = EmbeddingCacheStore(str(tmp))
+            store.put_many("model-a", 3, {"h1": [1.0, 2.0, 3.0], "h2": np.array([4.0, 5.0, 6.0])})
+            store.close()
+
+            store = EmbeddingCacheStore(str(tmp))
+            try:
+                found = store.get_many("model-a", 3, ["h1", "h2", "h3"])
+                self.assertEqual(store.dimension_for("model-a"), 3)
+                self.assertIsNone(store.dimension_for("model-b"))
+                self.assertEqual(store.get_many("model-b", 3, ["h1"]), {})
+            finally:
+                store.close()
+
+            np.testing.assert_array_equal(found["h1"], [1.0, 2.0, 3.0])
+            np.testing.assert_array_equal(found["h2"], [4.0, 5.0, 6.0])
+            self.assertNotIn("h3", found)
+            self.assertEqual((store.hit_count, store.miss_count), (2, 2))
+
+    def test_full_cache_evicts_least_recently_used_and_reuses_slots(self) -> None:
+        with managed_temp_dir("embedding_cache_evict") as tmp:
+            # Two rows of dim 2.
+            store = EmbeddingCacheStore(str(tmp), max_bytes=16)
+            try:
+                store.put_many("m", 2, {"old": [1.0, 1.0]})
+                store.put_many("m", 2, {"recent": [2.0, 2.0]})
+                store.get_many("m", 2, ["old"])
+
+                store.put_many("m", 2, {"new": [3.0, 3.0]})
+
+                found = store.get_many("m", 2, ["old", "recent", "new"])
+                self.assertEqual(sorted(found), ["new", "old"])
+                np.testing.assert_array_equal(found["new"], [3.0, 3.0])
+                self.assertEqual(store.entry_count("m", 2), 2)
+                self.assertEqual(store.evicted_count, 1)
+                self.assertEqual((tmp / next(p.name for p in tmp.glob("*.f32"))).stat().st_size, 16)
+            finally:
+                store.close()
+
+    def test_overflow_past_leaked_slots_is_left_uncached(self) -> None:
+        with managed_temp_dir("embedding_cache_overflow") as tmp:
+            store = EmbeddingCacheStore(str(tmp), max_bytes=16)
+            try:
+                store.put_many("m", 2, {"a": [1.0, 1.0]})
+                # Slot 1 leaked by an interrupted write: allocated but never recorded in entries.
+                store._conn.execute("UPDATE vector_files SET next_slot = 2 WHERE model = 'm' AND dim = 2")
+
+                store.put_many("m", 2, {"b": [2.0, 2.0], "c": [3.0, 3.0]})
+
+                found = store.get_many("m", 2, ["a", "b", "c"])
+                self.assertEqual(sorted(found), ["b"])
+                np.testing.assert_array_equal(found["b"], [2.0, 2.0])
+                self.assertEqual(store.entry_count("m", 2), 1)
+            finally:
+                store.close()
+
+    def test_store_opens_lazily_and_serves_other_threads(self) -> None:
+        with managed_temp_dir("embedding_cache_lazy") as tmp:
+            store = EmbeddingCacheStore(str(tmp / "cache"))
+            self.assertFalse((tmp / "cache").exists())
+            store.put_many("m", 2, {"h": [1.0, 2.0]})
+            found: dict = {}
+            worker = threading.Thread(target=lambda: found.update(store.get_many("m", 2, ["h"])))
+            worker.start()
+            worker.join()
+            store.close()
+
+            np.testing.assert_array_equal(found["h"], [1.0, 2.0])
+
+    def test_text_hash_normalizes_line_endings_and_separates_query_from_text(self) -> None:
+        self.assertEqual(embedding_text_hash("a\r\nb "), embedding_text_hash("a\nb"))
+        self.assertNotEqual(embedding_text_hash("a", "query"), embedding_text_hash("a", "text"))
+
+
+@unittest.skipUnless(HAS_LLAMA_INDEX, "llama_index is not installed")
+class TestCachedEmbedding(unittest.TestCase):
+    def _fake_model(self):
+        from llama_index.core.base.embeddings.base import BaseEmbedding
+
+        class FakeEmbedding(BaseEmbedding):
+            calls: list = []
+
+            def _get_query_embedding(self, query):
+                self.calls.append(("query", [query]))
+                return [float(len(query)), 1.0]
+
+            async def _aget_query_embedding(self, query):
+                return self._get_query_embedding(query)
+
+            def _get_text_embedding(self, text):
+                return self._get_text_embeddings([text])[0]
+
+            def _get_text_embeddings(self, texts):
+                self.calls.append(("text", list(texts)))
+                return [[float(len(text)), 0.0] for text in texts]
+
+        return FakeEmbedding(model_name="fake", calls=[])
+
+    def test_only_misses_reach_the_model_and_kinds_are_cached_separately(self) -> None:
+        from src.indexing.infrastructure.cached_embedding import CachedEmbedding
+
+        with managed_temp_dir("cached_embedding") as tmp:
+            inner = self._fake_model()
+            store = EmbeddingCacheStore(str(tmp))
+            try:
+                model = CachedEmbedding(inner, store)
+                first = model.get_text_embedding_batch(["aa", "bbb", "aa"])
+                second = model.get_text_embedding_batch(["bbb", "cccc"])
+                query = model.get_query_embedding("aa")
+                model.get_query_embedding("aa")
+            finally:
+                store.close()
+
+            self.assertEqual(first, [[2.0, 0.0], [3.0, 0.0], [2.0, 0.0]])
+            self.assertEqual(second, [[3.0, 0.0], [4.0, 0.0]])
+            self.assertEqual(query, [2.0, 1.0])
+            self.assertEqual(inner.calls, [("text", ["aa", "bbb"]), ("text", ["cccc"]), ("query", ["aa"])])
+
+
+if __name__ == "__main__":
+    unittest.main()
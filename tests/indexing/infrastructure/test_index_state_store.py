@@ -0,0 +1,63 @@
+import unittest
+
+from src.indexing.domain.models import IndexStateRow
+from src.indexing.infrastructure.index_state_store import SQLiteIndexStateStore
+from tests.utils.tempdir import managed_temp_dir
+
+
+def _row(doc_id: str, revid: int = 1) -> IndexStateRow:
+    return IndexStateRow(
+        doc_id=doc_id,
+        revid=revid,
+        fingerprint=f"fp-{doc_id}-{revid}",
+        node_ids=(f"{doc_id}-0", f"{doc_id}-1"),
+        source_path=f"cat/{doc_id}.json",
+        indexed_at="2024-01-01T00:00:00+00:00",
+    )
+
+
+class TestSQLiteIndexStateStore(unittest.TestCase):
+    def test_committed_rows_and_signature_survive_reopen(self) -> None:
+        with managed_temp_dir("index_state_store") as tmp:
+            db_path = str(tmp / "index_state.db")
+            store = SQLiteIndexStateStore(db_path)
+            store.upsert(_row("1"))
+            store.upsert(_row("2"))
+            store.upsert(_row("1", revid=3))
+            store.delete("2")
+            store.set_signature("sig-a")
+            store.commit()
+            store.close()
+
+            store = SQLiteIndexStateStore(db_path)
+            try:
+                state = store.get_all()
+                signature = store.get_signature()
+            finally:
+                store.close()
+
+            self.assertEqual(list(state), ["1"])
+            self.assertEqual(state["1"], _row("1", revid=3))
+            self.assertEqual(signature, "sig-a")
+
+    def test_close_discards_uncommitted_writes(self) -> None:
+        with managed_temp_dir("index_state_rollback") as tmp:
+            db_path = str(tmp / "index_state.db")
+            store = SQLiteIndexStateStore(db_path)
+            store.upsert(_row("1"))
+            store.commit()
+            store.clear()
+            store.upsert(_row("2"))
+            store.set_signature("sig-b")
+            store.close()
+
+            store = SQLiteIndexStateStore(db_path)
+            try:
+                self.assertEqual(list(store.get_all()), ["1"])
+                self.assertIsNone(store.get_signature())
+            finally:
+                store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
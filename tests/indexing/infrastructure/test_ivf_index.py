@@ -0,0 +1,92 @@
+import unittest
+
+import numpy as np
+
+from src.indexing.infrastructure.ivf_index import IvfConfig, IvfIndex
+from src.indexing.infrastructure.memmap_vectors import MemmapVectorMatrix
+from tests.utils.tempdir import managed_temp_dir
+
+
+def _clustered(count: int, dim: int = 16, clusters: int = 20, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    points = centers[rng.integers(0, clusters, size=count)] + rng.normal(scale=0.2, size=(count, dim))
+    return (points / np.linalg.norm(points, axis=1, keepdims=True)).astype(np.float32)
+
+
+class IvfIndexTests(unittest.TestCase):
+    def test_lists_partition_every_row_once(self) -> None:
+        vectors = _clustered(500)
+        ivf = IvfIndex.build(vectors, IvfConfig(nlist=10, iterations=5))
+
+        self.assertEqual(ivf.nlist, 10)
+        self.assertEqual(int(ivf.offsets[-1]), 500)
+        self.assertEqual(sorted(ivf.rows.tolist()), list(range(500)))
+        self.assertEqual(len(ivf.candidate_rows(vectors[0], nprobe=10)), 500)
+
+    def test_retrain_only_when_row_count_moves_far(self) -> None:
+        ivf = IvfIndex.build(_clustered(200), IvfConfig(nlist=4, iterations=2))
+
+        self.assertFalse(ivf.needs_retrain(150))
+        self.assertFalse(ivf.needs_retrain(400))
+        self.assertTrue(ivf.needs_retrain(99))
+        self.assertTrue(ivf.needs_retrain(401))
+
+
+class MemmapIvfQueryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.vectors = _clustered(2000)
+        self.ids = [f"n{i}" for i in range(len(self.vectors))]
+        self.queries = _clustered(30, seed=1)
+
+    def _saved_matrix(self, directory, ann: IvfConfig | None) -> MemmapVectorMatrix:
+        matrix = MemmapVectorMatrix(ann=ann)
+        matrix.add(self.ids, self.vectors, [{"ref_doc_id": f"d{i % 50}"} for i in range(len(self.ids))])
+        matrix.save(directory)
+        return matrix
+
+    def test_probing_recalls_exact_neighbours(self) -> None:
+        with managed_temp_dir("ivf-recall-") as temp_dir:
+            matrix = self._saved_matrix(temp_dir / "vectors", IvfConfig(nlist=20, nprobe=4, min_rows=100))
+            recalls = []
+            for query in self.queries:
+                exact, _ = matrix.query(query, 10, nprobe=0)
+                approx, _ = matrix.query(query, 10)
+                recalls.append(len(set(exact) & set(approx)) / 10)
+                all_lists, _ = matrix.query(query, 10, nprobe=20)
+                self.assertEqual(all_lists, exact)
+
+            self.assertGreaterEqual(float(np.mean(recalls)), 0.9)
+
+    def test_below_min_rows_stays_exact_without_ivf_files(self) -> None:
+        with managed_temp_dir("ivf-small-") as temp_dir:
+            directory = temp_dir / "vectors"
+            self._saved_matrix(directory, IvfConfig(min_rows=10_000))
+
+            self.assertFalse(any(path.name.startswith("ivf_") for path in directory.iterdir()))
+
+    def test_reload_keeps_centroids_and_respects_deletions(self) -> None:
+        with managed_temp_dir("ivf-reload-") as temp_dir:
+            directory = temp_dir / "vectors"
+            matrix = self._saved_matrix(directory, IvfConfig(nlist=20, nprobe=20, min_rows=100))
+            centroids = matrix._ivf.centroids.copy()
+            top, _ = matrix.query(self.queries[0], 1)
+
+            matrix.delete(top)
+            matrix.save(directory)
+            reloaded = MemmapVectorMatrix.load(directory)
+
+            self.assertEqual(reloaded.ann.nlist, 20)
+            np.testing.assert_array_equal(reloaded._ivf.centroids, centroids)
+            self.assertEqual(int(reloaded._ivf.offsets[-1]), len(self.ids) - 1)
+            ids, _ = reloaded.query(self.queries[0], 10)
+            self.assertNotIn(top[0], ids)
+            self.assertEqual(ids, reloaded.query(self.queries[0], 10, nprobe=0)[0])
+            self.assertEqual(
+                sorted(path.name for path in directory.iterdir() if path.name.startswith("ivf_")),
+                sorted(f"ivf_{kind}-{generation:06d}.npy" for kind in ("centroids", "offsets", "rows", "trained") for generation in (1, 2)),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
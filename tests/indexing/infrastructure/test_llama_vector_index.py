@@ -0,0 +1,68 @@
+import importlib.util
+import unittest
+
+from src.indexing.domain.models import IndexDocument
+from tests.utils.tempdir import managed_temp_dir
+
+HAS_LLAMA_INDEX = importlib.util.find_spec("llama_index") is not None
+
+
+def _document(doc_id: str, text: str) -> IndexDocument:
+    return IndexDocument(
+        doc_id=doc_id,
+        pageid=int(doc_id),
+        revid=1,
+        title=f"Page {doc_id}",
+        text=text,
+        fingerprint=f"fp-{doc_id}",
+        source_path=f"cat/{doc_id}.json",
+        metadata={"pageid": int(doc_id), "title": f"Page {doc_id}", "entity_type": "cat"},
+    )
+
+
+@unittest.skipUnless(HAS_LLAMA_INDEX, "llama_index is not installed")
+class TestLlamaVectorIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        from llama_index.core import Settings
+        from llama_index.core.embeddings import MockEmbedding
+
+        self._previous_embed_model = Settings._embed_model
+        Settings.embed_model = MockEmbedding(embed_dim=8)
+
+    def tearDown(self) -> None:
+        from llama_index.core import Settings
+
+        Settings._embed_model = self._previous_embed_model
+
+    def test_node_ids_are_deterministic_and_survive_persist(self) -> None:
+        from src.indexing.infrastructure.llama_vector_index import LlamaVectorIndex
+
+        with managed_temp_dir("llama_vector_index") as tmp:
+            index = LlamaVectorIndex(str(tmp / "vector_store"), chunk_size=64, chunk_overlap=0)
+            node_ids = index.add_documents([_document("1", "Cat one content."), _document("2", "Cat two content.")])
+            self.assertEqual(node_ids, {"1": ["1-0"], "2": ["2-0"]})
+            index.delete_nodes(node_ids["2"])
+            index.persist()
+
+            reloaded = LlamaVectorIndex(str(tmp / "vector_store"), chunk_size=64, chunk_overlap=0)
+            texts = {node_id: text for node_id, text, _ in reloaded.iter_node_texts()}
+
+            self.assertEqual(sorted(texts), ["1-0"])
+            self.assertTrue(texts["1-0"].startswith("Page 1\n"))
+
+    def test_reinserting_a_page_overwrites_its_chunks(self) -> None:
+        from src.indexing.infrastructure.llama_vector_index import LlamaVectorIndex
+
+        with managed_temp_dir("llama_vector_reinsert") as tmp:
+            index = LlamaVectorIndex(str(tmp / "vector_store"), chunk_size=64, chunk_overlap=0)
+            index.add_documents([_document("1", "Old content.")])
+            index.add_documents([_document("1", "New content.")])
+
+            texts = [text for _, text, _ in index.iter_node_texts()]
+
+            self.assertEqual(len(texts), 1)
+            self.assertIn("New content.", texts[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
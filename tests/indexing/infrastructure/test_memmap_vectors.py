@@ -0,0 +1,118 @@
+import unittest
+
+import numpy as np
+
+from src.indexing.domain.label_filter import LabelFilter
+from src.indexing.infrastructure.memmap_vectors import MemmapVectorMatrix
+from tests.utils.tempdir import managed_temp_dir
+
+
+class TestMemmapVectorMatrix(unittest.TestCase):
+    def _vectors(self, count: int, dim: int = 8, seed: int = 0) -> np.ndarray:
+        return np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+
+    def test_query_matches_brute_force_cosine_across_save_and_reload(self) -> None:
+        vectors = self._vectors(50)
+        ids = [f"n{i}" for i in range(50)]
+        query = self._vectors(1, seed=1)[0]
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = [ids[i] for i in np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]]
+
+        with managed_temp_dir("memmap_vectors") as tmp:
+            matrix = MemmapVectorMatrix()
+            matrix.add(ids, vectors, [{"ref_doc_id": f"d{i // 5}"} for i in range(50)])
+            self.assertEqual(matrix.query(query, 5)[0], expected)
+
+            matrix.save(tmp)
+            reloaded = MemmapVectorMatrix.load(tmp)
+
+            self.assertIsInstance(reloaded._base, np.memmap)
+            found_ids, scores = reloaded.query(query, 5)
+            self.assertEqual(found_ids, expected)
+            self.assertEqual(scores, sorted(scores, reverse=True))
+            restricted = reloaded.query(query, 10, allowed_ref_doc_ids={"d2"})[0]
+            self.assertEqual(sorted(restricted), ["n10", "n11", "n12", "n13", "n14"])
+
+    def test_deletes_and_additions_survive_compaction(self) -> None:
+        with managed_temp_dir("memmap_compact") as tmp:
+            matrix = MemmapVectorMatrix(dtype="float16")
+            matrix.add(["a", "b", "c"], np.eye(3, dtype=np.float32), [{"ref_doc_id": "1"}, {"ref_doc_id": "1"}, {"ref_doc_id": "2"}])
+            matrix.save(tmp)
+
+            matrix.delete_ref_doc("1")
+            matrix.add(["d"], [[0.0, 1.0, 1.0]], [{"ref_doc_id": "3"}])
+            self.assertEqual(matrix.query([0.0, 1.0, 0.0], 5)[0], ["d", "c"])
+            matrix.save(tmp)
+
+            reloaded = MemmapVectorMatrix.load(tmp)
+            self.assertEqual(len(reloaded), 2)
+            self.assertEqual(reloaded.query([0.0, 0.0, 1.0], 5)[0], ["c", "d"])
+            self.assertEqual(reloaded._base.dtype, np.float16)
+            matrix.save(tmp)
+            # The previous generation stays for open readers; anything older is collected.
+            self.assertEqual(
+                sorted(path.name for path in tmp.iterdir()),
+                ["ids-000002.npy", "ids-000003.npy", "meta.json", "rows-000002.json", "rows-000003.json", "vectors-000002.npy", "vectors-000003.npy"],
+            )
+
+    def test_open_reader_survives_a_save_and_filters_lazily(self) -> None:
+        with managed_temp_dir("memmap_reader") as tmp:
+            writer = MemmapVectorMatrix()
+            writer.add(["a", "b"], [[1.0, 0.0], [0.0, 1.0]], [{"ref_doc_id": "1"}, {"ref_doc_id": "2"}])
+            writer.save(tmp)
+            reader = MemmapVectorMatrix.load(tmp)
+
+            writer.add(["c"], [[1.0, 1.0]], [{"ref_doc_id": "3"}])
+            writer.save(tmp)
+
+            self.assertEqual(reader.query([1.0, 0.0], 5, allowed_ref_doc_ids={"2"})[0], ["b"])
+
+    def test_allowed_ids_longer_than_stored_ids_are_not_truncated(self) -> None:
+        with managed_temp_dir("memmap_allowed_ids") as tmp:
+            matrix = MemmapVectorMatrix()
+            matrix.add(["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+            matrix.save(tmp)
+
+            self.assertEqual(matrix.query([1.0, 0.0], 5, allowed_ids={"a-long", "b"})[0], ["b"])
+            self.assertEqual(matrix.query([1.0, 0.0], 5, allowed_ids={"ab"})[0], [])
+
+    def test_re_adding_an_id_replaces_its_vector(self) -> None:
+        with managed_temp_dir("memmap_replace") as tmp:
+            matrix = MemmapVectorMatrix()
+            matrix.add(["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+            matrix.save(tmp)
+
+            matrix.add(["a"], [[0.0, 1.0]])
+
+            self.assertEqual(len(matrix), 2)
+            np.testing.assert_allclose(matrix.get_vector("a"), [0.0, 1.0])
+            with self.assertRaises(ValueError):
+                matrix.add(["c"], [[1.0, 0.0, 0.0]])
+
+
+    def test_label_filter_restricts_base_and_delta_rows(self) -> None:
+        vectors = self._vectors(40)
+        labels = [
+            {"entity_type": "cat" if i % 2 else "enemy", "subtypes": ["target_trait:red"] if i % 4 == 1 else []}
+            for i in range(40)
+        ]
+        query = self._vectors(1, seed=2)[0]
+
+        with managed_temp_dir("memmap_labels") as tmp:
+            matrix = MemmapVectorMatrix()
+            matrix.add([f"n{i}" for i in range(40)], vectors, [{"ref_doc_id": f"d{i}", "metadata": labels[i]} for i in range(40)])
+            matrix.save(tmp)
+            matrix.add(["late"], self._vectors(1, seed=3), [{"ref_doc_id": "late", "metadata": {"entity_type": "cat", "subtypes": ["target_trait:red"]}}])
+
+            red_cats = LabelFilter(entity_types=("cat",), subtype_groups=(("target_trait:red", "target_trait:black"),))
+            ids, _ = matrix.query(query, 40, label_filter=red_cats)
+            enemies, _ = matrix.query(query, 40, label_filter=LabelFilter(entity_types=("enemy",)))
+            nothing, _ = matrix.query(query, 40, label_filter=LabelFilter(subtype_groups=(("rarity:rare",),)))
+
+            self.assertEqual(sorted(ids), sorted([f"n{i}" for i in range(1, 40, 4)] + ["late"]))
+            self.assertEqual(sorted(enemies), sorted(f"n{i}" for i in range(0, 40, 2)))
+            self.assertEqual(nothing, [])
+            self.assertEqual(matrix.label_vocabulary(), ({"cat", "enemy"}, {"target_trait:red"}))
+
+if __name__ == "__main__":
+    unittest.main()
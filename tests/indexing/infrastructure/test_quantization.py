@@ -0,0 +1,98 @@
+import unittest
+
+import numpy as np
+
+from src.indexing.infrastructure.memmap_vectors import MemmapVectorMatrix
+from src.indexing.infrastructure.quantization import (
+    QuantizationConfig,
+    load_quantizer,
+    save_quantizer,
+    score_codes,
+    train_quantizer,
+)
+from tests.utils.tempdir import managed_temp_dir
+
+
+def _normalized(count: int, dim: int = 32, seed: int = 0) -> np.ndarray:
+    vectors = np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class QuantizerTests(unittest.TestCase):
+    def test_int8_scores_track_float_scores(self) -> None:
+        vectors = _normalized(400)
+        quantizer = train_quantizer(vectors, QuantizationConfig(kind="int8"))
+        query = vectors[0]
+
+        approximate = score_codes(quantizer, quantizer.encode(vectors), query)
+
+        np.testing.assert_allclose(approximate, vectors @ query, atol=0.02)
+
+    def test_pq_codes_are_one_byte_per_subvector_and_round_trip(self) -> None:
+        vectors = _normalized(600)
+        quantizer = train_quantizer(vectors, QuantizationConfig(kind="pq", pq_subvectors=8, iterations=4))
+        codes = quantizer.encode(vectors)
+
+        self.assertEqual(codes.shape, (600, 8))
+        self.assertEqual(codes.dtype, np.uint8)
+        with managed_temp_dir("pq-") as temp_dir:
+            path = temp_dir / "quantizer.npz"
+            save_quantizer(quantizer, path)
+            reloaded = load_quantizer(path)
+        np.testing.assert_array_equal(reloaded.encode(vectors), codes)
+        self.assertEqual(reloaded.trained_count, 600)
+
+    def test_invalid_configs_are_rejected(self) -> None:
+        with self.assertRaisesRegex(ValueError, "Unsupported quantization"):
+            QuantizationConfig(kind="int4")
+        with self.assertRaisesRegex(ValueError, "not divisible"):
+            train_quantizer(_normalized(50, dim=30), QuantizationConfig(kind="pq", pq_subvectors=8))
+
+
+class QuantizedMatrixTests(unittest.TestCase):
+    def test_rescored_results_match_exact_float_search(self) -> None:
+        vectors = _normalized(1000)
+        ids = [f"n{i}" for i in range(len(vectors))]
+        queries = _normalized(20, seed=1)
+        with managed_temp_dir("quantized-matrix-") as temp_dir:
+            exact = MemmapVectorMatrix()
+            exact.add(ids, vectors)
+            exact.save(temp_dir / "float")
+            quantized = MemmapVectorMatrix(quantization=QuantizationConfig(kind="pq", pq_subvectors=8, rescore_factor=20))
+            quantized.add(ids, vectors)
+            quantized.save(temp_dir / "pq")
+            reloaded = MemmapVectorMatrix.load(temp_dir / "pq")
+
+            for query in queries:
+                expected_ids, expected_scores = exact.query(query, 5)
+                found_ids, found_scores = reloaded.query(query, 5)
+                self.assertEqual(found_ids, expected_ids)
+                np.testing.assert_allclose(found_scores, expected_scores, rtol=1e-5)
+            self.assertEqual(reloaded.quantization.kind, "pq")
+            self.assertLess(reloaded.scan_nbytes, exact.scan_nbytes)
+
+    def test_save_reuses_trained_parameters_and_reencodes_rows(self) -> None:
+        vectors = _normalized(300)
+        with managed_temp_dir("quantized-resave-") as temp_dir:
+            directory = temp_dir / "vectors"
+            matrix = MemmapVectorMatrix(quantization=QuantizationConfig(kind="int8"))
+            matrix.add([f"n{i}" for i in range(300)], vectors)
+            matrix.save(directory)
+            low = matrix._quantizer.low.copy()
+
+            matrix.delete(["n0", "n1"])
+            matrix.save(directory)
+
+            np.testing.assert_array_equal(matrix._quantizer.low, low)
+            self.assertEqual(len(matrix._codes), 298)
+            self.assertEqual(
+                sorted(path.name for path in directory.iterdir()),
+                sorted(
+                    ["meta.json"]
+                    + [f"{name}-{generation:06d}.{suffix}" for name, suffix in (("codes", "npy"), ("ids", "npy"), ("quantizer", "npz"), ("rows", "json"), ("vectors", "npy")) for generation in (1, 2)]
+                ),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
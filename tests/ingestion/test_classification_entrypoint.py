@@ -1,7 +1,10 @@
 import json
+import sqlite3
 import unittest
+from dataclasses import replace
 
-from src.classification.classify import run_classify
+from src.classification.classify import run_classify, run_merge_shards
+from src.classification.domain.rules import DEFAULT_RULE_SET
 from tests.utils.tempdir import managed_temp_dir
 
 
@@ -145,3 +148,189 @@ class ClassificationAdapterTests(unittest.TestCase):
             review_row = json.loads(reviews[0])
             self.assertEqual(label_row["entity_type"], "invalid")
             self.assertEqual(review_row["entity_type"], "invalid")
+
+    def test_adapter_reports_stage_timings_and_profile(self):
+        with managed_temp_dir("adapter_profile") as tmp_path:
+            input_dir = tmp_path / "html"
+            input_dir.mkdir()
+            (input_dir / "stage.json").write_text(
+                json.dumps(
+                    {
+                        "pageid": 1,
+                        "title": "Stage A",
+                        "revid": 1,
+                        "categories": ["Category:Event Stages"],
+                        "content": "stage content",
+                        "is_redirect": False,
+                    }
+                ),
+                encoding="utf-8",
+            )
+
+            result = run_classify(
+                enable_classification=True,
+                source_mode="html",
+                input_dir=str(input_dir),
+                output_labels_path=str(tmp_path / "labels.jsonl"),
+                output_report_path=str(tmp_path / "report.json"),
+                output_review_path=str(tmp_path / "review.jsonl"),
+                classified_output_root=str(tmp_path / "classified"),
+                incremental=False,
+                show_progress=False,
+                profile=True,
+            )
+
+            self.assertIsNotNone(result)
+            self.assertEqual(result.stage_timings["classify"]["count"], 1)
+            self.assertEqual(result.stage_timings["discover"]["count"], 1)
+            self.assertTrue((tmp_path / "report.prof").exists())
+            report = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))
+            self.assertEqual(set(report["stage_timings"]), set(result.stage_timings))
+            self.assertEqual(report["profile_path"], str(tmp_path / "report.prof"))
+            for timing in report["stage_timings"].values():
+                self.assertGreaterEqual(timing["wall_ms"], 0.0)
+
+    def test_adapter_reports_prefetch_stats(self):
+        with managed_temp_dir("adapter_prefetch") as tmp_path:
+            input_dir = tmp_path / "html"
+            input_dir.mkdir()
+            for pageid in (1, 2):
+                (input_dir / f"page_{pageid}.json").write_text(
+                    json.dumps({"pageid": pageid, "title": f"Page {pageid}", "revid": 1, "categories": []}),
+                    encoding="utf-8",
+                )
+
+            result = run_classify(
+                enable_classification=True,
+                source_mode="html",
+                input_dir=str(input_dir),
+                output_labels_path=str(tmp_path / "labels.jsonl"),
+                output_report_path=str(tmp_path / "report.json"),
+                output_review_path=str(tmp_path / "review.jsonl"),
+                classified_output_root=str(tmp_path / "classified"),
+                incremental=False,
+                show_progress=False,
+                prefetch_depth=2,
+            )
+
+            self.assertEqual(result.source_stats["hit_count"] + result.source_stats["stall_count"], 2)
+            self.assertEqual(result.source_stats["miss_count"], 0)
+            report = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))
+            self.assertEqual(report["source_stats"], result.source_stats)
+
+    def test_adapter_shadow_rules_diff_against_primary(self):
+        with managed_temp_dir("adapter_shadow_rules") as tmp_path:
+            input_dir = tmp_path / "html"
+            input_dir.mkdir()
+            (input_dir / "cat.json").write_text(
+                json.dumps({"pageid": 1, "title": "Cat A", "revid": 1, "categories": ["Category:Cat Units"]}),
+                encoding="utf-8",
+            )
+            candidate = replace(
+                DEFAULT_RULE_SET,
+                strategy_version="candidate",
+                primary_rules=tuple(rule for rule in DEFAULT_RULE_SET.primary_rules if rule.rule_id != "cat_units"),
+            )
+
+            result = run_classify(
+                enable_classification=True,
+                source_mode="html",
+                input_dir=str(input_dir),
+                output_labels_path=str(tmp_path / "labels.jsonl"),
+                output_report_path=str(tmp_path / "report.json"),
+                output_review_path=str(tmp_path / "review.jsonl"),
+                classified_output_root=str(tmp_path / "classified"),
+                incremental=False,
+                show_progress=False,
+                shadow_rules=candidate,
+            )
+
+            self.assertEqual(result.by_entity_type["cat"], 1)
+            diff = json.loads((tmp_path / "report.shadow_diff.json").read_text(encoding="utf-8"))
+            self.assertEqual(diff["shadow_strategy_version"], "candidate")
+            self.assertEqual(diff["entity_transitions"], {"cat->misc": 1})
+
+    def test_adapter_merged_shards_equal_single_node_run(self):
+        with managed_temp_dir("adapter_shards") as tmp_path:
+            page_dir = tmp_path / "corpus" / "page"
+            page_dir.mkdir(parents=True)
+            categories = (
+                ["Category:Cat Units", "Category:Rare Cats"],
+                ["Category:Enemy Units", "Category:Red Enemies"],
+                ["Category:Event Stages"],
+                [],
+            )
+            rows = []
+            for pageid in range(1, 61):
+                path = page_dir / f"Page_{pageid}_{pageid}.json"
+                page = {"pageid": pageid, "title": f"Page {pageid}", "revid": 1, "categories": categories[pageid % 4]}
+                path.write_text(json.dumps(page), encoding="utf-8")
+                rows.append((pageid, page["title"], 1, str(path), ",".join(page["categories"])))
+            db_path = tmp_path / "corpus" / "wiki_registry.db"
+            conn = sqlite3.connect(db_path)
+            conn.execute(
+                "CREATE TABLE pages (page_id INTEGER PRIMARY KEY, title TEXT, last_revid INTEGER, file_path TEXT, categories TEXT)"
+            )
+            conn.executemany("INSERT INTO pages VALUES (?, ?, ?, ?, ?)", rows)
+            conn.commit()
+            conn.close()
+
+            def classify(run_dir: str, **shard_args):
+                return run_classify(
+                    enable_classification=True,
+                    source_mode="db",
+                    db_path=str(db_path),
+                    output_labels_path=str(tmp_path / run_dir / "labels.jsonl"),
+                    output_report_path=str(tmp_path / run_dir / "report.json"),
+                    output_review_path=str(tmp_path / run_dir / "review.jsonl"),
+                    classified_output_root=str(tmp_path / run_dir / "classified"),
+                    state_db_path=str(tmp_path / run_dir / "state.db"),
+                    show_progress=False,
+                    **shard_args,
+                )
+
+            single = classify("single")
+            shard_results = [classify("sharded", shard_index=index, shard_count=3) for index in range(3)]
+            self.assertTrue(all(result.total_pages > 0 for result in shard_results))
+            self.assertEqual(sum(result.total_pages for result in shard_results), 60)
+            self.assertTrue((tmp_path / "sharded" / "state.shard-001-of-003.db").exists())
+
+            merged = run_merge_shards(
+                shard_count=3,
+                output_labels_path=str(tmp_path / "sharded" / "labels.jsonl"),
+                output_report_path=str(tmp_path / "sharded" / "report.json"),
+                output_review_path=str(tmp_path / "sharded" / "review.jsonl"),
+            )
+            for name in ("labels.jsonl", "review.jsonl"):
+                self.assertEqual((tmp_path / "sharded" / name).read_bytes(), (tmp_path / "single" / name).read_bytes())
+
+            single_report = json.loads((tmp_path / "single" / "report.json").read_text(encoding="utf-8"))
+            merged_report = json.loads((tmp_path / "sharded" / "report.json").read_text(encoding="utf-8"))
+            for key in ("duration_ms", "generated_at", "stage_timings", "profile_path"):
+                single_report.pop(key)
+                merged_report.pop(key)
+            self.assertEqual(merged_report, single_report)
+            self.assertEqual(merged.loaded_ok, single.classified_count)
+
+            # A shard report produced with a different shard count (here copied over shard 0) is rejected.
+            classify("stale", shard_index=0, shard_count=2)
+            (tmp_path / "sharded" / "report.shard-000-of-003.json").write_bytes(
+                (tmp_path / "stale" / "report.shard-000-of-002.json").read_bytes()
+            )
+            with self.assertRaises(ValueError):
+                run_merge_shards(
+                    shard_count=3,
+                    output_labels_path=str(tmp_path / "sharded" / "labels.jsonl"),
+                    output_report_path=str(tmp_path / "sharded" / "report.json"),
+                    output_review_path=str(tmp_path / "sharded" / "review.jsonl"),
+                )
+
+    def test_merge_shards_requires_every_shard(self):
+        with managed_temp_dir("adapter_shards_missing") as tmp_path:
+            with self.assertRaises(FileNotFoundError):
+                run_merge_shards(
+                    shard_count=2,
+                    output_labels_path=str(tmp_path / "labels.jsonl"),
+                    output_report_path=str(tmp_path / "report.json"),
+                    output_review_path=str(tmp_path / "review.jsonl"),
+                )
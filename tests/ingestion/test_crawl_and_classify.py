@@ -0,0 +1,59 @@
+import json
+import unittest
+from dataclasses import replace
+from unittest.mock import patch
+
+from src.classification.classify import run_classify
+from src.classification.crawl_and_classify import run_crawl_and_classify
+from src.ingestion.application.workflows.crawl_pages import CrawlWorkflowConfig
+from tests.ingestion.test_crawl_workflow import FakeMwClient, make_doc
+from tests.utils.tempdir import managed_temp_dir
+
+
+class CrawlAndClassifyTests(unittest.TestCase):
+    def test_crawled_pages_are_classified_in_the_same_run(self):
+        docs = {
+            1: replace(make_doc(1, 10), categories=("Category:Enemy Units",)),
+            2: replace(make_doc(2, 20), categories=("Category:Cat Units",)),
+        }
+        with managed_temp_dir("crawl_and_classify") as tmp_path:
+            page_dir = tmp_path / "page"
+            state_db = tmp_path / "classification_state.db"
+            with patch(
+                "src.ingestion.crawl.MediaWikiClient",
+                side_effect=lambda **_: FakeMwClient(remote_pages={1: 10, 2: 20}, docs=docs),
+            ):
+                result = run_crawl_and_classify(
+                    page_dir=page_dir,
+                    raw_dir=tmp_path / "raw",
+                    db_path=tmp_path / "wiki_registry.db",
+                    workflow_config=CrawlWorkflowConfig(polite_sleep_seconds=0),
+                    output_labels_path=str(tmp_path / "labels.jsonl"),
+                    output_report_path=str(tmp_path / "report.json"),
+                    output_review_path=str(tmp_path / "review.jsonl"),
+                    classified_output_root=str(tmp_path / "classified"),
+                    state_db_path=str(state_db),
+                    handoff_queue_size=1,
+                    show_progress=False,
+                )
+
+            self.assertEqual(result.crawl.processed_total, 2)
+            self.assertEqual(result.classification.classified_count, 2)
+            self.assertEqual(len(list(page_dir.glob("*.json"))), 2)
+            rows = [json.loads(line) for line in (tmp_path / "labels.jsonl").read_text(encoding="utf-8").splitlines()]
+            self.assertEqual(sorted((row["pageid"], row["entity_type"]) for row in rows), [(1, "enemy"), (2, "cat")])
+
+            # State recorded during the handoff is shared with batch html runs over the persisted pages.
+            batch = run_classify(
+                enable_classification=True,
+                source_mode="html",
+                input_dir=str(page_dir),
+                output_labels_path=str(tmp_path / "batch_labels.jsonl"),
+                output_report_path=str(tmp_path / "batch_report.json"),
+                output_review_path=str(tmp_path / "batch_review.jsonl"),
+                classified_output_root=str(tmp_path / "classified"),
+                state_db_path=str(state_db),
+                show_progress=False,
+            )
+            self.assertEqual(batch.total_pages, 2)
+            self.assertEqual(batch.classified_count, 0)
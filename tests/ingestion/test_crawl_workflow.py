@@ -112,6 +112,28 @@ class CrawlWorkflowTests(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(sorted(mw.fetch_page_calls), [2, 3])
             self.assertEqual(len(registry.upserts), 2)
 
+    async def test_saved_pages_are_handed_off_and_handoff_errors_do_not_fail_pages(self):
+        with managed_temp_dir("crawl_workflow_handoff") as tmp:
+            mw = FakeMwClient(remote_pages={1: 10, 2: 20}, docs={1: make_doc(1, 10), 2: make_doc(2, 20)})
+            handed_off: list[tuple[int, str]] = []
+
+            async def on_page_saved(page_doc: WikiPageDoc, file_path: Path) -> None:
+                handed_off.append((page_doc.pageid, file_path.name))
+                if page_doc.pageid == 2:
+                    raise RuntimeError("consumer gone")
+
+            workflow = CrawlPagesWorkflow(
+                mw_client=mw,
+                registry=FakeRegistry(local_state={}),
+                sink=FakeSink(tmp),
+                config=CrawlWorkflowConfig(chunk_size=2, polite_sleep_seconds=0, show_progress=False),
+                on_page_saved=on_page_saved,
+            )
+
+            summary = await workflow.run()
+            self.assertEqual(summary.processed_total, 2)
+            self.assertEqual(sorted(handed_off), [(1, "1.json"), (2, "2.json")])
+
     async def test_no_updates_returns_early(self):
         with managed_temp_dir("crawl_workflow_no_updates") as tmp:
             mw = FakeMwClient(remote_pages={1: 10}, docs={1: make_doc(1, 10)})
@@ -0,0 +1,91 @@
+import importlib.util
+import re
+import unittest
+
+from src.query.rerank_policy import RerankPolicy
+
+HAS_LLAMA_INDEX = importlib.util.find_spec("llama_index") is not None
+
+
+@unittest.skipUnless(HAS_LLAMA_INDEX, "llama_index is not installed")
+class ConcurrentLLMRerankTests(unittest.TestCase):
+    def _rerank(self, choice_batch_size: int = 2, policy: RerankPolicy | None = None):
+        from llama_index.core.llms import MockLLM
+
+        from src.query.concurrent_rerank import ConcurrentLLMRerank
+
+        class FakeLLM(MockLLM):
+            # Picks every document mentioning "relevant"; a batch containing "broken" gets an unparsable answer.
+            calls: list = []
+
+            async def apredict(self, prompt, **prompt_args) -> str:
+                context = prompt_args["context_str"]
+                self.calls.append(context)
+                if "broken" in context:
+                    return "I cannot decide."
+                documents = re.split(r"Document (\d+):\n", context)[1:]
+                picks = [number for number, text in zip(documents[::2], documents[1::2]) if "relevant" in text]
+                return "\n".join(f"Doc: {number}, Relevance: 5" for number in picks)
+
+        llm = FakeLLM(calls=[])
+        rerank = ConcurrentLLMRerank(
+            llm=llm,
+            choice_batch_size=choice_batch_size,
+            top_n=2,
+            policy=policy or RerankPolicy(skip_margin=1.0, window=None),
+        )
+        return rerank, llm
+
+    @staticmethod
+    def _nodes(texts: list[str]):
+        from llama_index.core.schema import NodeWithScore, TextNode
+
+        return [NodeWithScore(node=TextNode(id_=f"n{i}", text=text), score=0.5) for i, text in enumerate(texts)]
+
+    def test_batches_are_scored_and_cached_per_query(self) -> None:
+        from llama_index.core.schema import QueryBundle
+
+        rerank, llm = self._rerank()
+        nodes = self._nodes(["noise", "relevant one", "relevant two", "noise"])
+
+        first = rerank.postprocess_nodes(nodes, query_bundle=QueryBundle("q"))
+        second = rerank.postprocess_nodes(nodes, query_bundle=QueryBundle("q"))
+
+        self.assertEqual([node.node.node_id for node in first], ["n1", "n2"])
+        self.assertEqual([node.node.node_id for node in second], ["n1", "n2"])
+        self.assertEqual(len(llm.calls), 2)
+        self.assertEqual(rerank.stats.llm_call_count, 2)
+        self.assertEqual(rerank.stats.cache_hit_count, 4)
+
+    def test_unparsable_batch_is_left_unscored_and_retried_later(self) -> None:
+        from llama_index.core.schema import QueryBundle
+
+        rerank, llm = self._rerank()
+        nodes = self._nodes(["relevant one", "noise", "broken", "relevant two"])
+
+        ranked = rerank.postprocess_nodes(nodes, query_bundle=QueryBundle("q"))
+        rerank.postprocess_nodes(nodes, query_bundle=QueryBundle("q"))
+
+        self.assertEqual([node.node.node_id for node in ranked], ["n0"])
+        self.assertEqual(rerank.stats.failed_batch_count, 2)
+        # Only the unparsable batch is sent again; the parsed one is served from the cache.
+        self.assertEqual(len(llm.calls), 3)
+
+    def test_clear_retrieval_winner_skips_the_llm(self) -> None:
+        from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+
+        rerank, llm = self._rerank(policy=RerankPolicy(skip_margin=0.4))
+        nodes = [
+            NodeWithScore(node=TextNode(id_="a", text="noise"), score=0.9),
+            NodeWithScore(node=TextNode(id_="b", text="relevant"), score=0.3),
+        ]
+
+        ranked = rerank.postprocess_nodes(nodes, query_bundle=QueryBundle("q"))
+
+        self.assertEqual([node.node.node_id for node in ranked], ["a", "b"])
+        self.assertEqual(llm.calls, [])
+        self.assertEqual(rerank.stats.skipped_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
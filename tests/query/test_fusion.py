@@ -0,0 +1,20 @@
+import unittest
+
+from src.query.fusion import reciprocal_rank_fusion
+
+
+class ReciprocalRankFusionTests(unittest.TestCase):
+    def test_items_ranked_by_both_lists_win(self) -> None:
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d", "b"]], top_n=3, k=60)
+
+        self.assertEqual([item_id for item_id, _ in fused], ["c", "b", "a"])
+        self.assertAlmostEqual(fused[0][1], 1 / 63 + 1 / 61)
+
+    def test_ties_keep_first_seen_order(self) -> None:
+        fused = reciprocal_rank_fusion([["a"], ["b"]], top_n=5)
+
+        self.assertEqual([item_id for item_id, _ in fused], ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
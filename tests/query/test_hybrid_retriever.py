@@ -0,0 +1,43 @@
+import importlib.util
+import unittest
+from unittest import mock
+
+from src.indexing.infrastructure.bm25_index import Bm25Index
+
+HAS_LLAMA_INDEX = importlib.util.find_spec("llama_index") is not None
+
+
+@unittest.skipUnless(HAS_LLAMA_INDEX, "llama_index is not installed")
+class HybridRetrieverTests(unittest.TestCase):
+    def test_bm25_ids_missing_from_the_docstore_are_dropped(self) -> None:
+        from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+        from llama_index.core.storage.docstore import SimpleDocumentStore
+
+        from src.query.hybrid_retriever import HybridRetriever
+
+        docstore = SimpleDocumentStore()
+        dense_node = TextNode(id_="dense", text="Dark Cat attacks black enemies.")
+        sparse_node = TextNode(id_="sparse", text="Black enemies appear in this stage.")
+        docstore.add_documents([dense_node, sparse_node])
+        index = mock.Mock(docstore=docstore)
+        # "stale" was indexed by BM25 but is no longer in the vector docstore.
+        sparse_index = Bm25Index.build(
+            [
+                ("stale", "black enemies black enemies", {}),
+                ("sparse", "Black enemies appear in this stage.", {}),
+            ]
+        )
+        retriever = HybridRetriever(index=index, sparse_index=sparse_index)
+        try:
+            with mock.patch(
+                "src.query.hybrid_retriever.dense_search", return_value=[NodeWithScore(node=dense_node, score=0.9)]
+            ):
+                nodes = retriever.search(QueryBundle("black enemies"), None, 5)
+        finally:
+            retriever.close()
+
+        self.assertEqual(sorted(node.node.node_id for node in nodes), ["dense", "sparse"])
+
+
+if __name__ == "__main__":
+    unittest.main()
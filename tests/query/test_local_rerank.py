@@ -0,0 +1,32 @@
+import importlib.util
+import unittest
+
+from src.query.rerank_scorers import LexicalScorer
+
+HAS_LLAMA_INDEX = importlib.util.find_spec("llama_index") is not None
+
+
+@unittest.skipUnless(HAS_LLAMA_INDEX, "llama_index is not installed")
+class LocalRerankTests(unittest.TestCase):
+    def test_fused_lexical_scores_follow_the_returned_order(self) -> None:
+        from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+
+        from src.query.local_rerank import LocalRerank
+
+        nodes = [
+            NodeWithScore(node=TextNode(id_="a", text="Stage notes.", metadata={"title": "Korea"}), score=0.9),
+            NodeWithScore(node=TextNode(id_="b", text="Dark Cat strikes black enemies.", metadata={"title": "Dark Cat"}), score=0.8),
+            NodeWithScore(node=TextNode(id_="c", text="A crazed basic cat.", metadata={"title": "Crazed Cat"}), score=0.7),
+        ]
+
+        reranked = LocalRerank(scorer=LexicalScorer(), top_n=3).postprocess_nodes(
+            nodes, query_bundle=QueryBundle("dark cat black enemies")
+        )
+
+        scores = [node.score for node in reranked]
+        self.assertEqual(reranked[0].node.node_id, "b")
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
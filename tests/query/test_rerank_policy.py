@@ -0,0 +1,87 @@
+import unittest
+
+from src.query.fusion import reciprocal_rank_fusion
+from src.query.rerank_policy import (
+    COSINE_RERANK_POLICY,
+    RRF_RERANK_POLICY,
+    RerankPolicy,
+    RerankScoreCache,
+    RerankStats,
+    plan_rerank,
+)
+
+
+class PlanRerankTests(unittest.TestCase):
+    def test_clear_winner_skips_rerank(self) -> None:
+        plan = plan_rerank([0.9, 0.5, 0.45], top_n=3, policy=RerankPolicy(skip_margin=0.4))
+
+        self.assertEqual(plan.action, "skip")
+        self.assertAlmostEqual(plan.margin, 0.4 / 0.9)
+
+    def test_distant_tail_is_truncated_but_never_below_top_n(self) -> None:
+        scores = [0.033, 0.032, 0.031, 0.016, 0.015, 0.015]
+        policy = RerankPolicy(skip_margin=0.4, window=0.2)
+
+        self.assertEqual(plan_rerank(scores, top_n=2, policy=policy).candidate_count, 3)
+        self.assertEqual(plan_rerank(scores, top_n=4, policy=policy).candidate_count, 4)
+        self.assertEqual(plan_rerank(scores, top_n=2, policy=RerankPolicy(window=None)).action, "full")
+
+    def test_missing_or_non_positive_scores_rerank_everything(self) -> None:
+        self.assertEqual(plan_rerank([None, 0.2], top_n=1, policy=RerankPolicy()).action, "full")
+        self.assertEqual(plan_rerank([0.0, -0.1], top_n=1, policy=RerankPolicy()).action, "full")
+        self.assertEqual(plan_rerank([0.4], top_n=3, policy=RerankPolicy()).action, "skip")
+
+
+class RrfPolicyTests(unittest.TestCase):
+    @staticmethod
+    def _fused_scores(dense: list[str], sparse: list[str], top_n: int = 5) -> list[float]:
+        return [score for _, score in reciprocal_rank_fusion([dense, sparse], top_n=top_n)]
+
+    def test_cosine_window_never_truncates_rrf_candidates(self) -> None:
+        scores = self._fused_scores(["a", "b", "c", "d", "e"], ["b", "a", "x", "y", "z"])
+
+        self.assertEqual(plan_rerank(scores, top_n=3, policy=COSINE_RERANK_POLICY).action, "full")
+
+    def test_only_nodes_found_by_both_retrievers_are_sent(self) -> None:
+        scores = self._fused_scores(["a", "b", "c", "d", "e"], ["b", "c", "a", "x", "y"])
+
+        plan = plan_rerank(scores, top_n=2, policy=RRF_RERANK_POLICY)
+
+        self.assertEqual((plan.action, plan.candidate_count), ("truncate", 3))
+
+    def test_top_node_found_by_both_retrievers_alone_skips_rerank(self) -> None:
+        scores = self._fused_scores(["a", "b", "c", "d", "e"], ["a", "x", "y", "z", "w"])
+
+        self.assertEqual(plan_rerank(scores, top_n=3, policy=RRF_RERANK_POLICY).action, "skip")
+
+    def test_disjoint_retrievers_rerank_everything(self) -> None:
+        scores = self._fused_scores(["a", "b", "c"], ["x", "y", "z"])
+
+        self.assertEqual(plan_rerank(scores, top_n=3, policy=RRF_RERANK_POLICY).action, "full")
+
+
+class RerankScoreCacheTests(unittest.TestCase):
+    def test_lru_eviction_and_content_hash_in_key(self) -> None:
+        cache = RerankScoreCache(max_entries=2)
+        cache.put("q", "a", "h1", 7.0)
+        cache.put("q", "b", "h1", 0.0)
+        self.assertEqual(cache.get("q", "a", "h1"), 7.0)
+        cache.put("q", "c", "h1", 3.0)
+
+        self.assertIsNone(cache.get("q", "b", "h1"))
+        self.assertIsNone(cache.get("q", "a", "h2"))
+        self.assertEqual(len(cache), 2)
+
+
+class RerankStatsTests(unittest.TestCase):
+    def test_skip_rate(self) -> None:
+        stats = RerankStats()
+        stats.record(plan_rerank([0.9, 0.1], 3, RerankPolicy()), llm_calls=0, cache_hits=0, failed_batches=0)
+        stats.record(plan_rerank([0.5, 0.5, 0.5], 3, RerankPolicy()), llm_calls=1, cache_hits=2, failed_batches=0)
+
+        self.assertEqual(stats.to_dict()["skip_rate"], 0.5)
+        self.assertEqual(stats.llm_call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
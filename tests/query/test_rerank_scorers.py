@@ -0,0 +1,71 @@
+import unittest
+from unittest import mock
+
+from src.query.benchmarks.questions import QUESTION_TEMPLATES, build_excerpt_questions, title_free_excerpt
+from src.query.rerank_scorers import CrossEncoderScorer, LexicalScorer, build_passage_scorer
+
+
+class LexicalScorerTests(unittest.TestCase):
+    def test_title_and_phrase_match_ranks_first(self) -> None:
+        passages = [
+            "Crazed Cat\nA crazed version of the basic cat.",
+            "Dark Cat\nDark Cat strikes black enemies with long range attacks.",
+            "Stage Notes\nBlack enemies appear in this stage.",
+        ]
+
+        scores = LexicalScorer().score("dark cat against black enemies", passages)
+
+        self.assertEqual(max(range(len(passages)), key=scores.__getitem__), 1)
+
+    def test_empty_query_scores_zero(self) -> None:
+        self.assertEqual(LexicalScorer().score("", ["A\nx", "B\ny"]), [0.0, 0.0])
+
+
+class BuildPassageScorerTests(unittest.TestCase):
+    def test_lexical_kind(self) -> None:
+        self.assertIsInstance(build_passage_scorer("lexical"), LexicalScorer)
+
+    def test_unsupported_kind_raises(self) -> None:
+        with self.assertRaises(ValueError):
+            build_passage_scorer("llm")
+
+    def test_cross_encoder_falls_back_to_lexical_when_unavailable(self) -> None:
+        with mock.patch.object(CrossEncoderScorer, "__init__", side_effect=ImportError("no sentence_transformers")):
+            scorer = build_passage_scorer("cross-encoder")
+
+        self.assertIsInstance(scorer, LexicalScorer)
+
+    def test_cross_encoder_falls_back_to_lexical_on_model_errors(self) -> None:
+        with mock.patch.object(CrossEncoderScorer, "__init__", side_effect=ValueError("not a valid model id")):
+            scorer = build_passage_scorer("cross-encoder")
+
+        self.assertIsInstance(scorer, LexicalScorer)
+
+
+class ExcerptQuestionTests(unittest.TestCase):
+    def test_one_title_free_question_per_unique_page(self) -> None:
+        pages = [
+            ("Dark Cat", "cat", "Dark Cat\nDark Cat is a cat that attacks black enemies from long range."),
+            ("Dark Cat", "cat", "A later chunk of the same page with enough words in it."),
+            ("Doge", "enemy", "Short.\nDOGE is the first enemy most players meet in the game."),
+            ("Misc", None, "Too short."),
+            (None, "cat", "A page without a title is never asked about at all."),
+        ]
+
+        questions = build_excerpt_questions(pages, sample_size=10, seed=0)
+
+        self.assertEqual(sorted(question.relevant_titles[0] for question in questions), ["Dark Cat", "Doge"])
+        dark_cat = next(question for question in questions if question.relevant_titles == ("Dark Cat",))
+        self.assertEqual(
+            dark_cat.question, QUESTION_TEMPLATES["cat"].format(excerpt="it is a cat that attacks black enemies from long range.")
+        )
+        for question in questions:
+            self.assertNotIn(question.relevant_titles[0].lower(), question.question.lower())
+
+    def test_cjk_sentences_are_split_without_spaces(self) -> None:
+        excerpt = title_free_excerpt("狂亂貓", "狂亂貓。狂亂貓是一隻攻擊力很高的貓咪角色。")
+
+        self.assertEqual(excerpt, "it是一隻攻擊力很高的貓咪角色。")
+
+if __name__ == "__main__":
+    unittest.main()
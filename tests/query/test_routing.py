@@ -0,0 +1,51 @@
+import unittest
+
+from src.indexing.domain.label_filter import LabelFilter
+from src.query.routing import LabelQueryRouter
+
+
+class LabelQueryRouterTests(unittest.TestCase):
+    def test_cat_question_with_trait_routes_to_target_trait(self) -> None:
+        decision = LabelQueryRouter().route("Which uber rare cats are good against red enemies?")
+
+        self.assertEqual(decision.label_filter.entity_types, ("cat", "enemy"))
+        self.assertEqual(decision.label_filter.subtype_groups, ())
+
+        decision = LabelQueryRouter().route("Best anti-red cats?")
+
+        self.assertEqual(
+            decision.label_filter,
+            LabelFilter(entity_types=("cat",), subtype_groups=(("target_trait:red",),)),
+        )
+
+    def test_rarity_implies_cat_and_does_not_confuse_rarity_levels(self) -> None:
+        decision = LabelQueryRouter().route("超激稀有 有哪些角色適合打天使？")
+
+        self.assertEqual(
+            decision.label_filter,
+            LabelFilter(entity_types=("cat",), subtype_groups=(("rarity:uber_rare",), ("target_trait:angel",))),
+        )
+
+    def test_enemy_trait_and_game_name_are_not_cat_routes(self) -> None:
+        decision = LabelQueryRouter().route("In Battle Cats, which zombie enemies revive?")
+
+        self.assertEqual(decision.label_filter, LabelFilter(entity_types=("enemy",), subtype_groups=(("trait:zombie",),)))
+
+    def test_vocabulary_drops_labels_the_index_does_not_have(self) -> None:
+        router = LabelQueryRouter(vocabulary=({"cat", "enemy"}, {"trait:white"}))
+
+        decision = router.route("Which traitless enemies appear in stage 3?")
+
+        self.assertEqual(decision.label_filter, LabelFilter(entity_types=("enemy",)))
+        self.assertIn("route_stage", decision.matched_rules)
+
+        decision = router.route("Which traitless enemies have the most HP?")
+
+        self.assertEqual(decision.label_filter, LabelFilter(entity_types=("enemy",), subtype_groups=(("trait:white",),)))
+
+    def test_unrelated_question_is_not_routed(self) -> None:
+        self.assertTrue(LabelQueryRouter().route("How does XP work?").label_filter.is_empty)
+
+
+if __name__ == "__main__":
+    unittest.main()